@@ -20,6 +20,7 @@ from slowapi.util import get_remote_address
 
 from api.deps import get_settings
 from api.middleware import add_security_headers, global_exception_handler
+from api.services.metrics import MetricsMiddleware, httpx_event_hooks, install_urllib_metrics
 from api.routes import (
     edge_scanner_router,
     engine_router,
@@ -62,9 +63,12 @@ async def lifespan(app: FastAPI):
     settings.DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     # Create shared HTTP client
-    http_client = httpx.AsyncClient(timeout=30.0)
+    http_client = httpx.AsyncClient(timeout=30.0, event_hooks=httpx_event_hooks())
     logger.info("HTTP client initialized")
 
+    # Time urllib.request.urlopen() calls per upstream host
+    install_urllib_metrics()
+
     yield
 
     # Shutdown
@@ -96,6 +100,9 @@ app.add_middleware(
 # Security middleware
 app.middleware("http")(add_security_headers)
 
+# Request metrics (outermost, so it times every other middleware too)
+app.add_middleware(MetricsMiddleware)
+
 # Global exception handler
 app.exception_handler(Exception)(global_exception_handler)
 
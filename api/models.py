@@ -92,7 +92,11 @@ class ReadyResponse(BaseModel):
 
 
 class MetricsResponse(BaseModel):
-    """Basic metrics response."""
+    """Request metrics response (Prometheus text format at /metrics/prometheus)."""
     uptime_seconds: float
     request_count: int = 0
+    avg_latency_ms: float = 0.0
+    in_flight: int = 0
+    routes: list[dict] = []
+    upstreams: list[dict] = []
     version: str = "2.0.0"
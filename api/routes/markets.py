@@ -1658,15 +1658,12 @@ async def get_metaculus_questions(
 ):
     """Fetch Metaculus forecasts - free crowd predictions for politics, economics, etc."""
     try:
-        import sys
-        odds_path = _get_odds_modules_path()
-        if odds_path not in sys.path:
-            sys.path.insert(0, odds_path)
-        from metaculus import fetch_questions
+        from odds.metaculus import fetch_questions, get_scan_stats
         questions = fetch_questions(limit=limit)
         # Filter by minimum forecasters
         filtered = [q for q in questions if q.get("forecasters", 0) >= min_forecasters]
-        return {"questions": filtered, "count": len(filtered), "total_fetched": len(questions)}
+        return {"questions": filtered, "count": len(filtered), "total_fetched": len(questions),
+                "scan": get_scan_stats()}
     except ImportError as e:
         logger.exception("Metaculus module import failed")
         raise HTTPException(status_code=503, detail="Metaculus service unavailable")
@@ -1681,11 +1678,7 @@ async def get_metaculus_edge(
 ):
     """Find edge between Metaculus forecasts and Polymarket prices."""
     try:
-        import sys
-        odds_path = _get_odds_modules_path()
-        if odds_path not in sys.path:
-            sys.path.insert(0, odds_path)
-        from metaculus import find_edges
+        from odds.metaculus import find_edges
         edges = find_edges(min_edge_pct=min_edge * 100)
         return {"edges": edges, "count": len(edges), "min_edge_pct": min_edge * 100}
     except ImportError as e:
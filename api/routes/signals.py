@@ -14,6 +14,7 @@ This router consolidates all signal-related endpoints:
 - /rotations - Position rotation history
 - /signals/ic-report - IC measurement across all sources
 - /signals/ic/{source} - Per-source IC measurement
+- /portfolio/dashboard, /portfolio/stream - Cached dashboard snapshot (ETag) + SSE events
 """
 import json
 import os
@@ -24,7 +25,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -840,8 +842,9 @@ def aggregate_all_signals() -> dict:
         signals_path = _get_signals_path()
         if signals_path not in sys.path:
             sys.path.insert(0, signals_path)
-        from ic_tracker import record_signal_prediction
+        from ic_tracker import record_signal_predictions
         from calibrator import calibrate_confidence
+        to_record = []
         for sig in all_signals:
             if sig.get("market_id") and sig.get("side") not in ["NEUTRAL", "RESEARCH", ""]:
                 # Auto-calibrate confidence before recording
@@ -850,7 +853,8 @@ def aggregate_all_signals() -> dict:
                 if cal_conf != raw_conf:
                     sig["confidence_raw"] = raw_conf
                     sig["confidence"] = round(cal_conf, 1)
-                record_signal_prediction(sig)
+                to_record.append(sig)
+        record_signal_predictions(to_record)
     except Exception:
         pass  # Non-critical — IC tracking failure must not block signal generation
 
@@ -1097,21 +1101,23 @@ async def get_correlation_violations(
     Detects cases where narrower outcomes are priced higher than broader ones:
     - P(Chiefs win Super Bowl) should be <= P(Chiefs win AFC)
     - P(Trump wins election) should be <= P(Trump wins nomination)
+    - P(BTC above 110k) should be <= P(BTC above 100k)
+    - Mutually exclusive outcomes should sum to <= 100% (set_violations)
     
     Violations indicate mispricing / arbitrage opportunities.
     """
     try:
         from odds.correlation import scan_correlation_arb
+        from api.services.http_client import http_client
         
-        # Fetch active markets from Polymarket
+        # Fetch active markets from Polymarket (pooled async client, no event-loop blocking)
         url = f"{GAMMA_API}/markets?limit=200&active=true&closed=false"
-        req = urllib.request.Request(url, headers={"User-Agent": "Polyclawd/2.0"})
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            markets = json.loads(resp.read().decode())
+        markets = await http_client.get(url)
         
         if not markets:
             return {"violations": [], "error": "Failed to fetch markets"}
         
+        # Shared constraint graph: repeat scans only re-check constraints whose prices moved
         result = scan_correlation_arb(markets, min_violation_pct=min_violation)
         return result
     except Exception as e:
@@ -1766,6 +1772,45 @@ async def get_resolve_log(limit: int = Query(default=20)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/portfolio/dashboard")
+async def get_portfolio_dashboard(request: Request):
+    """Get the full portfolio dashboard in one payload (status, history, archetypes, resolve log, risk guards).
+
+    Served from a snapshot rebuilt only when positions open/close. Send If-None-Match
+    with the previous ETag to get 304 Not Modified.
+    """
+    try:
+        from api.services.portfolio_snapshot import get_snapshot, etag_matches
+        snap = get_snapshot()
+    except Exception as e:
+        logger.exception(f"Portfolio dashboard failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {"ETag": snap.etag, "Cache-Control": "no-cache", "X-Portfolio-Version": str(snap.version)}
+    if etag_matches(request.headers.get("if-none-match"), snap.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snap.body, media_type="application/json", headers=headers)
+
+
+@router.get("/portfolio/stream")
+async def stream_portfolio_events(request: Request, last_event_id: Optional[int] = Query(default=None)):
+    """Server-Sent Events stream of portfolio open/close events.
+
+    Each event is followed by a `snapshot` event carrying the new dashboard ETag.
+    Resumes from the Last-Event-ID header (or ?last_event_id=) on reconnect.
+    """
+    from api.services.portfolio_snapshot import stream_events
+
+    header_id = request.headers.get("last-event-id")
+    if last_event_id is None and header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+    return StreamingResponse(
+        stream_events(last_event_id=last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ============================================================================
 # Equity Curve
 # ============================================================================
@@ -1777,20 +1822,8 @@ async def get_portfolio_equity_curve():
         signals_path = _get_signals_path()
         if signals_path not in sys.path:
             sys.path.insert(0, signals_path)
-        import sqlite3
-        from pathlib import Path
-        db_path = Path(signals_path).parent / "storage" / "shadow_trades.db"
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(
-            "SELECT timestamp, bankroll FROM paper_portfolio_state ORDER BY timestamp ASC"
-        ).fetchall()
-        conn.close()
-        # Add initial point
-        curve = [{"t": "", "v": 500.0}]
-        for r in rows:
-            curve.append({"t": r["timestamp"], "v": r["bankroll"]})
-        return curve
+        from paper_portfolio import get_equity_curve
+        return get_equity_curve()
     except Exception as e:
         logger.exception(f"Equity curve failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -2222,13 +2255,9 @@ async def basket_arb_signals():
 @router.get("/basket-arb/compression")
 async def basket_arb_compression():
     """Check if arb spreads are compressed (bot competition)."""
-    from signals.basket_arb_scanner import check_spread_compression, _fetch_events
-    import json
-    events = _fetch_events(limit=50)
-    all_markets = []
-    for ev in events:
-        all_markets.extend(ev.get("markets", []))
-    return check_spread_compression(all_markets)
+    from signals.basket_arb_scanner import get_basket_engine
+    # Maintained incrementally by the shared engine; should_pause once held for the window
+    return get_basket_engine().compression()
 
 
 # === Copy-Trade Watcher Endpoints ===
@@ -2263,23 +2292,8 @@ async def get_risk_guards():
         signals_path = _get_signals_path()
         if signals_path not in sys.path:
             sys.path.insert(0, signals_path)
-        from paper_portfolio import get_kelly_status, get_correlation_status
-        from time_decay_optimizer import get_optimal_entry_windows
-        # CV Kelly haircut
-        cv_kelly_data = {}
-        try:
-            from cv_kelly import calculate_cv_kelly_haircut
-            kelly_info = get_kelly_status()
-            cv_kelly_data = calculate_cv_kelly_haircut(kelly_info.get("fraction", 0.125))
-        except Exception:
-            cv_kelly_data = {"note": "insufficient data"}
-
-        return {
-            "kelly": get_kelly_status(),
-            "cv_kelly": cv_kelly_data,
-            "correlation": get_correlation_status(),
-            "time_decay_windows": get_optimal_entry_windows()["windows"][:5],
-        }
+        from api.services.portfolio_snapshot import build_risk_guards
+        return build_risk_guards()
     except Exception as e:
         logger.exception(f"Risk guards failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -2305,3 +2319,24 @@ async def strike_scanner():
     except Exception as e:
         logger.exception(f"Strike scanner failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/signals/strike-ladders")
+async def strike_ladders():
+    """Check crypto strike ladders for non-monotone pricing across strikes."""
+    try:
+        signals_path = _get_signals_path()
+        if signals_path not in sys.path:
+            sys.path.insert(0, signals_path)
+        from strike_probability import check_strike_ladders, get_calculator
+        ladders = check_strike_ladders()
+        return {
+            "ladders": ladders,
+            "count": len(ladders),
+            "violations": sum(len(ladder["violations"]) for ladder in ladders),
+            "stats": get_calculator().stats,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        }
+    except Exception as e:
+        logger.exception(f"Strike ladder check failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -2,12 +2,13 @@
 import logging
 from datetime import datetime
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from api.deps import get_storage_service
 from api.models import HealthResponse, ReadyResponse, MetricsResponse
+from api.services.metrics import registry as metrics_registry
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +17,6 @@ router = APIRouter()
 # Rate limiter (will use app.state.limiter at runtime)
 limiter = Limiter(key_func=get_remote_address)
 
-# Track startup time for uptime calculation
-_startup_time = datetime.now()
-
-
 @router.get("/health", response_model=HealthResponse)
 @limiter.limit("60/minute")
 async def health(request: Request) -> HealthResponse:
@@ -78,14 +75,16 @@ async def source_health(request: Request):
 @router.get("/metrics", response_model=MetricsResponse)
 @limiter.limit("30/minute")
 async def metrics(request: Request) -> MetricsResponse:
-    """Basic metrics endpoint.
+    """Request metrics.
 
-    Returns uptime and request count placeholder.
+    Per-route counts, status codes and latency quantiles (slowest total time
+    first), plus outbound calls per upstream host.
     """
-    uptime = (datetime.now() - _startup_time).total_seconds()
+    return MetricsResponse(**metrics_registry.snapshot(), version="2.0.0")
 
-    return MetricsResponse(
-        uptime_seconds=uptime,
-        request_count=0,  # Placeholder - would need middleware to track
-        version="2.0.0"
-    )
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+@limiter.limit("30/minute")
+async def metrics_prometheus(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint (text exposition format 0.0.4)."""
+    return PlainTextResponse(metrics_registry.prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -239,57 +239,40 @@ class CrossPlatformEdgeScanner:
         return prices
     
     def fetch_metaculus(self) -> list:
-        """Fetch Metaculus forecasts (individual fetches required - list API hides predictions)."""
+        """Fetch Metaculus forecasts (listing with predictions, detail fetches only for gaps)."""
         prices = []
         try:
-            # Step 1: Get top question IDs by forecaster count
-            list_url = "https://www.metaculus.com/api/posts/?forecast_type=binary&status=open&order_by=-forecasters_count&limit=30"
+            from odds.metaculus import fetch_community_predictions
+            
+            # Step 1: Get top questions by forecaster count, predictions inline where the API allows
+            list_url = "https://www.metaculus.com/api/posts/?forecast_type=binary&status=open&order_by=-forecasters_count&limit=30&with_cp=true"
             list_data = self._fetch_url(list_url, timeout=30)
             if not list_data:
                 print("Metaculus: No list data returned")
                 return prices
             
-            results = list_data.get("results", [])
-            question_ids = []
-            for q in results:
-                qid = q.get("id")
-                forecasters = q.get("nr_forecasters", 0) or 0
-                if qid and forecasters >= 100:  # Only high-forecaster questions
-                    question_ids.append((qid, q.get("title", ""), forecasters))
+            posts = [
+                q for q in list_data.get("results", [])
+                if q.get("id") and (q.get("nr_forecasters", 0) or 0) >= 100  # Only high-forecaster questions
+            ][:20]
             
-            print(f"Metaculus: Fetching {len(question_ids)} questions individually...")
+            # Step 2: Fill missing predictions from cache / concurrent rate-limited detail fetches
+            predictions, stats = fetch_community_predictions(posts, get_json=self._fetch_url)
+            print(f"Metaculus: {stats['questions']} questions, {stats['inline']} inline, "
+                  f"{stats['cache_hits']} cached, {stats['detail_requests']} detail requests")
             
-            # Step 2: Fetch each question to get predictions (API hides them in list)
-            for qid, title, forecasters in question_ids[:20]:  # Limit to 20 to avoid rate limits
-                try:
-                    detail_url = f"https://www.metaculus.com/api/posts/{qid}/"
-                    detail = self._fetch_url(detail_url, timeout=15)
-                    if not detail:
-                        continue
-                    
-                    question = detail.get("question", {})
-                    if not question or question.get("type") != "binary":
-                        continue
-                    
-                    # Get prediction from individual question
-                    aggregations = question.get("aggregations", {})
-                    recency = aggregations.get("recency_weighted", {})
-                    latest = recency.get("latest", {})
-                    centers = latest.get("centers", []) if isinstance(latest, dict) else []
-                    prob = centers[0] if centers else None
-                    
-                    if prob is not None and title:
-                        prices.append(PlatformPrice(
-                            platform="metaculus",
-                            market_id=str(qid),
-                            title=title,
-                            probability=prob,
-                            forecasters=forecasters,
-                            url=f"https://metaculus.com/questions/{qid}/"
-                        ))
-                except Exception as e:
-                    print(f"Metaculus question {qid} error: {e}")
-                    continue
+            for q in posts:
+                qid, title = q["id"], q.get("title", "")
+                prob = predictions.get(qid)
+                if prob is not None and title:
+                    prices.append(PlatformPrice(
+                        platform="metaculus",
+                        market_id=str(qid),
+                        title=title,
+                        probability=prob,
+                        forecasters=q.get("nr_forecasters", 0) or 0,
+                        url=f"https://metaculus.com/questions/{qid}/"
+                    ))
                     
             print(f"Metaculus: Got {len(prices)} questions with predictions")
         except Exception as e:
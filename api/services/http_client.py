@@ -7,6 +7,8 @@ import httpx
 from typing import Optional, Dict, Any
 import logging
 
+from api.services.metrics import httpx_event_hooks
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,7 +37,8 @@ class AsyncHTTPClient:
                     max_keepalive_connections=10
                 ),
                 headers={"User-Agent": "Polyclawd/2.0"},
-                follow_redirects=True
+                follow_redirects=True,
+                event_hooks=httpx_event_hooks(),
             )
             logger.info("HTTP client initialized with connection pooling")
         return self._client
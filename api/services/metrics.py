@@ -0,0 +1,329 @@
+"""Request and upstream latency metrics with Prometheus text exposition.
+
+MetricsMiddleware is a pure ASGI middleware (no BaseHTTPMiddleware task
+overhead) recording per-route request counts, status codes, an in-flight
+gauge and latency histograms. Outbound calls are timed per upstream host
+through httpx event hooks and a urllib handler installed on the global opener,
+which covers the urllib.request.urlopen() calls used throughout the routes.
+
+Low overhead by construction:
+- Each (method, route template) and upstream host maps to one preallocated
+  stats object; a request does a dict lookup and a few integer increments,
+  never builds a label dict.
+- Counters live in per-thread shards (threading.local), so the event loop
+  and the threadpool never contend or lose increments, and no lock is taken
+  on the hot path. Shards are merged only when /metrics is scraped.
+"""
+import threading
+import time
+import urllib.request
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Seconds. Routes span cached reads (~1ms) to multi-source scans (10s+).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (non-cumulative counts; cumulated on export)."""
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def merge(self, other: "Histogram"):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.total += other.total
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                lower = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1] * 2
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+        return LATENCY_BUCKETS[-1]
+
+
+class SeriesStats:
+    """Status counts + latency histogram for one route or upstream host."""
+    __slots__ = ("statuses", "latency")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram()
+
+    def observe(self, status: int, seconds: float):
+        statuses = self.statuses
+        statuses[status] = statuses.get(status, 0) + 1
+        self.latency.observe(seconds)
+
+    def merge(self, other: "SeriesStats"):
+        for status, n in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + n
+        self.latency.merge(other.latency)
+
+
+class MetricsRegistry:
+    """Per-thread sharded metric storage, merged on read."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._local = threading.local()
+        self._shards: List[Tuple[Dict, Dict]] = []
+        self._shards_lock = threading.Lock()  # Only taken when a thread records its first sample
+        self.in_flight = 0                    # Mutated on the event loop thread only
+
+    def _shard(self) -> Tuple[Dict, Dict]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = ({}, {})
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        routes = self._shard()[0]
+        key = (method, route)
+        stats = routes.get(key)
+        if stats is None:
+            stats = routes[key] = SeriesStats()
+        stats.observe(status, seconds)
+
+    def observe_upstream(self, host: str, status: int, seconds: float):
+        hosts = self._shard()[1]
+        stats = hosts.get(host)
+        if stats is None:
+            stats = hosts[host] = SeriesStats()
+        stats.observe(status, seconds)
+
+    def _merged(self, index: int) -> Dict:
+        merged: Dict = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, stats in list(shard[index].items()):
+                target = merged.get(key)
+                if target is None:
+                    target = merged[key] = SeriesStats()
+                target.merge(stats)
+        return merged
+
+    def reset(self):
+        with self._shards_lock:
+            for routes, hosts in self._shards:
+                routes.clear()
+                hosts.clear()
+        self.in_flight = 0
+        self.started = time.time()
+
+    # ------------------------------------------------------------------
+    # Exposition
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """JSON view: totals plus per-route/per-host counts and latency quantiles, slowest first."""
+        routes = self._merged(0)
+        hosts = self._merged(1)
+
+        def _series(stats: SeriesStats) -> dict:
+            h = stats.latency
+            return {
+                "count": h.count,
+                "statuses": {str(k): v for k, v in sorted(stats.statuses.items())},
+                "avg_ms": round(h.total / h.count * 1000, 2) if h.count else 0.0,
+                "p50_ms": round(h.quantile(0.50) * 1000, 2),
+                "p95_ms": round(h.quantile(0.95) * 1000, 2),
+                "p99_ms": round(h.quantile(0.99) * 1000, 2),
+                "total_s": round(h.total, 3),
+            }
+
+        route_list = [{"method": m, "route": r, **_series(s)} for (m, r), s in routes.items()]
+        route_list.sort(key=lambda x: x["total_s"], reverse=True)
+        host_list = [{"host": host, **_series(s)} for host, s in hosts.items()]
+        host_list.sort(key=lambda x: x["total_s"], reverse=True)
+
+        request_count = sum(r["count"] for r in route_list)
+        total_seconds = sum(s.latency.total for s in routes.values())
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "request_count": request_count,
+            "avg_latency_ms": round(total_seconds / request_count * 1000, 2) if request_count else 0.0,
+            "in_flight": self.in_flight,
+            "routes": route_list,
+            "upstreams": host_list,
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            "# HELP polyclawd_uptime_seconds Seconds since the metrics registry started.",
+            "# TYPE polyclawd_uptime_seconds gauge",
+            f"polyclawd_uptime_seconds {time.time() - self.started:.3f}",
+            "# HELP polyclawd_http_requests_in_flight Requests currently being served.",
+            "# TYPE polyclawd_http_requests_in_flight gauge",
+            f"polyclawd_http_requests_in_flight {self.in_flight}",
+        ]
+        routes = {f'method="{_escape(m)}",route="{_escape(r)}"': s for (m, r), s in sorted(self._merged(0).items())}
+        hosts = {f'host="{_escape(h)}"': s for h, s in sorted(self._merged(1).items())}
+        _emit_series(lines, "polyclawd_http_request", "HTTP requests served", routes)
+        _emit_series(lines, "polyclawd_upstream_request", "Outbound HTTP calls", hosts)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _emit_series(lines: List[str], name: str, help_text: str, series: Dict[str, SeriesStats]):
+    """Emit <name>s_total{...,status} and the <name>_duration_seconds histogram."""
+    lines += [f"# HELP {name}s_total {help_text} by status code.", f"# TYPE {name}s_total counter"]
+    for labels, stats in series.items():
+        for status, n in sorted(stats.statuses.items()):
+            lines.append(f'{name}s_total{{{labels},status="{status}"}} {n}')
+
+    lines += [f"# HELP {name}_duration_seconds {help_text} latency.", f"# TYPE {name}_duration_seconds histogram"]
+    for labels, stats in series.items():
+        h = stats.latency
+        cumulative = 0
+        for bound, c in zip(LATENCY_BUCKETS, h.counts):
+            cumulative += c
+            lines.append(f'{name}_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_duration_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+        lines.append(f"{name}_duration_seconds_sum{{{labels}}} {h.total:.6f}")
+        lines.append(f"{name}_duration_seconds_count{{{labels}}} {h.count}")
+
+
+registry = MetricsRegistry()
+
+
+# ============================================================================
+# Inbound: ASGI middleware
+# ============================================================================
+
+class MetricsMiddleware:
+    """Time every HTTP request and attribute it to its route template (not the raw path)."""
+
+    def __init__(self, app, metrics: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.metrics = metrics or registry
+        self._templates: Dict[object, str] = {}
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        template = self._templates.get(endpoint)
+        if template is None:
+            app = scope.get("app")
+            if app is not None:
+                _collect_templates(getattr(app, "routes", []), "", self._templates)
+            template = self._templates.setdefault(endpoint, UNMATCHED_ROUTE)
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status = 500  # If the app raises before sending headers
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight -= 1
+            metrics.observe_request(scope["method"], self._route_template(scope), status, elapsed)
+
+
+def _collect_templates(routes, prefix: str, out: Dict[object, str]):
+    for route in routes:
+        path = prefix + getattr(route, "path", "")
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is not None:
+            out.setdefault(endpoint, path)
+        sub_routes = getattr(route, "routes", None)
+        if sub_routes:
+            _collect_templates(sub_routes, path, out)
+        elif endpoint is None and getattr(route, "app", None) is not None:
+            out.setdefault(route.app, path + "/{path}")  # Mount (e.g. StaticFiles)
+
+
+# ============================================================================
+# Outbound: httpx hooks + urllib handler
+# ============================================================================
+
+_START_KEY = "polyclawd_metrics_start"
+
+
+async def _httpx_request_hook(request):
+    request.extensions[_START_KEY] = time.perf_counter()
+
+
+async def _httpx_response_hook(response):
+    start = response.request.extensions.get(_START_KEY)
+    if start is not None:
+        registry.observe_upstream(response.request.url.host, response.status_code, time.perf_counter() - start)
+
+
+def httpx_event_hooks() -> dict:
+    """event_hooks= for httpx.AsyncClient so its calls show up per upstream host."""
+    return {"request": [_httpx_request_hook], "response": [_httpx_response_hook]}
+
+
+class UpstreamTimingHandler(urllib.request.BaseHandler):
+    """Times urllib requests from send to response headers, per host."""
+    handler_order = 100  # Before HTTPErrorProcessor (1000) so 4xx/5xx are recorded too
+
+    def http_request(self, req):
+        req._metrics_start = time.perf_counter()
+        return req
+
+    def http_response(self, req, response):
+        start = getattr(req, "_metrics_start", None)
+        if start is not None:
+            host = urlsplit(req.full_url).hostname or req.host
+            registry.observe_upstream(host, response.status, time.perf_counter() - start)
+        return response
+
+    https_request = http_request
+    https_response = http_response
+
+
+_urllib_installed = False
+
+
+def install_urllib_metrics():
+    """Install the timing handler on urllib's global opener (idempotent)."""
+    global _urllib_installed
+    if _urllib_installed:
+        return
+    urllib.request.install_opener(urllib.request.build_opener(UpstreamTimingHandler()))
+    _urllib_installed = True
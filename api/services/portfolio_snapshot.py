@@ -0,0 +1,167 @@
+"""
+Portfolio Dashboard Snapshot — one cached payload for static/portfolio.html.
+
+Bundles status, history, archetype aggregates, resolve log and risk guards into
+a single pre-serialized JSON body with a strong ETag. The snapshot is rebuilt
+only when paper_portfolio's event version changes (a file read, no DB work) or
+after SNAPSHOT_MAX_AGE for inputs that move without portfolio events
+(time-decay windows, CV Kelly). stream_events() pushes open/close events as
+Server-Sent Events so dashboards refetch only when something happened.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+SIGNALS_DIR = Path(__file__).parent.parent.parent / "signals"
+
+SNAPSHOT_MAX_AGE = 300       # Rebuild at least every 5 min for non-event inputs
+SNAPSHOT_HISTORY_LIMIT = 50
+SNAPSHOT_RESOLVE_LOG_LIMIT = 15
+SSE_POLL_INTERVAL = 2.0      # Seconds between version-file checks per stream
+SSE_HEARTBEAT = 15.0         # Keepalive comment interval (proxies drop idle streams)
+
+
+@dataclass(frozen=True)
+class PortfolioSnapshot:
+    version: int
+    built_at: float
+    body: bytes
+    etag: str
+
+
+_lock = threading.Lock()
+_snapshot: Optional[PortfolioSnapshot] = None
+
+
+def _portfolio():
+    """Import paper_portfolio the same way the signal routes do."""
+    signals_path = str(SIGNALS_DIR)
+    if signals_path not in sys.path:
+        sys.path.insert(0, signals_path)
+    import paper_portfolio
+    return paper_portfolio
+
+
+def build_risk_guards() -> dict:
+    """Kelly, CV Kelly, correlation cap and time-decay windows."""
+    pp = _portfolio()
+    from time_decay_optimizer import get_optimal_entry_windows
+
+    kelly_info = pp.get_kelly_status()
+    try:
+        from cv_kelly import calculate_cv_kelly_haircut
+        cv_kelly_data = calculate_cv_kelly_haircut(kelly_info.get("fraction", 0.125))
+    except Exception:
+        cv_kelly_data = {"note": "insufficient data"}
+
+    return {
+        "kelly": kelly_info,
+        "cv_kelly": cv_kelly_data,
+        "correlation": pp.get_correlation_status(),
+        "time_decay_windows": get_optimal_entry_windows()["windows"][:5],
+    }
+
+
+def _build(version: int) -> PortfolioSnapshot:
+    pp = _portfolio()
+    try:
+        risk_guards = build_risk_guards()
+    except Exception as e:
+        logger.warning("Snapshot risk guards failed: %s", e)
+        risk_guards = None
+
+    payload = {
+        "version": version,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "status": pp.get_portfolio_status(),
+        "history": pp.get_position_history(limit=SNAPSHOT_HISTORY_LIMIT),
+        "archetype_breakdown": pp.get_archetype_breakdown(),
+        "archetype_pnl_series": pp.get_archetype_cumulative_pnl(),
+        "resolve_log": pp.get_resolve_log(limit=SNAPSHOT_RESOLVE_LOG_LIMIT),
+        "risk_guards": risk_guards,
+    }
+    # ETag covers content only, so a TTL rebuild with unchanged data still 304s
+    content = {k: v for k, v in payload.items() if k != "generated_at"}
+    etag = '"' + hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()[:20] + '"'
+    body = json.dumps(payload, default=str).encode()
+    return PortfolioSnapshot(version=version, built_at=time.time(), body=body, etag=etag)
+
+
+def get_snapshot(force: bool = False) -> PortfolioSnapshot:
+    """Return the cached snapshot, rebuilding only if the portfolio changed or it aged out."""
+    global _snapshot
+    version = _portfolio().get_portfolio_version()
+    snap = _snapshot
+    if not force and snap and snap.version == version and time.time() - snap.built_at < SNAPSHOT_MAX_AGE:
+        return snap
+
+    with _lock:
+        snap = _snapshot
+        if force or not snap or snap.version != version or time.time() - snap.built_at >= SNAPSHOT_MAX_AGE:
+            started = time.time()
+            snap = _build(version)
+            _snapshot = snap
+            logger.debug("Portfolio snapshot rebuilt: version=%d %.0fms", version, (time.time() - started) * 1000)
+    return snap
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 If-None-Match comparison (weak comparison, list or '*')."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any((t[2:] if t.startswith("W/") else t) == etag for t in tags)
+
+
+def _sse(data: dict, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_events(
+    last_event_id: Optional[int] = None,
+    poll_interval: float = SSE_POLL_INTERVAL,
+    heartbeat: float = SSE_HEARTBEAT,
+) -> AsyncIterator[str]:
+    """Yield SSE frames: one per portfolio event, then a snapshot notice with the new ETag.
+
+    While nothing changes each stream only stats the version file. On reconnect
+    the browser sends Last-Event-ID and missed events are replayed from SQLite.
+    """
+    pp = _portfolio()
+    last_id = pp.get_portfolio_version() if last_event_id is None else last_event_id
+    yield f"retry: {int(poll_interval * 2500)}\n\n"
+    idle = 0.0
+
+    while True:
+        version = pp.get_portfolio_version()
+        if version < last_id:
+            last_id = version  # DB was reset
+        if version > last_id:
+            for event in pp.get_portfolio_events(since_id=last_id):
+                last_id = event["id"]
+                yield _sse(event, event=event["event"], event_id=event["id"])
+            snap = get_snapshot()
+            yield _sse({"version": snap.version, "etag": snap.etag}, event="snapshot")
+            idle = 0.0
+        elif idle >= heartbeat:
+            yield ": keepalive\n\n"
+            idle = 0.0
+        await asyncio.sleep(poll_interval)
+        idle += poll_interval
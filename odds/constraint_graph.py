@@ -0,0 +1,424 @@
+"""
+Constraint Graph for Cross-Market Correlation
+
+Markets are nodes; constraints between them are derived once per market
+(when it is added or retitled) and re-checked only when a price changes.
+
+Constraint kinds:
+- subset: P(narrower) <= P(broader), from CONSTRAINT_TEMPLATES within an
+  entity (e.g. P(Chiefs win Super Bowl) <= P(Chiefs win AFC))
+- ladder: threshold markets on the same question at different strikes
+  must be monotone (P(BTC above 110k) <= P(BTC above 100k))
+- exclusive: mutually exclusive outcomes must sum to <= 1
+  (Polymarket negRisk events, or "Will X win <same contest>?" for known X)
+
+Subset edges are found through an (entity, template, role) index, so adding
+a market costs its degree rather than its entity group's size; ladders and
+exclusive sets are re-evaluated in linear time only when one of their
+members moved.
+"""
+
+import bisect
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from odds.correlation import (
+        CONSTRAINT_TEMPLATES,
+        MarketPair,
+        _get_price,
+        _is_broader_outcome,
+        extract_entities,
+    )
+except ImportError:
+    from correlation import (
+        CONSTRAINT_TEMPLATES,
+        MarketPair,
+        _get_price,
+        _is_broader_outcome,
+        extract_entities,
+    )
+
+MIN_PAIR_VIOLATION = 0.01    # Same 1% floor detect_constraint_violations always used
+MIN_SET_VIOLATION = 0.01     # Sum of exclusive outcomes above 1.01
+ACTIONABLE_VIOLATION = 0.03  # 3% = actionable
+
+_TEMPLATES = [(re.compile(p), re.compile(c)) for p, c, _ in CONSTRAINT_TEMPLATES]
+
+# "above $100,000", "over 4.5%", "reach 150k"
+_THRESHOLD_RE = re.compile(
+    r'\b(above|over|at least|more than|greater than|exceed|reach|hit|below|under|less than)'
+    r'\s+\$?(\d[\d,]*(?:\.\d+)?)\s*([kmb]\b)?',
+    re.IGNORECASE,
+)
+_DOWN_WORDS = {'below', 'under', 'less than'}
+_SCALE = {'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+# "Will <subject> win <contest>?"
+_WINNER_RE = re.compile(r'^will\s+(?:the\s+)?(.+?)\s+win\s+(?:the\s+)?(.+?)\??$', re.IGNORECASE)
+
+
+@dataclass
+class ExclusiveSetViolation:
+    """Mutually exclusive outcomes whose YES prices sum to more than 1."""
+    group: str
+    markets: List[Tuple[str, float]]  # (title, price), highest price first
+    total: float
+    constraint: str
+    violation: float       # Percentage points above 100%
+    arb_opportunity: bool
+
+
+def market_id(market: Dict) -> str:
+    """Stable node id for a market dict (Polymarket, Kalshi or bare title)."""
+    for key in ('id', 'conditionId', 'ticker'):
+        if market.get(key):
+            return str(market[key])
+    return market.get('title', '') or market.get('question', '')
+
+
+def _threshold(title: str) -> Optional[Tuple[str, bool, float]]:
+    """(ladder key, is_down, strike) for a threshold question, else None."""
+    m = _THRESHOLD_RE.search(title)
+    if not m:
+        return None
+    word = m.group(1).lower()
+    try:
+        strike = float(m.group(2).replace(',', ''))
+    except ValueError:
+        return None
+    if m.group(3):
+        strike *= _SCALE[m.group(3).lower()]
+    key = (title[:m.start()] + f'<{word}>' + title[m.end():]).lower().strip()
+    return key, word in _DOWN_WORDS, strike
+
+
+def _exclusive_group(market: Dict, title: str) -> Optional[str]:
+    """Key shared by mutually exclusive outcomes, if the market belongs to a set."""
+    if market.get('exclusive_group'):
+        return str(market['exclusive_group'])
+    if market.get('negRisk') and market.get('negRiskMarketID'):
+        return f"negrisk:{market['negRiskMarketID']}"
+    m = _WINNER_RE.match(title.strip())
+    if m and extract_entities(m.group(1)):
+        return 'win:' + re.sub(r'\s+', ' ', m.group(2).lower()).strip()
+    return None
+
+
+class _Node:
+    __slots__ = ('id', 'title', 'price', 'order', 'entities', 'roles', 'ladder', 'exclusive', 'edges')
+
+    def __init__(self, mid: str, market: Dict, title: str, order: int):
+        self.id = mid
+        self.title = title
+        self.price = _get_price(market)
+        self.order = order
+        self.entities = sorted({e.lower() for e in extract_entities(title)})
+        lower = title.lower()
+        self.roles = [
+            (j, role)
+            for j, (parent_re, child_re) in enumerate(_TEMPLATES)
+            for role, rx in (('P', parent_re), ('C', child_re))
+            if rx.search(lower)
+        ]
+        self.ladder = _threshold(title)
+        self.exclusive = _exclusive_group(market, title)
+        self.edges: Set[Tuple[str, str]] = set()
+
+
+@dataclass
+class _Edge:
+    parent: str
+    child: str
+    entity: str
+
+
+@dataclass
+class _Ladder:
+    is_down: bool
+    rungs: List[Tuple[float, str]] = field(default_factory=list)  # Sorted by strike
+
+
+class ConstraintGraph:
+    """Incrementally maintained constraint graph over a market universe.
+
+    ``sync(markets)`` takes a full snapshot (adds, retitles, reprices and
+    drops markets); ``update_prices({id: price})`` applies price moves only.
+    ``violations()`` returns (pairwise, exclusive-set) violations, touching
+    only the constraints whose members changed since the last call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, _Node] = {}
+        self._edges: Dict[Tuple[str, str], _Edge] = {}
+        self._role_index: Dict[Tuple[str, int, str], Set[str]] = {}
+        self._entities: Dict[str, Set[str]] = {}
+        self._ladders: Dict[str, _Ladder] = {}
+        self._exclusive: Dict[str, Set[str]] = {}
+        self._order = 0
+        # Cached results, refreshed for dirty constraints only
+        self._edge_violations: Dict[Tuple[str, str], MarketPair] = {}
+        self._ladder_violations: Dict[str, List[MarketPair]] = {}
+        self._set_violations: Dict[str, ExclusiveSetViolation] = {}
+        self._dirty_ladders: Set[str] = set()
+        self._dirty_sets: Set[str] = set()
+        self.stats: Dict = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @property
+    def entity_groups(self) -> int:
+        return len(self._entities)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def sync(self, markets: Iterable[Dict]) -> Dict:
+        """Make the graph match a full market snapshot; returns update stats."""
+        started = time.perf_counter()
+        added = repriced = removed = 0
+        with self._lock:
+            seen = set()
+            for market in markets:
+                title = market.get('title', '') or market.get('question', '')
+                mid = market_id(market)
+                seen.add(mid)
+                node = self._nodes.get(mid)
+                if node is not None and node.title == title:
+                    price = _get_price(market)
+                    if price != node.price:
+                        self._set_price(node, price)
+                        repriced += 1
+                    continue
+                if node is not None:
+                    self._remove(node)
+                self._add(mid, market, title)
+                added += 1
+            for mid in [m for m in self._nodes if m not in seen]:
+                self._remove(self._nodes[mid])
+                removed += 1
+            self.stats = {
+                'nodes': len(self._nodes),
+                'edges': len(self._edges),
+                'ladders': sum(1 for ladder in self._ladders.values() if len(ladder.rungs) > 1),
+                'exclusive_sets': sum(1 for s in self._exclusive.values() if len(s) > 1),
+                'added': added,
+                'repriced': repriced,
+                'removed': removed,
+                'sync_seconds': round(time.perf_counter() - started, 4),
+            }
+            return dict(self.stats)
+
+    def update_prices(self, prices: Dict[str, float]) -> int:
+        """Apply price moves for known markets; returns how many changed."""
+        changed = 0
+        with self._lock:
+            for mid, price in prices.items():
+                node = self._nodes.get(mid)
+                if node is not None and node.price != price:
+                    self._set_price(node, price)
+                    changed += 1
+        return changed
+
+    def _add(self, mid: str, market: Dict, title: str):
+        self._order += 1
+        node = self._nodes[mid] = _Node(mid, market, title, self._order)
+
+        # Subset edges: partners share an entity and hold the complementary role
+        partners: Dict[str, str] = {}
+        for entity in node.entities:
+            self._entities.setdefault(entity, set()).add(mid)
+            for j, role in node.roles:
+                other = 'C' if role == 'P' else 'P'
+                for pid in self._role_index.get((entity, j, other), ()):
+                    partners.setdefault(pid, entity)
+        for entity in node.entities:
+            for j, role in node.roles:
+                self._role_index.setdefault((entity, j, role), set()).add(mid)
+        for pid, entity in partners.items():
+            if pid != mid:
+                self._link(self._nodes[pid], node, entity)
+
+        if node.ladder:
+            key, is_down, strike = node.ladder
+            ladder = self._ladders.setdefault(key, _Ladder(is_down))
+            bisect.insort(ladder.rungs, (strike, mid))
+            self._dirty_ladders.add(key)
+        if node.exclusive:
+            self._exclusive.setdefault(node.exclusive, set()).add(mid)
+            self._dirty_sets.add(node.exclusive)
+
+    def _link(self, first: _Node, second: _Node, entity: str):
+        """Orient an edge the way detect_constraint_violations always has."""
+        if _is_broader_outcome(first.title, second.title):
+            key = (first.id, second.id)
+        else:
+            key = (second.id, first.id)
+        self._edges[key] = _Edge(key[0], key[1], entity)
+        first.edges.add(key)
+        second.edges.add(key)
+        self._check_edge(key)
+
+    def _remove(self, node: _Node):
+        del self._nodes[node.id]
+        for key in node.edges:
+            self._edges.pop(key, None)
+            self._edge_violations.pop(key, None)
+            other = key[1] if key[0] == node.id else key[0]
+            if other in self._nodes:
+                self._nodes[other].edges.discard(key)
+        for entity in node.entities:
+            self._discard(self._entities, entity, node.id)
+            for j, role in node.roles:
+                self._discard(self._role_index, (entity, j, role), node.id)
+        if node.ladder:
+            key, _, strike = node.ladder
+            ladder = self._ladders[key]
+            ladder.rungs.remove((strike, node.id))
+            self._dirty_ladders.add(key)
+        if node.exclusive:
+            self._discard(self._exclusive, node.exclusive, node.id)
+            self._dirty_sets.add(node.exclusive)
+
+    @staticmethod
+    def _discard(index: Dict, key, mid: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(mid)
+            if not ids:
+                del index[key]
+
+    def _set_price(self, node: _Node, price: Optional[float]):
+        node.price = price
+        for key in node.edges:
+            self._check_edge(key)
+        if node.ladder:
+            self._dirty_ladders.add(node.ladder[0])
+        if node.exclusive:
+            self._dirty_sets.add(node.exclusive)
+
+    # ------------------------------------------------------------------
+    # Solver
+    # ------------------------------------------------------------------
+
+    def _check_edge(self, key: Tuple[str, str]):
+        edge = self._edges[key]
+        parent, child = self._nodes[edge.parent], self._nodes[edge.child]
+        if parent.price is None or child.price is None:
+            self._edge_violations.pop(key, None)
+            return
+        violation = max(0, child.price - parent.price)
+        if violation > MIN_PAIR_VIOLATION:
+            self._edge_violations[key] = MarketPair(
+                parent_market=parent.title,
+                parent_price=parent.price,
+                child_market=child.title,
+                child_price=child.price,
+                constraint="P(child) <= P(parent)",
+                violation=round(violation * 100, 2),
+                arb_opportunity=violation > ACTIONABLE_VIOLATION,
+                entity=edge.entity.title(),
+            )
+        else:
+            self._edge_violations.pop(key, None)
+
+    def _check_ladder(self, key: str) -> List[MarketPair]:
+        """Worst monotonicity break per rung, via one pass over sorted strikes."""
+        ladder = self._ladders.get(key)
+        if ladder is not None and not ladder.rungs:
+            del self._ladders[key]
+        if ladder is None or len(ladder.rungs) < 2:
+            return []
+        # Walk from the narrowest strike to the broadest, tracking the highest
+        # price seen among strictly narrower rungs
+        rungs = [(s, self._nodes[mid]) for s, mid in ladder.rungs]
+        if not ladder.is_down:
+            rungs.reverse()
+        constraint = ("P(lower strike) <= P(higher strike)" if ladder.is_down
+                      else "P(higher strike) <= P(lower strike)")
+        found = []
+        best: Optional[_Node] = None
+        i = 0
+        while i < len(rungs):
+            j = i
+            while j < len(rungs) and rungs[j][0] == rungs[i][0]:
+                j += 1
+            tier_best = best
+            for _, node in rungs[i:j]:
+                if node.price is None:
+                    continue
+                if best is not None and best.price - node.price > MIN_PAIR_VIOLATION:
+                    violation = best.price - node.price
+                    found.append(MarketPair(
+                        parent_market=node.title,
+                        parent_price=node.price,
+                        child_market=best.title,
+                        child_price=best.price,
+                        constraint=constraint,
+                        violation=round(violation * 100, 2),
+                        arb_opportunity=violation > ACTIONABLE_VIOLATION,
+                        entity=key,
+                    ))
+                if tier_best is None or node.price > tier_best.price:
+                    tier_best = node
+            best = tier_best
+            i = j
+        return found
+
+    def _check_set(self, key: str) -> Optional[ExclusiveSetViolation]:
+        members = [self._nodes[mid] for mid in self._exclusive.get(key, ())]
+        priced = [n for n in members if n.price is not None]
+        if len(priced) < 2:
+            return None
+        total = sum(n.price for n in priced)
+        if total - 1 <= MIN_SET_VIOLATION:
+            return None
+        priced.sort(key=lambda n: -n.price)
+        return ExclusiveSetViolation(
+            group=key,
+            markets=[(n.title, n.price) for n in priced],
+            total=round(total, 4),
+            constraint="sum(P) <= 1",
+            violation=round((total - 1) * 100, 2),
+            arb_opportunity=total - 1 > ACTIONABLE_VIOLATION,
+        )
+
+    def violations(self) -> Tuple[List[MarketPair], List[ExclusiveSetViolation]]:
+        """Current (pairwise + ladder, exclusive-set) violations."""
+        with self._lock:
+            for key in self._dirty_ladders:
+                found = self._check_ladder(key)
+                if found:
+                    self._ladder_violations[key] = found
+                else:
+                    self._ladder_violations.pop(key, None)
+            for key in self._dirty_sets:
+                found = self._check_set(key)
+                if found:
+                    self._set_violations[key] = found
+                else:
+                    self._set_violations.pop(key, None)
+            self._dirty_ladders.clear()
+            self._dirty_sets.clear()
+
+            pairs = list(self._edge_violations.values())
+            for found in self._ladder_violations.values():
+                pairs.extend(found)
+            return pairs, list(self._set_violations.values())
+
+
+_graph: Optional[ConstraintGraph] = None
+
+
+def get_constraint_graph() -> ConstraintGraph:
+    """Process-wide graph, so repeated scans only apply price moves."""
+    global _graph
+    if _graph is None:
+        _graph = ConstraintGraph()
+    return _graph
@@ -8,6 +8,10 @@ Examples:
 - P(Chiefs win Super Bowl) <= P(Chiefs win AFC)
 - P(Player wins MVP) <= P(Team makes playoffs)
 - P(Candidate wins) <= P(Candidate wins primary)
+- P(BTC above 110k) <= P(BTC above 100k)
+- sum of mutually exclusive outcomes <= 1
+
+Constraint detection runs on odds/constraint_graph.py.
 """
 
 import re
@@ -120,60 +124,27 @@ def group_markets_by_entity(markets: List[Dict]) -> Dict[str, List[Dict]]:
     return entity_markets
 
 
+def _constraint_graph_module():
+    try:
+        from odds import constraint_graph
+    except ImportError:
+        import constraint_graph
+    return constraint_graph
+
+
 def detect_constraint_violations(markets: List[Dict]) -> List[MarketPair]:
     """
     Find related markets and check for constraint violations.
     
+    Builds a ConstraintGraph over the markets, so related pairs come from an
+    (entity, template, role) index instead of comparing every pair within
+    each entity group. Also reports threshold-ladder inversions.
+    
     Returns list of market pairs with violations (arb opportunities).
     """
-    violations = []
-    entity_groups = group_markets_by_entity(markets)
-    
-    for entity, entity_markets in entity_groups.items():
-        if len(entity_markets) < 2:
-            continue
-        
-        # Compare all pairs within this entity
-        for i, m1 in enumerate(entity_markets):
-            for m2 in entity_markets[i+1:]:
-                title1 = m1.get('title', '') or m1.get('question', '')
-                title2 = m2.get('title', '') or m2.get('question', '')
-                
-                # Get prices
-                price1 = _get_price(m1)
-                price2 = _get_price(m2)
-                
-                if price1 is None or price2 is None:
-                    continue
-                
-                # Determine which is parent (broader) and child (narrower)
-                constraint = find_constraint_type(title1, title2)
-                
-                if constraint == 'subset':
-                    # Determine parent/child based on title keywords
-                    if _is_broader_outcome(title1, title2):
-                        parent, parent_price = title1, price1
-                        child, child_price = title2, price2
-                    else:
-                        parent, parent_price = title2, price2
-                        child, child_price = title1, price1
-                    
-                    # Check constraint: child <= parent
-                    violation = max(0, child_price - parent_price)
-                    
-                    if violation > 0.01:  # 1% minimum violation
-                        violations.append(MarketPair(
-                            parent_market=parent,
-                            parent_price=parent_price,
-                            child_market=child,
-                            child_price=child_price,
-                            constraint="P(child) <= P(parent)",
-                            violation=round(violation * 100, 2),
-                            arb_opportunity=violation > 0.03,  # 3% = actionable
-                            entity=entity.title()
-                        ))
-    
-    return violations
+    graph = _constraint_graph_module().ConstraintGraph()
+    graph.sync(markets)
+    return graph.violations()[0]
 
 
 def _get_price(market: Dict) -> Optional[float]:
@@ -227,27 +198,33 @@ def _is_broader_outcome(title1: str, title2: str) -> bool:
     return len(title1) < len(title2)
 
 
-def scan_correlation_arb(markets: List[Dict], min_violation_pct: float = 3.0) -> Dict:
+def scan_correlation_arb(markets: List[Dict], min_violation_pct: float = 3.0, graph=None) -> Dict:
     """
     Main entry point: scan markets for correlation-based arbitrage.
     
     Args:
         markets: List of market dicts with title and price
         min_violation_pct: Minimum constraint violation to report (default 3%)
+        graph: ConstraintGraph to sync into (default: the shared one, so
+            repeated scans only re-check constraints whose prices moved)
     
     Returns:
         Dict with violations and summary stats
     """
-    all_violations = detect_constraint_violations(markets)
+    if graph is None:
+        graph = _constraint_graph_module().get_constraint_graph()
+    graph_stats = graph.sync(markets)
+    all_violations, set_violations = graph.violations()
     
     actionable = [v for v in all_violations if v.violation >= min_violation_pct]
+    actionable_sets = [v for v in set_violations if v.violation >= min_violation_pct]
     
     return {
         "timestamp": datetime.utcnow().isoformat(),
         "total_markets_scanned": len(markets),
-        "entity_groups_found": len(group_markets_by_entity(markets)),
-        "total_violations": len(all_violations),
-        "actionable_violations": len(actionable),
+        "entity_groups_found": graph.entity_groups,
+        "total_violations": len(all_violations) + len(set_violations),
+        "actionable_violations": len(actionable) + len(actionable_sets),
         "violations": [
             {
                 "entity": v.entity,
@@ -262,7 +239,20 @@ def scan_correlation_arb(markets: List[Dict], min_violation_pct: float = 3.0) ->
                          if v.arb_opportunity else "Monitor"
             }
             for v in sorted(actionable, key=lambda x: -x.violation)
-        ]
+        ],
+        "set_violations": [
+            {
+                "group": v.group,
+                "markets": [{"title": t, "price": f"{p:.1%}"} for t, p in v.markets],
+                "total": f"{v.total:.1%}",
+                "constraint": v.constraint,
+                "violation_pct": v.violation,
+                "arb_opportunity": v.arb_opportunity,
+                "action": f"Buy NO on all {len(v.markets)} outcomes" if v.arb_opportunity else "Monitor"
+            }
+            for v in sorted(actionable_sets, key=lambda x: -x.violation)
+        ],
+        "constraint_graph": graph_stats,
     }
 
 
@@ -23,8 +23,10 @@ import time
 
 try:
     from .smart_matcher import create_signature, signatures_match, match_markets
+    from .kalshi_market_store import get_market_store
 except ImportError:
     from odds.smart_matcher import create_signature, signatures_match, match_markets
+    from odds.kalshi_market_store import get_market_store
 
 # Kalshi API endpoints
 KALSHI_API_BASE = "https://api.elections.kalshi.com/trade-api/v2"
@@ -126,6 +128,12 @@ def _get_auth_headers() -> dict:
         print(f"Kalshi auth error: {e}")
         return {"Accept": "application/json"}
 
+
+def market_store():
+    """The shared, authenticated Kalshi market store every caller should use."""
+    return get_market_store(headers=_get_auth_headers)
+
+
 def _fetch_kalshi_series_sync(limit: int = 200) -> List[dict]:
     """
     Fetch ALL series from Kalshi API with cursor-based pagination.
@@ -206,6 +214,10 @@ def _fetch_all_kalshi_markets_sync(
     """
     Fetch ALL markets from Kalshi API with cursor-based pagination.
     
+    Open markets come from the shared KalshiMarketStore (synced once, then
+    refreshed incrementally); other statuses, or an empty store, page the
+    API directly.
+    
     Args:
         series_ticker: Filter by series (e.g., "KXFIRSTSUPERBOWLSONG")
         event_ticker: Filter by event
@@ -215,6 +227,21 @@ def _fetch_all_kalshi_markets_sync(
     Returns:
         List of all markets matching criteria
     """
+    if status == "open":
+        store = market_store()
+        markets = store.markets(series_ticker=series_ticker, event_ticker=event_ticker)
+        if len(store):
+            return markets
+    return _page_kalshi_markets_sync(series_ticker, event_ticker, status, max_pages)
+
+
+def _page_kalshi_markets_sync(
+    series_ticker: Optional[str],
+    event_ticker: Optional[str],
+    status: str,
+    max_pages: int,
+) -> List[dict]:
+    """Serial cursor walk over /markets, falling back to the demo API."""
     all_markets = []
     cursor = None
     headers = _get_auth_headers()
@@ -735,9 +762,9 @@ async def get_kalshi_entertainment_props() -> dict:
         "KXGOLDENGLOBES",        # Golden Globes
     ]
     
+    by_series = market_store().series_markets(known_entertainment_series, status="all")
     for series_ticker in known_entertainment_series:
-        series_markets = _fetch_all_kalshi_markets_sync(series_ticker=series_ticker, status="all")
-        for market in series_markets:
+        for market in by_series[series_ticker]:
             ticker = market.get("ticker", "")
             if ticker not in seen_tickers:
                 seen_tickers.add(ticker)
@@ -0,0 +1,406 @@
+"""
+Kalshi Market Store
+Process-wide cache of the open Kalshi market universe, shared by every caller.
+
+Every consumer used to walk the /markets cursor serially on each call. The
+store instead:
+- Full sync: splits the universe into close-time windows (min_close_ts /
+  max_close_ts) and pages each window's cursor concurrently, alongside the
+  open /events pages that carry each event's category
+- Incremental refresh: asks only for markets updated since the last sync
+  (min_updated_ts), drops markets whose status left the open set, and
+  upserts the rest. If the API rejects min_updated_ts it re-pages the
+  near-term windows instead.
+- One retention rule for both paths: a market stays while the API reports
+  it open, even past its close_time (settlement can lag close)
+- Series fan-out: pages several series in parallel, cached per series
+- Views: filtered, field-projected copies, so callers never mutate the cache
+
+Usage:
+    from odds.kalshi_edge import market_store  # get_market_store(headers=_get_auth_headers)
+
+    store = market_store()
+    markets = store.markets(fields=("ticker", "title", "yes_ask", "close_time"))
+    sports = store.markets(predicate=lambda m: m["event_ticker"].startswith("KXNFL"))
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+KALSHI_API_BASE = "https://api.elections.kalshi.com/trade-api/v2"
+
+MARKETS_PAGE_LIMIT = 1000  # /markets maximum
+EVENTS_PAGE_LIMIT = 200  # /events maximum
+OPEN_STATUSES = ("active", "open")
+
+# Close-time window edges (seconds from now) for concurrent full syncs. The
+# first window has no lower bound so markets past close_time but still open
+# are kept; the last has no upper bound.
+WINDOW_EDGES = (86400, 3 * 86400, 7 * 86400, 30 * 86400, 90 * 86400, 365 * 86400)
+HOT_HORIZON = 7 * 86400  # Re-paged on refresh when min_updated_ts isn't available
+UPDATED_SKEW = 5  # Seconds of overlap between incremental refreshes
+
+
+def _close_ts(market: dict) -> Optional[float]:
+    close_time = market.get("close_time")
+    if not close_time:
+        return None
+    try:
+        return datetime.fromisoformat(close_time.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return None
+
+
+class KalshiMarketStore:
+    """Shared, incrementally refreshed cache of open Kalshi markets.
+
+    Args:
+        api_base: Kalshi trade API root.
+        headers: Callable returning request headers (e.g. auth).
+        get_json: Override for HTTP GET (path, params) -> JSON or None; tests
+            and benchmarks inject a fake API here.
+        refresh_interval: Seconds a view may be served before an incremental refresh.
+        full_sync_interval: Seconds between full re-syncs, which also catch
+            markets that left the open set early.
+        max_workers: Concurrent requests for window and series fan-out.
+        max_pages: Per-cursor safety limit.
+    """
+
+    def __init__(
+        self,
+        api_base: str = KALSHI_API_BASE,
+        headers: Optional[Callable[[], dict]] = None,
+        get_json: Optional[Callable[[str, dict], Optional[dict]]] = None,
+        refresh_interval: float = 60,
+        full_sync_interval: float = 1800,
+        max_workers: int = 6,
+        max_pages: int = 200,
+    ):
+        self.api_base = api_base
+        self.headers = headers or (lambda: {"Accept": "application/json"})
+        self.refresh_interval = refresh_interval
+        self.full_sync_interval = full_sync_interval
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self._get_json = get_json or self._http_get_json
+        self._session: Optional[requests.Session] = None
+
+        self._markets: Dict[str, dict] = {}
+        self._events: Dict[str, dict] = {}  # event_ticker -> {"category", "series_ticker"}
+        self._series: Dict[Tuple[str, str], Tuple[float, List[dict]]] = {}
+        self._lock = threading.Lock()  # Guards the dicts above
+        self._sync_lock = threading.Lock()  # One sync at a time; others wait for its result
+        self._last_full = 0.0
+        self._last_refresh = 0.0
+        self._updated_since_supported = True
+        self.stats = {"full_syncs": 0, "refreshes": 0, "requests": 0, "last_sync_seconds": 0.0}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _http_get_json(self, path: str, params: dict) -> Optional[dict]:
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount("https://", adapter)
+            self._session = session
+        resp = self._session.get(f"{self.api_base}{path}", params=params, headers=self.headers(), timeout=30)
+        if resp.status_code != 200:
+            logger.warning(f"Kalshi {path} returned {resp.status_code}")
+            return None
+        return resp.json()
+
+    def _page(self, path: str, key: str, params: dict, limit: int) -> Optional[List[dict]]:
+        """Walk one cursor to the end. None if any page failed or the cursor
+        outran max_pages: a partial list would read as markets having closed."""
+        items: List[dict] = []
+        cursor = None
+        for page in range(self.max_pages):
+            query = {**params, "limit": limit}
+            if cursor:
+                query["cursor"] = cursor
+            try:
+                data = self._get_json(path, query)
+            except Exception as e:
+                logger.warning(f"Kalshi {path} page {page} failed: {e}")
+                data = None
+            with self._lock:
+                self.stats["requests"] += 1
+            if data is None:
+                if page:
+                    logger.warning(f"Kalshi {path} cursor incomplete after {page} pages; discarding {len(items)} items")
+                return None
+            batch = data.get(key, [])
+            items.extend(batch)
+            cursor = data.get("cursor")
+            if not cursor or len(batch) < limit:
+                return items
+        logger.warning(f"Kalshi {path} cursor exceeded {self.max_pages} pages; discarding {len(items)} items")
+        return None
+
+    def _page_markets(self, params: dict) -> Optional[List[dict]]:
+        return self._page("/markets", "markets", params, MARKETS_PAGE_LIMIT)
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _windows(self, now: float, horizon: Optional[float] = None) -> List[dict]:
+        windows, lower = [], None
+        for edge in WINDOW_EDGES:
+            if horizon is not None and lower is not None and lower - now >= horizon:
+                break
+            upper = int(now + edge)
+            windows.append({"status": "open", **({"min_close_ts": lower} if lower else {}), "max_close_ts": upper})
+            lower = upper + 1
+        if horizon is None:
+            windows.append({"status": "open", "min_close_ts": lower})
+        return windows
+
+    def _fetch_windows(self, windows: List[dict], with_events: bool = False) -> Tuple[Optional[List[dict]], List[dict]]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            events = (
+                pool.submit(self._page, "/events", "events", {"status": "open"}, EVENTS_PAGE_LIMIT)
+                if with_events else None
+            )
+            pages = list(pool.map(self._page_markets, windows))
+            event_list = (events.result() or []) if events else []
+        if any(p is None for p in pages):
+            return None, event_list
+        return [m for page in pages for m in page], event_list
+
+    def full_sync(self) -> dict:
+        """Replace the universe with a fresh, concurrently paged copy."""
+        with self._sync_lock:
+            return self._full_sync()
+
+    def _full_sync(self) -> dict:
+        started = time.time()
+        markets, events = self._fetch_windows(self._windows(started), with_events=True)
+        if markets is None:
+            logger.warning("Kalshi full sync incomplete; keeping the previous universe")
+            return {"ok": False}
+        with self._lock:
+            self._markets = {
+                m["ticker"]: m for m in markets
+                if m.get("ticker") and m.get("status", "active") in OPEN_STATUSES
+            }
+            for event in events:
+                self._remember_event(event)
+            self._last_full = self._last_refresh = started
+            self._updated_since_supported = True  # Retry min_updated_ts after a transient failure
+            self.stats["full_syncs"] += 1
+            self.stats["last_sync_seconds"] = round(time.time() - started, 3)
+            count = len(self._markets)
+        logger.info(f"Kalshi store: full sync of {count} markets in {time.time() - started:.2f}s")
+        return {"ok": True, "markets": count, "seconds": round(time.time() - started, 3)}
+
+    def refresh(self) -> dict:
+        """Incremental refresh: upsert recently updated markets, drop closed ones."""
+        with self._sync_lock:
+            return self._refresh()
+
+    def _refresh(self) -> dict:
+        started = time.time()
+        since = int(self._last_refresh - UPDATED_SKEW)
+        updated = covered_until = None
+        if self._updated_since_supported:
+            # min_updated_ts can't be combined with other filters, so status is checked locally
+            updated = self._page_markets({"min_updated_ts": since})
+            if updated is None:
+                logger.info("Kalshi min_updated_ts unavailable; refreshing near-term windows instead")
+                self._updated_since_supported = False
+        if updated is None:
+            windows = self._windows(started, horizon=HOT_HORIZON)
+            updated, _ = self._fetch_windows(windows)
+            if updated is None:
+                return {"ok": False}
+            covered_until = windows[-1]["max_close_ts"]
+
+        with self._lock:
+            upserted = removed = 0
+            for market in updated:
+                ticker = market.get("ticker")
+                if not ticker:
+                    continue
+                if market.get("status", "active") in OPEN_STATUSES:
+                    self._markets[ticker] = market
+                    upserted += 1
+                elif self._markets.pop(ticker, None) is not None:
+                    removed += 1
+            if covered_until is not None:
+                # The windows list every open market closing up to covered_until,
+                # so a stored one in that range that wasn't returned is no longer open
+                returned = {m.get("ticker") for m in updated}
+                for ticker in [
+                    t for t, m in self._markets.items()
+                    if t not in returned and (_close_ts(m) or float("inf")) <= covered_until
+                ]:
+                    del self._markets[ticker]
+                    removed += 1
+            unknown = {m.get("event_ticker") for m in updated} - set(self._events) - {None, ""}
+            self._last_refresh = started
+            self.stats["refreshes"] += 1
+            self.stats["last_sync_seconds"] = round(time.time() - started, 3)
+        self._fetch_events(unknown)
+        return {"ok": True, "upserted": upserted, "removed": removed, "seconds": round(time.time() - started, 3)}
+
+    def _fetch_events(self, event_tickers: Iterable[str]):
+        tickers = list(event_tickers)
+        if not tickers:
+            return
+
+        def fetch(ticker):
+            try:
+                return (self._get_json(f"/events/{ticker}", {}) or {}).get("event")
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            found = [e for e in pool.map(fetch, tickers) if e]
+        with self._lock:
+            self.stats["requests"] += len(tickers)
+            for event in found:
+                self._remember_event(event)
+
+    def _remember_event(self, event: dict):
+        ticker = event.get("event_ticker")
+        if ticker:
+            self._events[ticker] = {
+                "category": event.get("category", ""),
+                "series_ticker": event.get("series_ticker", ""),
+            }
+
+    def ensure_fresh(self):
+        """Sync on first use, refresh when stale, full re-sync on the long interval."""
+        now = time.time()
+        if now - self._last_refresh < self.refresh_interval:
+            return
+        with self._sync_lock:
+            now = time.time()
+            if now - self._last_refresh < self.refresh_interval:
+                return  # Another thread refreshed while we waited
+            if not self._markets or now - self._last_full >= self.full_sync_interval:
+                self._full_sync()
+            else:
+                self._refresh()
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def markets(
+        self,
+        series_ticker: Optional[str] = None,
+        event_ticker: Optional[str] = None,
+        predicate: Optional[Callable[[dict], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+        min_close_ts: Optional[float] = None,
+        max_close_ts: Optional[float] = None,
+    ) -> List[dict]:
+        """Open markets matching the filters, as copies.
+
+        Markets carry `_event_category` and `_series_ticker` from their event.
+
+        Args:
+            series_ticker: Keep markets whose event belongs to this series.
+            event_ticker: Keep one event's markets.
+            predicate: Extra filter over the (annotated) market dict.
+            fields: Project to these keys only; cheaper than full copies.
+            min_close_ts / max_close_ts: Close-time bounds (unix seconds).
+        """
+        self.ensure_fresh()
+        with self._lock:
+            markets = list(self._markets.values())
+            events = self._events
+        out = []
+        for market in markets:
+            if event_ticker and market.get("event_ticker") != event_ticker:
+                continue
+            event = events.get(market.get("event_ticker"), {})
+            series = event.get("series_ticker") or market.get("series_ticker", "")
+            if series_ticker and series != series_ticker:
+                continue
+            if min_close_ts is not None or max_close_ts is not None:
+                close_ts = _close_ts(market)
+                if close_ts is None:
+                    continue
+                if min_close_ts is not None and close_ts < min_close_ts:
+                    continue
+                if max_close_ts is not None and close_ts > max_close_ts:
+                    continue
+            view = {**market, "_event_category": event.get("category", ""), "_series_ticker": series}
+            if predicate is not None and not predicate(view):
+                continue
+            out.append({k: view.get(k) for k in fields} if fields else view)
+        return out
+
+    def series_markets(self, series_tickers: Sequence[str], status: str = "all") -> Dict[str, List[dict]]:
+        """Markets for several series, paged in parallel and cached per series.
+
+        Unlike markets(), this reaches closed/settled markets too.
+        """
+        now = time.time()
+        result: Dict[str, List[dict]] = {}
+        missing = []
+        with self._lock:
+            for series in series_tickers:
+                cached = self._series.get((series, status))
+                if cached and now - cached[0] < self.refresh_interval:
+                    result[series] = cached[1]
+                else:
+                    missing.append(series)
+
+        def fetch(series):
+            params = {"series_ticker": series}
+            if status and status != "all":
+                params["status"] = status
+            return self._page_markets(params)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                fetched = dict(zip(missing, pool.map(fetch, missing)))
+            with self._lock:
+                for series, markets in fetched.items():
+                    if markets is not None:  # Failed fetches aren't cached
+                        self._series[(series, status)] = (now, markets)
+            result.update({series: markets or [] for series, markets in fetched.items()})
+        return {series: [dict(m) for m in result[series]] for series in series_tickers}
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def clear(self):
+        with self._lock:
+            self._markets.clear()
+            self._events.clear()
+            self._series.clear()
+            self._last_full = self._last_refresh = 0.0
+
+
+_stores: Dict[tuple, KalshiMarketStore] = {}
+_store_lock = threading.Lock()
+
+
+def get_market_store(**kwargs) -> KalshiMarketStore:
+    """Process-wide store for this configuration.
+
+    Stores are keyed by their keyword arguments, so callers share one only
+    when they ask for the same config (e.g. the same headers callable) and a
+    caller's kwargs are never silently dropped for an earlier caller's store.
+    """
+    key = tuple(sorted(kwargs.items()))
+    with _store_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = KalshiMarketStore(**kwargs)
+        return store
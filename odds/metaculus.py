@@ -4,9 +4,12 @@ Free API, no key required - quality forecasts for politics, science, economics
 """
 
 import json
+import threading
+import time
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 METACULUS_API = "https://www.metaculus.com/api/posts"
 
@@ -21,38 +24,160 @@ RELEVANT_TAGS = [
     "technology",
 ]
 
+# Detail fetches share one limiter: ~3 requests/second with a small burst
+REQUESTS_PER_SECOND = 3.0
+MAX_WORKERS = 4
+# Cached predictions are reused while the question's activity is unchanged,
+# but never for longer than this (recency weighting drifts on its own)
+PREDICTION_TTL = 900
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests/second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiter = TokenBucket(REQUESTS_PER_SECOND, capacity=REQUESTS_PER_SECOND)
+
+# question id -> (activity key, fetched at, prediction)
+_prediction_cache: Dict[int, Tuple[tuple, float, Optional[float]]] = {}
+_cache_lock = threading.Lock()
+_last_scan: Dict = {}
 
-import time
 
-def _get_question_prediction(question_id: int) -> Optional[float]:
-    """Fetch prediction for a single question (detail endpoint has full data)"""
+def _get_json(url: str, timeout: int = 10) -> Optional[Dict]:
+    """GET a Metaculus endpoint, None on any failure"""
     try:
-        time.sleep(0.3)  # Rate limit: ~3 requests/second
-        url = f"{METACULUS_API}/{question_id}/"
         req = urllib.request.Request(url, headers={"User-Agent": "Polyclawd/1.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
-        
-        question_data = data.get("question", {})
-        qtype = question_data.get("type")
-        
-        if qtype != "binary":
-            return None
-            
-        aggregations = question_data.get("aggregations", {})
-        if aggregations:
-            recency = aggregations.get("recency_weighted", {})
-            if recency:
-                latest = recency.get("latest", {})
-                if latest and isinstance(latest, dict):
-                    centers = latest.get("centers", [])
-                    if centers:
-                        return centers[0]
-        return None
-    except Exception as e:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode())
+    except Exception:
         return None
 
 
+def _latest_center(question_data: Dict, aggregation: str = "recency_weighted") -> Optional[float]:
+    """Latest center of an aggregation, if the payload carries one"""
+    aggregations = question_data.get("aggregations") or {}
+    latest = (aggregations.get(aggregation) or {}).get("latest")
+    if latest and isinstance(latest, dict):
+        centers = latest.get("centers") or []
+        if centers:
+            return centers[0]
+    return None
+
+
+def _activity_key(post: Dict) -> tuple:
+    """What changes when a question gets new forecasts or edits"""
+    return (
+        post.get("last_activity_time") or post.get("edited_at"),
+        post.get("forecasts_count", post.get("nr_forecasters")),
+    )
+
+
+def _get_question_prediction(question_id: int, get_json=None) -> Tuple[bool, Optional[float]]:
+    """Fetch prediction for a single question (detail endpoint has full data).
+
+    Returns (fetched, prediction): a failed request is (False, None), so it
+    isn't mistaken for a question that simply has no prediction.
+    """
+    _limiter.acquire()
+    data = (get_json or _get_json)(f"{METACULUS_API}/{question_id}/", timeout=10)
+    if not data:
+        return False, None
+    question_data = data.get("question") or {}
+    if question_data.get("type") != "binary":
+        return True, None
+    return True, _latest_center(question_data)
+
+
+def fetch_community_predictions(
+    posts: List[Dict],
+    get_json=None,
+    ttl: float = PREDICTION_TTL,
+    max_workers: int = MAX_WORKERS,
+) -> Tuple[Dict[int, Optional[float]], Dict]:
+    """
+    Community predictions for a page of listing posts.
+
+    Predictions embedded in the listing (``with_cp=true``) are used as-is.
+    The rest come from the cache when the question's activity is unchanged
+    and the entry is younger than ``ttl``; only the remainder hit the detail
+    endpoint, concurrently under the shared token bucket. Failed detail
+    requests aren't cached, so the next scan retries them.
+
+    Returns:
+        ({question id: prediction or None}, request/caching stats)
+    """
+    started = time.time()
+    stats = {"questions": 0, "inline": 0, "cache_hits": 0, "detail_requests": 0, "detail_failures": 0}
+    predictions: Dict[int, Optional[float]] = {}
+    pending = []
+
+    with _cache_lock:
+        for post in posts:
+            qid = post.get("id")
+            if qid is None:
+                continue
+            stats["questions"] += 1
+            key = _activity_key(post)
+            inline = _latest_center(post.get("question") or {})
+            if inline is not None:
+                predictions[qid] = inline
+                _prediction_cache[qid] = (key, started, inline)
+                stats["inline"] += 1
+                continue
+            cached = _prediction_cache.get(qid)
+            if cached and cached[0] == key and started - cached[1] < ttl:
+                predictions[qid] = cached[2]
+                stats["cache_hits"] += 1
+                continue
+            pending.append((qid, key))
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            fetched = list(pool.map(lambda item: _get_question_prediction(item[0], get_json), pending))
+        stats["detail_requests"] = len(pending)
+        with _cache_lock:
+            for (qid, key), (ok, prediction) in zip(pending, fetched):
+                predictions[qid] = prediction
+                if ok:
+                    _prediction_cache[qid] = (key, time.time(), prediction)
+                else:
+                    stats["detail_failures"] += 1
+
+    stats["seconds"] = round(time.time() - started, 3)
+    return predictions, stats
+
+
+def get_scan_stats() -> Dict:
+    """Request counts and cache hits for the most recent fetch_questions scan"""
+    return dict(_last_scan)
+
+
+def clear_prediction_cache():
+    with _cache_lock:
+        _prediction_cache.clear()
+
+
 def fetch_questions(
     limit: int = 50,
     status: str = "open",
@@ -70,46 +195,50 @@ def fetch_questions(
         order_by: -activity, -publish_time, -close_time, -nr_forecasters
         min_forecasters: Minimum forecasters for quality filter
         search: Optional search term
-        fetch_predictions: If True, fetch each question's prediction (slower but complete)
+        fetch_predictions: If True, attach community predictions (from the listing,
+            the prediction cache, or rate-limited concurrent detail fetches)
     """
     try:
-        url = f"{METACULUS_API}/?limit={limit}&status={status}&type=question&order_by={order_by}&forecast_type=binary"
+        url = f"{METACULUS_API}/?limit={limit}&status={status}&type=question&order_by={order_by}&forecast_type=binary&with_cp=true"
         if search:
             url += f"&search={urllib.parse.quote(search)}"
         
-        req = urllib.request.Request(url, headers={"User-Agent": "Polyclawd/1.0"})
-        
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read().decode())
+        data = _get_json(url, timeout=15)
+        if data is None:
+            raise RuntimeError("listing request failed")
         
-        questions = []
+        posts = []
         for q in data.get("results", []):
             forecasters = q.get("nr_forecasters", 0)
             if forecasters < min_forecasters:
                 continue
-            
-            question_data = q.get("question", {})
-            qtype = question_data.get("type", "unknown")
-            
-            if qtype != "binary":
+            if q.get("question", {}).get("type", "unknown") != "binary":
                 continue
-            
+            posts.append(q)
+        
+        # One bulk pass instead of a detail request (and sleep) per question
+        predictions, stats = {}, {"questions": len(posts), "inline": 0, "cache_hits": 0,
+                                  "detail_requests": 0, "detail_failures": 0}
+        if fetch_predictions:
+            predictions, stats = fetch_community_predictions(posts)
+        stats["listing_requests"] = 1
+        stats["requests"] = stats["listing_requests"] + stats["detail_requests"]
+        _last_scan.clear()
+        _last_scan.update(stats, timestamp=datetime.now(timezone.utc).isoformat())
+        
+        questions = []
+        for q in posts:
+            question_data = q.get("question", {})
             qid = q.get("id")
-            
-            # Fetch prediction from detail endpoint (list doesn't include it)
-            community_prediction = None
-            if fetch_predictions and forecasters >= min_forecasters:
-                community_prediction = _get_question_prediction(qid)
-            
             questions.append({
                 "id": qid,
                 "title": q.get("title", ""),
                 "short_title": q.get("short_title", ""),
                 "url": f"https://www.metaculus.com/questions/{qid}/",
                 "status": q.get("status"),
-                "type": qtype,
-                "forecasters": forecasters,
-                "community_prediction": community_prediction,
+                "type": question_data.get("type"),
+                "forecasters": q.get("nr_forecasters", 0),
+                "community_prediction": predictions.get(qid),
                 "created_at": q.get("created_at"),
                 "close_time": question_data.get("scheduled_close_time"),
                 "resolve_time": question_data.get("scheduled_resolve_time"),
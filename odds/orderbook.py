@@ -0,0 +1,325 @@
+"""
+NumPy Order Books for Polymarket CLOB
+
+A Book holds each side as sorted price/size arrays (bids descending, asks
+ascending), so depth, VWAP-to-size and slippage are cumulative sums plus a
+searchsorted instead of Python loops over level objects. BookBatch pads many
+books into 2-D arrays and computes the same analytics for all of them at
+once; simulate_fill walks a side to price an order at realistic size.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+WALL_MULTIPLE = 3.0   # Level > 3x average size = wall
+ANALYSIS_LEVELS = 10  # Levels analyze_orderbook_depth has always looked at
+
+
+def _side_arrays(levels: Sequence[Dict], descending: bool):
+    """Price/size arrays for one side of a raw CLOB book, best level first."""
+    if not levels:
+        return np.empty(0), np.empty(0)
+    px = np.array([lvl["price"] for lvl in levels], dtype=float)
+    sz = np.array([lvl["size"] for lvl in levels], dtype=float)
+    order = np.argsort(-px if descending else px, kind="stable")
+    return px[order], sz[order]
+
+
+def _split_sides(payloads: Sequence[Dict], key: str, descending: bool):
+    """Parse one side of many CLOB books with a single conversion and sort."""
+    levels = [lvl for data in payloads for lvl in data.get(key, ())]
+    counts = np.array([len(data.get(key, ())) for data in payloads], dtype=np.int64)
+    px = np.array([lvl["price"] for lvl in levels], dtype=float)
+    sz = np.array([lvl["size"] for lvl in levels], dtype=float)
+    owner = np.repeat(np.arange(len(payloads)), counts)
+    order = np.lexsort((-px if descending else px, owner))
+    cuts = np.cumsum(counts)[:-1]
+    return np.split(px[order], cuts), np.split(sz[order], cuts)
+
+
+def books_from_clob(payloads: Sequence[Dict]) -> List["Book"]:
+    """Build Books from many CLOB /book or /books responses in one pass."""
+    payloads = list(payloads)
+    if not payloads:
+        return []
+    bid_px, bid_sz = _split_sides(payloads, "bids", descending=True)
+    ask_px, ask_sz = _split_sides(payloads, "asks", descending=False)
+    return [Book(bid_px[i], bid_sz[i], ask_px[i], ask_sz[i], token_id=data.get("asset_id", ""),
+                 market_id=data.get("market", ""), outcome=data.get("outcome", ""))
+            for i, data in enumerate(payloads)]
+
+
+class Book:
+    """One token's order book as sorted NumPy arrays."""
+
+    __slots__ = ("token_id", "market_id", "outcome", "bid_px", "bid_sz", "ask_px", "ask_sz", "timestamp")
+
+    def __init__(self, bid_px, bid_sz, ask_px, ask_sz, token_id: str = "", market_id: str = "",
+                 outcome: str = "", timestamp: Optional[str] = None):
+        self.bid_px, self.bid_sz = np.asarray(bid_px, dtype=float), np.asarray(bid_sz, dtype=float)
+        self.ask_px, self.ask_sz = np.asarray(ask_px, dtype=float), np.asarray(ask_sz, dtype=float)
+        self.token_id = token_id
+        self.market_id = market_id
+        self.outcome = outcome
+        self.timestamp = timestamp or datetime.utcnow().isoformat()
+
+    @classmethod
+    def from_clob(cls, data: Dict, token_id: str = "") -> "Book":
+        """Build from a CLOB /book response (levels arrive worst-first; we sort)."""
+        bid_px, bid_sz = _side_arrays(data.get("bids", []), descending=True)
+        ask_px, ask_sz = _side_arrays(data.get("asks", []), descending=False)
+        return cls(bid_px, bid_sz, ask_px, ask_sz, token_id=token_id or data.get("asset_id", ""),
+                   market_id=data.get("market", ""), outcome=data.get("outcome", ""))
+
+    @property
+    def best_bid(self) -> float:
+        return float(self.bid_px[0]) if self.bid_px.size else 0.0
+
+    @property
+    def best_ask(self) -> float:
+        return float(self.ask_px[0]) if self.ask_px.size else 1.0
+
+    @property
+    def spread(self) -> float:
+        return round(self.best_ask - self.best_bid, 4)
+
+    @property
+    def mid_price(self) -> float:
+        if not (self.bid_px.size and self.ask_px.size):
+            return 0.5
+        return round((self.best_bid + self.best_ask) / 2, 4)
+
+    def complement(self) -> "Book":
+        """The other outcome's book implied by this one (NO asks = 1 - YES bids)."""
+        return Book(1.0 - self.ask_px, self.ask_sz, 1.0 - self.bid_px, self.bid_sz,
+                    market_id=self.market_id, timestamp=self.timestamp)
+
+    def to_orderbook(self, levels: int = ANALYSIS_LEVELS):
+        """Dataclass view (top ``levels`` per side) for existing OrderBook callers."""
+        try:
+            from odds.polymarket_clob import OrderBook, OrderBookLevel
+        except ImportError:
+            from polymarket_clob import OrderBook, OrderBookLevel
+        return OrderBook(
+            market_id=self.market_id,
+            token_id=self.token_id,
+            outcome=self.outcome,
+            bids=[OrderBookLevel(price=float(p), size=float(s))
+                  for p, s in zip(self.bid_px[:levels], self.bid_sz[:levels])],
+            asks=[OrderBookLevel(price=float(p), size=float(s))
+                  for p, s in zip(self.ask_px[:levels], self.ask_sz[:levels])],
+            spread=self.spread,
+            mid_price=self.mid_price,
+            timestamp=self.timestamp,
+        )
+
+
+@dataclass
+class Fill:
+    """Result of walking one side of a book."""
+    side: str               # "buy" (lifts asks) or "sell" (hits bids)
+    shares: float
+    notional: float
+    vwap: Optional[float]
+    best_price: Optional[float]
+    slippage: Optional[float]  # Adverse move of vwap vs. best price
+    levels_used: int
+    complete: bool
+
+
+def _walk(px: np.ndarray, sz: np.ndarray, shares=None, notional=None):
+    """Vectorized fill against sorted levels for one or many target sizes.
+
+    Returns (filled shares, filled notional, levels used) arrays shaped like
+    the target; exactly one of ``shares``/``notional`` must be given.
+    """
+    by_shares = shares is not None
+    target = np.asarray(shares if by_shares else notional, dtype=float)
+    if px.size == 0:
+        zero = np.zeros_like(target)
+        return zero, zero, zero.astype(int)
+    cum_sz = np.cumsum(sz)
+    cum_notional = np.cumsum(px * sz)
+
+    # First level where the cumulative amount reaches the target, then the partial take there
+    idx = np.minimum(np.searchsorted(cum_sz if by_shares else cum_notional, target, side="left"), px.size - 1)
+    prev_sz = np.where(idx > 0, cum_sz[idx - 1], 0.0)
+    prev_notional = np.where(idx > 0, cum_notional[idx - 1], 0.0)
+    if by_shares:
+        take = np.minimum(np.clip(target - prev_sz, 0.0, None), sz[idx])
+    else:
+        take = np.minimum(np.clip(target - prev_notional, 0.0, None) / px[idx], sz[idx])
+    levels = np.where(take > 0, idx + 1, idx)
+    return prev_sz + take, prev_notional + take * px[idx], levels
+
+
+def simulate_fill(book: Book, side: str = "buy", shares: Optional[float] = None,
+                  notional: Optional[float] = None, limit_price: Optional[float] = None) -> Fill:
+    """
+    Price an order against the book's visible depth.
+
+    Args:
+        book: Book to walk
+        side: "buy" lifts asks, "sell" hits bids
+        shares: Size in shares, or
+        notional: Size in dollars to spend (buy) / receive (sell)
+        limit_price: Optional worst acceptable price; deeper levels are ignored
+    """
+    if (shares is None) == (notional is None):
+        raise ValueError("Give exactly one of shares or notional")
+    buying = side == "buy"
+    px, sz = (book.ask_px, book.ask_sz) if buying else (book.bid_px, book.bid_sz)
+    if limit_price is not None:
+        keep = px <= limit_price if buying else px >= limit_price
+        px, sz = px[keep], sz[keep]
+    filled_sz, filled_notional, levels = (float(x) for x in _walk(px, sz, shares, notional))
+    target = shares if shares is not None else notional
+    got = filled_sz if shares is not None else filled_notional
+    vwap = filled_notional / filled_sz if filled_sz > 0 else None
+    best = float(px[0]) if px.size else None
+    slippage = None
+    if vwap is not None:
+        slippage = round(vwap - best if buying else best - vwap, 6)
+    return Fill(
+        side=side,
+        shares=round(filled_sz, 6),
+        notional=round(filled_notional, 6),
+        vwap=round(vwap, 6) if vwap is not None else None,
+        best_price=best,
+        slippage=slippage,
+        levels_used=int(levels),
+        complete=got >= target - 1e-9,
+    )
+
+
+def vwap_curve(book: Book, sizes: Sequence[float], side: str = "buy") -> Dict[str, np.ndarray]:
+    """VWAP, slippage and fill ratio at each share size in ``sizes`` (vectorized)."""
+    buying = side == "buy"
+    px, sz = (book.ask_px, book.ask_sz) if buying else (book.bid_px, book.bid_sz)
+    sizes = np.asarray(sizes, dtype=float)
+    filled_sz, filled_notional, _ = _walk(px, sz, shares=sizes)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.where(filled_sz > 0, filled_notional / filled_sz, np.nan)
+    best = px[0] if px.size else np.nan
+    return {
+        "size": sizes,
+        "vwap": vwap,
+        "slippage": (vwap - best) if buying else (best - vwap),
+        "fill_ratio": np.where(sizes > 0, filled_sz / np.where(sizes > 0, sizes, 1), 1.0),
+    }
+
+
+class BookBatch:
+    """Many books padded into (n_books, max_levels) arrays; sizes pad with 0."""
+
+    def __init__(self, books: Sequence[Book], levels: Optional[int] = None):
+        self.books = list(books)
+        self.bid_px, self.bid_sz = self._pad([(b.bid_px, b.bid_sz) for b in self.books], levels)
+        self.ask_px, self.ask_sz = self._pad([(b.ask_px, b.ask_sz) for b in self.books], levels)
+
+    @staticmethod
+    def _pad(sides, levels):
+        width = max([px.size for px, _ in sides] + [1])
+        if levels is not None:
+            width = min(width, levels)
+        px = np.full((len(sides), width), np.nan)
+        sz = np.zeros((len(sides), width))
+        for i, (p, s) in enumerate(sides):
+            n = min(p.size, width)
+            px[i, :n], sz[i, :n] = p[:n], s[:n]
+        return px, sz
+
+    def __len__(self):
+        return len(self.books)
+
+    def top(self):
+        has_bid = self.bid_sz[:, 0] > 0
+        has_ask = self.ask_sz[:, 0] > 0
+        best_bid = np.where(has_bid, self.bid_px[:, 0], 0.0)
+        best_ask = np.where(has_ask, self.ask_px[:, 0], 1.0)
+        mid = np.where(has_bid & has_ask, (best_bid + best_ask) / 2, 0.5)
+        return best_bid, best_ask, best_ask - best_bid, mid
+
+    def vwap_to_size(self, sizes: Sequence[float], side: str = "buy") -> np.ndarray:
+        """(n_books, len(sizes)) VWAP for buying/selling each share size; NaN where depth runs out."""
+        px, sz = (self.ask_px, self.ask_sz) if side == "buy" else (self.bid_px, self.bid_sz)
+        px = np.nan_to_num(px)
+        cum_sz = np.cumsum(sz, axis=1)
+        cum_notional = np.cumsum(px * sz, axis=1)
+        sizes = np.asarray(sizes, dtype=float)
+        out = np.full((len(self.books), sizes.size), np.nan)
+        for j, q in enumerate(sizes):
+            # Levels fully consumed before reaching q, then the partial one
+            full = cum_sz < q
+            idx = np.minimum(full.sum(axis=1), px.shape[1] - 1)
+            rows = np.arange(len(self.books))
+            prev_sz = np.where(idx > 0, cum_sz[rows, idx - 1], 0.0)
+            prev_notional = np.where(idx > 0, cum_notional[rows, idx - 1], 0.0)
+            take = np.minimum(q - prev_sz, sz[rows, idx])
+            filled = prev_sz + take
+            ok = filled >= q - 1e-9
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[:, j] = np.where(ok, (prev_notional + take * px[rows, idx]) / q, np.nan)
+        return out
+
+    def analyze(self, levels: int = ANALYSIS_LEVELS) -> List[Dict]:
+        """analyze_orderbook_depth for every book, computed column-wise."""
+        bid_sz, ask_sz = self.bid_sz[:, :levels], self.ask_sz[:, :levels]
+        bid_px, ask_px = self.bid_px[:, :levels], self.ask_px[:, :levels]
+        bid_n = (bid_sz > 0).sum(axis=1)
+        ask_n = (ask_sz > 0).sum(axis=1)
+        # Sequential cumsum (not pairwise sum) so totals match Python's sum() to the bit
+        bid_liq = np.cumsum(bid_sz, axis=1)[:, -1]
+        ask_liq = np.cumsum(ask_sz, axis=1)[:, -1]
+        total = bid_liq + ask_liq
+        with np.errstate(invalid="ignore", divide="ignore"):
+            imbalance = np.where(total > 0, (bid_liq - ask_liq) / total, 0.0)
+            avg_bid = np.where(bid_n > 0, bid_liq / np.maximum(bid_n, 1), 0.0)
+            avg_ask = np.where(ask_n > 0, ask_liq / np.maximum(ask_n, 1), 0.0)
+        bid_wall = (bid_sz > avg_bid[:, None] * WALL_MULTIPLE) & (bid_sz > 0)
+        ask_wall = (ask_sz > avg_ask[:, None] * WALL_MULTIPLE) & (ask_sz > 0)
+        best_bid, best_ask, _, mid = self.top()
+        spread = np.array([round(x, 4) for x in (best_ask - best_bid).tolist()])
+
+        # Plain Python floats and round() (np.round differs on halves) for the per-book dicts
+        columns = zip(spread.tolist(), mid.tolist(), bid_liq.tolist(), ask_liq.tolist(),
+                      total.tolist(), imbalance.tolist())
+        bid_walls = self._walls(bid_px, bid_sz, bid_wall)
+        ask_walls = self._walls(ask_px, ask_sz, ask_wall)
+        out = []
+        for i, (spread_i, mid_i, bid_l, ask_l, total_l, imb) in enumerate(columns):
+            out.append({
+                "spread_cents": round(spread_i * 100, 2),
+                "mid_price": round(mid_i, 4),
+                "bid_liquidity": round(bid_l, 2),
+                "ask_liquidity": round(ask_l, 2),
+                "total_liquidity": round(total_l, 2),
+                "imbalance": round(imb, 3),
+                "imbalance_signal": "BUY" if imb > 0.2 else "SELL" if imb < -0.2 else "NEUTRAL",
+                "bid_walls": bid_walls[i],
+                "ask_walls": ask_walls[i],
+                "tight_spread": spread_i < 0.02,  # <2 cents is tight
+            })
+        return out
+
+    def _walls(self, px, sz, mask) -> List[List[Dict]]:
+        walls: List[List[Dict]] = [[] for _ in self.books]
+        rows, cols = np.nonzero(mask)
+        for r, p, s in zip(rows.tolist(), px[rows, cols].tolist(), sz[rows, cols].tolist()):
+            walls[r].append({"price": p, "size": s})
+        return walls
+
+
+def analyze_books(books: Iterable[Union[Book, Dict]]) -> List[Dict]:
+    """Depth analysis for many books (Book objects or raw CLOB responses) at once."""
+    books = list(books)
+    raw = [b for b in books if not isinstance(b, Book)]
+    if raw:
+        parsed = iter(books_from_clob(raw))
+        books = [b if isinstance(b, Book) else next(parsed) for b in books]
+    if not books:
+        return []
+    return BookBatch(books, levels=ANALYSIS_LEVELS).analyze()
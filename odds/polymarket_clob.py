@@ -4,14 +4,29 @@ Direct access to orderbook depth and price history
 """
 
 import json
+import threading
+import time
 import urllib.request
 from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+try:
+    from odds.orderbook import Book, analyze_books, books_from_clob
+except ImportError:
+    from orderbook import Book, analyze_books, books_from_clob
+
 CLOB_API = "https://clob.polymarket.com"
 GAMMA_API = "https://gamma-api.polymarket.com"
 
+BOOK_TTL = 5          # Seconds a fetched book is reused across callers
+TOKEN_ID_TTL = 3600   # Slug -> clobTokenIds mapping rarely changes
+BOOKS_BATCH = 100     # Token IDs per POST /books request
+
+_cache_lock = threading.Lock()
+_book_cache: Dict[str, tuple] = {}    # token_id -> (fetched_at, Book)
+_token_cache: Dict[str, tuple] = {}   # slug -> (fetched_at, {outcome: token_id}, [token_ids])
+
 # Resilient fetch wrapper
 try:
     from api.services.resilient_fetch import resilient_call
@@ -49,29 +64,37 @@ class OrderBook:
     timestamp: str
 
 
+def _json_list(value) -> list:
+    return json.loads(value) if isinstance(value, str) else (value or [])
+
+
+def _market_tokens(market_slug: str):
+    """({outcome: token_id}, [token_ids]) for a slug, cached for TOKEN_ID_TTL."""
+    now = time.time()
+    with _cache_lock:
+        cached = _token_cache.get(market_slug)
+    if cached and now - cached[0] < TOKEN_ID_TTL:
+        return cached[1], cached[2]
+
+    url = f"{GAMMA_API}/markets?slug={market_slug}"
+    markets = _resilient_urlopen("polymarket_gamma", url, timeout=10)
+    if not markets:
+        return {}, []
+    market = markets[0]
+    clob_token_ids = _json_list(market.get("clobTokenIds", "[]"))
+    outcomes = _json_list(market.get("outcomes", "[]"))
+    by_outcome = {o.lower(): t for o, t in zip(outcomes, clob_token_ids)}
+    with _cache_lock:
+        _token_cache[market_slug] = (now, by_outcome, clob_token_ids)
+    return by_outcome, clob_token_ids
+
+
 def get_token_id_for_market(market_slug: str, outcome: str = "Yes") -> Optional[str]:
     """Get CLOB token ID for a market outcome"""
     try:
-        url = f"{GAMMA_API}/markets?slug={market_slug}"
-        markets = _resilient_urlopen("polymarket_gamma", url, timeout=10)
-        
-        if not markets:
-            return None
-        
-        market = markets[0]
-        clob_token_ids = market.get("clobTokenIds", "[]")
-        if isinstance(clob_token_ids, str):
-            clob_token_ids = json.loads(clob_token_ids)
-        
-        outcomes = market.get("outcomes", "[]")
-        if isinstance(outcomes, str):
-            outcomes = json.loads(outcomes)
-        
-        # Match outcome to token ID
-        for i, o in enumerate(outcomes):
-            if o.lower() == outcome.lower() and i < len(clob_token_ids):
-                return clob_token_ids[i]
-        
+        by_outcome, clob_token_ids = _market_tokens(market_slug)
+        if outcome.lower() in by_outcome:
+            return by_outcome[outcome.lower()]
         return clob_token_ids[0] if clob_token_ids else None
         
     except Exception as e:
@@ -79,6 +102,68 @@ def get_token_id_for_market(market_slug: str, outcome: str = "Yes") -> Optional[
         return None
 
 
+def _post_books(token_ids: List[str]) -> List[Dict]:
+    """POST /books: many books in one round trip."""
+    body = json.dumps([{"token_id": t} for t in token_ids]).encode()
+
+    def _do_fetch():
+        req = urllib.request.Request(f"{CLOB_API}/books", data=body, method="POST",
+                                     headers={"User-Agent": "Polyclawd/1.0", "Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            return json.loads(resp.read().decode())
+    if HAS_RESILIENT:
+        return resilient_call("polymarket_clob", _do_fetch, retries=2, backoff_base=2.0)
+    return _do_fetch()
+
+
+def get_books(token_ids: List[str], max_age: float = BOOK_TTL) -> Dict[str, Book]:
+    """
+    Fetch order books for many tokens at once.
+
+    Books younger than ``max_age`` seconds come from the shared cache; the rest
+    go out in POST /books batches, falling back to one GET /book per token if
+    the batch endpoint fails. Tokens with no book are left out of the result.
+    """
+    now = time.time()
+    books: Dict[str, Book] = {}
+    missing = []
+    with _cache_lock:
+        for token_id in dict.fromkeys(t for t in token_ids if t):
+            cached = _book_cache.get(token_id)
+            if cached and now - cached[0] < max_age:
+                books[token_id] = cached[1]
+            else:
+                missing.append(token_id)
+
+    fetched: Dict[str, Book] = {}
+    for i in range(0, len(missing), BOOKS_BATCH):
+        chunk = missing[i:i + BOOKS_BATCH]
+        try:
+            wanted = set(chunk)
+            payloads = [d for d in _post_books(chunk) or [] if isinstance(d, dict) and d.get("asset_id") in wanted]
+            fetched.update((book.token_id, book) for book in books_from_clob(payloads))
+        except Exception as e:
+            print(f"Batch orderbook fetch error, falling back to per-token: {e}")
+            for token_id in chunk:
+                try:
+                    data = _resilient_urlopen("polymarket_clob", f"{CLOB_API}/book?token_id={token_id}", timeout=10)
+                    if "error" not in data:
+                        fetched[token_id] = Book.from_clob(data, token_id)
+                except Exception as e:
+                    print(f"Orderbook fetch error: {e}")
+
+    with _cache_lock:
+        for token_id, book in fetched.items():
+            _book_cache[token_id] = (now, book)
+    books.update(fetched)
+    return books
+
+
+def get_book(token_id: str, max_age: float = BOOK_TTL) -> Optional[Book]:
+    """NumPy order book for one token (see get_books)."""
+    return get_books([token_id], max_age=max_age).get(token_id)
+
+
 def get_orderbook(token_id: str) -> Optional[OrderBook]:
     """
     Fetch live orderbook for a token.
@@ -96,31 +181,11 @@ def get_orderbook(token_id: str) -> Optional[OrderBook]:
         if "error" in data:
             return None
         
-        bids = [
-            OrderBookLevel(price=float(b["price"]), size=float(b["size"]))
-            for b in data.get("bids", [])
-        ]
-        asks = [
-            OrderBookLevel(price=float(a["price"]), size=float(a["size"]))
-            for a in data.get("asks", [])
-        ]
-        
-        # Calculate spread and mid
-        best_bid = bids[0].price if bids else 0
-        best_ask = asks[0].price if asks else 1
-        spread = best_ask - best_bid
-        mid_price = (best_bid + best_ask) / 2 if bids and asks else 0.5
-        
-        return OrderBook(
-            market_id=data.get("market", ""),
-            token_id=token_id,
-            outcome=data.get("outcome", ""),
-            bids=bids[:10],  # Top 10 levels
-            asks=asks[:10],
-            spread=round(spread, 4),
-            mid_price=round(mid_price, 4),
-            timestamp=datetime.utcnow().isoformat()
-        )
+        # The CLOB lists levels worst-first; Book sorts so level 0 is the best price
+        book = Book.from_clob(data, token_id)
+        with _cache_lock:
+            _book_cache[token_id] = (time.time(), book)
+        return book.to_orderbook(levels=10)  # Top 10 levels
         
     except Exception as e:
         print(f"Orderbook fetch error: {e}")
@@ -183,15 +248,19 @@ def get_price_history(
         return []
 
 
-def analyze_orderbook_depth(orderbook: OrderBook) -> Dict:
+def analyze_orderbook_depth(orderbook) -> Dict:
     """
     Analyze orderbook for trading signals.
     
+    Accepts an OrderBook or a NumPy Book (use orderbook.analyze_books for many).
+    
     Returns:
         Analysis including liquidity, imbalance, and wall detection
     """
     if not orderbook:
         return {}
+    if isinstance(orderbook, Book):
+        return analyze_books([orderbook])[0]
     
     bid_liquidity = sum(b.size for b in orderbook.bids)
     ask_liquidity = sum(a.size for a in orderbook.asks)
@@ -231,27 +300,27 @@ def get_market_microstructure(market_slug: str) -> Dict:
     
     Returns bid/ask depth, spread analysis, and trading signals.
     """
-    # Get both Yes and No orderbooks
-    yes_book = get_orderbook_for_market(market_slug, "Yes")
-    no_book = get_orderbook_for_market(market_slug, "No")
+    # Get both Yes and No orderbooks: one slug lookup, one batched book fetch
+    try:
+        by_outcome, _ = _market_tokens(market_slug)
+    except Exception as e:
+        print(f"Error getting token ID: {e}")
+        by_outcome = {}
+    books = get_books([t for t in (by_outcome.get("yes"), by_outcome.get("no")) if t])
+    yes_book = books.get(by_outcome.get("yes"))
+    no_book = books.get(by_outcome.get("no"))
     
     result = {
         "market": market_slug,
         "timestamp": datetime.utcnow().isoformat(),
     }
     
-    if yes_book:
-        result["yes"] = {
-            "mid_price": yes_book.mid_price,
-            "spread": yes_book.spread,
-            "analysis": analyze_orderbook_depth(yes_book),
-        }
-    
-    if no_book:
-        result["no"] = {
-            "mid_price": no_book.mid_price,
-            "spread": no_book.spread,
-            "analysis": analyze_orderbook_depth(no_book),
+    present = [(side, b) for side, b in (("yes", yes_book), ("no", no_book)) if b is not None]
+    for (side, book), analysis in zip(present, analyze_books([b for _, b in present])):
+        result[side] = {
+            "mid_price": book.mid_price,
+            "spread": book.spread,
+            "analysis": analysis,
         }
     
     # Cross-check prices
@@ -298,18 +367,19 @@ async def get_clob_summary(market_id: str = None) -> Dict:
             with urllib.request.urlopen(req, timeout=15) as resp:
                 markets = json.loads(resp.read().decode())
             
+            # YES token IDs ride along in the listing, so all books come back in one batch
+            top = [(m, _json_list(m.get("clobTokenIds", "[]"))) for m in markets[:5] if m.get("slug")]
+            books = get_books([ids[0] for _, ids in top if ids])
             result["top_markets"] = []
-            for m in markets[:5]:
-                slug = m.get("slug", "")
-                if slug:
-                    analysis = get_market_microstructure(slug)
-                    if analysis.get("yes"):
-                        result["top_markets"].append({
-                            "question": m.get("question", "")[:60],
-                            "liquidity": m.get("liquidityNum", 0),
-                            "spread": analysis.get("yes", {}).get("spread", 0),
-                            "imbalance": analysis.get("yes", {}).get("analysis", {}).get("imbalance", 0),
-                        })
+            for m, ids in top:
+                book = books.get(ids[0]) if ids else None
+                if book is not None:
+                    result["top_markets"].append({
+                        "question": m.get("question", "")[:60],
+                        "liquidity": m.get("liquidityNum", 0),
+                        "spread": book.spread,
+                        "imbalance": analyze_orderbook_depth(book).get("imbalance", 0),
+                    })
         except Exception as e:
             print(f"Error: {e}")
     
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Parallel parameter sweep over the prediction market backtest.
+
+Loads the Kalshi dataset once, classifies every title once
+(prepare_markets), then replays it under each config of a grid or random
+sample across worker processes. Workers are forked after loading, so they
+share the frame copy-on-write instead of each re-reading Parquet.
+Per-config results are cached under the data snapshot hash, so re-runs and
+widened grids only evaluate new points.
+
+Sweepable parameters are BacktestConfig fields — the backtest analogues of
+the paper_portfolio knobs: min_entry_price (NO entry floor), kelly_fraction,
+max_position_pct, max_position_dollar, blocked_archetypes, apply_kill_rules,
+no_only, min_volume_kalshi (applied in memory; data is loaded at the lowest
+swept floor).
+
+Usage:
+    python scripts/backtest_sweep.py                          # Default grid
+    python scripts/backtest_sweep.py --grid sweep.json        # {"param": [values, ...], ...}
+    python scripts/backtest_sweep.py --random 100 --seed 7    # Random sample of the grid
+    python scripts/backtest_sweep.py --workers 8 --sort total_return --top 30
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+import prediction_market_backtest as bt  # noqa: E402
+
+SWEEPABLE = {
+    "min_entry_price", "kelly_fraction", "max_position_pct", "max_position_dollar",
+    "blocked_archetypes", "apply_kill_rules", "no_only", "min_volume_kalshi",
+}
+
+# 4 x 4 x 3 x 3 x 2 x 2 = 576 configs
+DEFAULT_GRID = {
+    "min_entry_price": [35, 45, 55, 65],
+    "kelly_fraction": [1 / 12, 1 / 8, 1 / 6, 1 / 4],
+    "max_position_pct": [0.02, 0.05, 0.10],
+    "max_position_dollar": [250.0, 500.0, 1000.0],
+    "blocked_archetypes": [[], ["price_above", "sports_winner"]],
+    "min_volume_kalshi": [5000, 10000],
+}
+
+# Ascending sort for these; everything else is "higher is better"
+LOWER_IS_BETTER = {"max_drawdown"}
+
+CACHE_DIR = bt.PROJECT_ROOT / "output" / "backtest" / "sweep_cache"
+
+# Set in the parent before forking (inherited) or by _init_worker under spawn
+_DATA: Optional[pd.DataFrame] = None
+
+
+# ============================================================================
+# Parameter sets
+# ============================================================================
+
+def expand_grid(grid: Dict[str, list]) -> List[Dict]:
+    """Cartesian product of the grid, in a stable order."""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def sample_grid(grid: Dict[str, list], n: int, seed: Optional[int] = None) -> List[Dict]:
+    """n distinct random points of the grid (all of it if n >= grid size)."""
+    points = expand_grid(grid)
+    if n >= len(points):
+        return points
+    return random.Random(seed).sample(points, n)
+
+
+def make_config(params: Dict, base: Optional[bt.BacktestConfig] = None) -> bt.BacktestConfig:
+    unknown = set(params) - SWEEPABLE
+    if unknown:
+        raise ValueError(f"Not sweepable: {sorted(unknown)} (allowed: {sorted(SWEEPABLE)})")
+    params = dict(params)
+    if "blocked_archetypes" in params:
+        params["blocked_archetypes"] = tuple(sorted(params["blocked_archetypes"]))
+    base = base or bt.BacktestConfig(show_plots=False, save_plots=False, export_csv=False)
+    return replace(base, **params)
+
+
+def _canonical(params: Dict) -> str:
+    return json.dumps({k: sorted(v) if isinstance(v, (list, tuple)) else v for k, v in params.items()},
+                      sort_keys=True)
+
+
+# ============================================================================
+# Data snapshot + cache keys
+# ============================================================================
+
+_CODE_FILES = (
+    bt.PROJECT_ROOT / "scripts" / "prediction_market_backtest.py",
+    bt.PROJECT_ROOT / "signals" / "mispriced_category_signal.py",
+    bt.PROJECT_ROOT / "signals" / "empirical_confidence.py",
+)
+
+
+def data_snapshot_hash(config: bt.BacktestConfig) -> str:
+    """Hash of the Parquet inputs (name, size, mtime), loader filters and replay code.
+
+    Cheap to compute — no file contents are read — and changes whenever the
+    downloaded data, the load-time filters or the signal logic change.
+    """
+    h = hashlib.sha256()
+    for sub in ("markets", "trades"):
+        for f in sorted((config.data_dir / "kalshi" / sub).glob("*.parquet")):
+            st = f.stat()
+            h.update(f"{sub}/{f.name}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    loader = {k: getattr(config, k) for k in ("min_volume_kalshi", "contested_low", "contested_high",
+                                               "max_days_to_close")}
+    h.update(json.dumps(loader, sort_keys=True).encode())
+    for f in _CODE_FILES:
+        if f.exists():
+            h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Content hash for an in-memory dataset (tests, ad-hoc frames)."""
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()[:16]
+
+
+def _config_key(params: Dict, base: bt.BacktestConfig) -> str:
+    base_fields = {f.name: getattr(base, f.name) for f in fields(base)
+                   if f.name not in SWEEPABLE and not isinstance(getattr(base, f.name), Path)}
+    payload = _canonical(params) + json.dumps(base_fields, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:20]
+
+
+def _read_cache(path: Path) -> Optional[Dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path: Path, metrics: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".tmp{os.getpid()}")
+    tmp.write_text(json.dumps(metrics))
+    tmp.replace(path)
+
+
+# ============================================================================
+# Evaluation
+# ============================================================================
+
+def path_metrics(path: Dict, config: bt.BacktestConfig) -> Dict:
+    """Return/drawdown/Sharpe for one replay_path (same formulas as compute_portfolio_metrics).
+
+    max_drawdown here is the true peak-to-trough drawdown of the equity curve.
+    """
+    traded = path["traded"]
+    pnl = np.array([path["sizes"][j][1] for j in traded], dtype=float)
+    won = path["won"][traded].astype(bool) if traded else np.zeros(0, dtype=bool)
+    equity = np.asarray(path["equity_curve"], dtype=float)
+    n = len(pnl)
+
+    running_peak = np.maximum.accumulate(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(running_peak > 0, (running_peak - equity) / running_peak, 0.0)
+    sharpe = float(pnl.mean() / pnl.std() * np.sqrt(252)) if n > 1 and pnl.std() > 0 else 0.0
+    gross_win = float(pnl[won].sum())
+    gross_loss = abs(float(pnl[~won].sum())) if (~won).any() else 1.0
+
+    return {
+        "trades": n,
+        "killed": len(path["killed"]),
+        "win_rate": round(float(won.mean()), 4) if n else 0.0,
+        "total_pnl": round(float(pnl.sum()), 2),
+        "total_return": round(float(equity[-1] / config.initial_bankroll - 1), 4) if config.initial_bankroll else 0.0,
+        "max_drawdown": round(float(drawdowns.max()), 4),
+        "sharpe": round(sharpe, 3),
+        "profit_factor": round(gross_win / gross_loss, 3) if gross_loss > 0 else float("inf"),
+        "final_bankroll": round(float(equity[-1]), 2),
+    }
+
+
+def evaluate(params: Dict, base: Optional[bt.BacktestConfig] = None) -> Dict:
+    """Replay the shared dataset under one parameter set."""
+    config = make_config(params, base)
+    df = _DATA
+    if df is None:
+        raise RuntimeError("Sweep dataset not loaded in this process")
+    if "min_volume_kalshi" in params:
+        df = df[df["volume"] >= config.min_volume_kalshi]
+        df.attrs["prepared"] = True
+    return path_metrics(bt.replay_path(df, config), config)
+
+
+def _init_worker(data: pd.DataFrame):
+    global _DATA
+    _DATA = data
+
+
+def run_sweep(data: pd.DataFrame, param_sets: List[Dict], data_hash: str,
+              base: Optional[bt.BacktestConfig] = None, workers: Optional[int] = None,
+              cache_dir: Optional[Path] = CACHE_DIR, sort: str = "sharpe") -> pd.DataFrame:
+    """Evaluate every parameter set (cached ones are read back) and return a ranked table.
+
+    data must come from bt.prepare_markets. workers=1 evaluates in-process.
+    """
+    global _DATA
+    base = base or make_config({})
+    _DATA = data
+    workers = workers or os.cpu_count() or 1
+
+    results: Dict[int, Dict] = {}
+    cached: Dict[int, bool] = {}
+    todo = []
+    for i, params in enumerate(param_sets):
+        path = cache_dir / data_hash / f"{_config_key(params, base)}.json" if cache_dir else None
+        hit = _read_cache(path) if path else None
+        if hit is not None:
+            results[i], cached[i] = hit, True
+        else:
+            todo.append((i, params, path))
+
+    started = time.time()
+    if todo and workers <= 1:
+        for i, params, path in todo:
+            results[i], cached[i] = evaluate(params, base), False
+            if path:
+                _write_cache(path, results[i])
+    elif todo:
+        # fork: workers inherit _DATA copy-on-write. spawn: pickled to each worker once.
+        if "fork" in mp.get_all_start_methods():
+            ctx, init, initargs = mp.get_context("fork"), None, ()
+        else:
+            ctx, init, initargs = mp.get_context("spawn"), _init_worker, (data,)
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=ctx,
+                                 initializer=init, initargs=initargs) as pool:
+            futures = {pool.submit(evaluate, params, base): (i, path) for i, params, path in todo}
+            for done, future in enumerate(as_completed(futures), 1):
+                i, path = futures[future]
+                results[i], cached[i] = future.result(), False
+                if path:
+                    _write_cache(path, results[i])
+                if done % 50 == 0:
+                    print(f"  ... {done}/{len(todo)} configs ({time.time() - started:.0f}s)")
+
+    rows = []
+    for i, params in enumerate(param_sets):
+        row = {k: (",".join(sorted(v)) if isinstance(v, (list, tuple)) else v) for k, v in params.items()}
+        row.update(results[i])
+        row["cached"] = cached[i]
+        rows.append(row)
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    table = table.sort_values(sort, ascending=sort in LOWER_IS_BETTER, kind="stable").reset_index(drop=True)
+    table.insert(0, "rank", range(1, len(table) + 1))
+    return table
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep over the prediction market backtest")
+    parser.add_argument("--grid", type=Path, help="JSON file: {param: [values, ...]}")
+    parser.add_argument("--random", type=int, help="Evaluate a random sample of N grid points")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --random")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--sort", default="sharpe", help="Rank by this metric (default: sharpe)")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    parser.add_argument("--both-sides", action="store_true", help="Base config trades both sides")
+    parser.add_argument("--bankroll", type=float, default=10_000, help="Starting bankroll")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't write the result cache")
+    args = parser.parse_args()
+
+    grid = json.loads(args.grid.read_text()) if args.grid else DEFAULT_GRID
+    param_sets = sample_grid(grid, args.random, args.seed) if args.random else expand_grid(grid)
+    make_config({k: v[0] for k, v in grid.items() if v})  # Fail fast on unknown parameter names
+
+    base = make_config({}, bt.BacktestConfig(
+        no_only=not args.both_sides, initial_bankroll=args.bankroll,
+        include_polymarket=False, show_plots=False, save_plots=False, export_csv=False,
+    ))
+    load_config = replace(base, min_volume_kalshi=min(grid.get("min_volume_kalshi", [base.min_volume_kalshi])))
+
+    print("Loading market data...")
+    started = time.time()
+    data = bt.prepare_markets(bt.load_kalshi_markets(load_config))
+    data_hash = data_snapshot_hash(load_config)
+    print(f"  Prepared {len(data):,} markets in {time.time() - started:.1f}s (snapshot {data_hash})")
+
+    print(f"\nSweeping {len(param_sets)} configs...")
+    started = time.time()
+    table = run_sweep(data, param_sets, data_hash, base=base, workers=args.workers,
+                      cache_dir=None if args.no_cache else CACHE_DIR, sort=args.sort)
+    n_cached = int(table["cached"].sum()) if not table.empty else 0
+    print(f"  Done in {time.time() - started:.1f}s ({n_cached} from cache)\n")
+
+    if table.empty:
+        return
+    with pd.option_context("display.width", 200, "display.max_columns", 30):
+        print(table.head(args.top).to_string(index=False))
+
+    base.output_dir.mkdir(parents=True, exist_ok=True)
+    out = base.output_dir / "sweep_results.csv"
+    table.to_csv(out, index=False)
+    print(f"\n  Exported ranked sweep -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,35 @@
 from __future__ import annotations
 
 import sys
+import time
 from pathlib import Path
 
 from simple_term_menu import TerminalMenu
 
 from src.common.analysis import Analysis
 from src.common.indexer import Indexer
+from src.common.runner import AnalysisRunner, format_summary
 from src.common.util import package_data
 from src.common.util.strings import snake_to_title
 
 
-def analyze(name: str | None = None):
-    """Run analysis by name or show interactive menu."""
+def _run_analysis(instance, output_dir: Path) -> float:
+    """Run and save one analysis, printing saved files and wall time."""
+    started = time.perf_counter()
+    saved = instance.save(output_dir, formats=["png", "pdf", "csv", "json", "gif"])
+    elapsed = time.perf_counter() - started
+    for fmt, path in saved.items():
+        print(f"  {fmt}: {path}")
+    print(f"  time: {elapsed:.2f}s")
+    return elapsed
+
+
+def analyze(name: str | None = None, force: bool = False, lazy_figures: bool = False):
+    """Run analysis by name or show interactive menu.
+
+    `all` goes through the parallel, cached runner; --force re-runs cached
+    analyses and --lazy-figures defers PNG/PDF rendering to `render`.
+    """
     analyses = Analysis.load()
 
     if not analyses:
@@ -24,14 +41,7 @@ def analyze(name: str | None = None):
     # If name provided, run that specific analysis
     if name:
         if name == "all":
-            print("\nRunning all analyses...\n")
-            for analysis_cls in analyses:
-                instance = analysis_cls()
-                print(f"Running: {instance.name}")
-                saved = instance.save(output_dir, formats=["png", "pdf", "csv", "json", "gif"])
-                for fmt, path in saved.items():
-                    print(f"  {fmt}: {path}")
-            print("\nAll analyses complete.")
+            _run_all(analyses, output_dir, force, lazy_figures)
             return
 
         # Find matching analysis
@@ -39,10 +49,7 @@ def analyze(name: str | None = None):
             instance = analysis_cls()
             if instance.name == name:
                 print(f"\nRunning: {instance.name}\n")
-                saved = instance.save(output_dir, formats=["png", "pdf", "csv", "json", "gif"])
-                print("Saved files:")
-                for fmt, path in saved.items():
-                    print(f"  {fmt}: {path}")
+                _run_analysis(instance, output_dir)
                 return
 
         # No match found
@@ -72,24 +79,31 @@ def analyze(name: str | None = None):
         return
 
     if choice == 0:
-        # Run all analyses
-        print("\nRunning all analyses...\n")
-        for analysis_cls in analyses:
-            instance = analysis_cls()
-            print(f"Running: {instance.name}")
-            saved = instance.save(output_dir, formats=["png", "pdf", "csv", "json", "gif"])
-            for fmt, path in saved.items():
-                print(f"  {fmt}: {path}")
-        print("\nAll analyses complete.")
+        _run_all(analyses, output_dir, force, lazy_figures)
     else:
         # Run selected analysis
         analysis_cls = analyses[choice - 1]
         instance = analysis_cls()
         print(f"\nRunning: {instance.name}\n")
-        saved = instance.save(output_dir, formats=["png", "pdf", "csv", "json", "gif"])
-        print("Saved files:")
-        for fmt, path in saved.items():
-            print(f"  {fmt}: {path}")
+        _run_analysis(instance, output_dir)
+
+
+def _run_all(analyses: list, output_dir: Path, force: bool = False, lazy_figures: bool = False):
+    """Run every analysis through the cached process-pool runner and print a summary."""
+    print("\nRunning all analyses...\n")
+    started = time.perf_counter()
+    results = AnalysisRunner(output_dir, force=force, lazy_figures=lazy_figures).run(analyses)
+    print(format_summary(results, time.perf_counter() - started))
+
+
+def render():
+    """Render figures left pending by `analyze all --lazy-figures`."""
+    started = time.perf_counter()
+    results = AnalysisRunner(Path("output")).render(Analysis.load())
+    if not results:
+        print("No pending figures.")
+        return
+    print(format_summary(results, time.perf_counter() - started))
 
 
 def index():
@@ -135,14 +149,19 @@ def package():
 def main():
     if len(sys.argv) < 2:
         print("\nUsage: uv run main.py <command>")
-        print("Commands: analyze, index, package")
+        print("Commands: analyze, render, index, package")
         sys.exit(0)
 
     command = sys.argv[1]
 
     if command == "analyze":
-        name = sys.argv[2] if len(sys.argv) > 2 else None
-        analyze(name)
+        args = [a for a in sys.argv[2:] if not a.startswith("--")]
+        name = args[0] if args else None
+        analyze(name, force="--force" in sys.argv, lazy_figures="--lazy-figures" in sys.argv)
+        sys.exit(0)
+
+    if command == "render":
+        render()
         sys.exit(0)
 
     if command == "index":
@@ -154,7 +173,7 @@ def main():
         sys.exit(0)
 
     print(f"Unknown command: {command}")
-    print("Commands: analyze, index, package")
+    print("Commands: analyze, render, index, package")
     sys.exit(1)
 
 
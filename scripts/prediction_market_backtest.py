@@ -9,6 +9,7 @@ Usage:
     python scripts/prediction_market_backtest.py --both-sides             # Test both YES and NO
     python scripts/prediction_market_backtest.py --no-kill-rules          # Disable kill rules
     python scripts/prediction_market_backtest.py --kalshi-only --no-plots # Fast smoke test
+    python scripts/prediction_market_backtest.py --row-wise               # Per-row reference replay
 """
 
 import sys
@@ -22,7 +23,7 @@ import argparse
 import json
 import logging
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 import duckdb
 import numpy as np
@@ -45,6 +46,11 @@ from mispriced_category_signal import (
     MAX_DAYS_TO_CLOSE,
     WHALE_VOLUME_KALSHI,
     WHALE_VOLUME_POLYMARKET,
+    WEIGHT_CATEGORY_EDGE,
+    WEIGHT_VOLUME_SPIKE,
+    WEIGHT_WHALE_ACTIVITY,
+    WEIGHT_THETA,
+    CATEGORY_CRYPTO_MAP,
 )
 from empirical_confidence import (
     price_zone,
@@ -78,6 +84,7 @@ class BacktestConfig:
     no_only: bool = True
     apply_kill_rules: bool = True
     track_killed: bool = True
+    blocked_archetypes: Tuple[str, ...] = ()  # Skipped outright (cf. paper_portfolio.ARCHETYPE_BLOCKLIST)
 
     # Sizing
     initial_bankroll: float = 10_000.0
@@ -285,6 +292,8 @@ def replay_signal(title: str, price_cents: int, volume: int,
 
     # Classify archetype
     archetype = classify_archetype(title)
+    if archetype in config.blocked_archetypes:
+        return {"action": "skip", "reason": f"archetype_blocked_{archetype}"}
 
     # Kill rules
     should_kill, kill_reason, _ = _check_kill_rules(title, price_cents)
@@ -336,6 +345,199 @@ def replay_signal(title: str, price_cents: int, volume: int,
     }
 
 
+# ============================================================================
+# Section 4b: Columnar Signal Replay
+# ============================================================================
+# Same decisions as replay_signal, computed over whole columns. The regex
+# work (noise filter, archetype) runs once per distinct title and the kill
+# rules once per (archetype, price) pair — both through the production
+# functions. Only calculate_signal_confidence is mirrored in NumPy, since
+# (category, volume, duration) is close to unique per market; the parity
+# tests pin it to the scalar version.
+
+def _column(df: pd.DataFrame, name: str, default) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index)
+
+
+def prepare_markets(markets_df: pd.DataFrame) -> pd.DataFrame:
+    """Sort chronologically and precompute every config-independent replay column.
+
+    Adds the _FEATURES columns (archetype, kill rule, confidence, zones ...)
+    for rows with an entry price. The prepared frame can then be replayed
+    under any number of configs, where only side/skip/action are recomputed.
+    """
+    df = markets_df.sort_values("close_time").reset_index(drop=True)
+    has_price = _column(df, "price_cents", np.nan).notna().to_numpy()
+    if has_price.any():
+        features = _signal_features(df[has_price]).reindex(df.index)
+        for col in _FEATURES:
+            df[col] = features[col]
+    df.attrs["prepared"] = True
+    return df
+
+
+def _archetypes_by_title(titles: pd.Series) -> pd.Series:
+    """classify_archetype() once per distinct title, broadcast back to rows."""
+    codes, uniques = pd.factorize(titles)
+    archetypes = np.array([classify_archetype(t) for t in uniques], dtype=object)
+    return pd.Series(archetypes[codes] if len(uniques) else [], index=titles.index, dtype=object)
+
+
+def _velocity_multiplier(category: str) -> float:
+    """The score-velocity multiplier calculate_signal_confidence would apply for this category."""
+    crypto_symbol = CATEGORY_CRYPTO_MAP.get(category.lower() if category else "")
+    if not crypto_symbol:
+        return 1.0
+    try:
+        from alpha_score_tracker import score_velocity_modifier
+        return score_velocity_modifier(crypto_symbol, hours=2)["multiplier"]
+    except Exception:
+        return 1.0
+
+
+def _confidence_columns(category_edge: np.ndarray, volume: np.ndarray, days: np.ndarray,
+                        whale_threshold: np.ndarray, velocity: np.ndarray):
+    """Vectorized calculate_signal_confidence (avg_category_volume=1000): (unrounded confidence, confirmations)."""
+    edge_score = np.minimum(100, (category_edge / 0.60) * 100)
+
+    volume_ratio = volume / 1000
+    volume_score = np.select(
+        [volume >= whale_threshold, volume_ratio > 2.0, volume_ratio > 1.0],
+        [90 + np.minimum(10, (volume / whale_threshold - 1) * 5),
+         60 + np.minimum(30, (volume_ratio - 2) * 15),
+         30 + (volume_ratio - 1) * 30],
+        default=volume_ratio * 30,
+    )
+    volume_score = np.minimum(100, volume_score)
+
+    whale_score = np.where(volume >= whale_threshold, 100, np.minimum(80, volume / whale_threshold * 80))
+
+    theta_score = np.select(
+        [days <= 1, days <= 3, days <= 7, days <= 14, days <= 30],
+        [100, 85, 70, 50, np.maximum(15, 40 - (days - 14))],
+        default=5,
+    )
+
+    confidence = (
+        edge_score * WEIGHT_CATEGORY_EDGE
+        + volume_score * WEIGHT_VOLUME_SPIKE
+        + whale_score * WEIGHT_WHALE_ACTIVITY
+        + theta_score * WEIGHT_THETA
+    )
+    confirmations = (
+        (category_edge >= 0.20).astype(int)
+        + (volume >= whale_threshold)
+        + (volume_ratio > 2.0)
+        + (days <= 7)
+    )
+    confidence = np.where(confirmations >= 3, confidence * 1.20,
+                          np.where(confirmations >= 2, confidence * 1.10, confidence))
+    confidence = np.minimum(95, confidence * velocity)
+    return confidence, confirmations
+
+
+_FEATURES = ("subdaily_noise", "archetype", "kill_rule", "was_killable",
+             "confidence", "confirmations", "price_zone", "duration_bucket")
+
+# classify_duration() bucket upper bounds (inclusive)
+_DURATION_EDGES = (1, 3, 7, 14, 30, 90)
+
+
+def _signal_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Config-independent replay_signal columns for rows with an entry price."""
+    titles = _column(df, "title", "").map(str).to_numpy(dtype=object)
+    codes, uniques = pd.factorize(titles)
+    noise = np.array([_is_subdaily_noise(t) for t in uniques], dtype=bool)[codes]
+    archetype = np.array([classify_archetype(t) for t in uniques], dtype=object)[codes]
+
+    price_cents = df["price_cents"].to_numpy().astype(np.int64)
+    volume = _column(df, "volume", 0).to_numpy().astype(np.int64)
+    days = _column(df, "duration_days", 7).to_numpy().astype(float)
+    category = _column(df, "category", "").map(str).to_numpy(dtype=object)
+    platform = _column(df, "platform", "kalshi").map(str).to_numpy(dtype=object)
+
+    # Kill rules depend on the title only through its archetype: one call per (archetype, price)
+    arch_codes, _ = pd.factorize(archetype)
+    _, first_row = np.unique(arch_codes, return_index=True)
+    p_min = int(price_cents.min())
+    span = int(price_cents.max()) - p_min + 1
+    pair_keys, pair_inv = np.unique(arch_codes.astype(np.int64) * span + (price_cents - p_min), return_inverse=True)
+    kills = [_check_kill_rules(titles[first_row[k // span]], int(k % span + p_min)) for k in pair_keys.tolist()]
+    killable = np.array([k[0] for k in kills], dtype=bool)[pair_inv]
+    kill_rule = np.array([k[1] for k in kills], dtype=object)[pair_inv]
+
+    cats = pd.unique(category)
+    category_edge = pd.Series(category).map(
+        {c: MISPRICED_CATEGORIES[c]["error"] if c in MISPRICED_CATEGORIES else 0.15 for c in cats}
+    ).to_numpy(dtype=float)
+    velocity = pd.Series(category).map({c: _velocity_multiplier(c) for c in cats}).to_numpy(dtype=float)
+    whale_threshold = np.where(platform == "kalshi", WHALE_VOLUME_KALSHI, WHALE_VOLUME_POLYMARKET)
+    confidence, confirmations = _confidence_columns(category_edge, volume, days, whale_threshold, velocity)
+
+    prices, price_inv = np.unique(price_cents, return_inverse=True)
+    zones = np.array([price_zone(p / 100.0) for p in prices.tolist()], dtype=object)[price_inv]
+    bucket_labels = np.array([classify_duration(e) for e in _DURATION_EDGES] + [classify_duration(float("inf"))],
+                             dtype=object)
+
+    return pd.DataFrame({
+        "subdaily_noise": noise,
+        "archetype": archetype,
+        "kill_rule": kill_rule,
+        "was_killable": killable,
+        "confidence": [round(c, 1) for c in confidence.tolist()],
+        "confirmations": confirmations,
+        "price_zone": zones,
+        "duration_bucket": bucket_labels[np.searchsorted(_DURATION_EDGES, days, side="left")],
+    }, index=df.index)
+
+
+def replay_signals(markets_df: pd.DataFrame, config: BacktestConfig) -> pd.DataFrame:
+    """Columnar replay_signal over every row with an entry price.
+
+    Returns one row per input row (same index) with the replay_signal keys as
+    columns ("reason" is "" unless skipped); rows without an entry price get
+    action "skip", reason "no_entry_price". On a prepare_markets() frame only
+    the config-dependent columns are computed here.
+    """
+    has_price = _column(markets_df, "price_cents", np.nan).notna().to_numpy()
+    df = markets_df[has_price]
+    if df.empty:
+        return pd.DataFrame({"action": "skip", "reason": "no_entry_price"}, index=markets_df.index)
+
+    if markets_df.attrs.get("prepared"):
+        features = df[list(_FEATURES)]
+    else:
+        features = _signal_features(df)
+    noise = features["subdaily_noise"].to_numpy(dtype=bool)
+    archetype = features["archetype"].to_numpy(dtype=object)
+    killable = features["was_killable"].to_numpy(dtype=bool)
+    price_cents = df["price_cents"].to_numpy().astype(np.int64)
+
+    reason = np.full(len(df), "", dtype=object)
+    reason[noise] = "subdaily_noise"
+    blocked = ~noise & np.isin(archetype, list(config.blocked_archetypes))
+    reason[blocked] = ["archetype_blocked_" + a for a in archetype[blocked]]
+    skip = noise | blocked
+    if config.no_only:
+        below_min = ~skip & (price_cents < config.min_entry_price)
+        reason[below_min] = [f"below_min_entry_{p}c" for p in price_cents[below_min].tolist()]
+        skip |= below_min
+        side = np.full(len(df), "NO", dtype=object)
+    else:
+        # Archetype-informed side: whichever side has the higher Becker WR
+        sides = {a: "NO" if BECKER_NO_WIN_RATES.get(a, 0.593) >= 0.5 else "YES" for a in pd.unique(archetype)}
+        side = pd.Series(archetype).map(sides).to_numpy(dtype=object)
+
+    action = np.where(skip, "skip", np.where(killable & config.apply_kill_rules, "kill", "trade"))
+    replayed = pd.DataFrame({"action": action, "reason": reason, "side": side}, index=df.index)
+    replayed = pd.concat([replayed, features.drop(columns="subdaily_noise")], axis=1).reindex(markets_df.index)
+    replayed["action"] = replayed["action"].fillna("skip")
+    replayed["reason"] = replayed["reason"].fillna("no_entry_price")
+    return replayed
+
+
 # ============================================================================
 # Section 5: Trade Simulation
 # ============================================================================
@@ -447,6 +649,143 @@ def simulate_trades(markets_df: pd.DataFrame, config: BacktestConfig) -> Backtes
     return result
 
 
+def replay_path(markets_df: pd.DataFrame, config: BacktestConfig) -> Dict:
+    """Columnar signal replay + sizing pass, without materializing Trade objects.
+
+    Everything except the bankroll is computed vectorized. Position size
+    depends on the running bankroll (and the $ cap), so the last step is a
+    single pass over plain floats for the candidate rows only.
+
+    Returns the replayed rows ("df", "sig" and per-row arrays), the row
+    positions that traded / were killed, their (position_size, dollar_pnl),
+    the equity curve and the peak bankroll.
+    """
+    if not markets_df.attrs.get("prepared"):
+        markets_df = prepare_markets(markets_df)
+    sig = replay_signals(markets_df, config)
+    live = (sig["action"] != "skip").to_numpy()
+    df = markets_df[live]
+    sig = sig[live]
+
+    entry_price = df["price_cents"].to_numpy().astype(np.int64) / 100.0
+    resolution = np.where(df["resolved_yes"].to_numpy(dtype=bool), "YES", "NO")
+    side = sig["side"].to_numpy(dtype=object)
+    won = side == resolution
+    cost_basis = np.where(side == "NO", 1.0 - entry_price, entry_price)
+    pnl_per_unit = np.where(won, 1.0 - cost_basis, -cost_basis)
+
+    # Kelly sizing (bankroll-independent part)
+    conf_decimal = np.minimum(sig["confidence"].to_numpy(dtype=float), 95) / 100.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = np.where(cost_basis > 0, (1.0 - cost_basis) / cost_basis, 0.0)
+        kelly_f = np.where((b > 0) & (conf_decimal > 0),
+                           np.maximum(0.0, (b * conf_decimal - (1 - conf_decimal)) / b) * config.kelly_fraction, 0.0)
+    position_pct = np.minimum(kelly_f, config.max_position_pct)
+
+    # Rows that can ever open a position; everything else is skipped before the kill check
+    candidate = np.flatnonzero((cost_basis > 0) & (position_pct > 0))
+    killed_mask = (sig["action"] == "kill").to_numpy()
+
+    bankroll = config.initial_bankroll
+    peak = bankroll
+    cap = config.max_position_dollar
+    equity_curve = [bankroll]
+    traded, killed, sizes = [], [], {}
+    for j, pct, cost, unit, is_kill in zip(candidate.tolist(), position_pct[candidate].tolist(),
+                                           cost_basis[candidate].tolist(), pnl_per_unit[candidate].tolist(),
+                                           killed_mask[candidate].tolist()):
+        if bankroll <= 0:
+            break
+        position_size = min(bankroll * pct, cap)
+        if position_size <= 0:
+            continue
+        dollar_pnl = position_size / cost * unit
+        sizes[j] = (position_size, dollar_pnl)
+        if is_kill:
+            if config.track_killed:
+                killed.append(j)
+            continue
+        traded.append(j)
+        bankroll += dollar_pnl
+        equity_curve.append(bankroll)
+        peak = max(peak, bankroll)
+
+    return {
+        "df": df,
+        "sig": sig,
+        "entry_price": entry_price,
+        "resolution": resolution,
+        "side": side,
+        "won": won,
+        "pnl_per_unit": pnl_per_unit,
+        "traded": traded,
+        "killed": killed,
+        "sizes": sizes,
+        "equity_curve": equity_curve,
+        "peak": peak,
+    }
+
+
+def simulate_trades_columnar(markets_df: pd.DataFrame, config: BacktestConfig) -> BacktestResult:
+    """simulate_trades on columns: identical trades, killed trades and equity curve."""
+    result = BacktestResult(config=config)
+    result.equity_curve = [config.initial_bankroll]
+    if markets_df.empty:
+        return result
+
+    path = replay_path(markets_df, config)
+    df, sig = path["df"], path["sig"]
+    columns = {
+        "market_id": df["market_id"].map(str).tolist(),
+        "platform": _column(df, "platform", "kalshi").map(str).tolist(),
+        "title": _column(df, "title", "").map(str).tolist(),
+        "category": _column(df, "category", "").map(str).tolist(),
+        "volume": _column(df, "volume", 0).tolist(),
+        "duration": _column(df, "duration_days", 7).tolist(),
+        "close_time": _column(df, "close_time", "").tolist(),
+        "archetype": sig["archetype"].tolist(),
+        "price_zone": sig["price_zone"].tolist(),
+        "duration_bucket": sig["duration_bucket"].tolist(),
+        "kill_rule": sig["kill_rule"].tolist(),
+        "confidence": sig["confidence"].tolist(),
+    }
+    entry_list, unit_list = path["entry_price"].tolist(), path["pnl_per_unit"].tolist()
+    won_list, side_list, res_list = path["won"].tolist(), path["side"].tolist(), path["resolution"].tolist()
+    sizes = path["sizes"]
+
+    def _trade(j: int) -> Trade:
+        position_size, dollar_pnl = sizes[j]
+        return Trade(
+            market_id=columns["market_id"][j],
+            platform=columns["platform"][j],
+            title=columns["title"][j][:200],
+            archetype=columns["archetype"][j],
+            side=side_list[j],
+            entry_price=entry_list[j],
+            price_zone=columns["price_zone"][j],
+            resolution=res_list[j],
+            won=won_list[j],
+            pnl=round(unit_list[j], 4),
+            position_size=round(position_size, 2),
+            dollar_pnl=round(dollar_pnl, 2),
+            confidence=round(columns["confidence"][j], 1),
+            category=columns["category"][j],
+            volume=int(columns["volume"][j]),
+            duration_days=round(float(columns["duration"][j]), 1),
+            duration_bucket=columns["duration_bucket"][j],
+            close_time=str(columns["close_time"][j]),
+            kill_rule=columns["kill_rule"][j],
+        )
+
+    result.trades = [_trade(j) for j in path["traded"]]
+    result.killed_trades = [_trade(j) for j in path["killed"]]
+    result.equity_curve = path["equity_curve"]
+    result.total_trades = len(result.trades)
+    peak = path["peak"]
+    result.max_drawdown = (peak - min(result.equity_curve)) / peak if peak > 0 else 0
+    return result
+
+
 # ============================================================================
 # Section 6: Metrics
 # ============================================================================
@@ -533,16 +872,11 @@ def polymarket_archetype_analysis(poly_df: pd.DataFrame) -> pd.DataFrame:
     if poly_df.empty:
         return pd.DataFrame()
 
-    records = []
-    for _, row in poly_df.iterrows():
-        arch = classify_archetype(str(row.get("title", "")))
-        records.append({
-            "archetype": arch,
-            "resolved_no": not row["resolved_yes"],
-            "volume": row.get("volume", 0),
-        })
-
-    df = pd.DataFrame(records)
+    df = pd.DataFrame({
+        "archetype": _archetypes_by_title(_column(poly_df, "title", "").map(str)),
+        "resolved_no": ~poly_df["resolved_yes"].astype(bool),
+        "volume": _column(poly_df, "volume", 0),
+    })
     table = (
         df.groupby("archetype")
         .agg(n=("resolved_no", "count"), no_wins=("resolved_no", "sum"), avg_volume=("volume", "mean"))
@@ -566,16 +900,11 @@ def kalshi_population_analysis(kalshi_df: pd.DataFrame) -> pd.DataFrame:
     if kalshi_df.empty:
         return pd.DataFrame()
 
-    records = []
-    for _, row in kalshi_df.iterrows():
-        arch = classify_archetype(str(row.get("title", "")))
-        records.append({
-            "archetype": arch,
-            "resolved_no": not row["resolved_yes"],
-            "volume": row.get("volume", 0),
-        })
-
-    df = pd.DataFrame(records)
+    df = pd.DataFrame({
+        "archetype": _archetypes_by_title(_column(kalshi_df, "title", "").map(str)),
+        "resolved_no": ~kalshi_df["resolved_yes"].astype(bool),
+        "volume": _column(kalshi_df, "volume", 0),
+    })
     table = (
         df.groupby("archetype")
         .agg(n=("resolved_no", "count"), no_wins=("resolved_no", "sum"),
@@ -900,6 +1229,7 @@ def main():
     parser.add_argument("--max-position", type=float, default=500, help="Max position size in dollars")
     parser.add_argument("--no-plots", action="store_true", help="Skip matplotlib output")
     parser.add_argument("--no-csv", action="store_true", help="Skip CSV export")
+    parser.add_argument("--row-wise", action="store_true", help="Use the per-row reference replay (slow)")
     args = parser.parse_args()
 
     config = BacktestConfig(
@@ -932,7 +1262,8 @@ def main():
 
     # ── Kalshi backtest (position-sized, markets with entry prices only) ──
     print("\nRunning signal replay + trade simulation...")
-    result = simulate_trades(kalshi_df, config)
+    simulate = simulate_trades if args.row_wise else simulate_trades_columnar
+    result = simulate(kalshi_df, config)
     compute_portfolio_metrics(result)
     wr_table = compute_wr_table(result.trades)
     kill_report = compute_kill_report(result) if config.track_killed else {}
@@ -3,13 +3,14 @@ HF Latency Engine — Phase 3
 
 Persistent service that:
 1. Streams real-time BTC/ETH prices from Binance WebSocket
-2. Polls Chainlink oracle prices on Polygon (every ~500ms)
+2. Polls Chainlink oracle prices on Polygon (every ~500ms, one hedged JSON-RPC batch)
 3. Detects latency divergence (Binance moved but oracle hasn't updated)
 4. Generates directional signals when delta > threshold
 5. Logs all events to SQLite for backtesting
 
 Designed to run as a separate systemd service alongside polyclawd-api.
-Exposes state via a small HTTP endpoint on port 8422.
+Exposes state over HTTP on port 8422 (keep-alive, cached snapshots) and
+pushes divergence/edge transitions over SSE (/stream) and WebSocket (/ws).
 
 Based on: [[Polymarket 134 to 200K Story]] and [[HF_MODULE_PLAN]]
 """
@@ -30,12 +31,11 @@ import aiomcache
 import websockets
 
 from services.hf_enrichment import get_enrichment_reader
-from services.hf_velocity import (
-    ImbalanceVelocityTracker,
-    CVDAccelerationTracker,
-    LiquidationProximityTracker,
-)
-from services.hf_triggers import evaluate_edge, build_edge_payload
+from services.hf_events import TriggerScheduler, enrichment_inputs
+from services.hf_oracle import ChainlinkBatchPoller
+from services.hf_server import StateHub, create_app, serve
+from services.hf_velocity import SymbolVelocityTrackers
+from services.hf_triggers import DETECTOR_INPUTS, IncrementalEdgeEvaluator, build_edge_payload
 
 logger = logging.getLogger("hf_engine")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
@@ -50,8 +50,6 @@ POLYGON_RPC_LIST = [
     "https://polygon-bor-rpc.publicnode.com",
 ]
 POLYGON_RPC = POLYGON_RPC_LIST[0]
-_rpc_index = 0  # current active RPC
-_rpc_consecutive_errors = 0
 
 # Chainlink Price Feed Aggregator contracts on Polygon
 CHAINLINK_FEEDS = {
@@ -59,9 +57,6 @@ CHAINLINK_FEEDS = {
     "ETH": "0xF9680D99D6C9589e2a93a78A04A279e509205945",
 }
 
-# latestRoundData() selector
-LATEST_ROUND_DATA = "0xfeaf968c"
-
 # Latency arb thresholds
 LATENCY_THRESHOLD_PCT = 0.3   # Min % divergence to flag
 LATENCY_THRESHOLD_HIGH = 0.8  # High-conviction threshold
@@ -78,6 +73,10 @@ HTTP_PORT = int(os.getenv("HF_ENGINE_PORT", "8422"))
 # Price averaging window
 PRICE_WINDOW = 50  # Last N ticks for VWAP/average
 
+# Trigger evaluation
+TRIGGER_SYMBOLS = ["BTCUSDT"]
+ENRICHMENT_POLL_SECONDS = 0.5  # memcached re-read; unchanged keys don't wake the evaluator
+
 
 # ============================================================================
 # Data Structures
@@ -132,81 +131,8 @@ _stats = {
 # Chainlink Oracle Poller
 # ============================================================================
 
-async def poll_chainlink_oracle(asset: str) -> Optional[Dict]:
-    """Poll Chainlink price feed on Polygon via JSON-RPC."""
-    contract = CHAINLINK_FEEDS.get(asset)
-    if not contract:
-        return None
-    
-    payload = json.dumps({
-        "jsonrpc": "2.0",
-        "method": "eth_call",
-        "params": [{"to": contract, "data": LATEST_ROUND_DATA}, "latest"],
-        "id": 1,
-    })
-    
-    global _rpc_index, _rpc_consecutive_errors
-
-    for attempt in range(len(POLYGON_RPC_LIST)):
-        rpc_url = POLYGON_RPC_LIST[_rpc_index]
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "curl", "-s", "-X", "POST", rpc_url,
-                "-H", "Content-Type: application/json",
-                "-d", payload,
-                "--max-time", "5",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=8)
-
-            result = json.loads(stdout.decode())
-
-            # Check for RPC error (quota exceeded, unauthorized, etc.)
-            if result.get("error"):
-                err_msg = result["error"].get("message", "")
-                logger.warning(f"RPC error on {rpc_url}: {err_msg}")
-                _rpc_consecutive_errors += 1
-                if _rpc_consecutive_errors >= 3:
-                    _rpc_index = (_rpc_index + 1) % len(POLYGON_RPC_LIST)
-                    _rpc_consecutive_errors = 0
-                    logger.warning(f"Switching RPC to {POLYGON_RPC_LIST[_rpc_index]}")
-                    continue
-                return None
-
-            hex_data = result.get("result", "")
-
-            if not hex_data or len(hex_data) < 322:
-                return None
-
-            # Decode: (roundId, answer, startedAt, updatedAt, answeredInRound)
-            data = hex_data[2:]
-            chunks = [data[i:i+64] for i in range(0, len(data), 64)]
-
-            answer = int(chunks[1], 16)
-            updated_at = int(chunks[3], 16)
-
-            price = answer / 1e8  # Chainlink uses 8 decimals
-
-            _rpc_consecutive_errors = 0
-            return {
-                "price": price,
-                "updated_at": updated_at,
-                "fetched_at": time.time(),
-            }
-
-        except Exception as e:
-            logger.error(f"Chainlink poll error ({asset}) on {rpc_url}: {e}")
-            _stats["errors"] += 1
-            _rpc_consecutive_errors += 1
-            if _rpc_consecutive_errors >= 3:
-                _rpc_index = (_rpc_index + 1) % len(POLYGON_RPC_LIST)
-                _rpc_consecutive_errors = 0
-                logger.warning(f"Switching RPC to {POLYGON_RPC_LIST[_rpc_index]}")
-                continue
-            return None
-
-    return None
+# One JSON-RPC batch per interval for all feeds, hedged across the two best RPCs
+_oracle = ChainlinkBatchPoller(CHAINLINK_FEEDS, POLYGON_RPC_LIST)
 
 
 async def oracle_poller_loop():
@@ -214,23 +140,31 @@ async def oracle_poller_loop():
     logger.info("🔗 Starting Chainlink oracle poller...")
     
     while True:
-        for asset in ["BTC", "ETH"]:
-            try:
-                result = await poll_chainlink_oracle(asset)
-                if result:
-                    state = _state[asset]
-                    state.oracle_price = result["price"]
-                    state.oracle_updated_at = result["updated_at"]
-                    state.oracle_fetched_at = result["fetched_at"]
-                    
-                    _stats["oracle_polls"] += 1
-                    _stats["last_oracle_poll"] = datetime.now(timezone.utc).isoformat()
-                    
-                    # Check divergence
-                    _check_divergence(asset)
-            except Exception as e:
-                logger.error(f"Oracle poller error ({asset}): {e}")
-                _stats["errors"] += 1
+        try:
+            rounds = await _oracle.poll()
+            if not rounds:
+                _stats["errors"] += 1  # Every RPC leg failed; per-RPC errors in /oracle
+        except Exception as e:
+            logger.error(f"Oracle poller error: {e}")
+            _stats["errors"] += 1
+            rounds = {}
+
+        for asset, result in rounds.items():
+            state = _state[asset]
+            state.oracle_fetched_at = result["fetched_at"]
+            _stats["oracle_polls"] += 1
+            _stats["last_oracle_poll"] = datetime.now(timezone.utc).isoformat()
+            if not result["changed"]:
+                continue  # Same round: nothing new to compare against
+
+            state.oracle_price = result["price"]
+            state.oracle_updated_at = result["updated_at"]
+
+            # Check divergence
+            _check_divergence(asset)
+            _scheduler.notify(f"{asset}USDT", ("oracle",), "oracle")
+
+        _hub.touch("state", "signals")
         
         await asyncio.sleep(0.5)  # Poll every 500ms
 
@@ -252,6 +186,7 @@ async def binance_ws_loop():
                 
                 async for msg in ws:
                     try:
+                        received = time.perf_counter()
                         data = json.loads(msg)
                         
                         symbol = data.get("s", "")
@@ -275,6 +210,8 @@ async def binance_ws_loop():
                         
                         # Check divergence on every tick
                         _check_divergence(asset)
+                        _hub.touch("state", "signals")
+                        _scheduler.notify_price(symbol, price, received)
                     
                     except (json.JSONDecodeError, ValueError, KeyError):
                         continue
@@ -308,6 +245,7 @@ def _check_divergence(asset: str):
     # Check oracle staleness
     now = time.time()
     oracle_age = now - state.oracle_updated_at if state.oracle_updated_at > 0 else 999
+    previous = (state.latency_signal, state.signal_strength)
     
     # Determine signal
     if abs_div >= LATENCY_THRESHOLD_PCT:
@@ -339,6 +277,7 @@ def _check_divergence(asset: str):
             
             _recent_events.append(asdict(event))
             _stats["latency_signals"] += 1
+            _hub.touch("events")
             
             # Log high-strength events
             if strength in ("medium", "high"):
@@ -357,6 +296,19 @@ def _check_divergence(asset: str):
         state.latency_signal = "NONE"
         state.signal_strength = "none"
 
+    # Push transitions only; while a divergence persists every tick re-logs it
+    if (state.latency_signal, state.signal_strength) != previous:
+        _hub.publish("divergence", {
+            "asset": asset,
+            "signal": state.latency_signal,
+            "strength": state.signal_strength,
+            "previous": previous[0],
+            "divergence_pct": state.divergence_pct,
+            "binance_price": state.binance_price,
+            "oracle_price": state.oracle_price,
+            "oracle_age_s": round(oracle_age, 1),
+        })
+
 
 # ============================================================================
 # SQLite Persistence
@@ -411,87 +363,96 @@ def _log_event_to_db(event: LatencyEvent):
 
 
 # ============================================================================
-# HTTP Status Endpoint
+# HTTP Status Server
 # ============================================================================
 
-async def http_handler(reader, writer):
-    """Simple HTTP handler for status queries."""
-    try:
-        request = await asyncio.wait_for(reader.read(4096), timeout=5)
-        request_line = request.decode().split("\r\n")[0]
-        path = request_line.split(" ")[1] if " " in request_line else "/"
-        
-        if path == "/health":
-            body = json.dumps({"status": "running", "timestamp": datetime.now(timezone.utc).isoformat()})
-        elif path == "/state":
-            body = json.dumps({
-                "prices": {k: asdict(v) for k, v in _state.items()},
-                "stats": _stats,
-            })
-        elif path == "/events":
-            body = json.dumps({
-                "events": list(_recent_events)[-50:],
-                "total": len(_recent_events),
-            })
-        elif path == "/signals":
-            # Current actionable signals
-            signals = []
-            for asset, state in _state.items():
-                if state.latency_signal in ("UP", "DOWN"):
-                    signals.append({
-                        "asset": asset,
-                        "direction": state.latency_signal,
-                        "strength": state.signal_strength,
-                        "divergence_pct": state.divergence_pct,
-                        "binance_price": state.binance_price,
-                        "oracle_price": state.oracle_price,
-                    })
-            body = json.dumps({"signals": signals, "count": len(signals)})
-        else:
-            body = json.dumps({
-                "service": "Polyclawd HF Latency Engine",
-                "version": "1.0.0",
-                "endpoints": ["/health", "/state", "/events", "/signals"],
-                "phase": "Phase 3",
+# Views are serialized once per change (touch) and served to every poller;
+# divergence and edge transitions are pushed over /stream (SSE) and /ws.
+_hub = StateHub()
+
+
+def _health_view() -> Dict:
+    return {"status": "running", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+def _state_view() -> Dict:
+    return {
+        "prices": {k: asdict(v) for k, v in _state.items()},
+        "stats": _stats,
+    }
+
+
+def _events_view() -> Dict:
+    return {
+        "events": list(_recent_events)[-50:],
+        "total": len(_recent_events),
+    }
+
+
+def _signals_view() -> Dict:
+    # Current actionable signals
+    signals = []
+    for asset, state in _state.items():
+        if state.latency_signal in ("UP", "DOWN"):
+            signals.append({
+                "asset": asset,
+                "direction": state.latency_signal,
+                "strength": state.signal_strength,
+                "divergence_pct": state.divergence_pct,
+                "binance_price": state.binance_price,
+                "oracle_price": state.oracle_price,
             })
-        
-        response = (
-            f"HTTP/1.1 200 OK\r\n"
-            f"Content-Type: application/json\r\n"
-            f"Content-Length: {len(body)}\r\n"
-            f"Access-Control-Allow-Origin: *\r\n"
-            f"\r\n{body}"
-        )
-        writer.write(response.encode())
-        await writer.drain()
-    except Exception:
-        pass
-    finally:
-        writer.close()
-        try:
-            await writer.wait_closed()
-        except Exception:
-            pass
+    return {"signals": signals, "count": len(signals)}
+
+
+def _triggers_view() -> Dict:
+    return {**_scheduler.snapshot(), "detectors": _evaluator.stats}
+
+
+def _enrichment_view() -> Dict:
+    return {**get_enrichment_reader().snapshot(),
+            "symbols": {symbol: e.get("_meta") for symbol, e in _enrichment.items()}}
+
+
+def _server_view() -> Dict:
+    return {**_hub.stats, "subscribers": _hub.subscriber_count, "last_event_id": _hub.last_event_id}
+
+
+_hub.register("health", _health_view, max_age=1.0)
+_hub.register("state", _state_view)
+_hub.register("events", _events_view)
+_hub.register("signals", _signals_view)
+_hub.register("oracle", lambda: _oracle.snapshot(), max_age=1.0)
+_hub.register("triggers", _triggers_view, max_age=1.0)
+_hub.register("enrichment", _enrichment_view, max_age=1.0)
+_hub.register("server", _server_view, max_age=1.0)
 
 
 async def start_http_server():
-    """Start the status HTTP server."""
-    server = await asyncio.start_server(http_handler, "127.0.0.1", HTTP_PORT)
+    """Start the status server (HTTP/1.1 keep-alive, SSE and WebSocket push)."""
+    app = create_app(_hub, index={
+        "service": "Polyclawd HF Latency Engine",
+        "version": "1.1.0",
+        "phase": "Phase 3",
+    })
     logger.info(f"📊 Status server listening on http://127.0.0.1:{HTTP_PORT}")
-    async with server:
-        await server.serve_forever()
+    await serve(app, "127.0.0.1", HTTP_PORT)
 
 
 # ============================================================================
 # Trigger Evaluation Loop
 # ============================================================================
 
-# Velocity trackers (persistent across cycles)
-_velocity_trackers = {
-    "imbalance": ImbalanceVelocityTracker(window_size=12),
-    "cvd": CVDAccelerationTracker(window_size=12),
-    "liquidation": LiquidationProximityTracker(price_window=30),
-}
+# Velocity trackers (persistent across cycles), one ring-buffer row per symbol
+_symbol_trackers = SymbolVelocityTrackers(imbalance_window=12, cvd_window=12, price_window=30)
+_velocity_trackers = _symbol_trackers.trackers("BTCUSDT")
+
+# Input-change events → coalesced batches; detectors re-run only for dirty inputs
+_scheduler = TriggerScheduler(TRIGGER_SYMBOLS)
+_evaluator = IncrementalEdgeEvaluator()
+_enrichment: Dict[str, Dict] = {}  # Latest enrichment per symbol (enrichment_poller_loop)
+ALL_INPUTS = frozenset().union(*DETECTOR_INPUTS.values())
+_last_edge: Dict[str, tuple] = {}  # symbol -> (action, direction, trigger, reason) last pushed
 
 # Memcached client for writing edge decisions
 _mc_client: Optional[aiomcache.Client] = None
@@ -504,79 +465,118 @@ async def _get_mc_client() -> aiomcache.Client:
     return _mc_client
 
 
+async def enrichment_poller_loop():
+    """Re-read Virtuoso enrichment and raise trigger events for keys whose contents changed."""
+    logger.info("📥 Starting enrichment poller...")
+    reader = get_enrichment_reader()
+
+    while True:
+        try:
+            # One pipelined memcached round trip for every symbol's keys
+            for symbol, (enrichment, changed) in (await reader.read_enrichment_many(TRIGGER_SYMBOLS)).items():
+                _enrichment[symbol] = enrichment
+                if changed:
+                    _scheduler.notify(symbol, enrichment_inputs(changed, symbol), "enrichment")
+        except Exception as e:
+            logger.debug(f"Enrichment poll error: {e}")
+
+        await asyncio.sleep(ENRICHMENT_POLL_SECONDS)
+
+
+def _update_trackers(reader, enrichment: Dict, inputs, btc: PriceState):
+    """Feed the velocity trackers only from inputs that changed."""
+    if "orderbook" in inputs:
+        ob = reader.get_orderbook_depth(enrichment, "BTCUSDT")
+        if ob:
+            bid_d = ob.get("bid_depth", ob.get("bids_total", 0))
+            ask_d = ob.get("ask_depth", ob.get("asks_total", 0))
+            if bid_d > 0 and ask_d > 0:
+                _velocity_trackers["imbalance"].update(bid_d, ask_d)
+
+    if "cvd" in inputs:
+        cvd_data = reader.get_cvd_data(enrichment, "BTCUSDT")
+        if cvd_data:
+            cvd_val = cvd_data.get("cvd", cvd_data.get("cumulative_delta", 0))
+            if cvd_val:
+                _velocity_trackers["cvd"].update(float(cvd_val))
+
+    if "price" in inputs and btc.binance_price > 0:
+        _velocity_trackers["liquidation"].update_price(btc.binance_price)
+
+
 async def trigger_evaluation_loop():
-    """Evaluate predictive triggers every ~1 second.
+    """Evaluate predictive triggers when their inputs change.
 
-    Reads Virtuoso enrichment data from memcached, updates velocity trackers
-    with both enrichment + fast Binance/oracle data, evaluates triggers, and
-    writes the edge decision back to memcached for Virtuoso API to read.
+    Waits on the scheduler for coalesced events (price moves past the tick
+    threshold, changed enrichment keys, new oracle rounds, or a heartbeat on
+    a quiet symbol), updates the velocity trackers from the changed inputs,
+    re-runs only the detectors reading them, and writes the edge decision
+    back to memcached for Virtuoso API to read.
     """
     logger.info("🎯 Starting trigger evaluation loop...")
     reader = get_enrichment_reader()
 
-    # Wait for Binance WS to populate initial prices
+    # Wait for Binance WS to populate initial prices. Events queued meanwhile
+    # are replaced by one full startup evaluation so they don't count as latency.
     await asyncio.sleep(5)
+    _scheduler.drain()
+    for symbol in TRIGGER_SYMBOLS:
+        _scheduler.notify(symbol, ALL_INPUTS, "startup")
 
     while True:
-        try:
-            # Read Virtuoso enrichment data
-            enrichment = await reader.read_enrichment("BTCUSDT")
-
-            # Build fast data dict from global _state
-            btc = _state["BTC"]
-            fast = {
-                "symbol": "BTCUSDT",
-                "binance_price": btc.binance_price,
-                "oracle_price": btc.oracle_price,
-                "price_change_3m_pct": 0.0,  # TODO: compute from price history
-            }
-
-            # Update velocity trackers from enrichment data
-            ob = reader.get_orderbook_depth(enrichment, "BTCUSDT")
-            if ob:
-                bid_d = ob.get("bid_depth", ob.get("bids_total", 0))
-                ask_d = ob.get("ask_depth", ob.get("asks_total", 0))
-                if bid_d > 0 and ask_d > 0:
-                    _velocity_trackers["imbalance"].update(bid_d, ask_d)
-
-            cvd_data = reader.get_cvd_data(enrichment, "BTCUSDT")
-            if cvd_data:
-                cvd_val = cvd_data.get("cvd", cvd_data.get("cumulative_delta", 0))
-                if cvd_val:
-                    _velocity_trackers["cvd"].update(float(cvd_val))
-
-            if btc.binance_price > 0:
-                _velocity_trackers["liquidation"].update_price(btc.binance_price)
-
-            # Evaluate triggers
-            decision = evaluate_edge(enrichment, fast, _velocity_trackers)
-
-            # Build payload with oracle state
-            oracle_state = {
-                "binance_price": btc.binance_price,
-                "oracle_price": btc.oracle_price,
-                "divergence_pct": btc.divergence_pct,
-                "latency_signal": btc.latency_signal,
-            }
-            payload = build_edge_payload(decision, oracle_state)
-
-            # Write to memcached for Virtuoso API
-            mc = await _get_mc_client()
-            payload_bytes = json.dumps(payload).encode()
-            await mc.set(b"polymarket:edge:BTCUSDT", payload_bytes, exptime=30)
-
-            if decision.action == "TRADE":
-                logger.info(
-                    f"🎯 EDGE SIGNAL: {decision.direction} "
-                    f"conf={decision.confidence:.1%} "
-                    f"trigger={decision.trigger_type} "
-                    f"size=${decision.sizing.get('recommended_usd', 0):.0f}"
-                )
-
-        except Exception as e:
-            logger.debug(f"Trigger eval error: {e}")
+        for batch in await _scheduler.wait():
+            try:
+                enrichment = _enrichment.get(batch.symbol)
+                if enrichment is None:
+                    enrichment = _enrichment[batch.symbol] = await reader.read_enrichment(batch.symbol)
+
+                # Build fast data dict from global _state
+                btc = _state["BTC"]
+                fast = {
+                    "symbol": "BTCUSDT",
+                    "binance_price": btc.binance_price,
+                    "oracle_price": btc.oracle_price,
+                    "price_change_3m_pct": 0.0,  # TODO: compute from price history
+                }
+
+                _update_trackers(reader, enrichment, batch.inputs, btc)
+
+                # Evaluate triggers (dirty detectors only)
+                _evaluator.mark_dirty(batch.inputs)
+                decision = _evaluator.evaluate(enrichment, fast, _velocity_trackers)
+
+                # Build payload with oracle state
+                oracle_state = {
+                    "binance_price": btc.binance_price,
+                    "oracle_price": btc.oracle_price,
+                    "divergence_pct": btc.divergence_pct,
+                    "latency_signal": btc.latency_signal,
+                }
+                payload = build_edge_payload(decision, oracle_state)
+
+                # Write to memcached for Virtuoso API
+                mc = await _get_mc_client()
+                payload_bytes = json.dumps(payload).encode()
+                await mc.set(b"polymarket:edge:BTCUSDT", payload_bytes, exptime=30)
+                latency = _scheduler.record(batch)
+
+                edge_key = (decision.action, decision.direction, decision.trigger_type, decision.reason)
+                if edge_key != _last_edge.get(batch.symbol):
+                    _last_edge[batch.symbol] = edge_key
+                    _hub.publish("edge", {"symbol": batch.symbol, "source": batch.source,
+                                          "latency_ms": round(latency * 1000, 2), **payload})
+
+                if decision.action == "TRADE":
+                    logger.info(
+                        f"🎯 EDGE SIGNAL: {decision.direction} "
+                        f"conf={decision.confidence:.1%} "
+                        f"trigger={decision.trigger_type} "
+                        f"size=${decision.sizing.get('recommended_usd', 0):.0f} "
+                        f"({batch.source} → signal {latency * 1000:.1f}ms)"
+                    )
 
-        await asyncio.sleep(1)
+            except Exception as e:
+                logger.debug(f"Trigger eval error: {e}")
 
 
 # ============================================================================
@@ -603,6 +603,7 @@ async def main():
         binance_ws_loop(),
         oracle_poller_loop(),
         start_http_server(),
+        enrichment_poller_loop(),
         trigger_evaluation_loop(),
     )
 
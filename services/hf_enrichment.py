@@ -1,8 +1,18 @@
 """
-HF Enrichment Reader — Direct memcached client for Virtuoso data.
+HF Enrichment Reader — Pipelined memcached reads of Virtuoso data.
 
-Replaces the mcporter subprocess bridge (~500ms/call) with direct
-aiomcache reads (<1ms/call) for low-latency trigger evaluation.
+Replaces the mcporter subprocess bridge (~500ms/call) with direct reads
+over the memcached text protocol for low-latency trigger evaluation.
+
+One read cycle is one round trip: every symbol's keys plus the global keys
+go out as pipelined ``gets`` commands on a persistent connection. ``gets``
+returns each item's CAS unique, which changes on every write, so a key
+whose CAS matches the previous read is neither compared nor re-decoded.
+JSON payloads are decoded straight from bytes (orjson when installed).
+
+Each field carries staleness metadata in ``_meta["fields"]``: age since
+Virtuoso last rewrote it (CAS change) and a stale flag past
+STALE_AFTER_SECONDS, so a stopped writer is visible per key.
 
 Reads cache keys written by virtuoso-trading every ~15s.
 """
@@ -11,9 +21,13 @@ import asyncio
 import json
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import aiomcache
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger("hf_enrichment")
 
@@ -21,6 +35,10 @@ logger = logging.getLogger("hf_enrichment")
 MEMCACHED_HOST = "localhost"
 MEMCACHED_PORT = 11211
 
+READ_TIMEOUT_SECONDS = 1.0
+KEYS_PER_COMMAND = 100        # Keys per pipelined gets line (memcached's line buffer is finite)
+STALE_AFTER_SECONDS = 60.0    # Virtuoso rewrites every ~15s; 4 missed writes is a stalled writer
+
 # Cache keys written by virtuoso-trading (verified from Virtuoso codebase)
 # Note: analysis:market_regime is plain text, all others are JSON
 SYMBOL_KEYS = [
@@ -38,6 +56,99 @@ GLOBAL_KEYS = [
     "market:tickers",           # JSON dict {symbol: {price, change, volume}}
 ]
 
+TEXT_KEYS = {"analysis:market_regime"}
+
+
+class MemcacheError(Exception):
+    """memcached returned an error line or an unparseable response."""
+
+
+class MemcachedPipeline:
+    """Persistent memcached text-protocol connection for batched ``gets``.
+
+    All keys are written before any response is read, so a batch costs one
+    round trip however many commands it spans. Requests are serialized on
+    the connection; any protocol or socket error drops it and the next call
+    reconnects.
+    """
+
+    def __init__(self, host: str = MEMCACHED_HOST, port: int = MEMCACHED_PORT,
+                 timeout: float = READ_TIMEOUT_SECONDS):
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        self.stats = {"round_trips": 0, "keys": 0, "hits": 0, "connects": 0, "errors": 0}
+
+    async def gets(self, keys: List[str]) -> Dict[str, Tuple[bytes, Optional[int]]]:
+        """key -> (value, cas) for every key present; cas is None if the server omits it."""
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._gets(keys), self._timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, MemcacheError):
+                self.stats["errors"] += 1
+                await self.close()
+                raise
+
+    async def _gets(self, keys: List[str]) -> Dict[str, Tuple[bytes, Optional[int]]]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+            self.stats["connects"] += 1
+        commands = [keys[i:i + KEYS_PER_COMMAND] for i in range(0, len(keys), KEYS_PER_COMMAND)]
+        self._writer.write(b"".join(b"gets " + " ".join(chunk).encode() + b"\r\n" for chunk in commands))
+        await self._writer.drain()
+        self.stats["round_trips"] += 1
+        self.stats["keys"] += len(keys)
+
+        items: Dict[str, Tuple[bytes, Optional[int]]] = {}
+        reader = self._reader
+        for _ in commands:
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                if line == b"END\r\n":
+                    break
+                parts = line.split()
+                if len(parts) < 4 or parts[0] != b"VALUE":
+                    raise MemcacheError(line.decode(errors="replace").strip())
+                data = await reader.readexactly(int(parts[3]) + 2)
+                items[parts[1].decode()] = (data[:-2], int(parts[4]) if len(parts) > 4 else None)
+        self.stats["hits"] += len(items)
+        return items
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+
+def decode_value(key: str, raw: Optional[bytes]) -> Any:
+    """Parse a cached payload: plain text for TEXT_KEYS, JSON otherwise (text if it isn't JSON)."""
+    if raw is None:
+        return None
+    if key not in TEXT_KEYS:
+        try:
+            return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+        except ValueError:  # JSONDecodeError and orjson.JSONDecodeError both subclass it
+            pass
+    try:
+        return raw.decode()
+    except UnicodeDecodeError:
+        return None
+
+
+class _Field:
+    """Last observed state of one cache key."""
+    __slots__ = ("cas", "raw", "value", "version", "written_at")
+
+    def __init__(self):
+        self.cas: Optional[int] = None
+        self.raw: Optional[bytes] = None
+        self.value: Any = None
+        self.version = 0          # Bumped when the content (not just the CAS) changes
+        self.written_at = 0.0     # When a new CAS was first seen (lower bound on the write time)
+
 
 class VirtuosoEnrichmentReader:
     """Reads Virtuoso's cached analysis data directly from memcached."""
@@ -45,34 +156,47 @@ class VirtuosoEnrichmentReader:
     def __init__(self, host: str = MEMCACHED_HOST, port: int = MEMCACHED_PORT):
         self._host = host
         self._port = port
-        self._client: Optional[aiomcache.Client] = None
+        self._client: Optional[MemcachedPipeline] = None
         self._last_read: float = 0.0
         self._last_data: Dict[str, Any] = {}
+        self._fields: Dict[str, _Field] = {}
+        self._seen: Dict[Tuple[str, str], int] = {}  # (symbol, key) -> field version last returned
+        self._connects = 0  # CAS uniques restart with memcached: only trust them within one connection
+        self.stats = {"reads": 0, "failed_reads": 0, "decodes": 0, "cas_hits": 0}
 
-    async def _get_client(self) -> aiomcache.Client:
+    async def _get_client(self) -> MemcachedPipeline:
         if self._client is None:
-            self._client = aiomcache.Client(self._host, self._port, pool_size=2)
+            self._client = MemcachedPipeline(self._host, self._port)
         return self._client
 
-    async def _safe_get(self, client: aiomcache.Client, key: str) -> Any:
-        """Read a single cache key with error handling."""
-        try:
-            raw = await client.get(key.encode())
-            if raw is None:
-                return None
-            decoded = raw.decode()
-            # analysis:market_regime is plain text, not JSON
-            if key == "analysis:market_regime":
-                return decoded
-            return json.loads(decoded)
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            try:
-                return raw.decode()
-            except Exception:
-                return None
-        except Exception as e:
-            logger.debug(f"Cache read failed for {key}: {e}")
-            return None
+    def _update(self, key: str, item: Optional[Tuple[bytes, Optional[int]]], now: float) -> _Field:
+        field = self._fields.get(key)
+        if field is None:
+            field = self._fields[key] = _Field()
+        raw, cas = item if item is not None else (None, None)
+        if cas is not None and cas == field.cas:
+            self.stats["cas_hits"] += 1
+            return field
+        if raw != field.raw or field.version == 0:
+            field.raw = raw
+            field.value = decode_value(key, raw)
+            field.version += 1
+            field.written_at = now
+            self.stats["decodes"] += raw is not None
+        elif cas is not None:  # Rewritten with identical content: fresher, not changed
+            field.written_at = now
+        field.cas = cas
+        return field
+
+    @staticmethod
+    def _field_meta(field: _Field, now: float) -> Dict[str, Any]:
+        age = round(now - field.written_at, 3) if field.raw is not None else None
+        return {
+            "found": field.raw is not None,
+            "version": field.version,
+            "age_s": age,
+            "stale": age is None or age > STALE_AFTER_SECONDS,
+        }
 
     async def read_enrichment(self, symbol: str = "BTCUSDT") -> Dict[str, Any]:
         """Read all Virtuoso enrichment data for a symbol in one batch.
@@ -80,39 +204,81 @@ class VirtuosoEnrichmentReader:
         Returns dict keyed by cache key name with parsed values.
         Includes metadata about read latency and data freshness.
         """
-        start = time.monotonic()
-        client = await self._get_client()
-        enrichment: Dict[str, Any] = {}
+        enrichment, _ = await self.read_enrichment_changes(symbol)
+        return enrichment
 
-        # Read symbol-specific keys
-        for key_template in SYMBOL_KEYS:
-            key = key_template.format(symbol=symbol)
-            enrichment[key] = await self._safe_get(client, key)
+    async def read_enrichment_changes(self, symbol: str = "BTCUSDT") -> Tuple[Dict[str, Any], List[str]]:
+        """read_enrichment plus the cache keys whose value changed since the last read for this symbol.
 
-        # Read global keys
-        for key in GLOBAL_KEYS:
-            enrichment[key] = await self._safe_get(client, key)
+        Virtuoso rewrites its keys every ~15s; the change list is what the HF
+        engine turns into trigger events (everything is "changed" on the first read).
+        """
+        return (await self.read_enrichment_many([symbol]))[symbol]
 
+    async def read_enrichment_many(self, symbols: Iterable[str]) -> Dict[str, Tuple[Dict[str, Any], List[str]]]:
+        """read_enrichment_changes for several symbols in one memcached round trip.
+
+        If memcached is unreachable the last known values are returned with
+        ``_meta["read_error"]`` set and no changes; field ages keep growing.
+        """
+        symbols = list(symbols)
+        start = time.monotonic()
+        keys = {s: [t.format(symbol=s) for t in SYMBOL_KEYS] + GLOBAL_KEYS for s in symbols}
+        wanted = list(dict.fromkeys(k for ks in keys.values() for k in ks))
+        error = None
+        try:
+            client = await self._get_client()
+            items = await client.gets(wanted)
+            if client.stats["connects"] != self._connects:
+                self._connects = client.stats["connects"]
+                for field in self._fields.values():
+                    field.cas = None  # Fall back to a bytes compare once
+        except Exception as e:
+            logger.debug(f"Enrichment read failed: {e}")
+            error = f"{type(e).__name__}: {e}"[:200]
+            items = None
+        now = time.time()
+        self.stats["reads"] += 1
+        if items is None:
+            self.stats["failed_reads"] += 1
+            fields = {k: self._fields.get(k) or _Field() for k in wanted}
+        else:
+            fields = {k: self._update(k, items.get(k), now) for k in wanted}
         elapsed_ms = (time.monotonic() - start) * 1000
-        enrichment["_meta"] = {
-            "read_latency_ms": round(elapsed_ms, 2),
-            "timestamp": time.time(),
-            "symbol": symbol,
-            "keys_found": sum(1 for v in enrichment.values() if v is not None and not isinstance(v, dict) or v),
-        }
 
-        self._last_read = time.time()
-        self._last_data = enrichment
-        return enrichment
+        results = {}
+        for symbol in symbols:
+            enrichment: Dict[str, Any] = {}
+            changed: List[str] = []
+            for key in keys[symbol]:
+                field = fields[key]
+                enrichment[key] = field.value
+                if items is not None and self._seen.get((symbol, key)) != field.version:
+                    self._seen[(symbol, key)] = field.version
+                    changed.append(key)
+            field_meta = {key: self._field_meta(fields[key], now) for key in keys[symbol]}
+            enrichment["_meta"] = {
+                "read_latency_ms": round(elapsed_ms, 2),
+                "timestamp": now,
+                "symbol": symbol,
+                "keys_found": sum(1 for m in field_meta.values() if m["found"]),
+                "changed_keys": len(changed),
+                "stale_keys": [key for key, m in field_meta.items() if m["found"] and m["stale"]],
+                "fields": field_meta,
+                "read_error": error,
+            }
+            results[symbol] = (enrichment, changed)
+
+        self._last_read = now
+        self._last_data = results[symbols[-1]][0] if symbols else {}
+        return results
 
     async def read_multi_symbol(self, symbols: list[str] = None) -> Dict[str, Dict]:
         """Read enrichment for multiple symbols."""
         if symbols is None:
             symbols = ["BTCUSDT", "ETHUSDT"]
-        results = {}
-        for symbol in symbols:
-            results[symbol] = await self.read_enrichment(symbol)
-        return results
+        results = await self.read_enrichment_many(symbols)
+        return {symbol: enrichment for symbol, (enrichment, _) in results.items()}
 
     def get_regime(self, enrichment: Dict) -> str:
         """Extract regime classification from enrichment data."""
@@ -177,6 +343,13 @@ class VirtuosoEnrichmentReader:
                 return orderflow
         return {}
 
+    def snapshot(self) -> Dict:
+        return {
+            "stats": dict(self.stats),
+            "memcached": dict(self._client.stats) if self._client else None,
+            "decoder": "orjson" if HAS_ORJSON else "json",
+        }
+
     async def close(self):
         if self._client:
             await self._client.close()
@@ -0,0 +1,249 @@
+"""
+HF Trigger Events — input-change scheduling for trigger evaluation.
+
+Replaces the fixed 1s trigger loop. Producers report what changed:
+- Binance WS:        notify_price() — only moves >= PRICE_TICK_PCT since the
+                     last price event count, so tick noise doesn't wake anything
+- Enrichment poller: notify(..., source="enrichment") with the inputs derived
+                     from the memcached keys whose bytes changed
+- Oracle poller:     notify(..., source="oracle") on a new Chainlink round
+
+wait() blocks until something is pending, then sleeps COALESCE_SECONDS so a
+burst (a price move plus the enrichment rewrite it caused) becomes one
+evaluation, and hands back one TriggerBatch per symbol carrying the union of
+dirty inputs. A heartbeat re-samples price and re-checks wall-clock windows
+when a symbol has been quiet for HEARTBEAT_SECONDS, which also keeps the 30s
+memcached edge key alive.
+
+record(batch) closes the loop: tick-to-signal latency, measured from when
+the oldest event in the batch was received to when its decision was
+published, per event source.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+PRICE_TICK_PCT = 0.01      # Min % move since the last price event that wakes the evaluator
+COALESCE_SECONDS = 0.02    # Events arriving within this window share one evaluation
+HEARTBEAT_SECONDS = 5.0    # Re-evaluate a quiet symbol at least this often
+
+HEARTBEAT_INPUTS = frozenset({"price", "clock"})
+
+# Enrichment cache key → trigger inputs (DETECTOR_INPUTS names in hf_triggers).
+# Keys not listed (regime, confluence score, market overview) only feed the
+# gates, which run on every evaluation.
+ENRICHMENT_INPUTS = {
+    "liquidations:{symbol}": ("liquidations",),
+    "large_trades:{symbol}": ("large_trades",),
+    "orderbook:{symbol}:snapshot": ("orderbook",),
+    "confluence:breakdown:{symbol}": ("breakdown", "cvd"),
+    "analysis:signals": ("signals",),
+}
+
+# Seconds. An evaluation is sub-millisecond; the memcached write and the
+# coalescing window dominate.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def enrichment_inputs(changed_keys: Iterable[str], symbol: str) -> FrozenSet[str]:
+    """Map changed enrichment cache keys to trigger inputs ("gates" for gate-only keys)."""
+    by_key = {template.format(symbol=symbol): inputs for template, inputs in ENRICHMENT_INPUTS.items()}
+    inputs = set()
+    for key in changed_keys:
+        inputs.update(by_key.get(key, ("gates",)))
+    return frozenset(inputs)
+
+
+# ============================================================================
+# Latency Histogram
+# ============================================================================
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with interpolated quantiles."""
+    __slots__ = ("counts", "total", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                lower = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / c, self.max)
+            seen += c
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+@dataclass
+class TriggerBatch:
+    """Coalesced events for one symbol, evaluated together."""
+    symbol: str
+    inputs: FrozenSet[str]
+    source: str          # Source of the oldest event: price, enrichment, oracle, heartbeat, startup
+    received: float      # perf_counter() when the oldest event arrived
+    events: int = 1
+
+
+class TriggerScheduler:
+    """Dirty-input bookkeeping and wakeups for event-driven trigger evaluation.
+
+    Single event loop only: producers and the evaluator call in from
+    coroutines/callbacks on the same loop, so no locking is needed.
+    """
+
+    def __init__(self, symbols: Iterable[str] = ("BTCUSDT",),
+                 price_tick_pct: float = PRICE_TICK_PCT,
+                 coalesce_seconds: float = COALESCE_SECONDS,
+                 heartbeat_seconds: float = HEARTBEAT_SECONDS):
+        self.symbols = list(symbols)
+        self.price_tick_pct = price_tick_pct
+        self.coalesce_seconds = coalesce_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._pending: Dict[str, set] = {}
+        self._oldest: Dict[str, Tuple[float, str, int]] = {}  # symbol -> (received, source, events)
+        self._event_prices: Dict[str, float] = {}
+        self._last_eval: Dict[str, float] = {s: float("-inf") for s in self.symbols}
+        self._wakeup: Optional[asyncio.Event] = None  # Created on the running loop in wait()
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.stats = {
+            "events": 0,
+            "price_ticks": 0,
+            "price_ticks_ignored": 0,
+            "coalesced": 0,
+            "heartbeats": 0,
+            "batches": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def notify(self, symbol: str, inputs: Iterable[str], source: str,
+               received: Optional[float] = None) -> bool:
+        """Mark ``inputs`` dirty for ``symbol`` and wake the evaluator."""
+        if symbol not in self._last_eval:
+            return False
+        pending = self._pending.get(symbol)
+        if pending is None:
+            self._pending[symbol] = set(inputs)
+            self._oldest[symbol] = (received if received is not None else time.perf_counter(), source, 1)
+        else:
+            pending.update(inputs)
+            at, first_source, events = self._oldest[symbol]
+            self._oldest[symbol] = (at, first_source, events + 1)
+            self.stats["coalesced"] += 1
+        self.stats["events"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def notify_price(self, symbol: str, price: float, received: Optional[float] = None) -> bool:
+        """Report a trade price; only a move of at least price_tick_pct since the last price event counts."""
+        if symbol not in self._last_eval or price <= 0:
+            return False
+        self.stats["price_ticks"] += 1
+        last = self._event_prices.get(symbol)
+        if last and abs(price - last) / last * 100 < self.price_tick_pct:
+            self.stats["price_ticks_ignored"] += 1
+            return False
+        self._event_prices[symbol] = price
+        return self.notify(symbol, ("price",), "price", received)
+
+    # ------------------------------------------------------------------
+    # Consumer
+    # ------------------------------------------------------------------
+
+    def _queue_heartbeats(self, now: float) -> None:
+        for symbol, last in self._last_eval.items():
+            if symbol not in self._pending and now - last >= self.heartbeat_seconds:
+                self._pending[symbol] = set(HEARTBEAT_INPUTS)
+                self._oldest[symbol] = (now, "heartbeat", 1)
+                self.stats["heartbeats"] += 1
+
+    async def wait(self) -> List[TriggerBatch]:
+        """Block until a symbol has pending events (or is due a heartbeat), then drain."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        while True:
+            now = time.perf_counter()
+            self._queue_heartbeats(now)
+            if self._pending:
+                break
+            next_heartbeat = min(self._last_eval.values()) + self.heartbeat_seconds
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(next_heartbeat - now, 0.001))
+            except asyncio.TimeoutError:
+                pass
+        if self.coalesce_seconds > 0:
+            await asyncio.sleep(self.coalesce_seconds)
+        return self.drain()
+
+    def drain(self) -> List[TriggerBatch]:
+        """Take every pending batch without waiting."""
+        now = time.perf_counter()
+        batches = []
+        for symbol, inputs in self._pending.items():
+            received, source, events = self._oldest[symbol]
+            batches.append(TriggerBatch(symbol, frozenset(inputs), source, received, events))
+            self._last_eval[symbol] = now
+        self._pending.clear()
+        self._oldest.clear()
+        self.stats["batches"] += len(batches)
+        return batches
+
+    def record(self, batch: TriggerBatch, published: Optional[float] = None) -> float:
+        """Record tick-to-signal latency for an evaluated batch; returns seconds."""
+        seconds = (published if published is not None else time.perf_counter()) - batch.received
+        for name in (batch.source, "all"):
+            hist = self.latency.get(name)
+            if hist is None:
+                hist = self.latency[name] = LatencyHistogram()
+            hist.observe(seconds)
+        return seconds
+
+    def snapshot(self) -> Dict:
+        return {
+            "symbols": self.symbols,
+            "pending": {s: sorted(i) for s, i in self._pending.items()},
+            "stats": dict(self.stats),
+            "tick_to_signal": {name: h.summary() for name, h in sorted(self.latency.items())},
+        }
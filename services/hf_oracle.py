@@ -0,0 +1,235 @@
+"""
+HF Oracle Poller — batched, hedged Chainlink reads over Polygon JSON-RPC.
+
+One poll is one JSON-RPC batch: a latestRoundData() eth_call per feed in a
+single HTTP POST on a keep-alive connection, so adding feeds adds bytes,
+not round trips (the engine used to spawn a curl per feed per tick).
+
+Hedging: the batch goes to the healthiest RPC first; if it hasn't returned a
+valid response within HEDGE_DELAY_SECONDS, or fails outright, the same batch
+goes to the runner-up and whichever valid response lands first wins (the
+loser is cancelled). A slow or quota-limited endpoint therefore costs at most
+the hedge delay instead of a full timeout plus sequential failover.
+
+Round-id change detection: each feed remembers its last roundId and poll()
+flags only feeds that published a new round, so unchanged answers don't
+re-run divergence checks or wake the trigger evaluator.
+
+Per-RPC stats (requests, wins, errors, hedges, latency histogram) are
+exposed via snapshot() and ranked to pick the primary.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from services.hf_events import LatencyHistogram
+
+logger = logging.getLogger("hf_oracle")
+
+# latestRoundData() selector → (roundId, answer, startedAt, updatedAt, answeredInRound)
+LATEST_ROUND_DATA = "0xfeaf968c"
+FEED_DECIMALS = 8              # Chainlink USD feeds
+
+HEDGE_DELAY_SECONDS = 0.25     # Send the batch to the second RPC if the first hasn't answered by then
+RPC_TIMEOUT_SECONDS = 5.0
+MAX_CONSECUTIVE_ERRORS = 3     # Demote an RPC below healthy ones after this many failures in a row
+
+
+class RpcError(Exception):
+    """JSON-RPC endpoint returned an error or an unusable response."""
+
+
+class RpcStats:
+    """Request outcome counters and latency for one RPC endpoint."""
+    __slots__ = ("requests", "wins", "errors", "hedges", "cancelled",
+                 "consecutive_errors", "last_error", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.wins = 0
+        self.errors = 0
+        self.hedges = 0           # Requests sent as the hedge (second) leg
+        self.cancelled = 0        # Lost the race to the other RPC
+        self.consecutive_errors = 0
+        self.last_error: Optional[str] = None
+        self.latency = LatencyHistogram()
+
+    def summary(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "wins": self.wins,
+            "errors": self.errors,
+            "hedges": self.hedges,
+            "cancelled": self.cancelled,
+            "consecutive_errors": self.consecutive_errors,
+            "last_error": self.last_error,
+            "latency": self.latency.summary(),
+        }
+
+
+def _word(data: str, i: int) -> int:
+    return int(data[i * 64:(i + 1) * 64], 16)
+
+
+def decode_latest_round(hex_data: str, decimals: int = FEED_DECIMALS) -> Dict:
+    """Decode a latestRoundData() return value."""
+    if not isinstance(hex_data, str) or len(hex_data) < 322:
+        raise RpcError(f"short latestRoundData result ({len(hex_data or '')} chars)")
+    data = hex_data[2:]
+    answer = _word(data, 1)
+    if answer >= 1 << 255:  # int256
+        answer -= 1 << 256
+    return {
+        "round_id": _word(data, 0),
+        "price": answer / 10 ** decimals,
+        "updated_at": _word(data, 3),
+    }
+
+
+class ChainlinkBatchPoller:
+    """Polls a set of Chainlink feeds with one hedged JSON-RPC batch per interval."""
+
+    def __init__(self, feeds: Dict[str, str], rpc_urls: List[str],
+                 hedge_delay: float = HEDGE_DELAY_SECONDS,
+                 timeout: float = RPC_TIMEOUT_SECONDS,
+                 client: Optional[httpx.AsyncClient] = None):
+        self.feeds = dict(feeds)
+        self.rpc_urls = list(dict.fromkeys(rpc_urls))  # Dedupe, keep order (env override may repeat a default)
+        self.hedge_delay = hedge_delay
+        self.timeout = timeout
+        self._client = client
+        self._assets = list(self.feeds)
+        self._body = json.dumps([
+            {"jsonrpc": "2.0", "method": "eth_call",
+             "params": [{"to": contract, "data": LATEST_ROUND_DATA}, "latest"], "id": i}
+            for i, contract in enumerate(self.feeds.values())
+        ]).encode()
+        self._rounds: Dict[str, int] = {}
+        self.rpc_stats: Dict[str, RpcStats] = {url: RpcStats() for url in self.rpc_urls}
+        self.stats = {"polls": 0, "failed_polls": 0, "hedged_polls": 0, "new_rounds": 0, "unchanged": 0}
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def ranked_rpcs(self) -> List[str]:
+        """Healthy RPCs first, then by median latency; untried ones before slow ones."""
+        def key(url):
+            s = self.rpc_stats[url]
+            failing = s.consecutive_errors >= MAX_CONSECUTIVE_ERRORS
+            return (failing, s.latency.quantile(0.5) if s.latency.count else 0.0)
+        return sorted(self.rpc_urls, key=key)
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    def _parse_batch(self, payload) -> Dict[str, Dict]:
+        if isinstance(payload, dict):  # Whole-batch error (quota, unsupported batch, ...)
+            err = payload.get("error") or {}
+            raise RpcError(err.get("message", "non-batch response") if isinstance(err, dict) else str(err))
+        by_id = {item.get("id"): item for item in payload if isinstance(item, dict)}
+        rounds = {}
+        for i, asset in enumerate(self._assets):
+            item = by_id.get(i)
+            if item is None:
+                raise RpcError(f"missing response for {asset}")
+            if item.get("error"):
+                raise RpcError(f"{asset}: {item['error'].get('message', item['error'])}")
+            rounds[asset] = decode_latest_round(item.get("result"))
+        return rounds
+
+    async def _call(self, url: str, hedge: bool) -> Tuple[str, Dict[str, Dict]]:
+        """POST the batch to one RPC; raises RpcError/httpx errors, records stats either way."""
+        stats = self.rpc_stats[url]
+        stats.requests += 1
+        stats.hedges += hedge
+        started = time.perf_counter()
+        try:
+            client = await self._get_client()
+            resp = await client.post(url, content=self._body)
+            resp.raise_for_status()
+            rounds = self._parse_batch(resp.json())
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            stats.latency.observe(time.perf_counter() - started)  # Lower bound, still ranks it behind the winner
+            raise
+        except Exception as e:
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            stats.last_error = f"{type(e).__name__}: {e}"[:200]
+            raise
+        stats.latency.observe(time.perf_counter() - started)
+        stats.consecutive_errors = 0
+        return url, rounds
+
+    async def fetch(self) -> Optional[Dict[str, Dict]]:
+        """Latest round for every feed from the first valid RPC response, or None if all legs failed."""
+        ranked = self.ranked_rpcs()[:2]
+        launched = 1
+        pending = {asyncio.ensure_future(self._call(ranked[0], hedge=False))}
+        try:
+            while pending:
+                can_hedge = launched < len(ranked)
+                done, pending = await asyncio.wait(
+                    pending, timeout=self.hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        url, rounds = task.result()
+                        self.rpc_stats[url].wins += 1
+                        return rounds
+                    logger.debug(f"RPC leg failed: {task.exception()}")
+                if can_hedge:  # Primary slow (timeout) or failed: race the runner-up
+                    pending.add(asyncio.ensure_future(self._call(ranked[launched], hedge=True)))
+                    launched += 1
+                    self.stats["hedged_polls"] += 1
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def poll(self) -> Dict[str, Dict]:
+        """Fetch all feeds; each result carries ``changed`` (new roundId since the last poll)."""
+        self.stats["polls"] += 1
+        rounds = await self.fetch()
+        if rounds is None:
+            self.stats["failed_polls"] += 1
+            errors = {url: s.last_error for url, s in self.rpc_stats.items() if s.consecutive_errors}
+            logger.warning(f"Chainlink batch failed on every RPC: {errors}")
+            return {}
+        fetched_at = time.time()
+        for asset, r in rounds.items():
+            r["fetched_at"] = fetched_at
+            r["changed"] = self._rounds.get(asset) != r["round_id"]
+            if r["changed"]:
+                self._rounds[asset] = r["round_id"]
+                self.stats["new_rounds"] += 1
+            else:
+                self.stats["unchanged"] += 1
+        return rounds
+
+    def snapshot(self) -> Dict:
+        return {
+            "feeds": list(self.feeds),
+            "rounds": dict(self._rounds),
+            "stats": dict(self.stats),
+            "rpcs": {url: self.rpc_stats[url].summary() for url in self.ranked_rpcs()},
+        }
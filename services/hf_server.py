@@ -0,0 +1,291 @@
+"""
+HF Engine Server — keep-alive HTTP snapshots plus SSE/WebSocket event push.
+
+Replaces the hand-rolled responder on port 8422 (one request per
+connection, full json.dumps of the engine state per poll) with a Starlette
+app served by uvicorn inside the engine's event loop:
+
+- HTTP/1.1 keep-alive (httptools parser when installed).
+- StateHub caches each view (/state, /signals, ...) as pre-serialized bytes
+  with an ETag. Producers call touch(view) when the underlying data changes;
+  a GET re-serializes only if the view was touched since it was last built,
+  so N pollers between two ticks share one json.dumps. If-None-Match → 304.
+- publish(kind, data) serializes an event once and fans the ready-made
+  SSE frame / WebSocket text out to every subscriber queue. /stream (SSE)
+  and /ws (WebSocket) resume from Last-Event-ID (?last_event_id=) out of a
+  bounded history ring; a subscriber whose queue fills up is disconnected
+  and reconnects from its last id rather than stalling the publisher.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket
+
+logger = logging.getLogger("hf_server")
+
+EVENT_HISTORY = 1000        # Events kept for Last-Event-ID replay
+SUBSCRIBER_QUEUE = 256      # Undelivered events per subscriber before it is dropped
+STREAM_HEARTBEAT = 15.0     # Keepalive interval for idle streams (proxies drop silent ones)
+
+JSON_HEADERS = {"Cache-Control": "no-cache", "Access-Control-Allow-Origin": "*"}
+
+
+# ============================================================================
+# Snapshots and Events
+# ============================================================================
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    built_at: float
+    body: bytes
+    etag: str
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    kind: str
+    sse: bytes       # Complete SSE frame
+    text: str        # WebSocket message: {"id", "event", "data"}
+
+
+class Subscriber:
+    __slots__ = ("queue", "kinds", "dropped")
+
+    def __init__(self, kinds: Optional[Set[str]], maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.kinds = kinds
+        self.dropped = False
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 If-None-Match comparison (weak comparison, list or '*')."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any((t[2:] if t.startswith("W/") else t) == etag for t in tags)
+
+
+class StateHub:
+    """Versioned JSON views served from cache, plus pub/sub for pushed events.
+
+    Event-loop confined: producers and handlers run on the engine loop.
+    """
+
+    def __init__(self, history: int = EVENT_HISTORY, queue_size: int = SUBSCRIBER_QUEUE):
+        self._builders: Dict[str, Callable[[], Any]] = {}
+        self._max_age: Dict[str, Optional[float]] = {}
+        self._versions: Dict[str, int] = {}
+        self._cache: Dict[str, Snapshot] = {}
+        self._history: Deque[Event] = deque(maxlen=history)
+        self._subscribers: Set[Subscriber] = set()
+        self._queue_size = queue_size
+        self._boot = f"{int(time.time()):x}"  # Keeps ETags unique across restarts
+        self.last_event_id = 0
+        self.stats = {
+            "snapshot_builds": 0,
+            "snapshot_hits": 0,
+            "not_modified": 0,
+            "events_published": 0,
+            "frames_queued": 0,
+            "subscribers_dropped": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def register(self, name: str, builder: Callable[[], Any], max_age: Optional[float] = None):
+        """Add a view. ``max_age`` rebuilds it periodically for data that changes without touch()."""
+        self._builders[name] = builder
+        self._max_age[name] = max_age
+        self._versions.setdefault(name, 0)
+
+    def touch(self, *names: str):
+        """Mark views changed; the next read re-serializes them."""
+        versions = self._versions
+        for name in names:
+            versions[name] += 1
+
+    def snapshot(self, name: str) -> Snapshot:
+        version = self._versions[name]
+        snap = self._cache.get(name)
+        max_age = self._max_age[name]
+        if snap is not None and snap.version == version and (max_age is None or time.time() - snap.built_at < max_age):
+            self.stats["snapshot_hits"] += 1
+            return snap
+        body = json.dumps(self._builders[name](), default=str).encode()
+        etag = f'"{self._boot}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        snap = self._cache[name] = Snapshot(version, time.time(), body, etag)
+        self.stats["snapshot_builds"] += 1
+        return snap
+
+    @property
+    def views(self) -> List[str]:
+        return list(self._builders)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._builders
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def publish(self, kind: str, data: Any) -> int:
+        """Serialize once and queue for every subscriber of ``kind``; returns the event id."""
+        self.last_event_id += 1
+        event_id = self.last_event_id
+        payload = json.dumps(data, default=str)
+        event = Event(
+            id=event_id,
+            kind=kind,
+            sse=f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n".encode(),
+            text=f'{{"id": {event_id}, "event": {json.dumps(kind)}, "data": {payload}}}',
+        )
+        self._history.append(event)
+        self.stats["events_published"] += 1
+        for sub in list(self._subscribers):
+            if sub.kinds is None or kind in sub.kinds:
+                self._offer(sub, event)
+        return event_id
+
+    def _offer(self, sub: Subscriber, event: Event):
+        try:
+            sub.queue.put_nowait(event)
+            self.stats["frames_queued"] += 1
+        except asyncio.QueueFull:
+            sub.dropped = True
+            self._subscribers.discard(sub)
+            self.stats["subscribers_dropped"] += 1
+
+    def subscribe(self, kinds: Optional[Iterable[str]] = None, last_event_id: Optional[int] = None) -> Subscriber:
+        """Register a subscriber, replaying retained events after ``last_event_id``."""
+        sub = Subscriber(set(kinds) if kinds else None, self._queue_size)
+        if last_event_id is not None:
+            for event in self._history:
+                if event.id > last_event_id and (sub.kinds is None or event.kind in sub.kinds):
+                    self._offer(sub, event)
+        if not sub.dropped:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+# ============================================================================
+# HTTP / SSE / WebSocket App
+# ============================================================================
+
+def _subscription_args(params, headers) -> tuple:
+    kinds = [k for k in params.get("events", "").split(",") if k] or None
+    last_id = params.get("last_event_id") or headers.get("last-event-id")
+    return kinds, int(last_id) if last_id and last_id.isdigit() else None
+
+
+async def _until_disconnect(ws: WebSocket):
+    """Drain client frames (ignored) until the socket closes."""
+    while (await ws.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+def create_app(hub: StateHub, index: Optional[Dict] = None) -> Starlette:
+    """Starlette app serving every registered view at /<name>, plus /stream (SSE) and /ws."""
+
+    async def view(request: Request) -> Response:
+        name = request.path_params.get("view", "")
+        if name not in hub:
+            body = json.dumps({**(index or {}), "endpoints": [f"/{v}" for v in hub.views] + ["/stream", "/ws"]})
+            return Response(body, media_type="application/json", headers=JSON_HEADERS)
+        snap = hub.snapshot(name)
+        headers = {**JSON_HEADERS, "ETag": snap.etag}
+        if etag_matches(request.headers.get("if-none-match"), snap.etag):
+            hub.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(snap.body, media_type="application/json", headers=headers)
+
+    async def stream(request: Request) -> StreamingResponse:
+        kinds, last_id = _subscription_args(request.query_params, request.headers)
+        sub = hub.subscribe(kinds, last_id)
+
+        async def frames():
+            try:
+                yield f"retry: 3000\nid: {hub.last_event_id if last_id is None else last_id}\n\n".encode()
+                while not sub.dropped:
+                    try:
+                        event = await asyncio.wait_for(sub.queue.get(), timeout=STREAM_HEARTBEAT)
+                    except asyncio.TimeoutError:
+                        yield b": keepalive\n\n"
+                        continue
+                    yield event.sse
+            finally:
+                hub.unsubscribe(sub)
+
+        return StreamingResponse(frames(), media_type="text/event-stream",
+                                 headers={**JSON_HEADERS, "X-Accel-Buffering": "no"})
+
+    async def websocket(ws: WebSocket):
+        kinds, last_id = _subscription_args(ws.query_params, ws.headers)
+        await ws.accept()
+        sub = hub.subscribe(kinds, last_id)
+        closed = asyncio.ensure_future(_until_disconnect(ws))
+        try:
+            while not sub.dropped and not closed.done():
+                get = asyncio.ensure_future(sub.queue.get())
+                done, _ = await asyncio.wait({get, closed}, timeout=STREAM_HEARTBEAT,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if get in done:
+                    await ws.send_text(get.result().text)
+                    continue
+                get.cancel()
+                if not done:
+                    await ws.send_text('{"event": "keepalive"}')
+            if sub.dropped:
+                await ws.close(code=1013)  # Fell behind: reconnect with last_event_id
+        except Exception:
+            pass  # Client went away
+        finally:
+            closed.cancel()
+            hub.unsubscribe(sub)
+
+    return Starlette(routes=[
+        Route("/stream", stream),
+        WebSocketRoute("/ws", websocket),
+        Route("/", view),
+        Route("/{view}", view),
+    ])
+
+
+class _EmbeddedServer(uvicorn.Server):
+    """uvicorn inside a larger asyncio app: leave signal handling to the host process."""
+
+    def install_signal_handlers(self) -> None:
+        pass
+
+
+def make_server(app: Starlette, host: str = "127.0.0.1", port: int = 0) -> uvicorn.Server:
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False,
+                            lifespan="off", timeout_keep_alive=30)
+    return _EmbeddedServer(config)
+
+
+async def serve(app: Starlette, host: str, port: int):
+    """Run the app on the current event loop until cancelled."""
+    await make_server(app, host, port).serve()
@@ -423,12 +423,35 @@ ALL_DETECTORS = [
     detect_smart_money_squeeze,
 ]
 
+# Inputs each detector reads. A detector only re-runs when one of these changed:
+#   price        — Binance price sampled into the liquidation tracker
+#   liquidations, large_trades, orderbook, breakdown, signals — enrichment keys
+#   cvd          — CVD tracker (fed from the breakdown's orderflow component)
+#   clock        — wall-clock windows (whale trades older than 60s drop out)
+# Gates (regime, session, confluence) are cheap and re-run on every evaluation.
+DETECTOR_INPUTS = {
+    "detect_cascade": frozenset({"price", "liquidations"}),
+    "detect_whale_absorption": frozenset({"large_trades", "orderbook", "clock"}),
+    "detect_cvd_divergence": frozenset({"cvd", "price"}),
+    "detect_orderbook_cliff": frozenset({"orderbook"}),
+    "detect_smart_money_squeeze": frozenset({"breakdown", "signals"}),
+}
+
+
+def _run_detector(detector, enrichment: Dict, fast: Dict, velocity_trackers: Dict) -> Optional[TriggerResult]:
+    try:
+        return detector(enrichment, fast, velocity_trackers)
+    except Exception as e:
+        logger.debug(f"Detector {detector.__name__} error: {e}")
+        return None
+
 
 def evaluate_edge(
     enrichment: Dict,
     fast: Dict,
     velocity_trackers: Dict,
     bankroll: float = 10000.0,
+    triggers: Optional[List[TriggerResult]] = None,
 ) -> EdgeDecision:
     """Master decision function.
 
@@ -437,6 +460,9 @@ def evaluate_edge(
     Gate 3: Trigger evaluation (ranked by confidence)
     Gate 4: Confluence alignment (for non-cascade triggers)
     Gate 5: Session min confidence check
+
+    ``triggers`` skips detection and gates already-computed detector results
+    (see IncrementalEdgeEvaluator).
     """
     from services.hf_enrichment import get_enrichment_reader
     reader = get_enrichment_reader()
@@ -461,14 +487,12 @@ def evaluate_edge(
     }
 
     # Run all detectors
-    triggers: List[TriggerResult] = []
-    for detector in ALL_DETECTORS:
-        try:
-            result = detector(enrichment, fast, velocity_trackers)
+    if triggers is None:
+        triggers = []
+        for detector in ALL_DETECTORS:
+            result = _run_detector(detector, enrichment, fast, velocity_trackers)
             if result is not None:
                 triggers.append(result)
-        except Exception as e:
-            logger.debug(f"Detector {detector.__name__} error: {e}")
 
     if not triggers:
         return EdgeDecision(
@@ -531,6 +555,48 @@ def evaluate_edge(
     )
 
 
+class IncrementalEdgeEvaluator:
+    """evaluate_edge with per-detector dirty flags.
+
+    Callers mark which inputs changed (DETECTOR_INPUTS names); evaluate()
+    re-runs only the detectors reading one of them and reuses the cached
+    results of the rest, then applies the usual gates. Every detector starts
+    dirty, so the first evaluation is a full one.
+    """
+
+    def __init__(self, detectors: Optional[List] = None):
+        self._detectors = list(detectors or ALL_DETECTORS)
+        self._results: Dict[str, Optional[TriggerResult]] = {}
+        self._dirty = {d.__name__ for d in self._detectors}
+        self.stats = {"evaluations": 0, "detector_runs": 0, "detector_skips": 0}
+
+    def mark_dirty(self, inputs) -> None:
+        """Flag every detector that reads one of ``inputs``; None flags all of them."""
+        for detector in self._detectors:
+            name = detector.__name__
+            if inputs is None or DETECTOR_INPUTS.get(name, frozenset()) & inputs or name not in DETECTOR_INPUTS:
+                self._dirty.add(name)
+
+    @property
+    def dirty(self) -> List[str]:
+        return [d.__name__ for d in self._detectors if d.__name__ in self._dirty]
+
+    def evaluate(self, enrichment: Dict, fast: Dict, velocity_trackers: Dict,
+                 bankroll: float = 10000.0) -> EdgeDecision:
+        for detector in self._detectors:
+            name = detector.__name__
+            if name in self._dirty:
+                self._results[name] = _run_detector(detector, enrichment, fast, velocity_trackers)
+                self.stats["detector_runs"] += 1
+            else:
+                self.stats["detector_skips"] += 1
+        self._dirty.clear()
+        self.stats["evaluations"] += 1
+
+        triggers = [r for r in self._results.values() if r is not None]
+        return evaluate_edge(enrichment, fast, velocity_trackers, bankroll, triggers=triggers)
+
+
 def build_edge_payload(decision: EdgeDecision, oracle_state: Dict = None) -> Dict:
     """Build the full payload to write to memcached."""
     payload = asdict(decision)
@@ -6,46 +6,267 @@ Computes derivatives that Virtuoso doesn't provide:
 - CVD acceleration (second derivative of cumulative volume delta)
 - Liquidation proximity (distance + velocity toward nearest cluster)
 
-All trackers use ring buffers and are fed by the enrichment reader.
+All trackers use preallocated NumPy ring buffers (RingBank rows) and are fed
+by the enrichment reader. Each row keeps running sums so the least-squares
+slope over the window is O(1) per update and query, and a bank holding many
+symbols answers slope/velocity/acceleration for all of them in one vector op.
 """
 
 import time
-from collections import deque
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 
 @dataclass
 class VelocityReading:
     """A single timestamped reading."""
+    __slots__ = ("timestamp", "value")
     timestamp: float
     value: float
 
 
-class ImbalanceVelocityTracker:
+class RingBank:
+    """Fixed-window (timestamp, value) ring buffers for many keys.
+
+    Readings live in preallocated (rows x window) NumPy arrays (doubled when
+    full) so all-row queries are vector gathers; per-row bookkeeping (head,
+    count, anchor, running sums of t, v, t*t and t*v) stays in plain lists so
+    a single update or query never pays NumPy scalar overhead. Timestamps are
+    stored relative to a per-row anchor; every REANCHOR_WRAPS wraps the anchor
+    moves to the oldest reading and the sums are recomputed exactly, which
+    bounds float drift at an amortized O(1) cost.
+    """
+
+    REANCHOR_WRAPS = 8
+
+    def __init__(self, window: int, capacity: int = 1):
+        self.window = window
+        self._rows: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._ts = np.zeros((max(1, capacity), window))
+        self._val = np.zeros((max(1, capacity), window))
+        self._ts_rows = list(self._ts)  # Cached row views (rebuilt when the arrays grow)
+        self._val_rows = list(self._val)
+        self._head: List[int] = []      # Next write slot
+        self._count: List[int] = []
+        self._wraps: List[int] = []
+        self._anchor: List[float] = []
+        self._sums: List[List[float]] = []  # [S_t, S_v, S_tt, S_tv]
+
+    def row(self, key: str) -> int:
+        """Row index for ``key``, allocating one on first use."""
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+        row = len(self._keys)
+        if row == len(self._ts):
+            self._ts = np.vstack([self._ts, np.zeros_like(self._ts)])
+            self._val = np.vstack([self._val, np.zeros_like(self._val)])
+            self._ts_rows = list(self._ts)
+            self._val_rows = list(self._val)
+        self._rows[key] = row
+        self._keys.append(key)
+        self._head.append(0)
+        self._count.append(0)
+        self._wraps.append(0)
+        self._anchor.append(0.0)
+        self._sums.append([0.0, 0.0, 0.0, 0.0])
+        return row
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def append(self, row: int, timestamp: float, value: float) -> None:
+        """Push one reading, evicting the oldest once the window is full (O(1))."""
+        head = self._head[row]
+        count = self._count[row]
+        if count == 0:
+            self._anchor[row] = timestamp
+        t = timestamp - self._anchor[row]
+        sums = self._sums[row]
+        ts_row, val_row = self._ts_rows[row], self._val_rows[row]
+        if count == self.window:
+            old_t, old_v = ts_row.item(head), val_row.item(head)
+            sums[0] += t - old_t
+            sums[1] += value - old_v
+            sums[2] += t * t - old_t * old_t
+            sums[3] += t * value - old_t * old_v
+        else:
+            self._count[row] = count + 1
+            sums[0] += t
+            sums[1] += value
+            sums[2] += t * t
+            sums[3] += t * value
+        ts_row[head] = t
+        val_row[head] = value
+        head += 1
+        if head == self.window:
+            head = 0
+            self._wraps[row] += 1
+            if self._wraps[row] % self.REANCHOR_WRAPS == 0:
+                self._reanchor(row)
+        self._head[row] = head
+
+    def _reanchor(self, row: int) -> None:
+        # Only called on wrap, when the row is full
+        ts, vals = self._ts_rows[row], self._val_rows[row]
+        shift = float(ts.min())
+        ts -= shift
+        self._anchor[row] += shift
+        self._sums[row] = [float(ts.sum()), float(vals.sum()), float(ts @ ts), float(ts @ vals)]
+
+    def count(self, row: int) -> int:
+        return self._count[row]
+
+    def _slot(self, row: int, back: int) -> int:
+        """Buffer slot of the reading ``back`` places before the newest (0 = newest)."""
+        return (self._head[row] - 1 - back) % self.window
+
+    def value(self, row: int, back: int = 0) -> float:
+        return self._val_rows[row].item(self._slot(row, back))
+
+    def timestamp(self, row: int, back: int = 0) -> float:
+        return self._ts_rows[row].item(self._slot(row, back)) + self._anchor[row]
+
+    def recent(self, row: int, k: int) -> Tuple[List[float], List[float]]:
+        """Last ``k`` (relative timestamps, values), oldest first; fewer if the row is short."""
+        k = min(k, self._count[row])
+        head, window = self._head[row], self.window
+        ts_row, val_row = self._ts_rows[row], self._val_rows[row]
+        slots = [(head - k + i) % window for i in range(k)]
+        return [ts_row.item(i) for i in slots], [val_row.item(i) for i in slots]
+
+    def readings(self, row: int) -> List[VelocityReading]:
+        """Oldest-first readings for a row (debug/status views)."""
+        n = self.count(row)
+        return [VelocityReading(self.timestamp(row, b), self.value(row, b)) for b in range(n - 1, -1, -1)]
+
+    # ---- per-row statistics (O(1)) ----
+
+    def rate(self, row: int, back: int) -> float:
+        """(v[-1] - v[-1-back]) / (t[-1] - t[-1-back]); 0 if too few readings or dt <= 0."""
+        if self._count[row] < back + 1:
+            return 0.0
+        new, old = self._slot(row, 0), self._slot(row, back)
+        ts_row, val_row = self._ts_rows[row], self._val_rows[row]
+        dt = ts_row.item(new) - ts_row.item(old)  # Same anchor, so relative dt is exact
+        if dt <= 0:
+            return 0.0
+        return (val_row.item(new) - val_row.item(old)) / dt
+
+    def slope(self, row: int) -> float:
+        """Least-squares slope of value vs time over the window (O(1) from running sums)."""
+        n = self._count[row]
+        if n < 2:
+            return 0.0
+        s_t, s_v, s_tt, s_tv = self._sums[row]
+        denom = n * s_tt - s_t * s_t
+        if denom <= 0:
+            return 0.0
+        return (n * s_tv - s_t * s_v) / denom
+
+    # ---- all rows at once ----
+
+    def _last(self, back: int) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(self._keys)
+        slots = (np.array(self._head, dtype=np.int64) - 1 - back) % self.window
+        rows = np.arange(n)
+        return self._ts[rows, slots], self._val[rows, slots]
+
+    def _counts(self) -> np.ndarray:
+        return np.array(self._count, dtype=np.int64)
+
+    def rates(self, back: int) -> np.ndarray:
+        """rate(row, back) for every row."""
+        t1, v1 = self._last(0)
+        t0, v0 = self._last(back)
+        dt = t1 - t0
+        ok = (self._counts() >= back + 1) & (dt > 0)
+        return np.where(ok, (v1 - v0) / np.where(ok, dt, 1.0), 0.0)
+
+    def slopes(self) -> np.ndarray:
+        """slope(row) for every row."""
+        if not self._keys:
+            return np.zeros(0)
+        n = self._counts().astype(float)
+        s_t, s_v, s_tt, s_tv = np.array(self._sums).T
+        denom = n * s_tt - s_t * s_t
+        ok = (n >= 2) & (denom > 0)
+        return np.where(ok, (n * s_tv - s_t * s_v) / np.where(ok, denom, 1.0), 0.0)
+
+    def accelerations(self) -> np.ndarray:
+        """Second difference of the last three readings per row (see CVDAccelerationTracker)."""
+        t2, v2 = self._last(0)
+        t1, v1 = self._last(1)
+        t0, v0 = self._last(2)
+        dt1, dt0 = t2 - t1, t1 - t0
+        avg_dt = (t2 - t0) / 2
+        ok = (self._counts() >= 3) & (dt1 > 0) & (dt0 > 0) & (avg_dt > 0)
+        one = np.ones_like(dt1)
+        vel1 = (v2 - v1) / np.where(ok, dt1, one)
+        vel0 = (v1 - v0) / np.where(ok, dt0, one)
+        return np.where(ok, (vel1 - vel0) / np.where(ok, avg_dt, one), 0.0)
+
+    def latest(self, default: float = 0.0) -> np.ndarray:
+        """Newest value per row (``default`` for empty rows)."""
+        _, v = self._last(0)
+        return np.where(self._counts() > 0, v, default)
+
+
+class _BankTracker:
+    """A tracker backed by one RingBank row (private bank unless one is shared)."""
+
+    __slots__ = ("_bank", "_row")
+
+    def __init__(self, window_size: int, bank: Optional[RingBank] = None, key: str = ""):
+        self._bank = bank if bank is not None else RingBank(window_size)
+        self._row = self._bank.row(key)
+
+    def _push(self, value: float, ts: Optional[float]) -> None:
+        self._bank.append(self._row, time.time() if ts is None else ts, value)
+
+    def _latest(self, default: float) -> float:
+        return self._bank.value(self._row) if self._bank.count(self._row) else default
+
+    @property
+    def slope(self) -> float:
+        """Least-squares rate of change per second over the whole window."""
+        return self._bank.slope(self._row)
+
+    @property
+    def samples(self) -> int:
+        return self._bank.count(self._row)
+
+
+class ImbalanceVelocityTracker(_BankTracker):
     """Tracks rate-of-change of orderbook bid/ask imbalance ratio.
 
     Imbalance ratio = bid_depth / ask_depth
     Velocity = how fast the ratio is changing (positive = bids growing faster)
     """
 
-    def __init__(self, window_size: int = 12):
+    __slots__ = ()
+
+    def __init__(self, window_size: int = 12, bank: Optional[RingBank] = None, key: str = ""):
         # 12 readings at ~15s intervals = 3 min window
-        self._readings: deque[VelocityReading] = deque(maxlen=window_size)
+        super().__init__(window_size, bank, key)
 
-    def update(self, bid_depth: float, ask_depth: float) -> None:
+    def update(self, bid_depth: float, ask_depth: float, ts: Optional[float] = None) -> None:
         """Record a new orderbook depth reading."""
         if ask_depth <= 0:
             return
-        ratio = bid_depth / ask_depth
-        self._readings.append(VelocityReading(time.time(), ratio))
+        self._push(bid_depth / ask_depth, ts)
 
     @property
     def current_ratio(self) -> float:
         """Current bid/ask imbalance ratio."""
-        if not self._readings:
-            return 1.0
-        return self._readings[-1].value
+        return self._latest(1.0)
 
     @property
     def velocity(self) -> float:
@@ -54,14 +275,7 @@ class ImbalanceVelocityTracker:
         Positive = bids strengthening relative to asks (bullish)
         Negative = asks strengthening relative to bids (bearish)
         """
-        if len(self._readings) < 3:
-            return 0.0
-        recent = self._readings[-1]
-        older = self._readings[-3]  # ~45s ago at 15s intervals
-        dt = recent.timestamp - older.timestamp
-        if dt <= 0:
-            return 0.0
-        return (recent.value - older.value) / dt
+        return self._bank.rate(self._row, 2)  # vs. ~45s ago at 15s intervals
 
     @property
     def is_cliff(self) -> bool:
@@ -77,12 +291,8 @@ class ImbalanceVelocityTracker:
             return "DOWN"
         return None
 
-    @property
-    def samples(self) -> int:
-        return len(self._readings)
-
 
-class CVDAccelerationTracker:
+class CVDAccelerationTracker(_BankTracker):
     """Tracks first and second derivatives of Cumulative Volume Delta.
 
     CVD velocity = buying/selling momentum (first derivative)
@@ -90,29 +300,23 @@ class CVDAccelerationTracker:
     Positive acceleration with flat price = hidden accumulation
     """
 
-    def __init__(self, window_size: int = 12):
-        self._readings: deque[VelocityReading] = deque(maxlen=window_size)
+    __slots__ = ()
+
+    def __init__(self, window_size: int = 12, bank: Optional[RingBank] = None, key: str = ""):
+        super().__init__(window_size, bank, key)
 
-    def update(self, cvd_level: float) -> None:
+    def update(self, cvd_level: float, ts: Optional[float] = None) -> None:
         """Record a new CVD level reading."""
-        self._readings.append(VelocityReading(time.time(), cvd_level))
+        self._push(cvd_level, ts)
 
     @property
     def current_level(self) -> float:
-        if not self._readings:
-            return 0.0
-        return self._readings[-1].value
+        return self._latest(0.0)
 
     @property
     def velocity(self) -> float:
         """First derivative: CVD change per second."""
-        if len(self._readings) < 2:
-            return 0.0
-        r = self._readings
-        dt = r[-1].timestamp - r[-2].timestamp
-        if dt <= 0:
-            return 0.0
-        return (r[-1].value - r[-2].value) / dt
+        return self._bank.rate(self._row, 1)
 
     @property
     def acceleration(self) -> float:
@@ -121,16 +325,16 @@ class CVDAccelerationTracker:
         Positive = buying pressure increasing
         Negative = selling pressure increasing
         """
-        if len(self._readings) < 3:
+        if self.samples < 3:
             return 0.0
-        r = self._readings
-        dt1 = r[-1].timestamp - r[-2].timestamp
-        dt0 = r[-2].timestamp - r[-3].timestamp
+        (t0, t1, t2), (x0, x1, x2) = self._bank.recent(self._row, 3)
+        dt1 = t2 - t1
+        dt0 = t1 - t0
         if dt1 <= 0 or dt0 <= 0:
             return 0.0
-        v1 = (r[-1].value - r[-2].value) / dt1
-        v0 = (r[-2].value - r[-3].value) / dt0
-        avg_dt = (r[-1].timestamp - r[-3].timestamp) / 2
+        v1 = (x2 - x1) / dt1
+        v0 = (x1 - x0) / dt0
+        avg_dt = (t2 - t0) / 2
         if avg_dt <= 0:
             return 0.0
         return (v1 - v0) / avg_dt
@@ -151,31 +355,27 @@ class CVDAccelerationTracker:
             return True  # Price down but net buying
         return False
 
-    @property
-    def samples(self) -> int:
-        return len(self._readings)
-
 
-class LiquidationProximityTracker:
+class LiquidationProximityTracker(_BankTracker):
     """Tracks price distance and velocity toward liquidation clusters.
 
     Combines Virtuoso's liquidation zone map with real-time price
     to detect when a cascade is mechanically imminent.
     """
 
-    def __init__(self, price_window: int = 30):
+    __slots__ = ()
+
+    def __init__(self, price_window: int = 30, bank: Optional[RingBank] = None, key: str = ""):
         # 30 readings at ~1s from Binance ticks
-        self._price_history: deque[VelocityReading] = deque(maxlen=price_window)
+        super().__init__(price_window, bank, key)
 
-    def update_price(self, price: float) -> None:
+    def update_price(self, price: float, ts: Optional[float] = None) -> None:
         """Record a price tick."""
-        self._price_history.append(VelocityReading(time.time(), price))
+        self._push(price, ts)
 
     @property
     def current_price(self) -> float:
-        if not self._price_history:
-            return 0.0
-        return self._price_history[-1].value
+        return self._latest(0.0)
 
     def nearest_cluster(self, zones: list, min_size_usd: float = 10_000_000) -> Optional[dict]:
         """Find the nearest liquidation cluster to current price.
@@ -184,7 +384,7 @@ class LiquidationProximityTracker:
             zones: List of zone dicts from Virtuoso (with 'price' and 'size'/'volume' keys)
             min_size_usd: Minimum cluster size to consider (default $10M)
         """
-        if not self._price_history or not zones:
+        if not self.samples or not zones:
             return None
 
         current = self.current_price
@@ -216,19 +416,12 @@ class LiquidationProximityTracker:
 
         Uses last 5 readings (~5s window) for responsive velocity.
         """
-        if len(self._price_history) < 5:
-            return 0.0
-        recent = self._price_history[-1]
-        older = self._price_history[-5]
-        dt = recent.timestamp - older.timestamp
-        if dt <= 0:
-            return 0.0
-        price_delta = recent.value - older.value
+        rate = self._bank.rate(self._row, 4)
         # Positive velocity = moving toward target
-        if target_price > recent.value:
-            return price_delta / dt     # Price going up = approaching target above
+        if target_price > self.current_price:
+            return rate     # Price going up = approaching target above
         else:
-            return -price_delta / dt    # Price going down = approaching target below
+            return -rate    # Price going down = approaching target below
 
     def eta_seconds(self, target_price: float) -> Optional[float]:
         """Estimated time to reach target at current velocity.
@@ -269,9 +462,54 @@ class LiquidationProximityTracker:
         cluster["approaching"] = True
         return cluster
 
-    @property
-    def samples(self) -> int:
-        return len(self._price_history)
+
+class SymbolVelocityTrackers:
+    """Imbalance, CVD and price trackers for many symbols over shared RingBanks.
+
+    ``trackers(symbol)`` returns the dict evaluate_edge expects for one symbol;
+    ``snapshot()`` computes every symbol's statistics in vectorized passes.
+    """
+
+    def __init__(self, imbalance_window: int = 12, cvd_window: int = 12, price_window: int = 30,
+                 capacity: int = 16):
+        self.imbalance = RingBank(imbalance_window, capacity)
+        self.cvd = RingBank(cvd_window, capacity)
+        self.price = RingBank(price_window, capacity)
+        self._trackers: Dict[str, Dict[str, _BankTracker]] = {}
+
+    def trackers(self, symbol: str) -> Dict[str, _BankTracker]:
+        found = self._trackers.get(symbol)
+        if found is None:
+            found = self._trackers[symbol] = {
+                "imbalance": ImbalanceVelocityTracker(bank=self.imbalance, key=symbol),
+                "cvd": CVDAccelerationTracker(bank=self.cvd, key=symbol),
+                "liquidation": LiquidationProximityTracker(bank=self.price, key=symbol),
+            }
+        return found
+
+    def __len__(self) -> int:
+        return len(self._trackers)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-symbol velocity/acceleration/slope for every tracked symbol."""
+        imb, cvd, px = self.imbalance, self.cvd, self.price
+        columns = {
+            "imbalance_ratio": (imb, imb.latest(default=1.0)),
+            "imbalance_velocity": (imb, imb.rates(2)),
+            "imbalance_slope": (imb, imb.slopes()),
+            "cvd_level": (cvd, cvd.latest()),
+            "cvd_velocity": (cvd, cvd.rates(1)),
+            "cvd_acceleration": (cvd, cvd.accelerations()),
+            "cvd_slope": (cvd, cvd.slopes()),
+            "price": (px, px.latest()),
+            "price_velocity": (px, px.rates(4)),
+            "price_slope": (px, px.slopes()),
+        }
+        out = {symbol: {} for symbol in self._trackers}
+        for col, (bank, values) in columns.items():
+            for symbol, value in zip(bank.keys, values.tolist()):
+                out[symbol][col] = value
+        return out
 
 
 if __name__ == "__main__":
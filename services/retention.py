@@ -0,0 +1,493 @@
+"""
+Retention — hot windows, rollups and Parquet archival for shadow_trades.db
+
+Every service appends time series to the one shared SQLite file. Without
+retention those tables grow forever, WAL checkpoints slow down and every
+unindexed scan gets worse. Per table:
+
+1. Rows newer than the policy's hot window stay in SQLite untouched.
+2. Older rows are exported to Parquet under data/archive/<table>/month=YYYY-MM/
+   (hive-partitioned, readable with DuckDB via archive_source()).
+3. The same rows are folded into <table>_rollup (hourly mean + OHLC by key)
+   and deleted, in one SQLite transaction per chunk.
+4. Freed pages are returned with PRAGMA incremental_vacuum and the WAL is
+   truncated.
+
+Rows are only deleted after their Parquet file is on disk, so without
+DuckDB/pandas installed nothing is removed. Hot windows can be overridden in
+config/retention.json: {"signal_snapshots": {"hot_days": 30}, "alpha_snapshots": {"enabled": false}}
+
+Run via: python services/retention.py [run|dry-run|report|vacuum|enable-incremental-vacuum]
+Scheduled daily by services/scheduler.py.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import duckdb
+    import pandas as pd
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+logger = logging.getLogger("retention")
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DB_PATH = PROJECT_ROOT / "storage" / "shadow_trades.db"
+ARCHIVE_DIR = PROJECT_ROOT / "data" / "archive"
+CONFIG_PATH = PROJECT_ROOT / "config" / "retention.json"
+
+CHUNK_ROWS = 20_000            # Rows per archive/rollup/delete transaction
+VACUUM_PAGES = 20_000          # Pages freed per incremental_vacuum call (~80MB at 4KB pages)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    table: str
+    time_column: str
+    time_format: str                  # "epoch" (REAL seconds) | "iso" (isoformat TEXT)
+    hot_days: float
+    keys: Tuple[str, ...] = ()        # Rollup group-by columns
+    values: Tuple[str, ...] = ()      # Columns averaged per bucket
+    ohlc: Optional[str] = None        # Column tracked as open/high/low/close
+    rollup_seconds: int = 3600
+    cold_filter: Optional[str] = None  # Extra WHERE clause rows must satisfy to leave SQLite
+    enabled: bool = True
+
+
+POLICIES: Dict[str, RetentionPolicy] = {p.table: p for p in [
+    RetentionPolicy(
+        "hf_divergence_snapshots", "snapshot_at", "iso", hot_days=14,
+        keys=("asset",), values=("divergence_pct", "oracle_age_seconds"), ohlc="binance_price",
+    ),
+    RetentionPolicy(
+        "hf_signal_snapshots", "snapshot_at", "iso", hot_days=30,
+        keys=("asset", "fusion_direction"), values=("fusion_score", "fusion_confidence"),
+    ),
+    RetentionPolicy(
+        "hf_latency_events", "detected_at", "iso", hot_days=30,
+        keys=("asset", "direction"), values=("divergence_pct",), ohlc="binance_price",
+    ),
+    # volume_spike_detector / price_momentum_filter look back at most 48h
+    RetentionPolicy(
+        "signal_snapshots", "ts", "epoch", hot_days=14,
+        keys=("market_id",), values=("confidence", "volume"), ohlc="price",
+    ),
+    # IC windows are 30 days; unresolved predictions must stay for resolution. The IC tracker
+    # and calibrator read older history from prediction_stats / prediction_decay_stats
+    RetentionPolicy(
+        "signal_predictions", "timestamp", "epoch", hot_days=90,
+        keys=("source",), values=("confidence", "outcome"), cold_filter="resolved = 1",
+    ),
+    RetentionPolicy(
+        "alpha_snapshots", "timestamp", "epoch", hot_days=30,
+        keys=("symbol",), values=("confluence_score", "technical", "volume", "orderflow", "sentiment"), ohlc="price",
+    ),
+    RetentionPolicy(
+        "price_snapshots", "timestamp", "epoch", hot_days=30,
+        keys=("symbol",), values=("volume_24h",), ohlc="price",
+    ),
+]}
+
+
+def _get_db(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path or DB_PATH), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=10000")
+    return conn
+
+
+def load_policies(config_path: Optional[Path] = None) -> Dict[str, RetentionPolicy]:
+    """Default policies with per-table overrides from config/retention.json applied."""
+    policies = dict(POLICIES)
+    path = config_path or CONFIG_PATH
+    if not path.exists():
+        return policies
+    try:
+        overrides = json.loads(path.read_text())
+    except Exception as e:
+        logger.warning("Ignoring unreadable %s: %s", path, e)
+        return policies
+    for table, fields in overrides.items():
+        if table in policies and isinstance(fields, dict):
+            allowed = {k: v for k, v in fields.items() if k in ("hot_days", "rollup_seconds", "enabled")}
+            policies[table] = replace(policies[table], **allowed)
+    return policies
+
+
+def archive_source(table: str, archive_dir: Optional[Path] = None) -> str:
+    """DuckDB table expression over a table's archived partitions.
+
+    Usage: duckdb.sql(f"SELECT * FROM {archive_source('signal_snapshots')} WHERE month >= '2026-01'")
+    """
+    root = (archive_dir or ARCHIVE_DIR) / table
+    return f"read_parquet('{root}/**/*.parquet', hive_partitioning = true, union_by_name = true)"
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone() is not None
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def _to_epoch(value, time_format: str) -> Optional[float]:
+    if value is None:
+        return None
+    if time_format == "epoch":
+        return float(value)
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _cutoff_value(policy: RetentionPolicy, now: float):
+    cutoff = now - policy.hot_days * 86400
+    if policy.time_format == "epoch":
+        return cutoff
+    return datetime.fromtimestamp(cutoff, tz=timezone.utc).isoformat()
+
+
+def _cold_where(policy: RetentionPolicy) -> str:
+    where = f"{policy.time_column} IS NOT NULL AND {policy.time_column} < ?"
+    if policy.cold_filter:
+        where += f" AND ({policy.cold_filter})"
+    return where
+
+
+def _db_size(db_path: Path) -> Dict[str, int]:
+    wal = Path(str(db_path) + "-wal")
+    return {
+        "db_bytes": db_path.stat().st_size if db_path.exists() else 0,
+        "wal_bytes": wal.stat().st_size if wal.exists() else 0,
+    }
+
+
+# ============================================================================
+# Rollups
+# ============================================================================
+
+def _rollup_table(policy: RetentionPolicy) -> str:
+    return f"{policy.table}_rollup"
+
+
+def _ensure_rollup_table(conn: sqlite3.Connection, policy: RetentionPolicy):
+    cols = ["bucket_start REAL NOT NULL"]
+    cols += [f"{k} TEXT" for k in policy.keys]
+    cols += ["n INTEGER NOT NULL"]
+    for v in policy.values:
+        cols += [f"{v}_mean REAL", f"{v}_n INTEGER DEFAULT 0"]
+    if policy.ohlc:
+        cols += ["open REAL", "high REAL", "low REAL", "close REAL", "open_ts REAL", "close_ts REAL"]
+    pk = ", ".join(("bucket_start",) + policy.keys)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {_rollup_table(policy)} ({', '.join(cols)}, PRIMARY KEY ({pk}))")
+
+
+def _aggregate(rows: List[sqlite3.Row], policy: RetentionPolicy) -> Dict[tuple, dict]:
+    """Bucket rows by (bucket_start, *keys) into counts, means and OHLC."""
+    buckets: Dict[tuple, dict] = {}
+    for row in rows:
+        ts = _to_epoch(row[policy.time_column], policy.time_format)
+        if ts is None:
+            continue
+        bucket_start = ts - ts % policy.rollup_seconds
+        key = (bucket_start,) + tuple(None if row[k] is None else str(row[k]) for k in policy.keys)
+        b = buckets.get(key)
+        if b is None:
+            b = buckets[key] = {"n": 0, "values": {v: [0.0, 0] for v in policy.values}, "ohlc": None}
+        b["n"] += 1
+        for v in policy.values:
+            if row[v] is not None:
+                b["values"][v][0] += row[v]
+                b["values"][v][1] += 1
+        if policy.ohlc and row[policy.ohlc] is not None:
+            _merge_ohlc(b, [ts, row[policy.ohlc], row[policy.ohlc], row[policy.ohlc], ts, row[policy.ohlc]])
+    return buckets
+
+
+def _merge_ohlc(bucket: dict, other: Optional[list]):
+    """Merge [open_ts, open, high, low, close_ts, close] into bucket["ohlc"]."""
+    if other is None:
+        return
+    cur = bucket["ohlc"]
+    if cur is None:
+        bucket["ohlc"] = list(other)
+        return
+    if other[0] < cur[0]:
+        cur[0], cur[1] = other[0], other[1]
+    cur[2] = max(cur[2], other[2])
+    cur[3] = min(cur[3], other[3])
+    if other[4] >= cur[4]:
+        cur[4], cur[5] = other[4], other[5]
+
+
+def _upsert_rollups(conn: sqlite3.Connection, policy: RetentionPolicy, buckets: Dict[tuple, dict]):
+    """Merge aggregated buckets into the rollup table. Caller commits."""
+    table = _rollup_table(policy)
+    key_cols = ("bucket_start",) + policy.keys
+    match = " AND ".join(f"{c} IS ?" for c in key_cols)
+
+    for key, b in buckets.items():
+        existing = conn.execute(f"SELECT * FROM {table} WHERE {match}", key).fetchone()
+        if existing:
+            b["n"] += existing["n"]
+            for v in policy.values:
+                if existing[f"{v}_n"]:
+                    b["values"][v][0] += existing[f"{v}_mean"] * existing[f"{v}_n"]
+                    b["values"][v][1] += existing[f"{v}_n"]
+            if policy.ohlc and existing["open_ts"] is not None:
+                _merge_ohlc(b, [existing["open_ts"], existing["open"], existing["high"], existing["low"],
+                                existing["close_ts"], existing["close"]])
+            conn.execute(f"DELETE FROM {table} WHERE {match}", key)
+
+        cols = list(key_cols) + ["n"]
+        vals = list(key) + [b["n"]]
+        for v in policy.values:
+            total, count = b["values"][v]
+            cols += [f"{v}_mean", f"{v}_n"]
+            vals += [total / count if count else None, count]
+        if policy.ohlc and b["ohlc"]:
+            open_ts, o, h, lo, close_ts, c = b["ohlc"]
+            cols += ["open", "high", "low", "close", "open_ts", "close_ts"]
+            vals += [o, h, lo, c, open_ts, close_ts]
+        conn.execute(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", vals)
+
+
+# ============================================================================
+# Archival
+# ============================================================================
+
+def _write_parquet(rows: List[sqlite3.Row], columns: List[str], policy: RetentionPolicy,
+                   archive_dir: Path) -> List[str]:
+    """Write rows as one Parquet file per month partition. Returns written paths.
+
+    Files are named by id range so a retried chunk overwrites instead of duplicating.
+    """
+    by_month: Dict[str, list] = {}
+    for row in rows:
+        ts = _to_epoch(row[policy.time_column], policy.time_format) or 0
+        month = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m")
+        by_month.setdefault(month, []).append(tuple(row))
+
+    written = []
+    con = duckdb.connect()
+    try:
+        for month, month_rows in by_month.items():
+            part_dir = archive_dir / policy.table / f"month={month}"
+            part_dir.mkdir(parents=True, exist_ok=True)
+            ids = [r[columns.index("id")] for r in month_rows]
+            path = part_dir / f"{policy.table}-{min(ids)}-{max(ids)}.parquet"
+            tmp = path.with_suffix(".parquet.tmp")
+            frame = pd.DataFrame.from_records(month_rows, columns=columns)
+            con.register("chunk", frame)
+            con.execute(f"COPY (SELECT * FROM chunk) TO '{tmp}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+            con.unregister("chunk")
+            os.replace(tmp, path)
+            written.append(str(path))
+    finally:
+        con.close()
+    return written
+
+
+def apply_policy(conn: sqlite3.Connection, policy: RetentionPolicy, now: Optional[float] = None,
+                 dry_run: bool = False, archive_dir: Optional[Path] = None) -> dict:
+    """Archive, roll up and delete one table's rows older than its hot window."""
+    result = {"table": policy.table, "cold_rows": 0, "archived": 0, "rolled_up_buckets": 0, "files": []}
+    if not policy.enabled:
+        result["skipped"] = "disabled"
+        return result
+    if not _table_exists(conn, policy.table):
+        result["skipped"] = "missing table"
+        return result
+
+    columns = _columns(conn, policy.table)
+    needed = {"id", policy.time_column, *policy.keys, *policy.values} | ({policy.ohlc} if policy.ohlc else set())
+    missing = needed - set(columns)
+    if missing:
+        result["skipped"] = f"missing columns: {sorted(missing)}"
+        return result
+
+    where = _cold_where(policy)
+    cutoff = _cutoff_value(policy, now or time.time())
+    result["cold_rows"] = conn.execute(f"SELECT COUNT(*) FROM {policy.table} WHERE {where}", (cutoff,)).fetchone()[0]
+    if dry_run or result["cold_rows"] == 0:
+        return result
+    if not HAS_PARQUET:
+        result["skipped"] = "duckdb/pandas not installed — rows kept"
+        logger.warning("Retention: %s has %d cold rows but Parquet export is unavailable", policy.table, result["cold_rows"])
+        return result
+
+    _ensure_rollup_table(conn, policy)
+    conn.commit()
+    archive_dir = archive_dir or ARCHIVE_DIR
+    last_id = 0
+
+    while True:
+        rows = conn.execute(
+            f"SELECT * FROM {policy.table} WHERE {where} AND id > ? ORDER BY id LIMIT ?",
+            (cutoff, last_id, CHUNK_ROWS),
+        ).fetchall()
+        if not rows:
+            break
+        first_id, last_id = rows[0]["id"], rows[-1]["id"]
+
+        # Parquet first: rows leave SQLite only once they exist on disk elsewhere
+        result["files"] += _write_parquet(rows, columns, policy, archive_dir)
+        buckets = _aggregate(rows, policy)
+        _upsert_rollups(conn, policy, buckets)
+        conn.execute(f"DELETE FROM {policy.table} WHERE id BETWEEN ? AND ? AND {where}", (first_id, last_id, cutoff))
+        conn.commit()
+
+        result["archived"] += len(rows)
+        result["rolled_up_buckets"] += len(buckets)
+
+    logger.info("Retention: %s archived=%d buckets=%d files=%d",
+                policy.table, result["archived"], result["rolled_up_buckets"], len(result["files"]))
+    return result
+
+
+# ============================================================================
+# Vacuum + reporting
+# ============================================================================
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> dict:
+    """One-time switch to auto_vacuum=INCREMENTAL. Needs a full VACUUM (locks the DB), so run it manually."""
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode == 2:
+        return {"auto_vacuum": "incremental", "changed": False}
+    started = time.time()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return {"auto_vacuum": "incremental", "changed": True, "vacuum_seconds": round(time.time() - started, 2)}
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: int = VACUUM_PAGES) -> dict:
+    """Return up to `pages` free pages to the OS and truncate the WAL."""
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    freelist_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if mode == 2:
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+    checkpoint = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    result = {
+        "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}.get(mode, str(mode)),
+        "freelist_before": freelist_before,
+        "freelist_after": conn.execute("PRAGMA freelist_count").fetchone()[0],
+        "wal_checkpoint_busy": bool(checkpoint[0]) if checkpoint else None,
+    }
+    if mode != 2 and freelist_before:
+        result["note"] = "auto_vacuum is not incremental — run `enable-incremental-vacuum` once to reclaim free pages"
+    return result
+
+
+def _probe_latency(conn: sqlite3.Connection, policies: Dict[str, RetentionPolicy]) -> Dict[str, dict]:
+    """Time a full count and a recent-window query per table (ms)."""
+    probes = {}
+    now = time.time()
+    for policy in policies.values():
+        if not _table_exists(conn, policy.table):
+            continue
+        started = time.perf_counter()
+        rows = conn.execute(f"SELECT COUNT(*) FROM {policy.table}").fetchone()[0]
+        count_ms = (time.perf_counter() - started) * 1000
+        recent = replace(policy, hot_days=1, cold_filter=None)
+        started = time.perf_counter()
+        conn.execute(
+            f"SELECT COUNT(*) FROM {policy.table} WHERE {policy.time_column} >= ?", (_cutoff_value(recent, now),)
+        ).fetchone()
+        probes[policy.table] = {
+            "rows": rows,
+            "count_ms": round(count_ms, 2),
+            "last_day_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+    return probes
+
+
+def report(db_path: Optional[Path] = None, policies: Optional[Dict[str, RetentionPolicy]] = None) -> dict:
+    """Current file sizes, page stats and per-table probe latency."""
+    db_path = Path(db_path or DB_PATH)
+    policies = policies or load_policies()
+    conn = _get_db(db_path)
+    try:
+        return {
+            **_db_size(db_path),
+            "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+            "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+            "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+            "tables": _probe_latency(conn, policies),
+        }
+    finally:
+        conn.close()
+
+
+def run_retention(db_path: Optional[Path] = None, dry_run: bool = False, now: Optional[float] = None,
+                  policies: Optional[Dict[str, RetentionPolicy]] = None,
+                  archive_dir: Optional[Path] = None) -> dict:
+    """Apply every policy, vacuum, and report sizes and probe latency before and after."""
+    db_path = Path(db_path or DB_PATH)
+    policies = policies or load_policies()
+    started = time.time()
+    before = report(db_path, policies)
+
+    conn = _get_db(db_path)
+    try:
+        tables = [apply_policy(conn, p, now=now, dry_run=dry_run, archive_dir=archive_dir) for p in policies.values()]
+        vacuum = None if dry_run else incremental_vacuum(conn)
+    finally:
+        conn.close()
+
+    after = before if dry_run else report(db_path, policies)
+    result = {
+        "dry_run": dry_run,
+        "duration_s": round(time.time() - started, 2),
+        "tables": tables,
+        "vacuum": vacuum,
+        "before": before,
+        "after": after,
+        "bytes_freed": before["db_bytes"] + before["wal_bytes"] - after["db_bytes"] - after["wal_bytes"],
+    }
+    logger.info("Retention %s: %d rows archived, %.1f MB → %.1f MB in %.1fs",
+                "dry-run" if dry_run else "run", sum(t["archived"] for t in tables),
+                (before["db_bytes"] + before["wal_bytes"]) / 1e6, (after["db_bytes"] + after["wal_bytes"]) / 1e6,
+                result["duration_s"])
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "report"
+
+    if cmd == "run":
+        print(json.dumps(run_retention(), indent=2))
+    elif cmd == "dry-run":
+        print(json.dumps(run_retention(dry_run=True), indent=2))
+    elif cmd == "report":
+        print(json.dumps(report(), indent=2))
+    elif cmd == "vacuum":
+        db = _get_db()
+        print(json.dumps(incremental_vacuum(db), indent=2))
+        db.close()
+    elif cmd == "enable-incremental-vacuum":
+        db = _get_db()
+        print(json.dumps(enable_incremental_vacuum(db), indent=2))
+        db.close()
+    else:
+        print("Usage: retention.py [run|dry-run|report|vacuum|enable-incremental-vacuum]")
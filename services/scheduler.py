@@ -6,7 +6,7 @@ Persistent asyncio service that orchestrates all periodic tasks:
 - 5min:  health check, paper resolution, shadow resolution, weather reeval, alerts, calibration
 - 30min: signal scans (category, weather, tweets), edge alerts, source_health touch
 - 6h:    arena snapshots
-- daily:  Discord summary (22:00 UTC)
+- daily:  Discord summary (22:00 UTC), DB retention + incremental vacuum (04:00 UTC)
 - weekly: Discord recap + scorecard (Sunday 23:50 UTC)
 
 Replaces: /usr/local/bin/polyclawd-watchdog.sh (v12, 556 lines bash)
@@ -53,6 +53,7 @@ _state = {
     "weekly_sent": None,           # year+week string
     "scorecard_sent": None,        # year+week string
     "milestone_sent": {},          # strategy → bool
+    "retention_run": None,         # date string
 }
 
 
@@ -568,6 +569,22 @@ def task_weekly_recap():
     logger.info("Weekly Discord recap sent")
 
 
+def task_retention():
+    """Archive/roll up old time-series rows and vacuum shadow_trades.db (04:00 UTC)."""
+    today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    if _state["retention_run"] == today:
+        return
+
+    from services.retention import run_retention
+
+    result = run_retention()
+    _state["retention_run"] = today
+    logger.info(
+        "Retention: %d rows archived, %.1f MB freed",
+        sum(t["archived"] for t in result["tables"]), result["bytes_freed"] / 1e6,
+    )
+
+
 # ============================================================================
 # Scheduler loop
 # ============================================================================
@@ -626,6 +643,10 @@ async def tick_scheduled():
         if now.hour == 22:
             await run_in_thread(_run_safe, "daily_summary", task_daily_discord_summary)
 
+        # Retention + vacuum at 04:xx UTC (quietest window)
+        if now.hour == 4:
+            await run_in_thread(_run_safe, "retention", task_retention)
+
         # Weekly recap: Sunday 23:xx UTC
         if now.weekday() == 6 and now.hour == 23:
             await run_in_thread(_run_safe, "weekly_recap", task_weekly_recap)
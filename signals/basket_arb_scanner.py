@@ -6,14 +6,20 @@ meaning buying all outcomes guarantees profit.
 
 This is the #1 profitable pattern on Polymarket per X/Twitter alpha.
 
+BasketEngine keeps per-event running sums so a single outcome price change
+is O(1) and arb/compression events fire only when a threshold is crossed;
+it can be fed Gamma snapshots (sync_events) or a recorded price stream
+(replay).
+
 Signal source for Polyclawd pipeline.
 """
 
 import json
 import logging
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
@@ -29,6 +35,10 @@ MIN_MARKET_LIQUIDITY = 1000     # Minimum per-outcome liquidity
 POLYMARKET_FEE_PCT = 2.0        # ~2% fee on winnings (conservative estimate)
 MAX_OUTCOMES = 30               # Skip events with too many outcomes (liquidity spread thin)
 MIN_OUTCOMES = 2                # Need at least 2 outcomes
+COMPRESSION_SPREAD = 0.02       # |1 - YES - NO| under 2¢ = compressed
+COMPRESSION_MIN_MARKETS = 5     # Pause needs >5 compressed markets...
+COMPRESSION_RATIO = 0.5         # ...and more than half of those checked
+COMPRESSION_WINDOW_MIN = 10     # ...held for this long
 
 # Cache
 _cache: Dict = {"data": None, "timestamp": 0}
@@ -74,6 +84,369 @@ def _get_outcome_prices(market: Dict) -> Tuple[Optional[float], Optional[float]]
         return None, None
 
 
+def _net_profit_pct(total_cost: float) -> Tuple[float, float]:
+    """(gross, net) profit % for paying total_cost for a $1 payout."""
+    gross = ((1.0 - total_cost) / total_cost) * 100 if total_cost > 0 else 0
+    return gross, gross - POLYMARKET_FEE_PCT
+
+
+def _in_band(net_profit_pct: float) -> bool:
+    return MIN_ARB_EDGE_PCT <= net_profit_pct <= MAX_ARB_EDGE_PCT
+
+
+# Prices are summed as integer micro-dollars so running sums never drift
+_MICROS = 1_000_000
+
+
+def _micros(price: Optional[float]) -> Optional[int]:
+    return None if price is None else int(round(price * _MICROS))
+
+
+class _Outcome:
+    __slots__ = ("market_id", "question", "volume", "active", "yes", "no", "in_arb", "compressed")
+
+    def __init__(self, market_id: str, question: str, volume: float, active: bool):
+        self.market_id = market_id
+        self.question = question
+        self.volume = volume
+        self.active = active
+        self.yes = self.no = None  # Micro-dollars
+        self.in_arb = False
+        self.compressed = False
+
+
+class _Basket:
+    __slots__ = ("event_id", "title", "volume", "vol24h", "neg_risk", "eligible", "outcomes",
+                 "n_active", "sum_yes", "n_yes")
+
+    def __init__(self, event: Dict):
+        self.event_id = str(event.get("id", ""))
+        self.title = event.get("title", "")
+        self.volume = float(event.get("volume", 0) or 0)
+        self.vol24h = float(event.get("volume24hr", 0) or 0)
+        self.neg_risk = bool(event.get("negRisk") or event.get("enableNegRisk"))
+        self.outcomes: Dict[str, _Outcome] = {}
+        for m in event.get("markets", []):
+            mid = m.get("conditionId", "") or str(m.get("id", ""))
+            self.outcomes[mid] = _Outcome(mid, m.get("question", ""), float(m.get("volume", 0) or 0),
+                                          bool(m.get("active") and not m.get("closed")))
+        self.n_active = sum(1 for o in self.outcomes.values() if o.active)
+        self.eligible = (
+            bool(self.outcomes)
+            and (self.volume >= MIN_EVENT_VOLUME or self.vol24h >= MIN_EVENT_VOLUME)
+            and MIN_OUTCOMES <= self.n_active <= MAX_OUTCOMES
+        )
+        self.sum_yes = self.n_yes = 0
+
+    def structure(self) -> tuple:
+        return tuple((mid, o.active) for mid, o in self.outcomes.items())
+
+
+class BasketEngine:
+    """Incremental sum-to-one arbitrage state over many multi-outcome events.
+
+    Each event keeps a running sum of its active outcomes' YES prices, so
+    ``update`` is O(1) per outcome price change. Arb and
+    compression events are emitted only on threshold crossings:
+
+    - ``basket_arb``: neg-risk event whose YES asks sum below $1 (net of fees)
+    - ``yes_no_arb``: single market with YES + NO < $1
+    - ``compression_*``: market-wide spread compression (bot competition)
+
+    Timestamps come from the caller (``ts``), so replays are deterministic.
+    """
+
+    def __init__(self, compression_window_min: float = COMPRESSION_WINDOW_MIN):
+        self._lock = threading.Lock()
+        self._baskets: Dict[str, _Basket] = {}
+        self._open_baskets: set = set()          # event_id
+        self._open_yes_no: set = set()           # (event_id, market_id)
+        self.compression_window = compression_window_min * 60
+        self._n_outcomes = 0
+        self._n_compressed = 0
+        self._compressed_since: Optional[float] = None
+        self._pause_emitted = False
+        self.stats = {"updates": 0, "events_emitted": 0}
+
+    def __len__(self):
+        return len(self._baskets)
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def sync_events(self, events: List[Dict], ts: Optional[float] = None) -> List[Dict]:
+        """Apply a Gamma /events snapshot: new, restructured and dropped events
+        are rebuilt, everything else goes through ``update``."""
+        ts = time.time() if ts is None else ts
+        emitted: List[Dict] = []
+        with self._lock:
+            seen = set()
+            for event in events:
+                fresh = _Basket(event)
+                seen.add(fresh.event_id)
+                current = self._baskets.get(fresh.event_id)
+                if current is None or current.structure() != fresh.structure() \
+                        or current.neg_risk != fresh.neg_risk:
+                    if current is not None:
+                        self._drop(current, ts, emitted)
+                    self._baskets[fresh.event_id] = current = fresh
+                    self._n_outcomes += len(fresh.outcomes)
+                    rebuilt = True
+                else:
+                    # Metadata only; eligibility can move with volume
+                    current.title, current.volume, current.vol24h = fresh.title, fresh.volume, fresh.vol24h
+                    rebuilt = current.eligible != fresh.eligible
+                    current.eligible = fresh.eligible
+                for m in event.get("markets", []):
+                    yes, no = _get_outcome_prices(m)
+                    mid = m.get("conditionId", "") or str(m.get("id", ""))
+                    o, latest = current.outcomes[mid], fresh.outcomes[mid]
+                    o.question = latest.question
+                    if not rebuilt and o.volume == latest.volume and \
+                            (o.yes, o.no) == (_micros(yes), _micros(no)):
+                        continue  # Unchanged outcome
+                    o.volume = latest.volume
+                    self._apply(current, o, yes, no, ts, emitted)
+                self._check_basket(current, ts, emitted)
+            for eid in [e for e in self._baskets if e not in seen]:
+                self._drop(self._baskets[eid], ts, emitted)
+            self._check_compression(ts, emitted)
+            self.stats["events_emitted"] += len(emitted)
+        return emitted
+
+    def update(self, event_id: str, market_id: str, yes: Optional[float] = None,
+               no: Optional[float] = None, ts: Optional[float] = None) -> List[Dict]:
+        """One outcome's new prices (omitted sides keep their last value)."""
+        ts = time.time() if ts is None else ts
+        emitted: List[Dict] = []
+        with self._lock:
+            basket = self._baskets.get(event_id)
+            outcome = basket.outcomes.get(market_id) if basket else None
+            if outcome is None:
+                return emitted
+            self._apply(
+                basket, outcome,
+                outcome.yes / _MICROS if yes is None and outcome.yes is not None else yes,
+                outcome.no / _MICROS if no is None and outcome.no is not None else no,
+                ts, emitted,
+            )
+            self._check_basket(basket, ts, emitted)
+            self._check_compression(ts, emitted)
+            self.stats["events_emitted"] += len(emitted)
+        return emitted
+
+    def replay(self, ticks: Iterable[Dict]) -> List[Dict]:
+        """Drive the engine from recorded ticks
+        ({"ts", "event_id", "market_id", "yes"?, "no"?}); returns all emitted events."""
+        emitted = []
+        for t in ticks:
+            emitted.extend(self.update(t["event_id"], t["market_id"], t.get("yes"), t.get("no"), ts=t["ts"]))
+        return emitted
+
+    # ------------------------------------------------------------------
+    # State transitions
+    # ------------------------------------------------------------------
+
+    def _apply(self, basket: _Basket, o: _Outcome, yes, no, ts, emitted):
+        self.stats["updates"] += 1
+        if o.active and o.yes is not None and o.yes > 0:
+            basket.sum_yes -= o.yes
+            basket.n_yes -= 1
+        o.yes, o.no = _micros(yes), _micros(no)
+        if o.active and o.yes is not None and o.yes > 0:
+            basket.sum_yes += o.yes
+            basket.n_yes += 1
+
+        compressed = (o.yes is not None and o.no is not None
+                      and abs(_MICROS - o.yes - o.no) < COMPRESSION_SPREAD * _MICROS)
+        self._n_compressed += compressed - o.compressed
+        o.compressed = compressed
+
+        in_arb = basket.eligible and o.active and self._yes_no_edge(o) is not None
+        if in_arb != o.in_arb:
+            o.in_arb = in_arb
+            key = (basket.event_id, o.market_id)
+            if in_arb:
+                self._open_yes_no.add(key)
+                emitted.append(self._event("arb_open", "yes_no_arb", basket, ts, o))
+            else:
+                self._open_yes_no.discard(key)
+                emitted.append(self._event("arb_close", "yes_no_arb", basket, ts, o))
+
+    def _yes_no_edge(self, o: _Outcome) -> Optional[Tuple[float, float]]:
+        if o.yes is None or o.no is None or o.yes <= 0 or o.no <= 0:
+            return None
+        total_cost = (o.yes + o.no) / _MICROS
+        if total_cost >= 1.0 or o.volume < MIN_MARKET_LIQUIDITY:
+            return None
+        gross, net = _net_profit_pct(total_cost)
+        return (gross, net) if _in_band(net) else None
+
+    def _basket_edge(self, b: _Basket) -> Optional[Tuple[float, float, float]]:
+        """(total cost, gross %, net %) if the basket is in the arb band."""
+        if not (b.eligible and b.neg_risk) or b.n_yes != b.n_active:
+            return None
+        total_cost = b.sum_yes / _MICROS
+        gross, net = _net_profit_pct(total_cost)
+        return (total_cost, gross, net) if _in_band(net) else None
+
+    def _check_basket(self, b: _Basket, ts, emitted):
+        in_arb = self._basket_edge(b) is not None
+        if in_arb == (b.event_id in self._open_baskets):
+            return
+        if in_arb:
+            self._open_baskets.add(b.event_id)
+            emitted.append(self._event("arb_open", "basket_arb", b, ts))
+        else:
+            self._open_baskets.discard(b.event_id)
+            emitted.append(self._event("arb_close", "basket_arb", b, ts))
+
+    def _check_compression(self, ts, emitted):
+        active = (self._n_compressed > COMPRESSION_MIN_MARKETS
+                  and self._n_compressed / max(self._n_outcomes, 1) > COMPRESSION_RATIO)
+        if active and self._compressed_since is None:
+            self._compressed_since = ts
+            emitted.append({"kind": "compression_start", "ts": ts, **self._compression_counts()})
+        elif not active and self._compressed_since is not None:
+            emitted.append({"kind": "compression_end", "ts": ts,
+                            "held_seconds": ts - self._compressed_since, **self._compression_counts()})
+            self._compressed_since = None
+            self._pause_emitted = False
+        if active and not self._pause_emitted and ts - self._compressed_since >= self.compression_window:
+            self._pause_emitted = True
+            emitted.append({"kind": "compression_pause", "ts": ts, **self._compression_counts()})
+
+    def _drop(self, b: _Basket, ts, emitted):
+        if b.event_id in self._open_baskets:
+            self._open_baskets.discard(b.event_id)
+            emitted.append(self._event("arb_close", "basket_arb", b, ts))
+        for o in b.outcomes.values():
+            if o.in_arb:
+                self._open_yes_no.discard((b.event_id, o.market_id))
+                emitted.append(self._event("arb_close", "yes_no_arb", b, ts, o))
+            self._n_compressed -= o.compressed
+        self._n_outcomes -= len(b.outcomes)
+        del self._baskets[b.event_id]
+
+    def _event(self, kind, signal_type, b: _Basket, ts, o: Optional[_Outcome] = None) -> Dict:
+        event = {"kind": kind, "type": signal_type, "event_id": b.event_id, "ts": ts}
+        if o is not None:
+            event["condition_id"] = o.market_id
+        if kind == "arb_open":
+            event["signal"] = self._signal(signal_type, b, o, ts)
+            event["net_profit_pct"] = event["signal"]["net_profit_pct"]
+        return event
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def _signal(self, signal_type: str, b: _Basket, o: Optional[_Outcome], ts: float) -> Dict:
+        generated_at = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+        if signal_type == "yes_no_arb":
+            gross, net = self._yes_no_edge(o)
+            yes, no = o.yes / _MICROS, o.no / _MICROS
+            return {
+                "type": "yes_no_arb",
+                "event_title": b.title,
+                "market_title": o.question[:100],
+                "condition_id": o.market_id,
+                "yes_price": round(yes, 4),
+                "no_price": round(no, 4),
+                "total_cost": round(yes + no, 4),
+                "gross_profit_pct": round(gross, 2),
+                "net_profit_pct": round(net, 2),
+                "market_volume": o.volume,
+                "platform": "polymarket",
+                "source": "basket_arb",
+                "confidence": min(0.95, 0.7 + net / 20),
+                "generated_at": generated_at,
+            }
+        total_cost, gross, net = self._basket_edge(b)
+        outcomes = [
+            {
+                "question": x.question[:80],
+                "yes_price": x.yes / _MICROS,
+                "condition_id": x.market_id,
+                "volume": x.volume,
+            }
+            for x in b.outcomes.values() if x.active
+        ]
+        return {
+            "type": signal_type,
+            "event_title": b.title,
+            "event_id": b.event_id,
+            "num_outcomes": len(outcomes),
+            "total_cost": round(total_cost, 4),
+            "gross_profit_pct": round(gross, 2),
+            "net_profit_pct": round(net, 2),
+            "event_volume": b.volume,
+            "event_vol24h": b.vol24h,
+            "outcomes": outcomes,
+            "platform": "polymarket",
+            "source": "basket_arb",
+            "confidence": min(0.95, 0.7 + net / 20),  # High confidence — it's math
+            "generated_at": generated_at,
+        }
+
+    def signals(self, ts: Optional[float] = None) -> List[Dict]:
+        """Every currently open arb as a scan_basket_arb-style signal, best first."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            out = [self._signal("basket_arb", self._baskets[eid], None, ts) for eid in self._open_baskets]
+            out.extend(self._signal("yes_no_arb", self._baskets[eid], self._baskets[eid].outcomes[mid], ts)
+                       for eid, mid in self._open_yes_no)
+        out.sort(key=lambda x: x["net_profit_pct"], reverse=True)
+        return out
+
+    def _compression_counts(self) -> Dict:
+        return {
+            "compressed_count": self._n_compressed,
+            "total_checked": self._n_outcomes,
+            "compression_ratio": self._n_compressed / max(self._n_outcomes, 1),
+        }
+
+    def compression(self, ts: Optional[float] = None) -> Dict:
+        """Market-wide compression state; should_pause once it has held for the window."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            held = ts - self._compressed_since if self._compressed_since is not None else 0.0
+            compressed = [
+                {
+                    "question": o.question[:60],
+                    "spread": round(abs(_MICROS - o.yes - o.no) / _MICROS, 4),
+                    "spread_cents": round(abs(_MICROS - o.yes - o.no) / _MICROS * 100, 1),
+                }
+                for b in self._baskets.values() for o in b.outcomes.values() if o.compressed
+            ][:10]
+            return {
+                **self._compression_counts(),
+                "compressed_since": self._compressed_since,
+                "held_seconds": round(held, 1),
+                "window_seconds": self.compression_window,
+                "should_pause": self._compressed_since is not None and held >= self.compression_window,
+                "compressed_markets": compressed,
+            }
+
+
+_engine: Optional[BasketEngine] = None
+_engine_synced = 0.0
+
+
+def get_basket_engine(refresh: bool = True) -> BasketEngine:
+    """Shared engine, re-synced from Gamma at most once per CACHE_TTL."""
+    global _engine, _engine_synced
+    if _engine is None:
+        _engine = BasketEngine()
+    if refresh and time.time() - _engine_synced >= CACHE_TTL:
+        events = _fetch_events(limit=200)
+        if events:
+            _engine.sync_events(events)
+            _engine_synced = time.time()
+    return _engine
+
+
 def scan_basket_arb() -> List[Dict]:
     """Scan for sum-to-one arbitrage opportunities.
     
@@ -82,127 +455,12 @@ def scan_basket_arb() -> List[Dict]:
     2. If sum < 1.0 (minus fees), there's guaranteed profit
     3. For 2-outcome markets: check if YES + NO < 1.0
     
+    Served from the shared BasketEngine; only outcomes whose prices moved
+    since the last Gamma snapshot are re-evaluated.
+    
     Returns list of arb signals sorted by edge.
     """
-    events = _fetch_events(limit=200)
-    signals = []
-    now = datetime.now(timezone.utc)
-    
-    for event in events:
-        markets = event.get("markets", [])
-        if not markets:
-            continue
-        
-        event_title = event.get("title", "")
-        event_volume = float(event.get("volume", 0) or 0)
-        event_vol24h = float(event.get("volume24hr", 0) or 0)
-        
-        if event_volume < MIN_EVENT_VOLUME and event_vol24h < MIN_EVENT_VOLUME:
-            continue
-        
-        # Filter: only active, non-closed markets
-        active_markets = [
-            m for m in markets
-            if m.get("active") and not m.get("closed")
-        ]
-        
-        if len(active_markets) < MIN_OUTCOMES or len(active_markets) > MAX_OUTCOMES:
-            continue
-        
-        # === Strategy A: Multi-outcome event basket ===
-        # In a neg-risk event (mutually exclusive outcomes), buying YES on all
-        # outcomes guarantees exactly one wins → payout = $1
-        # If sum of all YES prices < $1, that's arb
-        
-        if event.get("negRisk") or event.get("enableNegRisk"):
-            yes_prices = []
-            all_valid = True
-            min_liquidity = float("inf")
-            
-            for m in active_markets:
-                yp, _ = _get_outcome_prices(m)
-                if yp is None or yp <= 0:
-                    all_valid = False
-                    break
-                yes_prices.append({
-                    "question": m.get("question", "")[:80],
-                    "yes_price": yp,
-                    "condition_id": m.get("conditionId", ""),
-                    "volume": float(m.get("volume", 0) or 0),
-                })
-                liq = float(m.get("volume", 0) or 0)
-                if liq < min_liquidity:
-                    min_liquidity = liq
-            
-            if not all_valid or not yes_prices:
-                continue
-            
-            total_cost = sum(p["yes_price"] for p in yes_prices)
-            gross_profit_pct = ((1.0 - total_cost) / total_cost) * 100 if total_cost > 0 else 0
-            net_profit_pct = gross_profit_pct - POLYMARKET_FEE_PCT
-            
-            if net_profit_pct >= MIN_ARB_EDGE_PCT and net_profit_pct <= MAX_ARB_EDGE_PCT:
-                signals.append({
-                    "type": "basket_arb",
-                    "event_title": event_title,
-                    "event_id": event.get("id", ""),
-                    "num_outcomes": len(yes_prices),
-                    "total_cost": round(total_cost, 4),
-                    "gross_profit_pct": round(gross_profit_pct, 2),
-                    "net_profit_pct": round(net_profit_pct, 2),
-                    "event_volume": event_volume,
-                    "event_vol24h": event_vol24h,
-                    "outcomes": yes_prices,
-                    "platform": "polymarket",
-                    "source": "basket_arb",
-                    "confidence": min(0.95, 0.7 + net_profit_pct / 20),  # High confidence — it's math
-                    "generated_at": now.isoformat(),
-                })
-        
-        # === Strategy B: Single-market YES+NO arb ===
-        # For individual 2-outcome markets: if YES + NO < 1.0, buy both
-        for m in active_markets:
-            yp, np = _get_outcome_prices(m)
-            if yp is None or np is None:
-                continue
-            if yp <= 0 or np <= 0:
-                continue
-            
-            total_cost = yp + np
-            if total_cost >= 1.0:
-                continue  # No arb
-            
-            gross_profit_pct = ((1.0 - total_cost) / total_cost) * 100
-            net_profit_pct = gross_profit_pct - POLYMARKET_FEE_PCT
-            
-            if net_profit_pct < MIN_ARB_EDGE_PCT or net_profit_pct > MAX_ARB_EDGE_PCT:
-                continue
-            
-            market_vol = float(m.get("volume", 0) or 0)
-            if market_vol < MIN_MARKET_LIQUIDITY:
-                continue
-            
-            signals.append({
-                "type": "yes_no_arb",
-                "event_title": event_title,
-                "market_title": m.get("question", "")[:100],
-                "condition_id": m.get("conditionId", ""),
-                "yes_price": round(yp, 4),
-                "no_price": round(np, 4),
-                "total_cost": round(total_cost, 4),
-                "gross_profit_pct": round(gross_profit_pct, 2),
-                "net_profit_pct": round(net_profit_pct, 2),
-                "market_volume": market_vol,
-                "platform": "polymarket",
-                "source": "basket_arb",
-                "confidence": min(0.95, 0.7 + net_profit_pct / 20),
-                "generated_at": now.isoformat(),
-            })
-    
-    # Sort by net profit descending
-    signals.sort(key=lambda x: x["net_profit_pct"], reverse=True)
-    
-    return signals
+    return get_basket_engine().signals()
 
 
 def get_basket_arb_signals() -> Dict:
@@ -8,8 +8,16 @@ Hooks into IC tracker data to:
 4. Conditional IC by market type / volatility regime
 
 Auto-updates as more trades resolve. No manual tuning needed.
+
+Curves, source weights and decay are all read from the IC tracker's
+incremental counts (prediction_stats / prediction_decay_stats), never from
+raw signal_predictions rows, so history archived by retention still counts.
+calibrate_confidence() reads recent curve bins from an
+in-process cache (CURVE_CACHE_TTL, dropped whenever a curve is rebuilt)
+instead of querying once per signal.
 """
 
+import os
 import sqlite3
 import time
 import math
@@ -18,6 +26,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from ic_tracker import _spearman_from_counts, calculate_ic, decay_counts, source_counts, source_totals
+except ImportError:
+    from signals.ic_tracker import _spearman_from_counts, calculate_ic, decay_counts, source_counts, source_totals
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent.parent / "storage" / "shadow_trades.db"
@@ -26,6 +39,10 @@ DB_PATH = Path(__file__).parent.parent / "storage" / "shadow_trades.db"
 MIN_SAMPLES_CALIBRATE = 20
 MIN_SAMPLES_PER_BIN = 5
 
+# calibrate_confidence() bin cache: db path -> (loaded_at, {source: [bin rows]})
+CURVE_CACHE_TTL = 300
+_curve_cache: Dict[str, Tuple[float, Dict[str, List[tuple]]]] = {}
+
 
 def _get_conn(db_path: str = None) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path or str(DB_PATH), timeout=10)
@@ -34,8 +51,27 @@ def _get_conn(db_path: str = None) -> sqlite3.Connection:
     return conn
 
 
+def _has_table(db_path: str, name: str) -> bool:
+    """True if the DB file exists and already has table ``name``.
+
+    Checked on every init rather than cached per path, so a DB file that is
+    deleted and recreated in the same process gets its tables again.
+    """
+    if not os.path.exists(db_path):
+        return False
+    conn = sqlite3.connect(db_path, timeout=10)
+    try:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
 def init_calibration_tables(db_path: str = None):
     """Create calibration tables."""
+    if _has_table(db_path or str(DB_PATH), "source_weights"):
+        return
     conn = _get_conn(db_path)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS calibration_curves (
@@ -83,34 +119,52 @@ def build_calibration_curve(source: str, n_bins: int = 5, db_path: str = None) -
         Dict with bins, overall calibration error (ECE), and adjustment map
     """
     init_calibration_tables(db_path)
-    conn = _get_conn(db_path)
-    conn.row_factory = sqlite3.Row
-
-    rows = conn.execute("""
-        SELECT confidence, outcome
-        FROM signal_predictions
-        WHERE source = ? AND resolved = 1
-        ORDER BY confidence
-    """, (source,)).fetchall()
-    conn.close()
-
-    if len(rows) < MIN_SAMPLES_CALIBRATE:
+    result, bin_rows = _curve_from_counts(source, source_counts(source, db_path=db_path), n_bins)
+    if not bin_rows:
+        return result
+
+    # Store in DB
+    try:
+        now = time.time()
+        conn = _get_conn(db_path)
+        conn.executemany("""
+            INSERT INTO calibration_curves
+            (timestamp, source, bin_lower, bin_upper, predicted_avg, 
+             actual_win_rate, sample_size, calibration_error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(now, source, *row) for row in bin_rows])
+        conn.commit()
+        conn.close()
+        _curve_cache.pop(db_path or str(DB_PATH), None)
+    except Exception:
+        pass
+
+    return result
+
+
+def _curve_from_counts(source: str, counts: Dict[Tuple[float, float], int],
+                       n_bins: int = 5) -> Tuple[dict, List[tuple]]:
+    """Bin {(confidence, outcome): n} into a calibration curve.
+
+    Returns (result dict, calibration_curves rows without timestamp/source).
+    """
+    sample_size = sum(counts.values())
+    if sample_size < MIN_SAMPLES_CALIBRATE:
         return {
             "source": source,
             "status": "insufficient_data",
-            "sample_size": len(rows),
+            "sample_size": sample_size,
             "min_required": MIN_SAMPLES_CALIBRATE,
-        }
+        }, []
 
     # Create equal-width bins from 50-100 confidence range
-    predictions = [(float(r["confidence"]), float(r["outcome"])) for r in rows]
-    
-    bin_edges = []
-    min_conf = min(p[0] for p in predictions)
-    max_conf = max(p[0] for p in predictions)
+    predictions = sorted(counts.items())
+    min_conf = predictions[0][0][0]
+    max_conf = predictions[-1][0][0]
     step = (max_conf - min_conf) / n_bins if max_conf > min_conf else 1
     
     bins = []
+    bin_rows = []
     total_ece = 0.0
     total_samples = 0
     adjustment_map = {}
@@ -119,57 +173,44 @@ def build_calibration_curve(source: str, n_bins: int = 5, db_path: str = None) -
         lower = min_conf + i * step
         upper = min_conf + (i + 1) * step if i < n_bins - 1 else max_conf + 0.1
         
-        bin_preds = [p for p in predictions if lower <= p[0] < upper]
-        if len(bin_preds) < MIN_SAMPLES_PER_BIN:
+        bin_preds = [(conf, outcome, n) for (conf, outcome), n in predictions if lower <= conf < upper]
+        bin_size = sum(n for _, _, n in bin_preds)
+        if bin_size < MIN_SAMPLES_PER_BIN:
             continue
 
-        avg_predicted = sum(p[0] for p in bin_preds) / len(bin_preds)
-        actual_win_rate = sum(p[1] for p in bin_preds) / len(bin_preds) * 100  # scale to match confidence
+        avg_predicted = sum(conf * n for conf, _, n in bin_preds) / bin_size
+        actual_win_rate = sum(outcome * n for _, outcome, n in bin_preds) / bin_size * 100  # scale to match confidence
         cal_error = abs(avg_predicted - actual_win_rate)
         
         bins.append({
             "bin": f"{lower:.0f}-{upper:.0f}",
             "predicted_avg": round(avg_predicted, 1),
             "actual_win_rate": round(actual_win_rate, 1),
-            "sample_size": len(bin_preds),
+            "sample_size": bin_size,
             "calibration_error": round(cal_error, 1),
             "direction": "overconfident" if avg_predicted > actual_win_rate else "underconfident",
         })
+        bin_rows.append((lower, upper, avg_predicted, actual_win_rate, bin_size, cal_error))
 
         # Adjustment: ratio of actual/predicted
         if avg_predicted > 0:
             adj = actual_win_rate / avg_predicted
             adjustment_map[f"{lower:.0f}-{upper:.0f}"] = round(adj, 3)
 
-        total_ece += cal_error * len(bin_preds)
-        total_samples += len(bin_preds)
-
-        # Store in DB
-        try:
-            conn2 = _get_conn(db_path)
-            conn2.execute("""
-                INSERT INTO calibration_curves
-                (timestamp, source, bin_lower, bin_upper, predicted_avg, 
-                 actual_win_rate, sample_size, calibration_error)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (time.time(), source, lower, upper, avg_predicted,
-                  actual_win_rate, len(bin_preds), cal_error))
-            conn2.commit()
-            conn2.close()
-        except Exception:
-            pass
+        total_ece += cal_error * bin_size
+        total_samples += bin_size
 
     ece = total_ece / total_samples if total_samples > 0 else 0
 
     return {
         "source": source,
         "status": "calibrated",
-        "sample_size": len(predictions),
+        "sample_size": sample_size,
         "bins": bins,
         "ece": round(ece, 2),  # Expected Calibration Error
         "adjustment_map": adjustment_map,
         "interpretation": _interpret_ece(ece),
-    }
+    }, bin_rows
 
 
 def _interpret_ece(ece: float) -> str:
@@ -196,35 +237,49 @@ def calibrate_confidence(source: str, raw_confidence: float, db_path: str = None
     Returns:
         Adjusted confidence (0-95, clamped)
     """
-    conn = _get_conn(db_path)
-    conn.row_factory = sqlite3.Row
-
-    # Get most recent calibration bins for this source
-    rows = conn.execute("""
-        SELECT bin_lower, bin_upper, predicted_avg, actual_win_rate, sample_size
-        FROM calibration_curves
-        WHERE source = ? 
-        AND timestamp > ? 
-        AND sample_size >= ?
-        ORDER BY timestamp DESC
-        LIMIT 20
-    """, (source, time.time() - 7 * 86400, MIN_SAMPLES_PER_BIN)).fetchall()
-    conn.close()
-
+    rows = _load_curves(db_path).get(source)
     if not rows:
         return raw_confidence  # no calibration data yet
 
     # Find matching bin
-    for r in rows:
-        if r["bin_lower"] <= raw_confidence < r["bin_upper"]:
-            if r["predicted_avg"] > 0:
-                adjustment = r["actual_win_rate"] / r["predicted_avg"]
+    for bin_lower, bin_upper, predicted_avg, actual_win_rate in rows:
+        if bin_lower <= raw_confidence < bin_upper:
+            if predicted_avg > 0:
+                adjustment = actual_win_rate / predicted_avg
                 adjusted = raw_confidence * adjustment
                 return max(1.0, min(95.0, adjusted))
 
     return raw_confidence  # no matching bin
 
 
+def _load_curves(db_path: str = None) -> Dict[str, List[tuple]]:
+    """Most recent calibration bins (≤20 per source, last 7 days), cached for CURVE_CACHE_TTL."""
+    key = db_path or str(DB_PATH)
+    cached = _curve_cache.get(key)
+    now = time.time()
+    if cached and now - cached[0] < CURVE_CACHE_TTL:
+        return cached[1]
+
+    init_calibration_tables(db_path)
+    conn = _get_conn(db_path)
+    rows = conn.execute("""
+        SELECT source, bin_lower, bin_upper, predicted_avg, actual_win_rate FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY source ORDER BY timestamp DESC, id DESC) AS rn
+            FROM calibration_curves
+            WHERE timestamp > ? AND sample_size >= ?
+        )
+        WHERE rn <= 20
+        ORDER BY source, rn
+    """, (now - 7 * 86400, MIN_SAMPLES_PER_BIN)).fetchall()
+    conn.close()
+
+    curves: Dict[str, List[tuple]] = {}
+    for source, *bin_row in rows:
+        curves.setdefault(source, []).append(tuple(bin_row))
+    _curve_cache[key] = (now, curves)
+    return curves
+
+
 def compute_source_weights(db_path: str = None) -> dict:
     """Compute optimal weights for each signal source based on IC and independence.
     
@@ -235,32 +290,22 @@ def compute_source_weights(db_path: str = None) -> dict:
         Dict mapping source → weight (0-1, sums to 1)
     """
     init_calibration_tables(db_path)
-    conn = _get_conn(db_path)
-    conn.row_factory = sqlite3.Row
 
     # Get all sources with resolved predictions
-    sources = conn.execute("""
-        SELECT DISTINCT source, COUNT(*) as cnt
-        FROM signal_predictions
-        WHERE resolved = 1
-        GROUP BY source
-        HAVING cnt >= 10
-    """).fetchall()
-    conn.close()
+    sources = {src: n for src, n in source_totals(db_path).items() if n >= 10}
 
     if not sources:
         return {"status": "insufficient_data", "weights": {}}
 
     # Calculate IC for each source
-    from ic_tracker import calculate_ic
     source_ics = {}
-    for row in sources:
-        ic_data = calculate_ic(row["source"], 30, db_path)
+    for source, cnt in sources.items():
+        ic_data = calculate_ic(source, 30, db_path)
         ic_val = ic_data.get("ic_value")
         if ic_val is not None and ic_val > 0:
-            source_ics[row["source"]] = {
+            source_ics[source] = {
                 "ic": ic_val,
-                "samples": row["cnt"],
+                "samples": cnt,
             }
 
     if not source_ics:
@@ -303,52 +348,21 @@ def get_signal_decay(source: str, market_type: str = None, db_path: str = None)
     Tells us the exploitable window.
     """
     init_calibration_tables(db_path)
-    conn = _get_conn(db_path)
-    conn.row_factory = sqlite3.Row
 
-    rows = conn.execute("""
-        SELECT confidence, outcome, timestamp, resolved_at
-        FROM signal_predictions
-        WHERE source = ? AND resolved = 1 AND resolved_at IS NOT NULL
-        ORDER BY timestamp
-    """, (source,)).fetchall()
-    conn.close()
-
-    if len(rows) < 20:
-        return {"source": source, "status": "insufficient_data", "sample_size": len(rows)}
+    # Counts grouped by resolution time (how long until market resolved)
+    buckets = decay_counts(source, db_path)
+    total = sum(sum(counts.values()) for counts in buckets.values())
+    if total < 20:
+        return {"source": source, "status": "insufficient_data", "sample_size": total}
 
-    # Group by resolution time (how long until market resolved)
-    buckets = {
-        "< 6h": [], "6-24h": [], "1-3d": [], "3-7d": [], "7-30d": []
-    }
-    
-    for r in rows:
-        hours = (r["resolved_at"] - r["timestamp"]) / 3600
-        conf = float(r["confidence"])
-        outcome = float(r["outcome"])
-        
-        if hours < 6:
-            buckets["< 6h"].append((conf, outcome))
-        elif hours < 24:
-            buckets["6-24h"].append((conf, outcome))
-        elif hours < 72:
-            buckets["1-3d"].append((conf, outcome))
-        elif hours < 168:
-            buckets["3-7d"].append((conf, outcome))
-        else:
-            buckets["7-30d"].append((conf, outcome))
-
-    from ic_tracker import _spearman_rank_correlation
-    
     decay = {}
-    for bucket, pairs in buckets.items():
-        if len(pairs) < 5:
-            decay[bucket] = {"ic": None, "samples": len(pairs)}
+    for bucket, counts in buckets.items():
+        samples = sum(counts.values())
+        if samples < 5:
+            decay[bucket] = {"ic": None, "samples": samples}
             continue
-        confs = [p[0] for p in pairs]
-        outs = [p[1] for p in pairs]
-        ic = _spearman_rank_correlation(confs, outs)
-        decay[bucket] = {"ic": round(ic, 4), "samples": len(pairs)}
+        ic = _spearman_from_counts(counts)
+        decay[bucket] = {"ic": round(ic, 4), "samples": samples}
 
     return {
         "source": source,
@@ -382,27 +396,20 @@ def full_calibration_report(db_path: str = None) -> dict:
     This is the main entry point for the auto-calibration system.
     """
     init_calibration_tables(db_path)
-    conn = _get_conn(db_path)
-    conn.row_factory = sqlite3.Row
-
-    sources = conn.execute("""
-        SELECT DISTINCT source, COUNT(*) as cnt
-        FROM signal_predictions
-        WHERE resolved = 1
-        GROUP BY source
-    """).fetchall()
+    sources = source_totals(db_path)
 
+    # Unresolved rows are never archived, so the raw table has all of them
+    conn = _get_conn(db_path)
     total_unresolved = conn.execute(
-        "SELECT COUNT(*) as c FROM signal_predictions WHERE resolved = 0"
-    ).fetchone()["c"]
-    
-    total_resolved = sum(r["cnt"] for r in sources)
+        "SELECT COUNT(*) FROM signal_predictions WHERE resolved = 0"
+    ).fetchone()[0]
     conn.close()
 
+    total_resolved = sum(sources.values())
+
     calibrations = {}
-    for row in sources:
-        cal = build_calibration_curve(row["source"], db_path=db_path)
-        calibrations[row["source"]] = cal
+    for source in sources:
+        calibrations[source] = build_calibration_curve(source, db_path=db_path)
 
     weights = compute_source_weights(db_path)
     
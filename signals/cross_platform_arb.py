@@ -9,10 +9,13 @@ Becker dataset analysis showed cross-platform spreads exist but require semantic
 matching (keyword overlap fails due to different market phrasing styles).
 """
 
+import hashlib
 import json
 import logging
 import re
+import threading
 import time
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
@@ -145,15 +148,21 @@ def _question_type(title: str) -> str:
     return "general"
 
 
-def _subjects_compatible(title_a: str, title_b: str, subj_a: str, subj_b: str) -> bool:
-    """Check if two markets are about the same thing AND asking the same question.
-    
-    Prevents matching "Will 2028 election occur?" with "Will AOC win 2028?"
-    """
-    # Different question types = not compatible
-    type_a = _question_type(title_a)
-    type_b = _question_type(title_b)
-    
+# Capitalized words too generic to identify a shared subject
+GENERIC_NAMES = {'Will', 'The', 'Democratic', 'Republican', 'United', 'States',
+                 'Presidential', 'President', 'Prime', 'Minister', 'Party',
+                 'Best', 'Next', 'National', 'Supreme', 'February', 'March',
+                 'January', 'April', 'May', 'June', 'July', 'August',
+                 'September', 'October', 'November', 'December'}
+
+
+def _proper_names(title: str) -> set:
+    """Proper nouns (names, places, orgs) in a title, minus generic ones."""
+    return set(re.findall(r'[A-Z][a-z]{2,}', title)) - GENERIC_NAMES
+
+
+def _types_compatible(type_a: str, type_b: str) -> bool:
+    """Whether two question types (from _question_type) ask the same kind of question."""
     # "who_will" can match with specific "win_X" questions
     if type_a != type_b:
         if not ({type_a, type_b} & {"who_will"} and {type_a, type_b} & {t for t in [type_a, type_b] if t.startswith("win_")}):
@@ -164,25 +173,20 @@ def _subjects_compatible(title_a: str, title_b: str, subj_a: str, subj_b: str) -
         if type_a != type_b:
             return False
     
-    # Extract proper nouns from both titles (names, places, orgs)
-    names_a = set(re.findall(r'[A-Z][a-z]{2,}', title_a))
-    names_b = set(re.findall(r'[A-Z][a-z]{2,}', title_b))
-    
-    # Remove generic capitalized words
-    generic_names = {'Will', 'The', 'Democratic', 'Republican', 'United', 'States',
-                     'Presidential', 'President', 'Prime', 'Minister', 'Party',
-                     'Best', 'Next', 'National', 'Supreme', 'February', 'March',
-                     'January', 'April', 'May', 'June', 'July', 'August',
-                     'September', 'October', 'November', 'December'}
-    names_a -= generic_names
-    names_b -= generic_names
+    return True
+
+
+def _subjects_compatible(title_a: str, title_b: str, subj_a: str, subj_b: str) -> bool:
+    """Check if two markets are about the same thing AND asking the same question.
     
-    # Must share at least one proper noun (a person's name, country, org)
-    shared_names = names_a & names_b
-    if not shared_names:
+    Prevents matching "Will 2028 election occur?" with "Will AOC win 2028?"
+    """
+    # Different question types = not compatible
+    if not _types_compatible(_question_type(title_a), _question_type(title_b)):
         return False
     
-    return True
+    # Must share at least one proper noun (a person's name, country, org)
+    return bool(_proper_names(title_a) & _proper_names(title_b))
 
 
 def _fetch_json(url: str, params: dict = None, timeout: int = 15, source_name: str = None) -> Optional[dict]:
@@ -325,56 +329,203 @@ def fetch_polymarket_active(limit: int = 200) -> List[Dict]:
     return markets
 
 
+def _title_hash(title: str) -> bytes:
+    return hashlib.blake2b(title.encode(), digest_size=8).digest()
+
+
+class _MarketFeatures:
+    """Everything matching needs from a title, computed once per (id, title)."""
+    
+    __slots__ = ("title_hash", "n_tokens", "tf", "norm", "qtype", "names")
+    
+    def __init__(self, title: str):
+        tokens = _tokenize(title)
+        self.title_hash = _title_hash(title)
+        self.n_tokens = len(tokens)
+        self.tf = Counter(tokens)  # Sparse TF vector
+        self.norm = sum(v ** 2 for v in self.tf.values()) ** 0.5
+        self.qtype = _question_type(title)
+        self.names = _proper_names(title)
+    
+    def cosine(self, other: "_MarketFeatures") -> float:
+        """Same value as _cosine_similarity on the token lists."""
+        if not self.norm or not other.norm:
+            return 0.0
+        small, large = (self.tf, other.tf) if len(self.tf) <= len(other.tf) else (other.tf, self.tf)
+        dot = sum(count * large.get(tok, 0) for tok, count in small.items())
+        return dot / (self.norm * other.norm)
+
+
+class MatchStore:
+    """Kalshi/Polymarket pairings kept across scans.
+    
+    Markets are keyed by id and title hash. Each sync re-tokenizes and
+    re-scores only markets that are new or retitled; pairings between
+    unchanged markets (accepted ones stored with their similarity, rejected
+    ones simply absent) are reused. Both sides keep an inverted token index
+    so a new Polymarket market is scored only against Kalshi markets sharing
+    at least two tokens, and vice versa.
+    
+    Accepted pairs are those with similarity >= ``min_sim`` that pass the
+    subject compatibility check; prices are not part of the store.
+    """
+    
+    def __init__(self, min_sim: float = MIN_SIMILARITY):
+        self.min_sim = min_sim
+        self._lock = threading.Lock()
+        self.last_scan: Dict = {}
+        self.reset()
+    
+    def reset(self, min_sim: Optional[float] = None):
+        if min_sim is not None:
+            self.min_sim = min_sim
+        self._kalshi: Dict[str, _MarketFeatures] = {}
+        self._poly: Dict[str, _MarketFeatures] = {}
+        self._kalshi_index: Dict[str, set] = {}
+        self._poly_index: Dict[str, set] = {}
+        self._pairs: Dict[Tuple[str, str], Tuple[float, int]] = {}  # -> (similarity, shared tokens)
+        self._by_kalshi: Dict[str, set] = {}
+        self._by_poly: Dict[str, set] = {}
+    
+    def __len__(self):
+        return len(self._pairs)
+    
+    def sync(self, kalshi_markets: List[Dict], poly_markets: List[Dict]) -> Dict:
+        """Bring the store in line with the current market lists; returns scan stats."""
+        started = time.perf_counter()
+        with self._lock:
+            new_kalshi, dropped_k = self._sync_side(
+                kalshi_markets, self._kalshi, self._kalshi_index, self._by_kalshi, 0)
+            new_poly, dropped_p = self._sync_side(
+                poly_markets, self._poly, self._poly_index, self._by_poly, 1)
+            reused = len(self._pairs)
+            
+            scored = 0
+            for kid in new_kalshi:
+                scored += self._score(kid, self._kalshi[kid], self._poly_index, kalshi_side=True)
+            for pid in new_poly:
+                scored += self._score(pid, self._poly[pid], self._kalshi_index, kalshi_side=False,
+                                      skip=new_kalshi)
+            
+            self.last_scan = {
+                "kalshi_markets": len(self._kalshi),
+                "poly_markets": len(self._poly),
+                "kalshi_rescored": len(new_kalshi),
+                "poly_rescored": len(new_poly),
+                "markets_dropped": dropped_k + dropped_p,
+                "pairs_reused": reused,
+                "pairs_recomputed": scored,
+                "pairs_accepted": len(self._pairs),
+                "match_seconds": round(time.perf_counter() - started, 4),
+            }
+            return dict(self.last_scan)
+    
+    def matches(self, kalshi_id: str) -> List[Tuple[str, float, int]]:
+        """Accepted (poly_id, similarity, shared_tokens) for a Kalshi market."""
+        with self._lock:
+            return [(pid, *self._pairs[(kalshi_id, pid)]) for pid in self._by_kalshi.get(kalshi_id, ())]
+    
+    def _sync_side(self, markets, features, index, by_id, pos) -> Tuple[set, int]:
+        titles = {m["id"]: m["title"] for m in markets}
+        dropped = 0
+        for mid in list(features):
+            title = titles.get(mid)
+            if title is None or _title_hash(title) != features[mid].title_hash:
+                self._forget(mid, features, index, by_id, pos)
+                dropped += title is None
+        
+        added = set()
+        for mid, title in titles.items():
+            if mid in features:
+                continue
+            f = features[mid] = _MarketFeatures(title)
+            for tok in f.tf:
+                index.setdefault(tok, set()).add(mid)
+            added.add(mid)
+        return added, dropped
+    
+    def _forget(self, mid, features, index, by_id, pos):
+        for tok in features.pop(mid).tf:
+            ids = index.get(tok)
+            if ids is not None:
+                ids.discard(mid)
+                if not ids:
+                    del index[tok]
+        other = self._by_poly if pos == 0 else self._by_kalshi
+        for oid in by_id.pop(mid, ()):
+            key = (mid, oid) if pos == 0 else (oid, mid)
+            self._pairs.pop(key, None)
+            other.get(oid, set()).discard(mid)
+    
+    def _score(self, mid, f, other_index, kalshi_side, skip=()) -> int:
+        """Score one new market against the other side's candidates; returns pairs scored."""
+        if kalshi_side and f.n_tokens < 2:
+            return 0
+        shared_counts: Dict[str, int] = {}
+        for tok in f.tf:
+            for oid in other_index.get(tok, ()):
+                shared_counts[oid] = shared_counts.get(oid, 0) + 1
+        
+        others = self._poly if kalshi_side else self._kalshi
+        scored = 0
+        for oid, shared in shared_counts.items():
+            if shared < 2 or oid in skip:
+                continue
+            o = others[oid]
+            if not kalshi_side and o.n_tokens < 2:
+                continue
+            scored += 1
+            sim = f.cosine(o)
+            if sim < self.min_sim:
+                continue
+            # Subject compatibility check — prevent "election occurs?" vs "AOC wins?"
+            if not _types_compatible(f.qtype, o.qtype) or not f.names & o.names:
+                continue
+            kid, pid = (mid, oid) if kalshi_side else (oid, mid)
+            self._pairs[(kid, pid)] = (sim, shared)
+            self._by_kalshi.setdefault(kid, set()).add(pid)
+            self._by_poly.setdefault(pid, set()).add(kid)
+        return scored
+
+
+_match_store: Optional[MatchStore] = None
+
+
+def get_match_store() -> MatchStore:
+    global _match_store
+    if _match_store is None:
+        _match_store = MatchStore()
+    return _match_store
+
+
 def find_arb_opportunities(
     kalshi_markets: List[Dict],
     poly_markets: List[Dict],
     min_spread: float = MIN_SPREAD_PCT,
     min_sim: float = MIN_SIMILARITY,
+    store: Optional[MatchStore] = None,
 ) -> List[Dict]:
     """Find cross-platform arbitrage opportunities using semantic matching.
     
-    Uses inverted index for efficient O(n*k) matching instead of O(n*m) brute force.
+    Pairings come from a MatchStore (the shared one by default), so only new
+    or retitled markets are re-scored; spreads are always computed from the
+    prices passed in.
     """
-    # Build inverted index on Polymarket tokens
-    poly_index = {}  # token -> list of market_idx
-    poly_tokens = []
-    poly_subjects = []
-    for i, pm in enumerate(poly_markets):
-        toks = _tokenize(pm["title"])
-        poly_tokens.append(toks)
-        poly_subjects.append(_extract_subject(pm["title"]))
-        for tok in set(toks):  # unique tokens only
-            poly_index.setdefault(tok, []).append(i)
-    
+    if store is None:
+        store = get_match_store()
+    if min_sim < store.min_sim:
+        store.reset(min_sim)
+    store.sync(kalshi_markets, poly_markets)
+    
+    poly_by_id = {pm["id"]: pm for pm in poly_markets}
+    poly_order = {pid: i for i, pid in enumerate(poly_by_id)}
     opportunities = []
     
     for km in kalshi_markets:
-        k_tokens = _tokenize(km["title"])
-        if len(k_tokens) < 2:
-            continue
-        
-        k_subject = _extract_subject(km["title"])
-        
-        # Find candidate Polymarket markets via inverted index
-        # (markets sharing at least 2 tokens)
-        candidate_counts = {}
-        for tok in set(k_tokens):
-            for pi in poly_index.get(tok, []):
-                candidate_counts[pi] = candidate_counts.get(pi, 0) + 1
-        
-        for pi, shared_count in candidate_counts.items():
-            if shared_count < 2:
-                continue
-            
-            sim = _cosine_similarity(k_tokens, poly_tokens[pi])
+        for pid, sim, shared_count in sorted(store.matches(km["id"]), key=lambda m: poly_order[m[0]]):
             if sim < min_sim:
                 continue
-            
-            pm = poly_markets[pi]
-            
-            # Subject compatibility check — prevent "election occurs?" vs "AOC wins?"
-            if not _subjects_compatible(km["title"], pm["title"], k_subject, poly_subjects[pi]):
-                continue
+            pm = poly_by_id[pid]
             
             # Calculate spread (both directions)
             # If Kalshi YES=70% and Poly YES=60%, spread=10pp
@@ -444,6 +595,7 @@ def scan_cross_platform_arb() -> Dict:
     logger.info(f"Fetched {len(kalshi)} Kalshi + {len(poly)} Polymarket active markets")
     
     arbs = find_arb_opportunities(kalshi, poly)
+    match_stats = get_match_store().last_scan
     
     # Staleness tags
     sources_used = []
@@ -479,6 +631,7 @@ def scan_cross_platform_arb() -> Dict:
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "sources_used": sources_used,
         "source_freshness": source_freshness,
+        "match_stats": match_stats,
     }
     
     _cache["data"] = result
@@ -497,6 +650,7 @@ if __name__ == "__main__":
     print(f"Arb opportunities: {result['arb_opportunities']}")
     print(f"Avg spread: {result['avg_spread']}pp")
     print(f"Max spread: {result['max_spread']}pp")
+    print(f"Matching: {result['match_stats']}")
     
     for arb in result["arbs"][:10]:
         print(f"\n  K: {arb['kalshi_title'][:70]}")
@@ -27,7 +27,10 @@ _INTRADAY_RE = re.compile(
 
 # Import full archetype classifier (14 archetypes) from mispriced_category_signal
 try:
-    from mispriced_category_signal import classify_archetype
+    try:
+        from mispriced_category_signal import classify_archetype
+    except ImportError:
+        from signals.mispriced_category_signal import classify_archetype
 except ImportError:
     # Fallback if import fails
     def classify_archetype(title: str) -> str:
@@ -200,6 +203,106 @@ def _load_resolved_trades() -> list:
         return []
 
 
+# Incrementally maintained (archetype, side, price_zone) → wins/total, updated by
+# record_resolved_trade() when shadow trades resolve and paper positions close,
+# so confidence lookups read O(#archetypes) rows instead of every resolved trade.
+
+def _get_db() -> sqlite3.Connection:
+    db = sqlite3.connect(str(DB_PATH), timeout=10)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA busy_timeout=5000")
+    _init_wr_table(db)
+    return db
+
+
+def _init_wr_table(db: sqlite3.Connection):
+    # Plain execute() (not executescript) so a caller's open transaction isn't committed
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS empirical_wr_stats (
+            archetype TEXT NOT NULL,
+            side TEXT NOT NULL,
+            price_zone TEXT NOT NULL,
+            wins INTEGER DEFAULT 0,
+            total INTEGER DEFAULT 0,
+            PRIMARY KEY (archetype, side, price_zone)
+        )
+    """)
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS empirical_wr_meta (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            built_at TEXT
+        )
+    """)
+
+
+def record_resolved_trade(db: sqlite3.Connection, title: str, side: str, price: float, won: bool):
+    """Fold one resolved trade into empirical_wr_stats. Caller commits."""
+    _init_wr_table(db)
+    db.execute(
+        """INSERT INTO empirical_wr_stats (archetype, side, price_zone, wins, total) VALUES (?, ?, ?, ?, 1)
+        ON CONFLICT(archetype, side, price_zone) DO UPDATE SET wins = wins + excluded.wins, total = total + 1""",
+        (classify_archetype(title or ""), side or "?", price_zone(price or 0), int(bool(won))),
+    )
+
+
+def _compute_wr_rows(trades: list) -> Dict[Tuple[str, str, str], Dict]:
+    rows = {}
+    for t in trades:
+        key = (classify_archetype(t["title"]), t["side"], price_zone(t["price"]))
+        b = rows.setdefault(key, {"wins": 0, "total": 0})
+        b["total"] += 1
+        b["wins"] += int(bool(t["won"]))
+    return rows
+
+
+def rebuild_wr_stats() -> Dict:
+    """Recompute empirical_wr_stats from all resolved shadow + paper trades."""
+    rows = _compute_wr_rows(_load_resolved_trades())
+    db = _get_db()
+    db.execute("DELETE FROM empirical_wr_stats")
+    db.executemany(
+        "INSERT INTO empirical_wr_stats (archetype, side, price_zone, wins, total) VALUES (?, ?, ?, ?, ?)",
+        [(*key, b["wins"], b["total"]) for key, b in rows.items()],
+    )
+    db.execute("INSERT OR REPLACE INTO empirical_wr_meta (id, built_at) VALUES (1, datetime('now'))")
+    db.commit()
+    db.close()
+    return {"buckets": len(rows), "trades": sum(b["total"] for b in rows.values())}
+
+
+def check_wr_stats(repair: bool = True) -> Dict:
+    """Compare empirical_wr_stats against a full recompute, rebuilding on drift unless repair=False."""
+    expected = _compute_wr_rows(_load_resolved_trades())
+    actual = {(r["archetype"], r["side"], r["price_zone"]): {"wins": r["wins"], "total": r["total"]}
+              for r in _load_wr_stats()}
+    mismatches = [
+        {"key": "|".join(k), "actual": actual.get(k), "expected": expected.get(k)}
+        for k in set(actual) | set(expected)
+        if actual.get(k) != expected.get(k)
+    ]
+    rebuilt = bool(mismatches) and repair
+    if rebuilt:
+        logger.warning(f"Empirical WR stats drifted ({len(mismatches)} mismatches); rebuilding")
+        rebuild_wr_stats()
+    return {"consistent": not mismatches, "mismatches": mismatches, "rebuilt": rebuilt}
+
+
+def _load_wr_stats() -> list:
+    """Read the summary rows, building them on first use."""
+    try:
+        db = _get_db()
+        if db.execute("SELECT 1 FROM empirical_wr_meta WHERE id=1").fetchone() is None:
+            db.close()
+            rebuild_wr_stats()
+            db = _get_db()
+        rows = [dict(r) for r in db.execute("SELECT archetype, side, price_zone, wins, total FROM empirical_wr_stats").fetchall()]
+        db.close()
+        return rows
+    except Exception as e:
+        logger.error(f"Failed to load WR stats: {e}")
+        return []
+
+
 def _compute_wr_table(trades: list) -> Dict[str, Dict]:
     """Build WR lookup table keyed by (archetype, side)."""
     table = {}
@@ -232,10 +335,6 @@ def bayesian_smooth(prior_wr: float, bucket_wr: float, n: int, prior_weight: int
 
 # ─── Main Confidence Calculator ─────────────────────────────────────
 
-# Cache for WR table (refreshed each call — DB is small)
-_wr_cache = None
-_wr_cache_count = 0
-
 def calculate_empirical_confidence(
     title: str,
     side: str,
@@ -261,8 +360,6 @@ def calculate_empirical_confidence(
             "breakdown": dict,
         }
     """
-    global _wr_cache, _wr_cache_count
-
     archetype = override_archetype or classify_archetype(title)
     zone = price_zone(entry_price)
     zone_mod = PRICE_ZONE_MODIFIERS.get(zone, 1.0)
@@ -286,10 +383,12 @@ def calculate_empirical_confidence(
             "breakdown": {},
         }
 
-    # Load WR table
-    trades = _load_resolved_trades()
-    total_resolved = len(trades)
-    wr_table = _compute_wr_table(trades)
+    # Load WR summary rows and roll up the levels we need
+    stats = _load_wr_stats()
+    total_resolved = sum(r["total"] for r in stats)
+    total_wins = sum(r["wins"] for r in stats)
+    side_rows = [r for r in stats if r["archetype"] == archetype and r["side"] == side]
+    arch_rows = [r for r in stats if r["archetype"] == archetype]
 
     # Determine prior weight based on total sample size
     if total_resolved < 30:
@@ -303,27 +402,24 @@ def calculate_empirical_confidence(
 
     # Look up archetype|side WR
     key = f"{archetype}|{side}"
-    bucket = wr_table.get(key, {"wins": 0, "total": 0, "wr": 0.5})
-    base_wr = bucket["wr"]
+    bucket = {"wins": sum(r["wins"] for r in side_rows), "total": sum(r["total"] for r in side_rows)}
     n = bucket["total"]
+    base_wr = bucket["wins"] / n if n > 0 else 0.5
 
     # Also check the more specific archetype|side|zone bucket
     zone_key = f"{archetype}|{side}|{zone}"
-    zone_trades = [t for t in trades 
-                   if classify_archetype(t["title"]) == archetype 
-                   and t["side"] == side 
-                   and price_zone(t["price"]) == zone]
-    zone_n = len(zone_trades)
-    zone_wr = sum(t["won"] for t in zone_trades) / zone_n if zone_n > 0 else base_wr
+    zone_row = next((r for r in side_rows if r["price_zone"] == zone), None)
+    zone_n = zone_row["total"] if zone_row else 0
+    zone_wr = zone_row["wins"] / zone_n if zone_n > 0 else base_wr
 
     # Archetype-level prior (all sides combined)
     # Fall back to empirical priors from 159K resolved markets when no local data
     becker_prior = BECKER_NO_WIN_RATES.get(archetype, 0.593)
-    arch_trades = [t for t in trades if classify_archetype(t["title"]) == archetype]
-    arch_wr = sum(t["won"] for t in arch_trades) / len(arch_trades) if arch_trades else becker_prior
+    arch_n = sum(r["total"] for r in arch_rows)
+    arch_wr = sum(r["wins"] for r in arch_rows) / arch_n if arch_n else becker_prior
 
     # Overall system prior
-    overall_wr = sum(t["won"] for t in trades) / len(trades) if trades else 0.593
+    overall_wr = total_wins / total_resolved if total_resolved else 0.593
 
     # Two-level Bayesian smoothing:
     # 1. Smooth archetype|side bucket toward archetype prior
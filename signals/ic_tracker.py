@@ -3,18 +3,32 @@
 Records signal predictions at generation time, resolves them against outcomes,
 and computes per-source IC to identify which signal sources carry real alpha.
 
+Resolved predictions are also folded into prediction_stats — counts per
+(source, prediction day, confidence, outcome) — at resolve time. IC over a
+rolling window is computed exactly from those counts (tie-averaged ranks,
+same as scipy's spearmanr) plus the raw rows of the partial boundary day,
+so it never rescans the full history. The calibrator bins the same counts,
+and its decay curve reads prediction_decay_stats (the same counts keyed by
+resolution horizon instead of day). Both survive retention archiving the
+raw rows.
+`python signals/ic_tracker.py verify` checks them against a full recompute.
+
 IC thresholds:
   - KILL < 0.03 (source adds noise, not signal)
   - WARN < 0.05 (marginal, needs more data)
   - OK >= 0.05 (contributing alpha)
 """
 
+import math
+import os
 import sqlite3
+import sys
 import time
 import logging
+from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +36,10 @@ DB_PATH = Path(__file__).parent.parent / "storage" / "shadow_trades.db"
 
 IC_KILL = 0.03
 IC_WARN = 0.05
+MIN_IC_SAMPLES = 10
+
+# Decay horizons: (label, upper bound in hours since the prediction)
+DECAY_BUCKETS = (("< 6h", 6), ("6-24h", 24), ("1-3d", 72), ("3-7d", 168), ("7-30d", None))
 
 
 def _get_conn(db_path: str = None) -> sqlite3.Connection:
@@ -32,8 +50,28 @@ def _get_conn(db_path: str = None) -> sqlite3.Connection:
     return conn
 
 
+def _has_table(db_path: str, name: str) -> bool:
+    """True if the DB file exists and already has table ``name``.
+
+    Checked on every init rather than cached per path, so a DB file that is
+    deleted and recreated in the same process gets its tables again.
+    """
+    if not os.path.exists(db_path):
+        return False
+    conn = sqlite3.connect(db_path, timeout=10)
+    try:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
 def init_ic_tables(db_path: str = None):
     """Create IC tracking tables if not exists."""
+    path = db_path or str(DB_PATH)
+    if _has_table(path, "prediction_stats") and _has_table(path, "prediction_decay_stats"):
+        return
     conn = _get_conn(db_path)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS signal_predictions (
@@ -58,6 +96,10 @@ def init_ic_tables(db_path: str = None):
         CREATE INDEX IF NOT EXISTS idx_sp_unresolved
         ON signal_predictions(resolved, market_id)
     """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sp_ts
+        ON signal_predictions(timestamp)
+    """)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS ic_measurements (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,33 +115,145 @@ def init_ic_tables(db_path: str = None):
         CREATE INDEX IF NOT EXISTS idx_ic_source_ts
         ON ic_measurements(source, timestamp)
     """)
+    # Check-create-backfill under the write lock: a second process racing the
+    # first waits here, then finds the tables and skips the backfill
+    conn.execute("BEGIN IMMEDIATE")
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prediction_stats'"
+    ).fetchone()
+    if not has_stats:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS prediction_stats (
+                source TEXT NOT NULL,
+                day TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                outcome REAL NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (source, day, confidence, outcome)
+            )
+        """)
+        _backfill_stats(conn)  # Existing DB: fold in everything resolved so far
+    has_decay = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prediction_decay_stats'"
+    ).fetchone()
+    if not has_decay:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS prediction_decay_stats (
+                source TEXT NOT NULL,
+                horizon TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                outcome REAL NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (source, horizon, confidence, outcome)
+            )
+        """)
+        _backfill_decay_stats(conn)
     conn.commit()
     conn.close()
 
 
+_STATS_SELECT = """
+    SELECT source, date(timestamp, 'unixepoch'), confidence, outcome, COUNT(*)
+    FROM signal_predictions
+    WHERE {where}
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+def _backfill_stats(conn: sqlite3.Connection):
+    conn.execute("INSERT INTO prediction_stats (source, day, confidence, outcome, n) "
+                 + _STATS_SELECT.format(where="resolved = 1 AND outcome IS NOT NULL"))
+
+
+_DECAY_HORIZON = "CASE " + " ".join(
+    f"WHEN resolved_at - timestamp < {hours * 3600} THEN '{label}'"
+    for label, hours in DECAY_BUCKETS if hours is not None
+) + f" ELSE '{DECAY_BUCKETS[-1][0]}' END"
+
+_DECAY_SELECT = f"""
+    SELECT source, {_DECAY_HORIZON}, confidence, outcome, COUNT(*)
+    FROM signal_predictions
+    WHERE {{where}} AND resolved_at IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+def _backfill_decay_stats(conn: sqlite3.Connection):
+    conn.execute("INSERT INTO prediction_decay_stats (source, horizon, confidence, outcome, n) "
+                 + _DECAY_SELECT.format(where="resolved = 1 AND outcome IS NOT NULL"))
+
+
+def _accumulate_resolved(conn: sqlite3.Connection, ids: Iterable[int]):
+    """Add just-resolved predictions to prediction_stats and prediction_decay_stats (caller commits)."""
+    ids = list(ids)
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        where = f"id IN ({','.join('?' * len(chunk))}) AND outcome IS NOT NULL"
+        conn.execute(
+            "INSERT INTO prediction_stats (source, day, confidence, outcome, n) "
+            + _STATS_SELECT.format(where=where)
+            + " ON CONFLICT(source, day, confidence, outcome) DO UPDATE SET n = n + excluded.n",
+            chunk,
+        )
+        conn.execute(
+            "INSERT INTO prediction_decay_stats (source, horizon, confidence, outcome, n) "
+            + _DECAY_SELECT.format(where=where)
+            + " ON CONFLICT(source, horizon, confidence, outcome) DO UPDATE SET n = n + excluded.n",
+            chunk,
+        )
+
+
+def rebuild_prediction_stats(db_path: str = None) -> dict:
+    """Recompute prediction_stats and prediction_decay_stats from signal_predictions.
+
+    Note: rows archived by retention are gone from signal_predictions, so a
+    rebuild drops them from the stats too.
+    """
+    init_ic_tables(db_path)
+    conn = _get_conn(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("DELETE FROM prediction_stats")
+    conn.execute("DELETE FROM prediction_decay_stats")
+    _backfill_stats(conn)
+    _backfill_decay_stats(conn)
+    rows, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(n), 0) FROM prediction_stats").fetchone()
+    conn.commit()
+    conn.close()
+    return {"stats_rows": rows, "resolved_predictions": total}
+
+
 def record_signal_prediction(signal: dict, db_path: str = None):
     """Store a signal prediction for later IC calculation.
 
     Args:
         signal: Dict with keys: source, market_id, market, side, confidence, price
     """
+    record_signal_predictions([signal], db_path)
+
+
+def record_signal_predictions(signals: list, db_path: str = None) -> int:
+    """Store many signal predictions in one transaction. Returns rows written."""
+    if not signals:
+        return 0
     init_ic_tables(db_path)
+    now = time.time()
     conn = _get_conn(db_path)
-    conn.execute("""
+    conn.executemany("""
         INSERT INTO signal_predictions
         (timestamp, source, market_id, market_title, side, confidence, price_at_signal)
         VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        time.time(),
+    """, [(
+        now,
         signal.get("source", "unknown"),
         signal.get("market_id", ""),
         (signal.get("market", "") or "")[:200],
         signal.get("side", ""),
         signal.get("confidence", 0),
         signal.get("price", 0.5),
-    ))
+    ) for signal in signals])
     conn.commit()
     conn.close()
+    return len(signals)
 
 
 def resolve_prediction(market_id: str, outcome: float, db_path: str = None) -> int:
@@ -114,12 +268,17 @@ def resolve_prediction(market_id: str, outcome: float, db_path: str = None) -> i
     """
     init_ic_tables(db_path)
     conn = _get_conn(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    ids = [r[0] for r in conn.execute(
+        "SELECT id FROM signal_predictions WHERE market_id = ? AND resolved = 0", (market_id,)
+    )]
     cursor = conn.execute("""
         UPDATE signal_predictions
         SET resolved = 1, outcome = ?, resolved_at = ?
         WHERE market_id = ? AND resolved = 0
     """, (outcome, time.time(), market_id))
     count = cursor.rowcount
+    _accumulate_resolved(conn, ids)
     conn.commit()
     conn.close()
     return count
@@ -142,7 +301,7 @@ def resolve_from_shadow_trades(db_path: str = None) -> dict:
         WHERE sp.resolved = 0 AND st.resolved = 1
     """).fetchall()
 
-    resolved_count = 0
+    resolved_ids = []
     for row in rows:
         # outcome: 1.0 if prediction side matched, 0.0 otherwise
         trade_won = row["pnl"] > 0 if row["pnl"] is not None else None
@@ -154,11 +313,12 @@ def resolve_from_shadow_trades(db_path: str = None) -> dict:
             SET resolved = 1, outcome = ?, resolved_at = ?
             WHERE id = ?
         """, (outcome, time.time(), row["id"]))
-        resolved_count += 1
+        resolved_ids.append(row["id"])
 
+    _accumulate_resolved(conn, resolved_ids)
     conn.commit()
     conn.close()
-    return {"resolved": resolved_count, "checked": len(rows)}
+    return {"resolved": len(resolved_ids), "checked": len(rows)}
 
 
 def _spearman_rank_correlation(x: list, y: list) -> float:
@@ -199,46 +359,127 @@ def _spearman_rank_correlation(x: list, y: list) -> float:
     return rho
 
 
-def calculate_ic(source: str, window_days: int = 30, db_path: str = None) -> dict:
-    """Calculate Information Coefficient for a signal source.
+def _spearman_from_counts(counts: Dict[Tuple[float, float], int]) -> float:
+    """Spearman rho of the expanded (confidence, outcome) sample, from its counts.
 
-    IC = Spearman rank correlation between predicted confidence and realized outcome.
+    Pearson correlation of tie-averaged ranks — the same value scipy's
+    spearmanr gives on the expanded lists, in O(distinct values).
+    """
+    n = sum(counts.values())
+    if n < 3:
+        return 0.0
+    x_totals, y_totals = defaultdict(int), defaultdict(int)
+    for (x, y), c in counts.items():
+        x_totals[x] += c
+        y_totals[y] += c
+
+    def _avg_ranks(totals):
+        ranks, seen = {}, 0
+        for value in sorted(totals):
+            c = totals[value]
+            ranks[value] = seen + (c + 1) / 2.0
+            seen += c
+        return ranks
 
-    Args:
-        source: Signal source name
-        window_days: Lookback window in days
-        db_path: Optional DB path override
+    rx, ry = _avg_ranks(x_totals), _avg_ranks(y_totals)
+    mean = (n + 1) / 2.0
+    sxx = sum(c * (rx[x] - mean) ** 2 for x, c in x_totals.items())
+    syy = sum(c * (ry[y] - mean) ** 2 for y, c in y_totals.items())
+    if sxx <= 0 or syy <= 0:
+        return 0.0  # Constant input (spearmanr → NaN → 0.0)
+    sxy = sum(c * (rx[x] - mean) * (ry[y] - mean) for (x, y), c in counts.items())
+    return sxy / math.sqrt(sxx * syy)
 
-    Returns:
-        Dict with ic_value, sample_size, status, and metadata
+
+def _window_counts(conn: sqlite3.Connection, cutoff: float,
+                   source: str = None) -> Dict[str, Dict[Tuple[float, float], int]]:
+    """{source: {(confidence, outcome): n}} for resolved predictions with timestamp > cutoff.
+
+    Whole days come from prediction_stats; the partial day containing the
+    cutoff comes from raw rows (idx_sp_source_ts / idx_sp_ts).
+    """
+    cutoff_day = datetime.fromtimestamp(cutoff, tz=timezone.utc).strftime("%Y-%m-%d")
+    day_end = datetime.strptime(cutoff_day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() + 86400
+    source_sql, source_args = ("AND source = ?", (source,)) if source else ("", ())
+
+    counts: Dict[str, Dict[Tuple[float, float], int]] = defaultdict(lambda: defaultdict(int))
+    rows = conn.execute(f"""
+        SELECT source, confidence, outcome, SUM(n) FROM prediction_stats
+        WHERE day > ? {source_sql}
+        GROUP BY source, confidence, outcome
+    """, (cutoff_day, *source_args)).fetchall()
+    rows += conn.execute(f"""
+        SELECT source, confidence, outcome, COUNT(*) FROM signal_predictions
+        WHERE resolved = 1 AND outcome IS NOT NULL AND timestamp > ? AND timestamp < ? {source_sql}
+        GROUP BY source, confidence, outcome
+    """, (cutoff, day_end, *source_args)).fetchall()
+    for src, conf, outcome, n in rows:
+        counts[src][(float(conf), float(outcome))] += n
+    return counts
+
+
+def source_counts(source: str, window_days: Optional[int] = None,
+                  db_path: str = None) -> Dict[Tuple[float, float], int]:
+    """Resolved-prediction counts for one source: {(confidence, outcome): n}.
+
+    window_days=None means all history (straight from prediction_stats).
     """
     init_ic_tables(db_path)
     conn = _get_conn(db_path)
-    conn.row_factory = sqlite3.Row
-    cutoff = time.time() - (window_days * 86400)
+    try:
+        if window_days is not None:
+            return dict(_window_counts(conn, time.time() - window_days * 86400, source).get(source, {}))
+        rows = conn.execute("""
+            SELECT confidence, outcome, SUM(n) FROM prediction_stats
+            WHERE source = ? GROUP BY confidence, outcome
+        """, (source,)).fetchall()
+        return {(float(c), float(o)): n for c, o, n in rows}
+    finally:
+        conn.close()
 
-    rows = conn.execute("""
-        SELECT confidence, outcome
-        FROM signal_predictions
-        WHERE source = ? AND resolved = 1 AND timestamp > ?
-        ORDER BY timestamp
-    """, (source, cutoff)).fetchall()
-    conn.close()
 
-    if len(rows) < 10:
+def source_totals(db_path: str = None) -> Dict[str, int]:
+    """All-time resolved-prediction count per source, from prediction_stats."""
+    init_ic_tables(db_path)
+    conn = _get_conn(db_path)
+    try:
+        return dict(conn.execute("SELECT source, SUM(n) FROM prediction_stats GROUP BY source").fetchall())
+    finally:
+        conn.close()
+
+
+def decay_counts(source: str, db_path: str = None) -> Dict[str, Dict[Tuple[float, float], int]]:
+    """Resolved-prediction counts for one source by horizon: {horizon: {(confidence, outcome): n}}.
+
+    Every DECAY_BUCKETS label is present, in order, even when empty.
+    """
+    init_ic_tables(db_path)
+    conn = _get_conn(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT horizon, confidence, outcome, n FROM prediction_decay_stats WHERE source = ?
+        """, (source,)).fetchall()
+    finally:
+        conn.close()
+    counts: Dict[str, Dict[Tuple[float, float], int]] = {label: {} for label, _ in DECAY_BUCKETS}
+    for horizon, conf, outcome, n in rows:
+        counts.setdefault(horizon, {})[(float(conf), float(outcome))] = n
+    return counts
+
+
+def _ic_result(source: str, counts: Dict[Tuple[float, float], int], window_days: int) -> dict:
+    sample_size = sum(counts.values())
+    if sample_size < MIN_IC_SAMPLES:
         return {
             "source": source,
             "ic_value": None,
-            "sample_size": len(rows),
+            "sample_size": sample_size,
             "window_days": window_days,
             "status": "insufficient_data",
-            "min_required": 10,
+            "min_required": MIN_IC_SAMPLES,
         }
 
-    confidences = [float(r["confidence"]) for r in rows]
-    outcomes = [float(r["outcome"]) for r in rows]
-
-    ic = _spearman_rank_correlation(confidences, outcomes)
+    ic = _spearman_from_counts(counts)
 
     # Determine status
     if abs(ic) < IC_KILL:
@@ -248,26 +489,49 @@ def calculate_ic(source: str, window_days: int = 30, db_path: str = None) -> dic
     else:
         status = "OK"
 
-    # Store measurement
+    return {
+        "source": source,
+        "ic_value": round(ic, 6),
+        "sample_size": sample_size,
+        "window_days": window_days,
+        "status": status,
+        "thresholds": {"kill": IC_KILL, "warn": IC_WARN},
+    }
+
+
+def _store_measurements(results: list, db_path: str = None):
+    rows = [(time.time(), r["source"], r["ic_value"], r["sample_size"], r["window_days"], r["status"])
+            for r in results if r["ic_value"] is not None]
+    if not rows:
+        return
     try:
         conn = _get_conn(db_path)
-        conn.execute("""
+        conn.executemany("""
             INSERT INTO ic_measurements (timestamp, source, ic_value, sample_size, window_days, status)
             VALUES (?, ?, ?, ?, ?, ?)
-        """, (time.time(), source, round(ic, 6), len(rows), window_days, status))
+        """, rows)
         conn.commit()
         conn.close()
     except Exception:
         pass
 
-    return {
-        "source": source,
-        "ic_value": round(ic, 6),
-        "sample_size": len(rows),
-        "window_days": window_days,
-        "status": status,
-        "thresholds": {"kill": IC_KILL, "warn": IC_WARN},
-    }
+
+def calculate_ic(source: str, window_days: int = 30, db_path: str = None) -> dict:
+    """Calculate Information Coefficient for a signal source.
+
+    IC = Spearman rank correlation between predicted confidence and realized outcome.
+
+    Args:
+        source: Signal source name
+        window_days: Lookback window in days
+        db_path: Optional DB path override
+
+    Returns:
+        Dict with ic_value, sample_size, status, and metadata
+    """
+    result = _ic_result(source, source_counts(source, window_days, db_path), window_days)
+    _store_measurements([result], db_path)
+    return result
 
 
 def ic_report(window_days: int = 30, db_path: str = None) -> dict:
@@ -278,21 +542,12 @@ def ic_report(window_days: int = 30, db_path: str = None) -> dict:
     """
     init_ic_tables(db_path)
     conn = _get_conn(db_path)
-    conn.row_factory = sqlite3.Row
-    cutoff = time.time() - (window_days * 86400)
-
-    # Get all sources with resolved predictions
-    sources = conn.execute("""
-        SELECT DISTINCT source, COUNT(*) as count
-        FROM signal_predictions
-        WHERE resolved = 1 AND timestamp > ?
-        GROUP BY source
-    """, (cutoff,)).fetchall()
+    counts = _window_counts(conn, time.time() - (window_days * 86400))
 
     # Total unresolved
     unresolved = conn.execute("""
         SELECT COUNT(*) as count FROM signal_predictions WHERE resolved = 0
-    """).fetchone()["count"]
+    """).fetchone()[0]
 
     conn.close()
 
@@ -300,15 +555,15 @@ def ic_report(window_days: int = 30, db_path: str = None) -> dict:
     kill_list = []
     warn_list = []
 
-    for row in sources:
-        source = row["source"]
-        ic_data = calculate_ic(source, window_days, db_path)
+    for source, source_counts_ in counts.items():
+        ic_data = _ic_result(source, source_counts_, window_days)
         source_ics[source] = ic_data
 
         if ic_data["status"] == "KILL":
             kill_list.append(source)
         elif ic_data["status"] == "WARN":
             warn_list.append(source)
+    _store_measurements(list(source_ics.values()), db_path)
 
     # Aggregate IC (average of non-None ICs)
     valid_ics = [v["ic_value"] for v in source_ics.values() if v["ic_value"] is not None]
@@ -318,7 +573,7 @@ def ic_report(window_days: int = 30, db_path: str = None) -> dict:
         "window_days": window_days,
         "sources": source_ics,
         "aggregate_ic": round(avg_ic, 6) if avg_ic is not None else None,
-        "total_resolved": sum(r["count"] for r in sources),
+        "total_resolved": sum(sum(c.values()) for c in counts.values()),
         "total_unresolved": unresolved,
         "kill_list": kill_list,
         "warn_list": warn_list,
@@ -328,3 +583,73 @@ def ic_report(window_days: int = 30, db_path: str = None) -> dict:
         },
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
+
+
+def verify_prediction_stats(window_days: int = 30, db_path: str = None, tolerance: float = 1e-9) -> dict:
+    """Compare the incremental stats against a full recompute from signal_predictions.
+
+    Per source, checks both the all-time counts (calibration input) and the
+    windowed IC (spearmanr over the raw rows). Sources with history archived
+    by retention show up as count mismatches — the stats still hold those rows.
+    """
+    init_ic_tables(db_path)
+    conn = _get_conn(db_path)
+    cutoff = time.time() - window_days * 86400
+    raw_all: Dict[str, Dict[Tuple[float, float], int]] = defaultdict(lambda: defaultdict(int))
+    raw_window: Dict[str, list] = defaultdict(list)
+    for src, ts, conf, outcome in conn.execute("""
+        SELECT source, timestamp, confidence, outcome FROM signal_predictions
+        WHERE resolved = 1 AND outcome IS NOT NULL
+    """):
+        raw_all[src][(float(conf), float(outcome))] += 1
+        if ts > cutoff:
+            raw_window[src].append((float(conf), float(outcome)))
+    stats_all: Dict[str, Dict[Tuple[float, float], int]] = defaultdict(dict)
+    for src, conf, outcome, n in conn.execute("""
+        SELECT source, confidence, outcome, SUM(n) FROM prediction_stats GROUP BY source, confidence, outcome
+    """):
+        stats_all[src][(float(conf), float(outcome))] = n
+    window = _window_counts(conn, cutoff)
+    conn.close()
+
+    sources = {}
+    mismatches = []
+    for src in sorted(set(raw_all) | set(stats_all)):
+        pairs = raw_window.get(src, [])
+        full_ic = _spearman_rank_correlation([p[0] for p in pairs], [p[1] for p in pairs]) \
+            if len(pairs) >= MIN_IC_SAMPLES else None
+        incremental = window.get(src, {})
+        inc_ic = _spearman_from_counts(incremental) if sum(incremental.values()) >= MIN_IC_SAMPLES else None
+        counts_match = dict(raw_all.get(src, {})) == stats_all.get(src, {})
+        ic_match = (full_ic is None and inc_ic is None) or (
+            full_ic is not None and inc_ic is not None and abs(full_ic - inc_ic) <= tolerance
+        )
+        sources[src] = {
+            "resolved_raw": sum(raw_all.get(src, {}).values()),
+            "resolved_stats": sum(stats_all.get(src, {}).values()),
+            "window_samples": len(pairs),
+            "ic_full": round(full_ic, 9) if full_ic is not None else None,
+            "ic_incremental": round(inc_ic, 9) if inc_ic is not None else None,
+            "counts_match": counts_match,
+            "ic_match": ic_match,
+        }
+        if not (counts_match and ic_match):
+            mismatches.append(src)
+
+    return {"ok": not mismatches, "window_days": window_days, "sources": sources, "mismatches": mismatches}
+
+
+if __name__ == "__main__":
+    import json
+    logging.basicConfig(level=logging.INFO)
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "report"
+    if cmd == "verify":
+        result = verify_prediction_stats()
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result["ok"] else 1)
+    elif cmd == "rebuild":
+        print(json.dumps(rebuild_prediction_stats(), indent=2))
+    elif cmd == "report":
+        print(json.dumps(ic_report(), indent=2))
+    else:
+        print("Usage: python ic_tracker.py [report|verify|rebuild]")
@@ -311,7 +311,26 @@ def _fetch_json(url: str, timeout: int = 12) -> Any:
 
 
 def fetch_kalshi_markets(pages: int = 3, per_page: int = 30, status: str = "open") -> List[Dict]:
-    """Fetch active markets from Kalshi with pagination."""
+    """Fetch active markets from Kalshi with pagination.
+
+    Open markets come from the shared Kalshi market store, which already
+    holds the whole open universe (targeted series included) with each
+    event's category; `pages`/`per_page` only apply to the direct fetch.
+    """
+    if status == "open":
+        try:
+            from odds.kalshi_edge import market_store
+        except ImportError:
+            market_store = None
+        if market_store is not None:
+            store = market_store()
+            markets = store.markets()
+            if len(store):
+                for m in markets:
+                    m["volume"] = int(float(m.get("volume_fp", "0") or "0"))
+                logger.info(f"Kalshi: {len(markets)} open markets from the market store")
+                return markets
+
     all_markets = []
     seen_tickers = set()
     cursor = None
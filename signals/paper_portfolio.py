@@ -7,7 +7,22 @@ Falls back to JSON state files (~/.openclaw/paper-trading/) when SQLite is empty
 import json
 import sqlite3
 try:
-    from empirical_confidence import calculate_empirical_confidence
+    try:
+        from empirical_confidence import (
+            calculate_empirical_confidence,
+            check_wr_stats,
+            rebuild_wr_stats,
+            record_resolved_trade,
+        )
+        from empirical_confidence import price_zone as _price_zone
+    except ImportError:
+        from signals.empirical_confidence import (
+            calculate_empirical_confidence,
+            check_wr_stats,
+            rebuild_wr_stats,
+            record_resolved_trade,
+        )
+        from signals.empirical_confidence import price_zone as _price_zone
     HAS_EMPIRICAL = True
 except ImportError:
     HAS_EMPIRICAL = False
@@ -31,6 +46,11 @@ try:
     HAS_MOMENTUM = True
 except ImportError:
     HAS_MOMENTUM = False
+try:
+    from odds.orderbook import Book, simulate_fill
+    HAS_FILL_SIM = True
+except ImportError:
+    HAS_FILL_SIM = False
 import logging
 import math
 from datetime import datetime, timezone
@@ -120,14 +140,11 @@ def _get_dynamic_kelly(conn) -> Dict[str, Any]:
         {"fraction": float, "rolling_wr": float, "rolling_trades": int,
          "drawdown_pct": float, "status": str, "reason": str}
     """
-    # Rolling win rate from last N closed trades
-    rows = conn.execute(
-        "SELECT status FROM paper_positions WHERE status IN ('won','lost') ORDER BY closed_at DESC LIMIT ?",
-        (KELLY_ROLLING_WINDOW,)
-    ).fetchall()
+    # Rolling win rate from last N closed trades (maintained window, no rescan)
+    recent = (_get_running_stats(conn)["recent_outcomes"] or "")[-KELLY_ROLLING_WINDOW:]
 
-    rolling_trades = len(rows)
-    wins = sum(1 for r in rows if r["status"] == "won")
+    rolling_trades = len(recent)
+    wins = recent.count("W")
     rolling_wr = wins / rolling_trades if rolling_trades > 0 else 0.5
 
     # Current drawdown
@@ -246,6 +263,41 @@ def _init_tables(conn: sqlite3.Connection):
             current_drawdown_pct REAL DEFAULT 0,
             sharpe_estimate REAL DEFAULT 0
         );
+        CREATE TABLE IF NOT EXISTS paper_portfolio_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            event TEXT NOT NULL,
+            position_id INTEGER,
+            payload TEXT
+        );
+        CREATE TABLE IF NOT EXISTS paper_archetype_stats (
+            archetype TEXT NOT NULL,
+            side TEXT NOT NULL,
+            price_zone TEXT NOT NULL,
+            open_count INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            losses INTEGER DEFAULT 0,
+            pnl REAL DEFAULT 0,
+            bet_total REAL DEFAULT 0,
+            hold_days_sum REAL DEFAULT 0,
+            hold_count INTEGER DEFAULT 0,
+            PRIMARY KEY (archetype, side, price_zone)
+        );
+        CREATE TABLE IF NOT EXISTS paper_archetype_pnl_points (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            archetype TEXT NOT NULL,
+            closed_at TEXT,
+            cumulative_pnl REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_pnl_points_archetype ON paper_archetype_pnl_points(archetype, id);
+        CREATE TABLE IF NOT EXISTS paper_running_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            closed_count INTEGER DEFAULT 0,
+            pnl_sum REAL DEFAULT 0,
+            pnl_sq_sum REAL DEFAULT 0,
+            recent_outcomes TEXT DEFAULT '',
+            built_at TEXT
+        );
     """)
     # Migration: add archetype column if missing
     try:
@@ -259,7 +311,16 @@ def _init_tables(conn: sqlite3.Connection):
         conn.commit()
     except sqlite3.OperationalError:
         pass  # Column already exists
+    # Migration: add market_slug column if missing (written by open_position)
+    try:
+        conn.execute("ALTER TABLE paper_positions ADD COLUMN market_slug TEXT DEFAULT ''")
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass  # Column already exists
     conn.commit()
+    # One-shot build of summary tables for databases that predate them
+    if conn.execute("SELECT 1 FROM paper_running_stats WHERE id=1").fetchone() is None:
+        rebuild_summaries(conn)
 
 
 def _get_bankroll(conn) -> float:
@@ -296,12 +357,12 @@ def _save_state(conn, bankroll, pnl_change=0):
     drawdown = (peak - bankroll) / peak if peak > 0 else 0
     max_dd = max(drawdown, prev["max_drawdown"] if prev else 0)
     
-    # Simple Sharpe: mean pnl / std pnl from closed trades
-    closed = conn.execute("SELECT pnl FROM paper_positions WHERE status IN ('won','lost')").fetchall()
-    if len(closed) >= 2:
-        pnls = [r["pnl"] for r in closed]
-        mean_pnl = sum(pnls) / len(pnls)
-        var = sum((p - mean_pnl)**2 for p in pnls) / len(pnls)
+    # Simple Sharpe: mean pnl / std pnl from closed trades (running sums, no rescan)
+    stats = _get_running_stats(conn)
+    n = stats["closed_count"]
+    if n >= 2:
+        mean_pnl = stats["pnl_sum"] / n
+        var = max(stats["pnl_sq_sum"] / n - mean_pnl ** 2, 0)
         std = math.sqrt(var) if var > 0 else 1
         sharpe = (mean_pnl / std) * math.sqrt(252) if std > 0 else 0
     else:
@@ -314,6 +375,278 @@ def _save_state(conn, bankroll, pnl_change=0):
     conn.commit()
 
 
+# ─── Summary Tables ─────────────────────────────────────────
+# Aggregates maintained incrementally on open/close so dashboard and Kelly
+# reads cost O(#archetypes) instead of rescanning paper_positions:
+#   paper_archetype_stats       per archetype/side/price-zone counts, P&L, hold time
+#   paper_archetype_pnl_points  per-archetype cumulative P&L, one row per close
+#   paper_running_stats         closed count, P&L sum/sum-of-squares, recent W/L window
+# rebuild_summaries() recomputes them from paper_positions; check_summaries()
+# compares the two and rebuilds on drift.
+
+def _zone(entry_price: Optional[float]) -> str:
+    if not HAS_EMPIRICAL or entry_price is None:
+        return "unknown"
+    return _price_zone(entry_price)
+
+
+def _hold_days(opened_at: Optional[str], closed_at: Optional[str]) -> Optional[float]:
+    if not opened_at or not closed_at:
+        return None
+    try:
+        opened = datetime.fromisoformat(opened_at.replace("Z", "+00:00"))
+        closed_dt = datetime.fromisoformat(closed_at.replace("Z", "+00:00"))
+        return (closed_dt - opened).total_seconds() / 86400
+    except Exception:
+        return None
+
+
+def _get_running_stats(conn) -> sqlite3.Row:
+    row = conn.execute("SELECT * FROM paper_running_stats WHERE id=1").fetchone()
+    if row is None:
+        rebuild_summaries(conn)
+        row = conn.execute("SELECT * FROM paper_running_stats WHERE id=1").fetchone()
+    return row
+
+
+def _apply_open(conn, archetype: str, side: str, entry_price: float):
+    """Count a newly opened position. Caller commits."""
+    conn.execute(
+        """INSERT INTO paper_archetype_stats (archetype, side, price_zone, open_count) VALUES (?, ?, ?, 1)
+        ON CONFLICT(archetype, side, price_zone) DO UPDATE SET open_count = open_count + 1""",
+        (archetype or "other", side, _zone(entry_price)),
+    )
+
+
+def _apply_close(conn, pos, outcome: str, pnl: float, closed_at: str):
+    """Fold a closed position into every summary table. Caller commits."""
+    archetype = pos["archetype"] or "other"
+    pnl = round(pnl, 2)  # Same precision as paper_positions.pnl
+    won = outcome == "won"
+    hold = _hold_days(pos["opened_at"], closed_at)
+
+    conn.execute(
+        """INSERT INTO paper_archetype_stats
+            (archetype, side, price_zone, open_count, wins, losses, pnl, bet_total, hold_days_sum, hold_count)
+        VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(archetype, side, price_zone) DO UPDATE SET
+            open_count = MAX(open_count - 1, 0),
+            wins = wins + excluded.wins, losses = losses + excluded.losses,
+            pnl = pnl + excluded.pnl, bet_total = bet_total + excluded.bet_total,
+            hold_days_sum = hold_days_sum + excluded.hold_days_sum, hold_count = hold_count + excluded.hold_count""",
+        (archetype, pos["side"], _zone(pos["entry_price"]), int(won), int(not won), pnl,
+         pos["bet_size"] or 0, hold or 0.0, int(hold is not None)),
+    )
+
+    last = conn.execute(
+        "SELECT cumulative_pnl FROM paper_archetype_pnl_points WHERE archetype=? ORDER BY id DESC LIMIT 1",
+        (archetype,),
+    ).fetchone()
+    conn.execute(
+        "INSERT INTO paper_archetype_pnl_points (archetype, closed_at, cumulative_pnl) VALUES (?, ?, ?)",
+        (archetype, closed_at, (last["cumulative_pnl"] if last else 0.0) + pnl),
+    )
+
+    stats = _get_running_stats(conn)
+    recent = ((stats["recent_outcomes"] or "") + ("W" if won else "L"))[-KELLY_ROLLING_WINDOW:]
+    conn.execute(
+        """UPDATE paper_running_stats SET closed_count = closed_count + 1, pnl_sum = pnl_sum + ?,
+            pnl_sq_sum = pnl_sq_sum + ?, recent_outcomes = ? WHERE id=1""",
+        (pnl, pnl * pnl, recent),
+    )
+
+    if HAS_EMPIRICAL:
+        try:
+            record_resolved_trade(conn, pos["market_title"] or "", pos["side"], pos["entry_price"], won)
+        except Exception as e:
+            logger.debug("Empirical WR update failed: %s", e)
+
+
+def _compute_summaries(conn) -> dict:
+    """Full recompute of the summary tables' contents from paper_positions."""
+    stats: Dict[tuple, dict] = {}
+    points = []
+    cumulative: Dict[str, float] = {}
+    outcomes = []
+    pnl_sum = pnl_sq_sum = 0.0
+
+    for row in conn.execute(
+        "SELECT archetype, side, entry_price, bet_size, status, pnl, opened_at, closed_at FROM paper_positions "
+        "WHERE status IN ('open','won','lost') ORDER BY (status='open'), closed_at ASC, id ASC"
+    ).fetchall():
+        arch = row["archetype"] or "other"
+        key = (arch, row["side"], _zone(row["entry_price"]))
+        b = stats.setdefault(key, {"open_count": 0, "wins": 0, "losses": 0, "pnl": 0.0,
+                                   "bet_total": 0.0, "hold_days_sum": 0.0, "hold_count": 0})
+        if row["status"] == "open":
+            b["open_count"] += 1
+            continue
+        pnl = row["pnl"] or 0.0
+        b["wins" if row["status"] == "won" else "losses"] += 1
+        b["pnl"] += pnl
+        b["bet_total"] += row["bet_size"] or 0
+        hold = _hold_days(row["opened_at"], row["closed_at"])
+        if hold is not None:
+            b["hold_days_sum"] += hold
+            b["hold_count"] += 1
+        cumulative[arch] = cumulative.get(arch, 0.0) + pnl
+        points.append((arch, row["closed_at"], cumulative[arch]))
+        outcomes.append("W" if row["status"] == "won" else "L")
+        pnl_sum += pnl
+        pnl_sq_sum += pnl * pnl
+
+    return {
+        "stats": stats,
+        "points": points,
+        "running": {
+            "closed_count": len(outcomes),
+            "pnl_sum": pnl_sum,
+            "pnl_sq_sum": pnl_sq_sum,
+            "recent_outcomes": "".join(outcomes)[-KELLY_ROLLING_WINDOW:],
+        },
+    }
+
+
+def rebuild_summaries(conn=None) -> dict:
+    """Recompute all summary tables from paper_positions. Returns row counts."""
+    own = conn is None
+    if own:
+        conn = _get_db()
+    data = _compute_summaries(conn)
+    conn.execute("DELETE FROM paper_archetype_stats")
+    conn.execute("DELETE FROM paper_archetype_pnl_points")
+    conn.executemany(
+        """INSERT INTO paper_archetype_stats
+            (archetype, side, price_zone, open_count, wins, losses, pnl, bet_total, hold_days_sum, hold_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [(*key, b["open_count"], b["wins"], b["losses"], b["pnl"], b["bet_total"], b["hold_days_sum"], b["hold_count"])
+         for key, b in data["stats"].items()],
+    )
+    conn.executemany(
+        "INSERT INTO paper_archetype_pnl_points (archetype, closed_at, cumulative_pnl) VALUES (?, ?, ?)",
+        data["points"],
+    )
+    r = data["running"]
+    conn.execute(
+        """INSERT OR REPLACE INTO paper_running_stats (id, closed_count, pnl_sum, pnl_sq_sum, recent_outcomes, built_at)
+        VALUES (1, ?, ?, ?, ?, ?)""",
+        (r["closed_count"], r["pnl_sum"], r["pnl_sq_sum"], r["recent_outcomes"], datetime.now(timezone.utc).isoformat()),
+    )
+    conn.commit()
+    if own:
+        conn.close()
+    logger.info("Paper summaries rebuilt: %d buckets, %d P&L points, %d closed",
+                len(data["stats"]), len(data["points"]), r["closed_count"])
+    return {"buckets": len(data["stats"]), "pnl_points": len(data["points"]), "closed": r["closed_count"]}
+
+
+def check_summaries(tolerance: float = 0.01, repair: bool = True) -> dict:
+    """Compare incrementally maintained summaries against a full recompute.
+
+    The meta row only records that the tables were built once, so drift found
+    here is repaired with a full rebuild unless repair=False.
+    """
+    conn = _get_db()
+    expected = _compute_summaries(conn)
+    mismatches = []
+
+    actual = {
+        (r["archetype"], r["side"], r["price_zone"]): dict(r)
+        for r in conn.execute("SELECT * FROM paper_archetype_stats").fetchall()
+    }
+    for key in set(actual) | set(expected["stats"]):
+        a = actual.get(key, {})
+        e = expected["stats"].get(key, {})
+        for field in ("open_count", "wins", "losses", "pnl", "bet_total", "hold_days_sum", "hold_count"):
+            if abs((a.get(field) or 0) - (e.get(field) or 0)) > tolerance:
+                mismatches.append({"table": "paper_archetype_stats", "key": "|".join(key), "field": field,
+                                   "actual": a.get(field), "expected": e.get(field)})
+
+    finals: Dict[str, list] = {}
+    for arch, _, cum in expected["points"]:
+        finals[arch] = [cum, finals.get(arch, [0, 0])[1] + 1]
+    for row in conn.execute(
+        "SELECT archetype, COUNT(*) AS n, "
+        "(SELECT cumulative_pnl FROM paper_archetype_pnl_points q WHERE q.archetype = p.archetype ORDER BY id DESC LIMIT 1) AS last "
+        "FROM paper_archetype_pnl_points p GROUP BY archetype"
+    ).fetchall():
+        cum, n = finals.pop(row["archetype"], [0.0, 0])
+        if abs(row["last"] - cum) > tolerance or row["n"] != n:
+            mismatches.append({"table": "paper_archetype_pnl_points", "key": row["archetype"], "field": "cumulative_pnl",
+                               "actual": [row["last"], row["n"]], "expected": [cum, n]})
+    for arch, (cum, n) in finals.items():
+        mismatches.append({"table": "paper_archetype_pnl_points", "key": arch, "field": "cumulative_pnl",
+                           "actual": None, "expected": [cum, n]})
+
+    running = _get_running_stats(conn)
+    for field, value in expected["running"].items():
+        got = running[field]
+        if (abs(got - value) > tolerance) if isinstance(value, float) else got != value:
+            mismatches.append({"table": "paper_running_stats", "key": "1", "field": field,
+                               "actual": got, "expected": value})
+    rebuilt = bool(mismatches) and repair
+    if rebuilt:
+        logger.warning("Paper summaries drifted (%d mismatches); rebuilding", len(mismatches))
+        rebuild_summaries(conn)
+    conn.close()
+
+    return {"consistent": not mismatches, "mismatches": mismatches, "rebuilt": rebuilt}
+
+
+# ─── Portfolio Events ───────────────────────────────────────
+# Every open/close is appended to paper_portfolio_events and the latest event id
+# is mirrored to a small version file. Readers (dashboard snapshot cache, SSE
+# stream) stat that file to detect changes without touching SQLite.
+
+def _version_path() -> Path:
+    return DB_PATH.parent / "paper_portfolio.version"
+
+
+def _record_event(conn, event: str, position_id: Optional[int], payload: dict) -> int:
+    """Append a portfolio event and bump the version file. Commits."""
+    cur = conn.execute(
+        "INSERT INTO paper_portfolio_events (timestamp, event, position_id, payload) VALUES (?, ?, ?, ?)",
+        (datetime.now(timezone.utc).isoformat(), event, position_id, json.dumps(payload)),
+    )
+    conn.commit()
+    event_id = cur.lastrowid
+    try:
+        path = _version_path()
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(str(event_id))
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning("Portfolio version file update failed: %s", e)
+    return event_id
+
+
+def get_portfolio_version() -> int:
+    """Id of the latest portfolio event (0 if none) — file read only, no DB work."""
+    try:
+        return int(_version_path().read_text().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def get_portfolio_events(since_id: int = 0, limit: int = 100) -> list:
+    """Return portfolio events with id > since_id, oldest first."""
+    conn = _get_db()
+    rows = conn.execute(
+        "SELECT id, timestamp, event, position_id, payload FROM paper_portfolio_events WHERE id > ? ORDER BY id ASC LIMIT ?",
+        (since_id, limit),
+    ).fetchall()
+    conn.close()
+    events = []
+    for r in rows:
+        e = dict(r)
+        try:
+            e["payload"] = json.loads(e["payload"]) if e["payload"] else {}
+        except (TypeError, ValueError):
+            e["payload"] = {}
+        events.append(e)
+    return events
+
+
 def evaluate_signal(signal: dict) -> dict:
     """Check if signal meets criteria, calculate bet size."""
     confidence = signal.get("confidence", 0)
@@ -549,6 +882,30 @@ def evaluate_signal(signal: dict) -> dict:
     return {"eligible": True, "bet_size": round(bet_size, 2), "edge": round(edge, 4), "kelly_pct": round(kelly_pct, 4), "reason": "Criteria met", "empirical": empirical_result, "volume_spike": volume_spike_data, "time_decay": time_decay_data, "score_velocity": score_velocity_data, "kelly": kelly_data}
 
 
+def _simulate_entry(signal: dict, side: str, bet_size: float) -> Optional[dict]:
+    """Price the entry against the signal's YES order book, if it carries one.
+
+    ``signal["orderbook"]`` may be an odds.orderbook.Book or a raw CLOB /book
+    response for the YES token; NO entries walk its complement. Returns the
+    YES-terms VWAP entry price and the dollars that actually fill.
+    """
+    book = signal.get("orderbook")
+    if not HAS_FILL_SIM or book is None:
+        return None
+    try:
+        if not isinstance(book, Book):
+            book = Book.from_clob(book)
+        fill = simulate_fill(book if side == "YES" else book.complement(), "buy", notional=bet_size,
+                             limit_price=MAX_PRICE)
+    except Exception as e:
+        logger.debug("Fill simulation skipped: %s", e)
+        return None
+    if fill.vwap is None:
+        return {"filled": 0.0, "entry_price": None, "fill": fill}
+    entry_price = fill.vwap if side == "YES" else 1 - fill.vwap
+    return {"filled": fill.notional, "entry_price": round(entry_price, 4), "fill": fill}
+
+
 def open_position(signal: dict) -> dict:
     """Open a paper position if criteria met."""
     eval_result = evaluate_signal(signal)
@@ -641,14 +998,40 @@ def open_position(signal: dict) -> dict:
         conn.close()
         return {"opened": False, "reason": cap_reason, "archetype": archetype, "edge": eval_result["edge"]}
 
+    # Depth-aware entry: pay the VWAP our size would actually get, and only what fills
+    fill_data = None
+    sim = _simulate_entry(signal, side, bet_size)
+    if sim is not None:
+        if sim["filled"] < MIN_BET:
+            conn.close()
+            return {"opened": False, "reason": f"Book depth fills ${sim['filled']:.2f} < ${MIN_BET:.0f} minimum",
+                    "archetype": archetype, "edge": eval_result["edge"]}
+        fill = sim["fill"]
+        fill_data = {"vwap": fill.vwap, "best_price": fill.best_price, "slippage": fill.slippage,
+                     "shares": fill.shares, "levels_used": fill.levels_used, "complete": fill.complete,
+                     "quoted_price": market_price}
+        market_price = sim["entry_price"]
+        bet_size = sim["filled"]
+        if side == "YES":
+            potential_payout = bet_size * (1 / market_price - 1)
+        else:
+            potential_payout = bet_size * (1 / (1 - market_price) - 1)
+        logger.info("Fill sim: market=%s vwap=%.4f slippage=%.4f filled=%.2f levels=%d",
+                    market_id[:30], fill.vwap, fill.slippage, bet_size, fill.levels_used)
+
     slug = signal.get("event_slug") or signal.get("slug") or ""
-    conn.execute("""INSERT INTO paper_positions
+    cur = conn.execute("""INSERT INTO paper_positions
         (opened_at, market_id, market_title, platform, side, entry_price, bet_size, potential_payout, confidence, edge_pct, status, archetype, strategy, market_slug)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'open', ?, ?, ?)""",
         (datetime.now(timezone.utc).isoformat(), market_id, market_title,
          signal.get("platform", "kalshi"), side, market_price, bet_size,
          round(potential_payout, 2), confidence, eval_result["edge"], archetype, strategy, slug))
+    _apply_open(conn, archetype, side, market_price)
     conn.commit()
+    _record_event(conn, "opened", cur.lastrowid, {
+        "market_id": market_id, "market_title": market_title, "side": side,
+        "entry_price": market_price, "bet_size": round(bet_size, 2), "archetype": archetype,
+    })
     conn.close()
 
     # Discord alert
@@ -659,7 +1042,7 @@ def open_position(signal: dict) -> dict:
     except Exception as e:
         logger.debug("Discord alert failed: %s", e)
 
-    return {"opened": True, "market_id": market_id, "side": side, "bet_size": bet_size, "edge": eval_result["edge"], "potential_payout": round(potential_payout, 2), "archetype": archetype}
+    return {"opened": True, "market_id": market_id, "side": side, "bet_size": bet_size, "edge": eval_result["edge"], "potential_payout": round(potential_payout, 2), "archetype": archetype, "fill": fill_data}
 
 
 def close_position(market_id: str, outcome: str, exit_price: float = None) -> dict:
@@ -683,14 +1066,20 @@ def close_position(market_id: str, outcome: str, exit_price: float = None) -> di
         pnl = -bet_size
     
     bankroll = _get_bankroll(conn) + pnl
+    closed_at = datetime.now(timezone.utc).isoformat()
     
     conn.execute("""UPDATE paper_positions SET status=?, closed_at=?, exit_price=?, pnl=?, close_reason=?
         WHERE id=?""",
-        (outcome, datetime.now(timezone.utc).isoformat(), exit_price or (1.0 if outcome == "won" else 0.0),
+        (outcome, closed_at, exit_price or (1.0 if outcome == "won" else 0.0),
          round(pnl, 2), outcome, pos["id"]))
+    _apply_close(conn, pos, outcome, pnl, closed_at)
     conn.commit()
     
     _save_state(conn, bankroll, pnl)
+    _record_event(conn, "closed", pos["id"], {
+        "market_id": market_id, "archetype": pos["archetype"] or "other", "side": side,
+        "outcome": outcome, "pnl": round(pnl, 2), "bankroll": round(bankroll, 2),
+    })
     conn.close()
 
     # Log resolution for learning system (tweet_count_mc, weather_ensemble)
@@ -856,8 +1245,9 @@ def get_portfolio_status() -> dict:
 
     open_positions = [dict(r) for r in conn.execute("SELECT * FROM paper_positions WHERE status='open' ORDER BY opened_at DESC").fetchall()]
 
-    closed_count = conn.execute("SELECT COUNT(*) as c FROM paper_positions WHERE status IN ('won','lost')").fetchone()["c"]
-    won_count = conn.execute("SELECT COUNT(*) as c FROM paper_positions WHERE status='won'").fetchone()["c"]
+    counts = conn.execute("SELECT SUM(wins) AS w, SUM(losses) AS l FROM paper_archetype_stats").fetchone()
+    won_count = counts["w"] or 0
+    closed_count = won_count + (counts["l"] or 0)
 
     conn.close()
 
@@ -1053,68 +1443,54 @@ def get_live_positions() -> dict:
     }
 
 
-def get_archetype_breakdown() -> dict:
-    """Compute win rate and P&L breakdown by archetype from closed trades."""
-    conn = _get_db()
-    closed = conn.execute(
-        "SELECT archetype, status, pnl, bet_size, opened_at, closed_at FROM paper_positions WHERE status IN ('won','lost')"
-    ).fetchall()
+def backfill_archetypes() -> int:
+    """Classify archetype for pre-migration positions (NULL, empty, or default 'other').
 
-    # Backfill archetype for pre-migration positions (NULL, empty, or default 'other')
+    Runs from the resolve job rather than on dashboard reads. Returns rows changed.
+    """
+    conn = _get_db()
     nulls = conn.execute(
-        "SELECT id, market_title FROM paper_positions WHERE archetype IS NULL OR archetype = '' OR archetype = 'other'"
+        "SELECT id, market_title, archetype FROM paper_positions WHERE archetype IS NULL OR archetype = '' OR archetype = 'other'"
     ).fetchall()
+    changed = 0
     if nulls:
         try:
             from mispriced_category_signal import classify_archetype
             for row in nulls:
                 arch = classify_archetype(row["market_title"])
-                conn.execute("UPDATE paper_positions SET archetype=? WHERE id=?", (arch, row["id"]))
+                if arch != row["archetype"]:
+                    conn.execute("UPDATE paper_positions SET archetype=? WHERE id=?", (arch, row["id"]))
+                    changed += 1
             conn.commit()
-            # Re-fetch
-            closed = conn.execute(
-                "SELECT archetype, status, pnl, bet_size, opened_at, closed_at FROM paper_positions WHERE status IN ('won','lost')"
-            ).fetchall()
-        except Exception:
-            pass
+        except Exception as e:
+            logger.debug("Archetype backfill failed: %s", e)
+    if changed:
+        rebuild_summaries(conn)
+        _record_event(conn, "archetypes_backfilled", None, {"count": changed})
+    conn.close()
+    return changed
 
+
+def get_archetype_breakdown() -> dict:
+    """Compute win rate and P&L breakdown by archetype from closed trades."""
+    conn = _get_db()
+    rows = conn.execute(
+        """SELECT archetype, SUM(wins) AS wins, SUM(losses) AS losses, SUM(pnl) AS pnl, SUM(bet_total) AS bet_total,
+            SUM(hold_days_sum) AS hold_days_sum, SUM(hold_count) AS hold_count
+        FROM paper_archetype_stats GROUP BY archetype HAVING SUM(wins) + SUM(losses) > 0"""
+    ).fetchall()
     conn.close()
 
-    buckets = {}
     total_hold_days = 0
     total_closed = 0
-
-    for row in closed:
-        arch = row["archetype"] or "other"
-        if arch not in buckets:
-            buckets[arch] = {"wins": 0, "losses": 0, "pnl": 0.0, "bet_total": 0.0, "hold_days": []}
-
-        b = buckets[arch]
-        if row["status"] == "won":
-            b["wins"] += 1
-        else:
-            b["losses"] += 1
-        b["pnl"] += row["pnl"] or 0
-        b["bet_total"] += row["bet_size"] or 0
-
-        # Hold time
-        if row["opened_at"] and row["closed_at"]:
-            try:
-                opened = datetime.fromisoformat(row["opened_at"].replace("Z", "+00:00"))
-                closed_dt = datetime.fromisoformat(row["closed_at"].replace("Z", "+00:00"))
-                days = (closed_dt - opened).total_seconds() / 86400
-                b["hold_days"].append(days)
-                total_hold_days += days
-                total_closed += 1
-            except Exception:
-                pass
-
     breakdown = []
-    for arch, b in sorted(buckets.items(), key=lambda x: x[1]["wins"] + x[1]["losses"], reverse=True):
+    for b in sorted(rows, key=lambda r: r["wins"] + r["losses"], reverse=True):
         total = b["wins"] + b["losses"]
-        avg_hold = sum(b["hold_days"]) / len(b["hold_days"]) if b["hold_days"] else 0
+        avg_hold = b["hold_days_sum"] / b["hold_count"] if b["hold_count"] else 0
+        total_hold_days += b["hold_days_sum"]
+        total_closed += b["hold_count"]
         breakdown.append({
-            "archetype": arch,
+            "archetype": b["archetype"],
             "trades": total,
             "wins": b["wins"],
             "losses": b["losses"],
@@ -1140,17 +1516,12 @@ def get_archetype_cumulative_pnl() -> dict:
     """
     conn = _get_db()
     rows = conn.execute(
-        "SELECT archetype, pnl, closed_at FROM paper_positions WHERE status IN ('won','lost') ORDER BY closed_at ASC"
+        "SELECT archetype, cumulative_pnl, closed_at FROM paper_archetype_pnl_points ORDER BY id ASC"
     ).fetchall()
     conn.close()
 
-    series = {}
+    series: Dict[str, list] = {}
     for row in rows:
-        arch = row["archetype"] or "other"
-        if arch not in series:
-            series[arch] = {"points": [], "running": 0.0}
-        s = series[arch]
-        s["running"] += row["pnl"] or 0
         dt = row["closed_at"]
         label = ""
         if dt:
@@ -1159,11 +1530,22 @@ def get_archetype_cumulative_pnl() -> dict:
                 label = f"{d.month}/{d.day}"
             except Exception:
                 label = dt[:10]
-        s["points"].append({"date": label, "pnl": round(s["running"], 2)})
+        series.setdefault(row["archetype"], []).append({"date": label, "pnl": round(row["cumulative_pnl"], 2)})
 
-    return {
-        arch: s["points"] for arch, s in series.items()
-    }
+    return series
+
+
+def get_equity_curve() -> list:
+    """Bankroll after every close — paper_portfolio_state is appended once per close by _save_state."""
+    conn = _get_db()
+    rows = conn.execute(
+        "SELECT timestamp, bankroll FROM paper_portfolio_state ORDER BY id ASC"
+    ).fetchall()
+    conn.close()
+    curve = [{"t": "", "v": STARTING_BANKROLL}]
+    for r in rows:
+        curve.append({"t": r["timestamp"], "v": r["bankroll"]})
+    return curve
 
 
 def close_position_by_id(position_id: int, outcome: str) -> dict:
@@ -1187,13 +1569,19 @@ def close_position_by_id(position_id: int, outcome: str) -> dict:
         pnl = -bet_size
 
     bankroll = _get_bankroll(conn) + pnl
+    closed_at = datetime.now(timezone.utc).isoformat()
 
     conn.execute("""UPDATE paper_positions SET status=?, closed_at=?, exit_price=?, pnl=?, close_reason=?
         WHERE id=?""",
-        (outcome, datetime.now(timezone.utc).isoformat(),
+        (outcome, closed_at,
          1.0 if outcome == "won" else 0.0, round(pnl, 2), f"manual: {outcome}", pos["id"]))
+    _apply_close(conn, pos, outcome, pnl, closed_at)
     conn.commit()
     _save_state(conn, bankroll, pnl)
+    _record_event(conn, "closed", pos["id"], {
+        "market_id": pos["market_id"], "archetype": pos["archetype"] or "other", "side": side,
+        "outcome": outcome, "pnl": round(pnl, 2), "bankroll": round(bankroll, 2),
+    })
     conn.close()
 
     return {
@@ -1301,6 +1689,8 @@ def resolve_open_positions() -> dict:
 
         return None
 
+    backfill_archetypes()
+
     conn = _get_db()
     open_positions = conn.execute("SELECT * FROM paper_positions WHERE status='open'").fetchall()
 
@@ -1345,20 +1735,59 @@ def resolve_open_positions() -> dict:
             pnl = -bet_size
             status = "lost"
 
+        closed_at = datetime.now(timezone.utc).isoformat()
         conn.execute("""UPDATE paper_positions SET status=?, closed_at=?, exit_price=?, pnl=?, close_reason=?
             WHERE id=?""",
-            (status, datetime.now(timezone.utc).isoformat(),
+            (status, closed_at,
              1.0 if won else 0.0, round(pnl, 2), f"auto-resolved: {outcome}", pos["id"]))
+        _apply_close(conn, pos, status, pnl, closed_at)
 
         resolved += 1
         total_pnl += pnl
-        details.append({"market": (pos["market_title"] or "")[:60], "outcome": outcome, "side": side, "won": won, "pnl": round(pnl, 2)})
+        details.append({"market": (pos["market_title"] or "")[:60], "outcome": outcome, "side": side, "won": won, "pnl": round(pnl, 2),
+                        "position_id": pos["id"], "market_id": market_id, "archetype": pos["archetype"] or "other", "status": status})
         logger.info(f"Resolved: {pos['market_title'][:50]} → {outcome} ({'WON' if won else 'LOST'} ${pnl:+.2f})")
 
     if resolved > 0:
         conn.commit()
         bankroll = _get_bankroll(conn) + total_pnl
         _save_state(conn, bankroll, total_pnl)
+        for d in details:
+            _record_event(conn, "closed", d.pop("position_id"), {
+                "market_id": d.pop("market_id"), "archetype": d.pop("archetype"), "side": d["side"],
+                "outcome": d.pop("status"), "pnl": d["pnl"], "bankroll": round(bankroll, 2),
+            })
     
     conn.close()
     return {"resolved": resolved, "total_pnl": round(total_pnl, 2), "details": details}
+
+
+def main():
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if cmd == "status":
+        print(json.dumps(get_portfolio_status(), indent=2, default=str))
+
+    elif cmd == "rebuild-summaries":
+        print(json.dumps(rebuild_summaries(), indent=2))
+        if HAS_EMPIRICAL:
+            print(json.dumps(rebuild_wr_stats(), indent=2))
+
+    elif cmd == "check-summaries":
+        result = check_summaries()
+        if HAS_EMPIRICAL:
+            result["empirical_wr"] = check_wr_stats()
+            result["consistent"] = result["consistent"] and result["empirical_wr"]["consistent"]
+        print(json.dumps(result, indent=2, default=str))
+        sys.exit(0 if result["consistent"] else 1)
+
+    else:
+        print(f"Usage: {sys.argv[0]} [status|rebuild-summaries|check-summaries]")
+
+
+if __name__ == "__main__":
+    main()
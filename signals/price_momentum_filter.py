@@ -7,7 +7,7 @@ Thesis: Fading peak optimism, not catching falling knives.
 - YES flat (±5%) → standard signal → allow
 - YES falling 5%+ → market self-correcting → skip (no edge left)
 
-Uses signal_snapshots table for price history.
+Uses signal_snapshots table for price history (epoch `ts` + (market_id, ts) index).
 """
 
 import logging
@@ -16,6 +16,11 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+try:
+    from shadow_tracker import migrate_snapshot_ts
+except ImportError:
+    from signals.shadow_tracker import migrate_snapshot_ts
+
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).parent.parent
@@ -26,6 +31,7 @@ RISING_THRESHOLD = 0.05    # +5% = rising (FOMO)
 FALLING_THRESHOLD = -0.05  # -5% = falling (self-correcting)
 LOOKBACK_HOURS = 24        # Window for momentum calculation
 MIN_DATA_POINTS = 2        # Need at least 2 snapshots for trend
+QUERY_CHUNK = 500          # Market ids per IN (...) — stays under SQLite's 999 bound-variable limit
 
 
 def _get_db() -> sqlite3.Connection:
@@ -36,33 +42,52 @@ def _get_db() -> sqlite3.Connection:
     return conn
 
 
-def get_price_history(market_id: str, hours: int = LOOKBACK_HOURS, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
-    """Get price snapshots for a market over the lookback window."""
+def get_price_histories(market_ids: List[str], hours: int = LOOKBACK_HOURS,
+                        conn: Optional[sqlite3.Connection] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Price snapshots for many markets over the lookback window in one indexed query.
+
+    Returns {market_id: [{"price", "snapshot_time", "volume"}, ...]} oldest first;
+    markets without history map to an empty list.
+    """
     close_conn = False
     if conn is None:
         conn = _get_db()
         close_conn = True
-
-    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
-
-    rows = conn.execute(
-        """SELECT price, snapshot_time, volume
-           FROM signal_snapshots
-           WHERE market_id = ? AND price IS NOT NULL AND price > 0
-           AND snapshot_time >= ?
-           ORDER BY id ASC""",
-        (market_id, cutoff)
-    ).fetchall()
+    migrate_snapshot_ts(conn)
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp()
+    ids = list(dict.fromkeys(market_ids))
+    histories: Dict[str, List[Dict[str, Any]]] = {m: [] for m in ids}
+
+    for i in range(0, len(ids), QUERY_CHUNK):
+        chunk = ids[i:i + QUERY_CHUNK]
+        rows = conn.execute(
+            f"""SELECT market_id, price, snapshot_time, volume
+               FROM signal_snapshots
+               WHERE market_id IN ({",".join("?" * len(chunk))}) AND ts >= ?
+               AND price IS NOT NULL AND price > 0
+               ORDER BY market_id, ts ASC, id ASC""",
+            (*chunk, cutoff)
+        ).fetchall()
+        for r in rows:
+            histories[r["market_id"]].append({"price": r["price"], "snapshot_time": r["snapshot_time"], "volume": r["volume"]})
 
     if close_conn:
         conn.close()
+    return histories
 
-    return [dict(r) for r in rows]
 
+def get_price_history(market_id: str, hours: int = LOOKBACK_HOURS, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    """Get price snapshots for a market over the lookback window."""
+    return get_price_histories([market_id], hours, conn)[market_id]
 
-def calculate_momentum(market_id: str, current_price: float = None, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+
+def calculate_momentum(market_id: str, current_price: float = None, conn: Optional[sqlite3.Connection] = None,
+                       history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Calculate YES price momentum for a market.
 
+    Pass `history` (from get_price_histories) to skip the per-market query.
+
     Returns:
         {
             "momentum": float,         # Price change as fraction (-1 to +inf)
@@ -74,7 +99,8 @@ def calculate_momentum(market_id: str, current_price: float = None, conn: Option
             "recommendation": str,     # "enter" | "skip" | "boost"
         }
     """
-    history = get_price_history(market_id, LOOKBACK_HOURS, conn)
+    if history is None:
+        history = get_price_history(market_id, LOOKBACK_HOURS, conn)
 
     if len(history) < MIN_DATA_POINTS and current_price is None:
         logger.debug("Insufficient price history: market=%s points=%d", market_id[:30], len(history))
@@ -155,7 +181,8 @@ def calculate_momentum(market_id: str, current_price: float = None, conn: Option
     }
 
 
-def check_entry(market_id: str, current_price: float, side: str = "NO", conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+def check_entry(market_id: str, current_price: float, side: str = "NO", conn: Optional[sqlite3.Connection] = None,
+                history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Check if momentum allows entry for this side.
 
     For NO bets:
@@ -171,7 +198,7 @@ def check_entry(market_id: str, current_price: float, side: str = "NO", conn: Op
     if side != "NO":
         return {"allow": True, "multiplier": 1.0, "momentum_data": None}
 
-    mom = calculate_momentum(market_id, current_price, conn)
+    mom = calculate_momentum(market_id, current_price, conn, history=history)
 
     if mom["recommendation"] == "skip":
         return {
@@ -200,6 +227,10 @@ def enrich_signals(signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         return signals
 
     conn = _get_db()
+    histories = get_price_histories(
+        [sig.get("market_id") or sig.get("ticker") or sig.get("id", "") for sig in signals], LOOKBACK_HOURS, conn
+    )
+    conn.close()
     boosted = 0
     skipped = 0
 
@@ -219,7 +250,7 @@ def enrich_signals(signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             sig["momentum_action"] = "enter"
             continue
 
-        result = check_entry(market_id, price, side, conn)
+        result = check_entry(market_id, price, side, history=histories[market_id])
         mom = result.get("momentum_data") or {}
 
         sig["momentum_direction"] = mom.get("direction", "unknown")
@@ -231,6 +262,5 @@ def enrich_signals(signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         elif result.get("multiplier", 1.0) > 1.0:
             boosted += 1
 
-    conn.close()
     logger.info("Momentum enrichment: %d boosted, %d would-skip out of %d signals", boosted, skipped, len(signals))
     return signals
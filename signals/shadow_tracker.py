@@ -22,6 +22,15 @@ from datetime import datetime, timedelta, timezone, date
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+try:
+    try:
+        from empirical_confidence import record_resolved_trade
+    except ImportError:
+        from signals.empirical_confidence import record_resolved_trade
+    HAS_EMPIRICAL = True
+except ImportError:
+    HAS_EMPIRICAL = False
+
 logger = logging.getLogger(__name__)
 
 # Paths
@@ -114,7 +123,8 @@ def _init_tables(conn: sqlite3.Connection):
             days_to_close REAL,
             confirmations INTEGER,
             reasoning TEXT,
-            raw_json TEXT
+            raw_json TEXT,
+            ts REAL
         );
 
         CREATE INDEX IF NOT EXISTS idx_trades_resolved ON shadow_trades(resolved);
@@ -131,6 +141,36 @@ def _init_tables(conn: sqlite3.Connection):
     except sqlite3.OperationalError:
         pass  # Column already exists
 
+    migrate_snapshot_ts(conn)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_market_ts ON signal_snapshots(market_id, ts)")
+    conn.commit()
+
+
+def migrate_snapshot_ts(conn: sqlite3.Connection) -> int:
+    """Add the epoch `ts` column to signal_snapshots and backfill it once.
+
+    Window queries used to filter on (snapshot_date || ' ' || snapshot_time),
+    which no index can serve. `ts` plus idx_snapshots_market_ts turns a
+    per-market time window into an index range scan. Returns rows backfilled.
+    """
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(signal_snapshots)").fetchall()}
+    if not cols or "ts" in cols:
+        return 0
+
+    conn.execute("ALTER TABLE signal_snapshots ADD COLUMN ts REAL")
+    # snapshot_time is a full ISO timestamp; very old rows stored only HH:MM
+    cur = conn.execute("""
+        UPDATE signal_snapshots SET ts = ROUND((julianday(
+            CASE WHEN snapshot_time LIKE '____-__-__%' THEN snapshot_time
+                 ELSE snapshot_date || ' ' || snapshot_time END
+        ) - 2440587.5) * 86400.0, 3)
+        WHERE ts IS NULL
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_market_ts ON signal_snapshots(market_id, ts)")
+    conn.commit()
+    logger.info(f"Backfilled signal_snapshots.ts for {cur.rowcount} rows")
+    return cur.rowcount
+
 
 def _migrate_legacy_json(conn: sqlite3.Connection):
     """Import trades from legacy JSON file into SQLite."""
@@ -188,7 +228,8 @@ def save_signal_snapshot(signals: List[Dict], source: str = "all"):
     """Save all current signals to daily snapshot table + file."""
     conn = get_db()
     today = date.today().isoformat()
-    now = datetime.now(timezone.utc).isoformat()
+    now_dt = datetime.now(timezone.utc)
+    now = now_dt.isoformat()
 
     # Save to SQLite
     for sig in signals:
@@ -210,8 +251,8 @@ def save_signal_snapshot(signals: List[Dict], source: str = "all"):
                 INSERT INTO signal_snapshots
                 (snapshot_date, snapshot_time, source, platform, market_id,
                  market, category, side, price, confidence, volume,
-                 days_to_close, confirmations, reasoning, raw_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 days_to_close, confirmations, reasoning, raw_json, ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 today, now,
                 sig.get("source", source),
@@ -227,6 +268,7 @@ def save_signal_snapshot(signals: List[Dict], source: str = "all"):
                 sig.get("confirmations"),
                 sig.get("reasoning", "")[:500],
                 json.dumps(sig)[:2000],
+                now_dt.timestamp(),
             ))
         except Exception as e:
             logger.debug(f"Snapshot insert error: {e}")
@@ -549,6 +591,11 @@ def resolve_trades(batch_size: int = 15, delay: float = 0.3) -> Dict[str, Any]:
             1.0 if result == side else 0.0,
             row["id"],
         ))
+        if HAS_EMPIRICAL:
+            try:
+                record_resolved_trade(conn, row["market"] or "", row["side"], row["entry_price"], row["side"] == result)
+            except Exception as e:
+                logger.warning(f"Empirical WR update failed for shadow trade {row['id']}: {e}")
 
         total_pnl += pnl
         resolved_count += 1
@@ -19,6 +19,8 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).parent.parent
@@ -52,6 +54,15 @@ MOMENTUM_COEFF = 0.3
 T_DF = 4
 # Min snapshots for vol calculation
 MIN_SNAPSHOTS = 20
+# Vol / momentum lookback windows (hours)
+VOL_WINDOW_HOURS = 168
+MOMENTUM_WINDOW_HOURS = 6
+# A higher strike may not price P(above) more than this over a lower one
+LADDER_TOLERANCE = 0.01
+# Parsed-title cache bound
+MAX_CACHED_CONTRACTS = 20000
+# Metadata keys parse_strike_market reads the expiry from
+EXPIRY_KEYS = ("end_date_iso", "end_date", "expiry", "expiration", "endDate")
 
 # Gamma API for fetching markets
 GAMMA_API = "https://gamma-api.polymarket.com"
@@ -89,9 +100,136 @@ def _normal_cdf(x: float) -> float:
     return 0.5 * (1 + math.erf(x / math.sqrt(2)))
 
 
+def _student_t_cdf_array(x: np.ndarray, df: int = 4) -> np.ndarray:
+    """Vectorized _student_t_cdf: one scipy call for a whole strike ladder."""
+    x = np.asarray(x, dtype=float)
+    try:
+        from scipy.stats import t
+        return np.asarray(t.cdf(x, df), dtype=float)
+    except ImportError:
+        pass
+    g1 = (x * (1 + 1 / (4 * df))) / np.sqrt(1 + x * x / (2 * df))
+    return np.array([_normal_cdf(g) for g in g1.ravel().tolist()]).reshape(x.shape)
+
+
+def _vol_from_rows(rows) -> Optional[float]:
+    """Daily vol from ascending (timestamp, price) snapshot rows; None if too few."""
+    if len(rows) < MIN_SNAPSHOTS:
+        return None
+
+    # Compute log returns
+    prices = [r["price"] for r in rows]
+    log_returns = []
+    for i in range(1, len(prices)):
+        if prices[i - 1] > 0 and prices[i] > 0:
+            log_returns.append(math.log(prices[i] / prices[i - 1]))
+
+    if len(log_returns) < 2:
+        return None
+
+    # Compute std of returns
+    mean_ret = sum(log_returns) / len(log_returns)
+    variance = sum((r - mean_ret) ** 2 for r in log_returns) / (len(log_returns) - 1)
+    std_ret = math.sqrt(variance)
+
+    # Estimate snapshots per day from actual timestamps
+    try:
+        first_ts = datetime.fromisoformat(rows[0]["timestamp"].replace("Z", "+00:00"))
+        last_ts = datetime.fromisoformat(rows[-1]["timestamp"].replace("Z", "+00:00"))
+        total_hours = max((last_ts - first_ts).total_seconds() / 3600, 1)
+        snapshots_per_day = (len(rows) / total_hours) * 24
+    except Exception:
+        snapshots_per_day = 144  # default: every 10 min
+
+    # Annualize to daily vol
+    return std_ret * math.sqrt(snapshots_per_day)
+
+
+def _momentum_from_rows(rows, daily_vol: Optional[float]) -> Optional[float]:
+    """Regression momentum in [-1, +1] from ascending snapshot rows; None if too few."""
+    if len(rows) < 3:
+        return None
+
+    # Linear regression: price vs time index
+    prices = [r["price"] for r in rows]
+    n = len(prices)
+    x_vals = list(range(n))
+    x_mean = (n - 1) / 2
+    y_mean = sum(prices) / n
+
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_vals, prices))
+    denominator = sum((x - x_mean) ** 2 for x in x_vals)
+
+    if denominator == 0:
+        return 0.0
+
+    slope = numerator / denominator  # price change per snapshot
+
+    # Normalize: slope / (daily_vol * current_price)
+    current_price = prices[-1]
+    if not daily_vol or daily_vol == 0 or current_price == 0:
+        return 0.0
+
+    # slope is per-snapshot; convert to per-day equivalent
+    try:
+        first_ts = datetime.fromisoformat(rows[0]["timestamp"].replace("Z", "+00:00"))
+        last_ts = datetime.fromisoformat(rows[-1]["timestamp"].replace("Z", "+00:00"))
+        hours_span = max((last_ts - first_ts).total_seconds() / 3600, 0.1)
+        snapshots_per_day = (n / hours_span) * 24
+    except Exception:
+        snapshots_per_day = 144
+
+    slope_per_day = slope * snapshots_per_day
+    momentum = slope_per_day / (daily_vol * current_price)
+
+    # Clamp to [-1, +1]
+    momentum = max(-1.0, min(1.0, momentum))
+    logger.debug("Momentum: %.3f (slope=%.2f/snap, vol=%.4f, price=%.0f)",
+                 momentum, slope, daily_vol, current_price)
+    return round(momentum, 4)
+
+
+def _market_prices(market: dict) -> Tuple[Optional[float], Optional[float]]:
+    """(yes, no) prices from whichever field the market carries."""
+    yes_price = None
+    no_price = None
+
+    # Try various field names
+    for key in ("yes_price", "outcomePrices", "bestBid", "lastTradePrice"):
+        val = market.get(key)
+        if val is not None:
+            if isinstance(val, str):
+                try:
+                    val = json.loads(val)
+                except (json.JSONDecodeError, TypeError):
+                    try:
+                        val = float(val)
+                    except (ValueError, TypeError):
+                        continue
+            if isinstance(val, list) and len(val) >= 2:
+                yes_price = float(val[0])
+                no_price = float(val[1])
+            elif isinstance(val, (int, float)):
+                yes_price = float(val)
+                no_price = 1 - yes_price
+            break
+
+    if yes_price is None:
+        # Try tokens array (Polymarket CLOB format)
+        tokens = market.get("tokens", [])
+        if tokens and len(tokens) >= 2:
+            yes_price = float(tokens[0].get("price", 0))
+            no_price = float(tokens[1].get("price", 0))
+
+    return yes_price, no_price
+
+
 class StrikeProbabilityCalculator:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or str(DB_PATH)
+        self._contracts: Dict[tuple, Optional[Dict[str, Any]]] = {}
+        self._contracts_day = None
+        self.stats = {"contract_parses": 0, "contract_hits": 0, "ladders": 0, "symbols": 0, "scored": 0}
 
     def _get_db(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path, timeout=10)
@@ -227,257 +365,163 @@ class StrikeProbabilityCalculator:
         logger.debug("Parsed strike market: %s", result)
         return result
 
-    def get_realized_vol(self, symbol: str, window_hours: int = 168) -> Optional[float]:
-        """Compute annualized daily volatility from price_snapshots.
-
-        Returns daily vol as a decimal (e.g., 0.021 = 2.1%/day), or None if insufficient data.
-        """
-        conn = self._get_db()
+    def _snapshot_rows(self, conn, symbol: str, window_hours: int):
         cutoff = (datetime.now(timezone.utc) - timedelta(hours=window_hours)).isoformat()
-
-        rows = conn.execute(
+        return conn.execute(
             """SELECT timestamp, price FROM price_snapshots
                WHERE symbol = ? AND timestamp >= ? AND price > 0
                ORDER BY timestamp ASC""",
             (symbol, cutoff)
         ).fetchall()
-        conn.close()
 
-        if len(rows) < MIN_SNAPSHOTS:
-            logger.debug("Insufficient snapshots for vol: %s has %d (need %d)", symbol, len(rows), MIN_SNAPSHOTS)
-            return None
+    def get_realized_vol(self, symbol: str, window_hours: int = VOL_WINDOW_HOURS) -> Optional[float]:
+        """Compute annualized daily volatility from price_snapshots.
 
-        # Compute log returns
-        prices = [r["price"] for r in rows]
-        log_returns = []
-        for i in range(1, len(prices)):
-            if prices[i - 1] > 0 and prices[i] > 0:
-                log_returns.append(math.log(prices[i] / prices[i - 1]))
+        Returns daily vol as a decimal (e.g., 0.021 = 2.1%/day), or None if insufficient data.
+        """
+        conn = self._get_db()
+        rows = self._snapshot_rows(conn, symbol, window_hours)
+        conn.close()
 
-        if len(log_returns) < 2:
+        daily_vol = _vol_from_rows(rows)
+        if daily_vol is None:
+            logger.debug("Insufficient snapshots for vol: %s has %d (need %d)", symbol, len(rows), MIN_SNAPSHOTS)
             return None
-
-        # Compute std of returns
-        mean_ret = sum(log_returns) / len(log_returns)
-        variance = sum((r - mean_ret) ** 2 for r in log_returns) / (len(log_returns) - 1)
-        std_ret = math.sqrt(variance)
-
-        # Estimate snapshots per day from actual timestamps
-        try:
-            first_ts = datetime.fromisoformat(rows[0]["timestamp"].replace("Z", "+00:00"))
-            last_ts = datetime.fromisoformat(rows[-1]["timestamp"].replace("Z", "+00:00"))
-            total_hours = max((last_ts - first_ts).total_seconds() / 3600, 1)
-            snapshots_per_day = (len(rows) / total_hours) * 24
-        except Exception:
-            snapshots_per_day = 144  # default: every 10 min
-
-        # Annualize to daily vol
-        daily_vol = std_ret * math.sqrt(snapshots_per_day)
-
-        logger.debug("Realized vol for %s: %.4f daily (%.1f%%) from %d snapshots, %.1f/day",
-                      symbol, daily_vol, daily_vol * 100, len(rows), snapshots_per_day)
+        logger.debug("Realized vol for %s: %.4f daily (%.1f%%) from %d snapshots",
+                     symbol, daily_vol, daily_vol * 100, len(rows))
         return daily_vol
 
-    def get_momentum(self, symbol: str, window_hours: int = 6) -> Optional[float]:
+    def get_momentum(self, symbol: str, window_hours: int = MOMENTUM_WINDOW_HOURS) -> Optional[float]:
         """Compute normalized momentum score via linear regression on recent snapshots.
 
         Returns score in [-1, +1], or None if insufficient data.
         """
         conn = self._get_db()
-        cutoff = (datetime.now(timezone.utc) - timedelta(hours=window_hours)).isoformat()
-
-        rows = conn.execute(
-            """SELECT timestamp, price FROM price_snapshots
-               WHERE symbol = ? AND timestamp >= ? AND price > 0
-               ORDER BY timestamp ASC""",
-            (symbol, cutoff)
-        ).fetchall()
+        rows = self._snapshot_rows(conn, symbol, window_hours)
         conn.close()
 
         if len(rows) < 3:
             logger.debug("Insufficient snapshots for momentum: %s has %d", symbol, len(rows))
             return None
+        return _momentum_from_rows(rows, self.get_realized_vol(symbol))
 
-        # Linear regression: price vs time index
-        prices = [r["price"] for r in rows]
-        n = len(prices)
-        x_vals = list(range(n))
-        x_mean = (n - 1) / 2
-        y_mean = sum(prices) / n
-
-        numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_vals, prices))
-        denominator = sum((x - x_mean) ** 2 for x in x_vals)
-
-        if denominator == 0:
-            return 0.0
-
-        slope = numerator / denominator  # price change per snapshot
-
-        # Normalize: slope / (daily_vol * current_price)
-        current_price = prices[-1]
-        daily_vol = self.get_realized_vol(symbol)
-
-        if not daily_vol or daily_vol == 0 or current_price == 0:
-            return 0.0
-
-        # slope is per-snapshot; convert to per-day equivalent
-        try:
-            first_ts = datetime.fromisoformat(rows[0]["timestamp"].replace("Z", "+00:00"))
-            last_ts = datetime.fromisoformat(rows[-1]["timestamp"].replace("Z", "+00:00"))
-            hours_span = max((last_ts - first_ts).total_seconds() / 3600, 0.1)
-            snapshots_per_day = (n / hours_span) * 24
-        except Exception:
-            snapshots_per_day = 144
-
-        slope_per_day = slope * snapshots_per_day
-        momentum = slope_per_day / (daily_vol * current_price)
-
-        # Clamp to [-1, +1]
-        momentum = max(-1.0, min(1.0, momentum))
-
-        logger.debug("Momentum for %s: %.3f (slope=%.2f/snap, vol=%.4f, price=%.0f)",
-                      symbol, momentum, slope, daily_vol, current_price)
-        return round(momentum, 4)
-
-    def calculate_probability(self, symbol: str, strike: float, direction: str,
-                              days_left: float) -> Optional[Dict[str, Any]]:
-        """Calculate probability of asset reaching strike price.
+    def get_market_inputs(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Current price, daily vol and momentum for a symbol from one DB pass.
 
-        Returns dict with prob, vol, momentum, z_score, current_price or None on failure.
+        Shared by every strike on the symbol; None when price or vol is missing.
         """
         conn = self._get_db()
         row = conn.execute(
             "SELECT price FROM price_snapshots WHERE symbol = ? AND price > 0 ORDER BY timestamp DESC LIMIT 1",
             (symbol,)
         ).fetchone()
-        conn.close()
-
         if not row:
+            conn.close()
             logger.debug("No current price for %s", symbol)
             return None
+        rows = self._snapshot_rows(conn, symbol, VOL_WINDOW_HOURS)
+        conn.close()
 
-        current_price = row["price"]
-        daily_vol = self.get_realized_vol(symbol)
-
+        daily_vol = _vol_from_rows(rows)
         if daily_vol is None or daily_vol <= 0:
             logger.debug("No vol available for %s", symbol)
             return None
 
-        if days_left <= 0:
-            logger.debug("Non-positive days_left: %.2f", days_left)
-            return None
-
-        distance_pct = (strike - current_price) / current_price
-        vol_over_period = daily_vol * math.sqrt(days_left)
-
-        if vol_over_period <= 0:
-            return None
-
-        z_score = distance_pct / vol_over_period
+        # Momentum window is a suffix of the vol window (same ISO-string comparison as the SQL)
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=MOMENTUM_WINDOW_HOURS)).isoformat()
+        recent = [r for r in rows if r["timestamp"] >= cutoff]
+        momentum = _momentum_from_rows(recent, daily_vol)
+        return {"current_price": row["price"], "daily_vol": daily_vol,
+                "momentum": momentum if momentum is not None else 0.0}
 
-        # Student-t CDF for fat tails
-        if direction == "above":
-            base_prob = 1 - _student_t_cdf(z_score, T_DF)
-        else:
-            base_prob = _student_t_cdf(z_score, T_DF)
-
-        # Momentum overlay
-        momentum = self.get_momentum(symbol)
-        if momentum is not None:
-            if direction == "above":
-                adjusted_prob = base_prob * (1 + MOMENTUM_COEFF * momentum)
-            else:
-                adjusted_prob = base_prob * (1 - MOMENTUM_COEFF * momentum)
-        else:
-            adjusted_prob = base_prob
-            momentum = 0.0
+    def price_strikes(self, inputs: Dict[str, Any], strikes, directions,
+                      days_left: float) -> Dict[str, np.ndarray]:
+        """Probabilities for a whole strike ladder in one vectorized evaluation.
 
-        # Clamp
-        final_prob = max(0.01, min(0.99, adjusted_prob))
+        All strikes share the symbol's inputs (price, vol, momentum) and expiry.
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        above = np.array([d == "above" for d in directions], dtype=bool)
+        current_price = inputs["current_price"]
+        distance_pct = (strikes - current_price) / current_price
+        z_score = distance_pct / (inputs["daily_vol"] * math.sqrt(days_left))
+
+        # Student-t CDF for fat tails, then the momentum overlay
+        cdf = _student_t_cdf_array(z_score, T_DF)
+        base_prob = np.where(above, 1 - cdf, cdf)
+        tilt = MOMENTUM_COEFF * inputs["momentum"]
+        adjusted = base_prob * np.where(above, 1 + tilt, 1 - tilt)
+        return {
+            "probability": np.clip(adjusted, 0.01, 0.99),
+            "base_probability": base_prob,
+            "z_score": z_score,
+            "distance_pct": distance_pct,
+        }
 
-        result = {
-            "probability": round(final_prob, 4),
-            "base_probability": round(base_prob, 4),
-            "current_price": current_price,
+    def _probability_result(self, inputs: Dict[str, Any], priced: Dict[str, np.ndarray], i: int,
+                            days_left: float) -> Dict[str, Any]:
+        daily_vol = inputs["daily_vol"]
+        return {
+            "probability": round(float(priced["probability"][i]), 4),
+            "base_probability": round(float(priced["base_probability"][i]), 4),
+            "current_price": inputs["current_price"],
             "daily_vol": round(daily_vol, 6),
             "daily_vol_pct": round(daily_vol * 100, 2),
-            "momentum": round(momentum, 4),
-            "z_score": round(z_score, 4),
-            "distance_pct": round(distance_pct * 100, 2),
+            "momentum": round(inputs["momentum"], 4),
+            "z_score": round(float(priced["z_score"][i]), 4),
+            "distance_pct": round(float(priced["distance_pct"][i]) * 100, 2),
             "days_left": round(days_left, 2),
         }
-        logger.debug("Probability calc: %s strike=%.0f dir=%s → %.1f%% (z=%.2f, vol=%.1f%%/day, mom=%.2f)",
-                      symbol, strike, direction, final_prob * 100, z_score, daily_vol * 100, momentum)
-        return result
 
-    def score_market(self, market: dict) -> Optional[Dict[str, Any]]:
-        """Score a single market: parse, calculate prob, compute edge.
+    def calculate_probability(self, symbol: str, strike: float, direction: str,
+                              days_left: float) -> Optional[Dict[str, Any]]:
+        """Calculate probability of asset reaching strike price.
 
-        market dict should have: title (or question), yes_price (or outcomePrices), end_date_iso, etc.
-        Returns scored dict or None if not applicable.
+        Returns dict with prob, vol, momentum, z_score, current_price or None on failure.
         """
-        title = market.get("title") or market.get("question") or market.get("market_title", "")
-        if not title:
-            return None
-
-        parsed = self.parse_strike_market(title, market)
-        if not parsed:
+        inputs = self.get_market_inputs(symbol)
+        if inputs is None:
             return None
 
-        # Calculate days left
-        now = datetime.now(timezone.utc)
-        expiry = parsed["expiry_date"]
-        days_left = (expiry - now).total_seconds() / 86400
-
-        if days_left < MIN_DAYS:
-            logger.debug("Skipping same-day market: %s (%.1f days)", title[:50], days_left)
-            return None
-        if days_left > MAX_DAYS:
-            logger.debug("Skipping long-dated market: %s (%.0f days)", title[:50], days_left)
+        if days_left <= 0:
+            logger.debug("Non-positive days_left: %.2f", days_left)
             return None
 
-        # Get market-implied probability
-        yes_price = None
-        no_price = None
-
-        # Try various field names
-        for key in ("yes_price", "outcomePrices", "bestBid", "lastTradePrice"):
-            val = market.get(key)
-            if val is not None:
-                if isinstance(val, str):
-                    try:
-                        val = json.loads(val)
-                    except (json.JSONDecodeError, TypeError):
-                        try:
-                            val = float(val)
-                        except (ValueError, TypeError):
-                            continue
-                if isinstance(val, list) and len(val) >= 2:
-                    yes_price = float(val[0])
-                    no_price = float(val[1])
-                elif isinstance(val, (int, float)):
-                    yes_price = float(val)
-                    no_price = 1 - yes_price
-                break
-
-        if yes_price is None:
-            # Try tokens array (Polymarket CLOB format)
-            tokens = market.get("tokens", [])
-            if tokens and len(tokens) >= 2:
-                yes_price = float(tokens[0].get("price", 0))
-                no_price = float(tokens[1].get("price", 0))
+        priced = self.price_strikes(inputs, [strike], [direction], days_left)
+        result = self._probability_result(inputs, priced, 0, days_left)
+        logger.debug("Probability calc: %s strike=%.0f dir=%s → %.1f%% (z=%.2f, vol=%.1f%%/day, mom=%.2f)",
+                     symbol, strike, direction, result["probability"] * 100, result["z_score"],
+                     inputs["daily_vol"] * 100, inputs["momentum"])
+        return result
 
-        if yes_price is None or yes_price <= 0:
-            logger.debug("No market price found for: %s", title[:50])
-            return None
+    def parse_contract(self, market: dict) -> Optional[Dict[str, Any]]:
+        """parse_strike_market through the contract cache (keyed by title + expiry fields).
 
-        # Calculate our probability
-        prob_result = self.calculate_probability(
-            parsed["symbol"], parsed["strike"], parsed["direction"], days_left
-        )
-        if not prob_result:
+        Entries are dropped at each UTC day change, since year-less titles roll
+        over relative to today.
+        """
+        title = market.get("title") or market.get("question") or market.get("market_title", "")
+        if not title:
             return None
+        today = datetime.now(timezone.utc).date()
+        if today != self._contracts_day or len(self._contracts) >= MAX_CACHED_CONTRACTS:
+            self._contracts.clear()
+            self._contracts_day = today
+        key = (title,) + tuple(market.get(k) for k in EXPIRY_KEYS)
+        try:
+            parsed = self._contracts[key]
+            self.stats["contract_hits"] += 1
+        except (KeyError, TypeError):
+            parsed = self.parse_strike_market(title, market)
+            self.stats["contract_parses"] += 1
+            try:
+                self._contracts[key] = parsed
+            except TypeError:  # Unhashable metadata value
+                pass
+        return parsed
 
+    def _score_result(self, market: dict, title: str, parsed: Dict[str, Any], days_left: float,
+                      yes_price: float, no_price: Optional[float], prob_result: Dict[str, Any]) -> Dict[str, Any]:
         our_prob = prob_result["probability"]
         market_implied = yes_price
 
@@ -502,7 +546,7 @@ class StrikeProbabilityCalculator:
             "symbol": parsed["symbol"],
             "strike": parsed["strike"],
             "direction": parsed["direction"],
-            "expiry_date": expiry.isoformat(),
+            "expiry_date": parsed["expiry_date"].isoformat(),
             "days_left": round(days_left, 1),
             "our_prob": round(our_prob, 4),
             "market_prob": round(market_implied, 4),
@@ -524,6 +568,141 @@ class StrikeProbabilityCalculator:
 
         return result
 
+    def _eligible(self, market: dict, now: datetime):
+        """(title, parsed, days_left, yes, no) for a scoreable market, else None."""
+        title = market.get("title") or market.get("question") or market.get("market_title", "")
+        if not title:
+            return None
+
+        parsed = self.parse_contract(market)
+        if not parsed:
+            return None
+
+        days_left = (parsed["expiry_date"] - now).total_seconds() / 86400
+        if days_left < MIN_DAYS:
+            logger.debug("Skipping same-day market: %s (%.1f days)", title[:50], days_left)
+            return None
+        if days_left > MAX_DAYS:
+            logger.debug("Skipping long-dated market: %s (%.0f days)", title[:50], days_left)
+            return None
+
+        # Get market-implied probability
+        yes_price, no_price = _market_prices(market)
+        if yes_price is None or yes_price <= 0:
+            logger.debug("No market price found for: %s", title[:50])
+            return None
+        return title, parsed, days_left, yes_price, no_price
+
+    def score_market(self, market: dict) -> Optional[Dict[str, Any]]:
+        """Score a single market: parse, calculate prob, compute edge.
+
+        market dict should have: title (or question), yes_price (or outcomePrices), end_date_iso, etc.
+        Returns scored dict or None if not applicable.
+        """
+        eligible = self._eligible(market, datetime.now(timezone.utc))
+        if not eligible:
+            return None
+        title, parsed, days_left, yes_price, no_price = eligible
+
+        # Calculate our probability
+        prob_result = self.calculate_probability(
+            parsed["symbol"], parsed["strike"], parsed["direction"], days_left
+        )
+        if not prob_result:
+            return None
+        return self._score_result(market, title, parsed, days_left, yes_price, no_price, prob_result)
+
+    def score_markets(self, markets: List[dict]) -> List[Dict[str, Any]]:
+        """Score many markets at once (same output as score_market per market).
+
+        Contracts come from the parse cache, market inputs are loaded once per
+        symbol, and each (symbol, expiry) ladder is priced in one vectorized call.
+        """
+        now = datetime.now(timezone.utc)
+        ladders: Dict[Tuple[str, datetime], list] = {}
+        for market in markets:
+            try:
+                eligible = self._eligible(market, now)
+            except Exception as e:
+                logger.debug("Error scoring market: %s — %s",
+                             (market.get("title") or market.get("question", ""))[:40], e)
+                continue
+            if eligible:
+                parsed = eligible[1]
+                ladders.setdefault((parsed["symbol"], parsed["expiry_date"]), []).append((market, eligible))
+
+        inputs_by_symbol: Dict[str, Optional[Dict[str, Any]]] = {}
+        results = []
+        for (symbol, _), contracts in ladders.items():
+            if symbol not in inputs_by_symbol:
+                inputs_by_symbol[symbol] = self.get_market_inputs(symbol)
+            inputs = inputs_by_symbol[symbol]
+            if inputs is None:
+                continue
+            # One expiry and one `now` per ladder, so every rung has the same days_left
+            days_left = contracts[0][1][2]
+            parsed = [eligible[1] for _, eligible in contracts]
+            priced = self.price_strikes(inputs, [c["strike"] for c in parsed],
+                                        [c["direction"] for c in parsed], days_left)
+            for i, (market, (title, parsed, days, yes_price, no_price)) in enumerate(contracts):
+                prob_result = self._probability_result(inputs, priced, i, days)
+                results.append(self._score_result(market, title, parsed, days, yes_price, no_price, prob_result))
+
+        self.stats["ladders"] = len(ladders)
+        self.stats["symbols"] = len(inputs_by_symbol)
+        self.stats["scored"] = len(results)
+        return results
+
+    def check_ladders(self, scored: List[Dict[str, Any]], tolerance: float = LADDER_TOLERANCE) -> List[Dict[str, Any]]:
+        """Monotonicity check per (symbol, expiry) strike ladder.
+
+        Every contract is put in P(price > strike) terms ("below" = 1 - YES), which
+        must not rise with the strike. A market price that does is a ladder
+        violation: buy the lower strike's YES and the higher strike's NO.
+        Takes score_markets output.
+        """
+        ladders: Dict[Tuple[str, str], list] = {}
+        for r in scored:
+            ladders.setdefault((r["symbol"], r["expiry_date"]), []).append(r)
+
+        report = []
+        for (symbol, expiry), rungs in ladders.items():
+            rungs.sort(key=lambda r: r["strike"])
+            strikes = np.array([r["strike"] for r in rungs])
+            above = np.array([r["direction"] == "above" for r in rungs])
+            market_p = np.array([r["market_prob"] for r in rungs])
+            model_p = np.array([r["our_prob"] for r in rungs])
+            market_above = np.where(above, market_p, 1 - market_p)
+            model_above = np.where(above, model_p, 1 - model_p)
+
+            # Running min of P(above) over lower strikes; a rung above it by > tolerance breaks the ladder
+            floor = np.minimum.accumulate(market_above)
+            lower = np.concatenate(([np.inf], floor[:-1]))
+            broken = np.nonzero(market_above - lower > tolerance)[0]
+            violations = []
+            for j in broken.tolist():
+                i = int(np.nonzero(market_above[:j] == lower[j])[0][-1])
+                violations.append({
+                    "lower_strike": float(strikes[i]),
+                    "higher_strike": float(strikes[j]),
+                    "lower_p_above": round(float(market_above[i]), 4),
+                    "higher_p_above": round(float(market_above[j]), 4),
+                    "gap": round(float(market_above[j] - market_above[i]), 4),
+                    "lower_market_id": rungs[i]["market_id"],
+                    "higher_market_id": rungs[j]["market_id"],
+                })
+            model_gaps = np.diff(model_above)
+            report.append({
+                "symbol": symbol,
+                "expiry_date": expiry,
+                "strikes": len(rungs),
+                "monotone": not violations,
+                "model_monotone": bool((model_gaps <= tolerance).all()),
+                "violations": violations,
+            })
+        report.sort(key=lambda r: (-len(r["violations"]), r["symbol"], r["expiry_date"]))
+        return report
+
     def scan_all_strikes(self, markets: List[dict] = None) -> List[Dict[str, Any]]:
         """Scan all crypto strike markets and return scored results sorted by edge.
 
@@ -534,15 +713,7 @@ class StrikeProbabilityCalculator:
 
         logger.info("Scanning %d markets for strike probability signals", len(markets))
 
-        results = []
-        for market in markets:
-            try:
-                scored = self.score_market(market)
-                if scored and scored["signal"] != "SKIP":
-                    results.append(scored)
-            except Exception as e:
-                logger.debug("Error scoring market: %s — %s", 
-                           (market.get("title") or market.get("question", ""))[:40], e)
+        results = [r for r in self.score_markets(markets) if r["signal"] != "SKIP"]
 
         # Sort by edge descending
         results.sort(key=lambda x: x["edge"], reverse=True)
@@ -614,3 +785,11 @@ def scan_strikes(markets: List[dict] = None) -> List[Dict[str, Any]]:
 def score_market(market: dict) -> Optional[Dict[str, Any]]:
     """Module-level convenience: score a single market."""
     return get_calculator().score_market(market)
+
+
+def check_strike_ladders(markets: List[dict] = None) -> List[Dict[str, Any]]:
+    """Module-level convenience: ladder-consistency report for strike markets."""
+    calc = get_calculator()
+    if markets is None:
+        markets = calc._fetch_crypto_markets()
+    return calc.check_ladders(calc.score_markets(markets))
@@ -19,6 +19,12 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 logger = logging.getLogger("polyclawd.tweet_count_scanner")
 
 # ============================================================================
@@ -210,45 +216,34 @@ def count_posts_in_window(posts: List[dict], start: datetime, end: datetime) ->
 # Monte Carlo Engine
 # ============================================================================
 
-def run_monte_carlo(daily_counts: List[int], window_days: float,
-                    posts_so_far: int = 0, days_elapsed: float = 0,
-                    simulations: int = MC_SIMULATIONS,
-                    counts_by_dow: Optional[Dict[int, List[int]]] = None,
-                    window_start: Optional[datetime] = None) -> Dict[str, float]:
-    """Run Monte Carlo simulation for tweet count bracket probabilities.
-    
-    Args:
-        daily_counts: Historical daily post counts (fallback pool)
-        window_days: Total window length in days
-        posts_so_far: Posts already counted in current window
-        days_elapsed: Days already elapsed in current window
-        simulations: Number of MC runs
-        counts_by_dow: {dow: [counts]} for DOW-aware sampling (0=Mon, 6=Sun)
-        window_start: Window start datetime (needed for DOW-aware sampling)
-    
-    Returns:
-        Dict of bracket_key → probability (e.g. {"280-299": 0.144})
-    """
-    if not daily_counts:
-        return {}
+def _bracket_key(total: int) -> str:
+    bracket_start = (total // BRACKET_WIDTH) * BRACKET_WIDTH
+    if bracket_start >= 580:
+        return "580+"
+    return f"{bracket_start}-{bracket_start + BRACKET_WIDTH - 1}"
 
-    remaining_days = max(0, window_days - days_elapsed)
+
+def _build_day_pools(daily_counts: List[int], remaining_days: float, posts_so_far: int, days_elapsed: float,
+                     counts_by_dow: Optional[Dict[int, List[int]]],
+                     window_start: Optional[datetime]) -> Tuple[list, Optional[Dict[int, Optional[list]]]]:
+    """Per-remaining-day sampling pools (DOW-aware if available) and optional pace weights."""
     remaining_whole = int(remaining_days)
     remaining_frac = remaining_days - remaining_whole
+    n_days = remaining_whole + (1 if remaining_frac > 0.1 else 0)
 
     # Build per-day sampling pools (DOW-aware if available)
     # Figure out what DOW each remaining day falls on
     day_pools = []
     if counts_by_dow and window_start:
         first_remaining = window_start + timedelta(days=int(days_elapsed) + (1 if days_elapsed % 1 > 0.5 else 0))
-        for i in range(remaining_whole + (1 if remaining_frac > 0.1 else 0)):
+        for i in range(n_days):
             d = (first_remaining + timedelta(days=i)).date()
             dow = d.weekday()
             pool = counts_by_dow.get(dow, [])
             # Fall back to full pool if DOW bucket too small (<4 samples)
             day_pools.append(pool if len(pool) >= 4 else daily_counts)
     else:
-        day_pools = [daily_counts] * (remaining_whole + (1 if remaining_frac > 0.1 else 0))
+        day_pools = [daily_counts] * n_days
 
     # Pace blending: if mid-week pace differs from historical mean by >1σ,
     # shift sampling toward current pace via weighted resampling
@@ -272,8 +267,99 @@ def run_monte_carlo(daily_counts: List[int], window_days: float,
                     total_w = sum(weights)
                     pace_weights[pool_idx] = [w / total_w for w in weights] if total_w > 0 else None
 
-    rng = random.Random(MC_SEED)
+    return day_pools, pace_weights
+
+
+def run_monte_carlo(daily_counts: List[int], window_days: float,
+                    posts_so_far: int = 0, days_elapsed: float = 0,
+                    simulations: int = MC_SIMULATIONS,
+                    counts_by_dow: Optional[Dict[int, List[int]]] = None,
+                    window_start: Optional[datetime] = None,
+                    seed: Optional[int] = MC_SEED) -> Dict[str, float]:
+    """Run Monte Carlo simulation for tweet count bracket probabilities.
+    
+    Args:
+        daily_counts: Historical daily post counts (fallback pool)
+        window_days: Total window length in days
+        posts_so_far: Posts already counted in current window
+        days_elapsed: Days already elapsed in current window
+        simulations: Number of MC runs
+        counts_by_dow: {dow: [counts]} for DOW-aware sampling (0=Mon, 6=Sun)
+        window_start: Window start datetime (needed for DOW-aware sampling)
+        seed: RNG seed for reproducible runs (None = fresh entropy)
+    
+    Returns:
+        Dict of bracket_key → probability (e.g. {"280-299": 0.144})
+    """
+    if not daily_counts:
+        return {}
+
+    remaining_days = max(0, window_days - days_elapsed)
+    day_pools, pace_weights = _build_day_pools(
+        daily_counts, remaining_days, posts_so_far, days_elapsed, counts_by_dow, window_start
+    )
+    engine = _simulate_totals_numpy if HAS_NUMPY else _simulate_totals_python
+    totals = engine(daily_counts, day_pools, pace_weights, remaining_days, posts_so_far, simulations, seed)
+
+    if HAS_NUMPY:
+        # Every bracket from the one totals vector: bin by bracket start, cap at 580+
+        starts = np.minimum(totals // BRACKET_WIDTH * BRACKET_WIDTH, 580)
+        keys, hits = np.unique(starts, return_counts=True)
+        return {_bracket_key(int(k)): int(n) / simulations for k, n in zip(keys, hits)}
+
     bracket_hits: Dict[str, int] = {}
+    for total in totals:
+        key = _bracket_key(total)
+        bracket_hits[key] = bracket_hits.get(key, 0) + 1
+    return {k: v / simulations for k, v in bracket_hits.items()}
+
+
+def _simulate_totals_numpy(daily_counts, day_pools, pace_weights, remaining_days, posts_so_far,
+                           simulations, seed) -> "np.ndarray":
+    """All simulations × remaining days at once.
+
+    Days sharing a pool (and weights) are sampled as one (simulations, k) block:
+    uniform pools via integer indices, pace-weighted pools by searchsorted on
+    the cumulative weights (same r <= cumulative rule as the scalar engine).
+    """
+    rng = np.random.default_rng(seed)
+    remaining_whole = int(remaining_days)
+    remaining_frac = remaining_days - remaining_whole
+    totals = np.full(simulations, posts_so_far, dtype=np.int64)
+
+    groups: Dict[tuple, list] = {}
+    for day_i in range(remaining_whole):
+        pool = day_pools[day_i] if day_i < len(day_pools) else daily_counts
+        weights = pace_weights.get(day_i) if pace_weights else None
+        key = (tuple(pool), tuple(weights) if weights else None)
+        groups.setdefault(key, [pool, weights, 0])[2] += 1
+
+    for pool, weights, n_days in groups.values():
+        values = np.asarray(pool, dtype=np.int64)
+        if weights:
+            cdf = np.cumsum(weights)
+            idx = np.searchsorted(cdf, rng.random((simulations, n_days)), side="left")
+            np.minimum(idx, len(values) - 1, out=idx)  # r above a rounded-down cdf[-1] → last, as before
+        else:
+            idx = rng.integers(0, len(values), size=(simulations, n_days))
+        totals += values[idx].sum(axis=1)
+
+    # Partial day: sample and scale
+    if remaining_frac > 0.1:
+        frac_pool = day_pools[remaining_whole] if remaining_whole < len(day_pools) else daily_counts
+        values = np.asarray(frac_pool, dtype=np.int64)
+        totals += (values[rng.integers(0, len(values), size=simulations)] * remaining_frac).astype(np.int64)
+
+    return totals
+
+
+def _simulate_totals_python(daily_counts, day_pools, pace_weights, remaining_days, posts_so_far,
+                            simulations, seed) -> List[int]:
+    """Scalar reference engine (used when NumPy is unavailable, and as the benchmark baseline)."""
+    remaining_whole = int(remaining_days)
+    remaining_frac = remaining_days - remaining_whole
+    rng = random.Random(seed)
+    totals = []
 
     for _ in range(simulations):
         total = posts_so_far
@@ -298,16 +384,9 @@ def run_monte_carlo(daily_counts: List[int], window_days: float,
             frac_pool = day_pools[remaining_whole] if remaining_whole < len(day_pools) else daily_counts
             total += int(rng.choice(frac_pool) * remaining_frac)
 
-        # Map to bracket
-        bracket_start = (total // BRACKET_WIDTH) * BRACKET_WIDTH
-        if bracket_start >= 580:
-            key = "580+"
-        else:
-            key = f"{bracket_start}-{bracket_start + BRACKET_WIDTH - 1}"
-        bracket_hits[key] = bracket_hits.get(key, 0) + 1
+        totals.append(total)
 
-    # Convert to probabilities
-    return {k: v / simulations for k, v in bracket_hits.items()}
+    return totals
 
 
 # ============================================================================
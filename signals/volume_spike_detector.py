@@ -3,7 +3,8 @@
 Volume Spike Detector — flags 3x+ volume surges as NO entry signals.
 
 Thesis: Retail FOMO drives volume spikes → YES gets overpriced → best NO entry.
-Uses existing signal_snapshots table for historical volume baselines.
+Uses existing signal_snapshots table for historical volume baselines
+(epoch `ts` column + (market_id, ts) index, batched per signal batch).
 """
 
 import logging
@@ -12,6 +13,11 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+try:
+    from shadow_tracker import migrate_snapshot_ts
+except ImportError:
+    from signals.shadow_tracker import migrate_snapshot_ts
+
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).parent.parent
@@ -23,6 +29,7 @@ MEGA_SPIKE_RATIO = 10.0  # 10x average = mega spike (extreme FOMO)
 MIN_HISTORY_POINTS = 3   # Need at least 3 prior snapshots for reliable baseline
 LOOKBACK_HOURS = 48      # Window for computing average volume
 MIN_VOLUME = 100         # Ignore markets with trivially low volume
+QUERY_CHUNK = 500        # Market ids per IN (...) — stays under SQLite's 999 bound-variable limit
 
 
 def _get_db() -> sqlite3.Connection:
@@ -33,45 +40,64 @@ def _get_db() -> sqlite3.Connection:
     return conn
 
 
-def get_volume_baseline(market_id: str, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
-    """Get average volume for a market over the lookback window.
+def get_volume_baselines(market_ids: List[str], conn: Optional[sqlite3.Connection] = None) -> Dict[str, Dict[str, Any]]:
+    """Average volume over the lookback window for many markets in one grouped query.
+
+    Served by idx_snapshots_market_ts — one index range scan per market id.
+    Markets without history are returned with zeroed baselines.
 
     Returns:
-        {"avg_volume": float, "data_points": int, "min_volume": int, "max_volume": int}
+        {market_id: {"avg_volume": float, "data_points": int, "min_volume": int, "max_volume": int}}
     """
     close_conn = False
     if conn is None:
         conn = _get_db()
         close_conn = True
-
-    cutoff = (datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)).strftime("%Y-%m-%d %H:%M")
-
-    rows = conn.execute(
-        """SELECT volume FROM signal_snapshots 
-           WHERE market_id = ? AND volume IS NOT NULL AND volume > 0
-           AND (snapshot_date || ' ' || snapshot_time) >= ?
-           ORDER BY id DESC""",
-        (market_id, cutoff)
-    ).fetchall()
+    migrate_snapshot_ts(conn)
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)).timestamp()
+    ids = list(dict.fromkeys(market_ids))
+    baselines = {m: {"avg_volume": 0, "data_points": 0, "min_volume": 0, "max_volume": 0} for m in ids}
+
+    for i in range(0, len(ids), QUERY_CHUNK):
+        chunk = ids[i:i + QUERY_CHUNK]
+        rows = conn.execute(
+            f"""SELECT market_id, AVG(volume) AS avg_volume, COUNT(*) AS data_points,
+                   MIN(volume) AS min_volume, MAX(volume) AS max_volume
+               FROM signal_snapshots
+               WHERE market_id IN ({",".join("?" * len(chunk))}) AND ts >= ?
+               AND volume IS NOT NULL AND volume > 0
+               GROUP BY market_id""",
+            (*chunk, cutoff)
+        ).fetchall()
+        for r in rows:
+            baselines[r["market_id"]] = {
+                "avg_volume": r["avg_volume"],
+                "data_points": r["data_points"],
+                "min_volume": r["min_volume"],
+                "max_volume": r["max_volume"],
+            }
 
     if close_conn:
         conn.close()
+    return baselines
 
-    if not rows:
-        return {"avg_volume": 0, "data_points": 0, "min_volume": 0, "max_volume": 0}
 
-    volumes = [r["volume"] for r in rows]
-    return {
-        "avg_volume": sum(volumes) / len(volumes),
-        "data_points": len(volumes),
-        "min_volume": min(volumes),
-        "max_volume": max(volumes),
-    }
+def get_volume_baseline(market_id: str, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+    """Get average volume for a market over the lookback window.
+
+    Returns:
+        {"avg_volume": float, "data_points": int, "min_volume": int, "max_volume": int}
+    """
+    return get_volume_baselines([market_id], conn)[market_id]
 
 
-def detect_spike(market_id: str, current_volume: int, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+def detect_spike(market_id: str, current_volume: int, conn: Optional[sqlite3.Connection] = None,
+                 baseline: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Check if current volume is a spike relative to historical baseline.
 
+    Pass `baseline` (from get_volume_baselines) to skip the per-market query.
+
     Returns:
         {"spike": bool, "ratio": float, "level": str, "avg_volume": float, "data_points": int}
         level: "none" | "spike" (3x) | "mega" (10x)
@@ -80,7 +106,8 @@ def detect_spike(market_id: str, current_volume: int, conn: Optional[sqlite3.Con
         logger.debug("Volume too low for spike check: market=%s vol=%d min=%d", market_id, current_volume, MIN_VOLUME)
         return {"spike": False, "ratio": 0, "level": "none", "avg_volume": 0, "data_points": 0}
 
-    baseline = get_volume_baseline(market_id, conn)
+    if baseline is None:
+        baseline = get_volume_baseline(market_id, conn)
 
     if baseline["data_points"] < MIN_HISTORY_POINTS:
         logger.debug(
@@ -140,6 +167,10 @@ def enrich_signals(signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         return signals
 
     conn = _get_db()
+    baselines = get_volume_baselines(
+        [sig.get("market_id") or sig.get("ticker") or sig.get("id", "") for sig in signals], conn
+    )
+    conn.close()
     enriched = 0
 
     for sig in signals:
@@ -157,7 +188,7 @@ def enrich_signals(signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             sig["volume_spike_level"] = "none"
             continue
 
-        result = detect_spike(market_id, volume, conn)
+        result = detect_spike(market_id, volume, baseline=baselines[market_id])
         sig["volume_spike"] = result["spike"]
         sig["volume_spike_ratio"] = result["ratio"]
         sig["volume_spike_level"] = result["level"]
@@ -165,7 +196,6 @@ def enrich_signals(signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if result["spike"]:
             enriched += 1
 
-    conn.close()
     logger.info("Volume spike enrichment: %d/%d signals spiking", enriched, len(signals))
     return signals
 
@@ -195,9 +225,10 @@ def scan_all_spikes(limit: int = 50) -> List[Dict[str, Any]]:
         (latest["snapshot_date"], latest["snapshot_time"], MIN_VOLUME, limit)
     ).fetchall()
 
+    baselines = get_volume_baselines([row["market_id"] for row in rows], conn)
     spikes = []
     for row in rows:
-        result = detect_spike(row["market_id"], row["volume"], conn)
+        result = detect_spike(row["market_id"], row["volume"], baseline=baselines[row["market_id"]])
         if result["spike"]:
             spikes.append({
                 "market_id": row["market_id"],
@@ -222,13 +253,14 @@ def scan_all_spikes(limit: int = 50) -> List[Dict[str, Any]]:
 def get_spike_history(market_id: str, hours: int = 72) -> List[Dict[str, Any]]:
     """Get volume history for a specific market (for debugging/charting)."""
     conn = _get_db()
-    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M")
+    migrate_snapshot_ts(conn)
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp()
 
     rows = conn.execute(
         """SELECT snapshot_date, snapshot_time, volume, price
            FROM signal_snapshots
-           WHERE market_id = ? AND (snapshot_date || ' ' || snapshot_time) >= ?
-           ORDER BY id ASC""",
+           WHERE market_id = ? AND ts >= ?
+           ORDER BY ts ASC, id ASC""",
         (market_id, cutoff)
     ).fetchall()
     conn.close()
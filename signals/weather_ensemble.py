@@ -16,12 +16,15 @@ hardcoded fair-value buckets.
 import asyncio
 import json
 import logging
+import math
 import os
 import time
 import urllib.request
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # ── API Keys (from env) ─────────────────────────────────────────────────
@@ -652,37 +655,63 @@ def get_ensemble_forecast(city: str, date: str) -> Optional[dict]:
 
 
 # ── Probability calculations ─────────────────────────────────────────────
-# Using normal CDF approximation (no scipy dependency)
+# Exact normal / Student-t CDFs, vectorized over NumPy arrays so a whole
+# bracket ladder is priced in one evaluation (scipy used when available).
+
+def _norm_cdf_array(z: np.ndarray) -> np.ndarray:
+    """Standard normal CDF over an array (exact, via erf)."""
+    z = np.asarray(z, dtype=float)
+    try:
+        from scipy.special import ndtr
+        return ndtr(z)
+    except ImportError:
+        pass
+    return 0.5 * (1.0 + _erf_ufunc(z / math.sqrt(2.0)).astype(float))
+
+
+_erf_ufunc = np.frompyfunc(math.erf, 1, 1)
+
+
+def _t_cdf_array(z: np.ndarray, df: int) -> np.ndarray:
+    """Student-t CDF over an array for integer df (exact closed form).
+
+    Abramowitz & Stegun 26.7.3/26.7.4: with theta = atan(z / sqrt(df)) the CDF
+    is a finite cosine series, so no incomplete-beta approximation is needed.
+    """
+    z = np.asarray(z, dtype=float)
+    df = int(df)
+    if df < 1:
+        raise ValueError("df must be >= 1")
+    theta = np.arctan(z / math.sqrt(df))
+    sin_t, cos2 = np.sin(theta), np.cos(theta) ** 2
+    series = np.ones_like(z)
+    term = np.ones_like(z)
+    if df % 2:
+        for k in range(1, (df - 1) // 2):
+            term = term * cos2 * (2 * k) / (2 * k + 1)
+            series = series + term
+        tail = theta + (sin_t * np.cos(theta) * series if df > 1 else 0.0)
+        return 0.5 + tail / math.pi
+    for k in range(1, df // 2):
+        term = term * cos2 * (2 * k - 1) / (2 * k)
+        series = series + term
+    return 0.5 + 0.5 * sin_t * series
+
 
 def _norm_cdf(x: float) -> float:
-    """Standard normal CDF approximation (Abramowitz & Stegun)."""
-    import math
+    """Standard normal CDF."""
     if x < -8:
         return 0.0
     if x > 8:
         return 1.0
-    a1, a2, a3, a4, a5 = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429
-    p = 0.3275911
-    sign = 1 if x >= 0 else -1
-    x_abs = abs(x)
-    t = 1.0 / (1.0 + p * x_abs)
-    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * math.exp(-x_abs * x_abs / 2.0)
-    return 0.5 * (1.0 + sign * y)
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
 
 
 def _t_cdf(x: float, df: float) -> float:
-    """Student-t CDF approximation via normal CDF with correction."""
-    import math
-    # For df >= 5, normal is close enough
+    """Student-t CDF (exact for integer df, normal limit for df >= 30)."""
     if df >= 30:
         return _norm_cdf(x)
-    # Hill's approx for small df
-    g = math.lgamma((df + 1) / 2) - math.lgamma(df / 2)
-    s = math.exp(g) / math.sqrt(df * math.pi)
-    # Use beta incomplete function approx — fall back to normal with wider spread
-    # Multiply x by correction factor to approximate fatter tails
-    correction = math.sqrt(df / (df - 2)) if df > 2 else 1.5
-    return _norm_cdf(x / correction)
+    return float(_t_cdf_array(np.array([x]), int(round(df)))[0])
 
 
 def prob_below(city: str, date: str, threshold_f: float) -> Optional[dict]:
@@ -755,6 +784,188 @@ def prob_in_range(city: str, date: str, low_f: float, high_f: float) -> Optional
     }
 
 
+# ── Batch bracket pricing ────────────────────────────────────────────────
+# One city/date event lists a whole ladder of brackets ("65°F or below",
+# "between 66-67°F", ..., "76°F or higher"). Pricing them together means one
+# forecast lookup and one vectorized CDF call per event instead of per market.
+
+MIN_EMPIRICAL_MEMBERS = 10  # Below this, member ECDF is too coarse — use parametric
+
+
+def _bracket_interval(
+    comparison: str, threshold_f: float, threshold_high_f: float = None, unit: str = "F",
+) -> Optional[Tuple[float, float]]:
+    """Map a market comparison to the °F interval it pays out on.
+
+    Brackets settle on a whole-degree reading in the market's own unit, so
+    edges are continuity corrected by half a native degree (0.5°F, or 0.5°C =
+    0.9°F for Celsius markets): "66-67°F" covers (65.5, 67.5], "65°F or below"
+    (-inf, 65.5] and "above 75°F" (75.5, inf) — adjacent brackets meet with no
+    gap, and "above X" is the complement of "below X".
+    """
+    half = 0.9 if unit == "C" else 0.5  # Half a native degree, in °F
+    if comparison == "above":
+        return (threshold_f + half, math.inf)
+    if comparison == "below":
+        return (-math.inf, threshold_f + half)
+    if comparison in ("between", "exact"):
+        if threshold_high_f is None:
+            threshold_high_f = threshold_f  # "exact" — one whole degree
+        return (threshold_f - half, threshold_high_f + half)
+    return None
+
+
+def prob_comparison(
+    city: str, date: str, comparison: str, threshold_f: float, threshold_high_f: float = None, unit: str = "F",
+) -> Optional[dict]:
+    """Single-market probability over the same continuity-corrected interval price_brackets uses."""
+    interval = _bracket_interval(comparison, threshold_f, threshold_high_f, unit)
+    if interval is None:
+        return None
+    low, high = interval
+    if low == -math.inf:
+        return prob_below(city, date, high)
+    if high == math.inf:
+        return prob_above(city, date, low)
+    return prob_in_range(city, date, low, high)
+
+
+def _is_partition(lows: np.ndarray, highs: np.ndarray) -> bool:
+    """True if the intervals tile (-inf, inf) with no gaps or overlaps, i.e. a complete bracket ladder."""
+    if len(lows) < 2:
+        return False
+    order = np.argsort(lows, kind="stable")
+    lows, highs = lows[order], highs[order]
+    return bool(lows[0] == -math.inf and highs[-1] == math.inf and np.allclose(lows[1:], highs[:-1]))
+
+
+def bracket_probabilities(
+    mean: float,
+    std: float,
+    lows: np.ndarray,
+    highs: np.ndarray,
+    df: Optional[int] = None,
+    members: Optional[np.ndarray] = None,
+    normalize: Optional[bool] = None,
+) -> np.ndarray:
+    """
+    P(low <= high temp <= high) for every interval, from one CDF evaluation.
+
+    Args:
+        mean, std: Forecast distribution in °F
+        lows, highs: Interval bounds (±inf allowed for open-ended brackets)
+        df: Student-t degrees of freedom; None = normal
+        members: Ensemble member highs — if given, uses their empirical CDF instead
+        normalize: Rescale to sum to 1. Default: only when the intervals
+            partition the real line (a complete bracket ladder), where it just
+            absorbs rounding; a partial set of brackets keeps its raw mass.
+
+    Returns:
+        Array of probabilities aligned with lows/highs.
+    """
+    lows = np.asarray(lows, dtype=float)
+    highs = np.asarray(highs, dtype=float)
+    # Evaluate each distinct threshold once, then gather back per interval
+    thresholds, inverse = np.unique(np.concatenate([lows, highs]), return_inverse=True)
+
+    if members is not None:
+        sorted_members = np.sort(np.asarray(members, dtype=float))
+        cdf = np.searchsorted(sorted_members, thresholds, side="right") / len(sorted_members)
+    else:
+        z = (thresholds - mean) / max(std, 1e-6)
+        cdf = _norm_cdf_array(z) if df is None else _t_cdf_array(z, df)
+
+    n = len(lows)
+    probs = np.clip(cdf[inverse[n:]] - cdf[inverse[:n]], 0.0, 1.0)
+
+    if normalize is None:
+        normalize = _is_partition(lows, highs)
+    if normalize:
+        total = probs.sum()
+        if total > 0:
+            probs = probs / total
+    return probs
+
+
+def price_brackets(city: str, date: str, brackets: List[dict], method: str = "parametric") -> Optional[dict]:
+    """
+    Price every bracket of a city/date event in one call.
+
+    Args:
+        city: City name
+        date: YYYY-MM-DD
+        brackets: [{"comparison": "between", "threshold_f": 66, "threshold_high_f": 67,
+                    "unit": "F", "market_price": 0.21}, ...] — unit is the unit the
+                    market settles in (thresholds are always °F); unit and
+                    market_price optional
+        method: "parametric" (normal, or t(df=4) with ≤2 sources) or
+                "empirical" (ensemble-member ECDF when enough members exist)
+
+    Returns:
+        {
+            "forecast_mean_f": 78.3, "forecast_std_f": 1.6, "n_sources": 4,
+            "agreement": 0.85, "confidence": 0.9, "distribution": "normal",
+            "exclusive": True,  # brackets cover every outcome; probabilities sum to 1
+            "brackets": [{..., "probability": 0.21, "edge": 0.04}, ...]  # input order, unknown comparisons dropped
+        }
+    """
+    forecast = get_ensemble_forecast(city, date)
+    if not forecast:
+        return None
+
+    ens = forecast["ensemble"]
+    mean = ens["high_mean_f"]
+    std = ens["high_std_f"]
+    n_sources = ens["n_sources"]
+    agreement = ens["source_agreement"]
+
+    priced = []
+    lows, highs = [], []
+    for b in brackets:
+        interval = _bracket_interval(b.get("comparison"), b.get("threshold_f"), b.get("threshold_high_f"), b.get("unit", "F"))
+        if interval is None:
+            logger.warning("Unknown comparison type: %s", b.get("comparison"))
+            continue
+        priced.append(b)
+        lows.append(interval[0])
+        highs.append(interval[1])
+    if not priced:
+        return None
+
+    members = None
+    df = 4 if n_sources <= 2 else None
+    distribution = "t(df=4)" if df else "normal"
+    if method == "empirical":
+        raw = (forecast.get("sources", {}).get("open_meteo_ensemble") or {}).get("raw_highs_f") or []
+        if len(raw) >= MIN_EMPIRICAL_MEMBERS:
+            members = np.asarray(raw, dtype=float)
+            distribution = f"empirical(n={len(raw)})"
+
+    lows_arr, highs_arr = np.asarray(lows), np.asarray(highs)
+    exclusive = _is_partition(lows_arr, highs_arr)
+    probs = bracket_probabilities(mean, std, lows_arr, highs_arr, df=df, members=members, normalize=exclusive)
+
+    results = []
+    for b, p in zip(priced, probs):
+        entry = dict(b)
+        entry["probability"] = round(float(p), 4)
+        if b.get("market_price") is not None:
+            entry["edge"] = round(float(p) - b["market_price"], 4)
+        results.append(entry)
+
+    return {
+        "forecast_mean_f": mean,
+        "forecast_std_f": std,
+        "n_sources": n_sources,
+        "n_models": ens.get("n_models", 0),
+        "agreement": agreement,
+        "confidence": round(min(1.0, (n_sources / 4) * 0.6 + agreement * 0.4), 2),
+        "distribution": distribution,
+        "exclusive": exclusive,
+        "brackets": results,
+    }
+
+
 def source_health() -> dict:
     """Report which sources are configured and responding."""
     return {
@@ -787,6 +998,7 @@ def ensemble_fair_value(
     comparison: str,
     threshold_f: float,
     threshold_high_f: float = None,
+    unit: str = "F",
 ) -> Optional[dict]:
     """
     Calculate fair value for a weather market using ensemble probabilities.
@@ -797,6 +1009,8 @@ def ensemble_fair_value(
         comparison: "above", "below", "between", "exact"
         threshold_f: Temperature threshold in °F (or low bound for between)
         threshold_high_f: High bound for "between" comparison
+        unit: Unit the market settles in ("F" or "C"); sets the continuity
+            correction, same interval as price_brackets
     
     Returns:
         {
@@ -809,20 +1023,10 @@ def ensemble_fair_value(
             ...
         }
     """
-    if comparison == "above":
-        result = prob_above(city, date, threshold_f)
-    elif comparison == "below":
-        result = prob_below(city, date, threshold_f)
-    elif comparison in ("between", "exact"):
-        if threshold_high_f is None:
-            # "exact" — use ±0.5°F range
-            threshold_high_f = threshold_f + 0.5
-            threshold_f = threshold_f - 0.5
-        result = prob_in_range(city, date, threshold_f, threshold_high_f)
-    else:
+    if comparison not in ("above", "below", "between", "exact"):
         logger.warning("Unknown comparison type: %s", comparison)
         return None
-
+    result = prob_comparison(city, date, comparison, threshold_f, threshold_high_f, unit)
     if not result:
         return None
 
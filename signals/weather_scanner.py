@@ -287,6 +287,10 @@ def _extract_temp_threshold(title: str) -> Optional[Tuple[str, float, str]]:
     
     Returns: (comparison, threshold_f, unit) or None
     e.g., ("above", 70.0, "F") or ("between", (66, 67), "F")
+
+    Markets settle on whole degrees, so "above X" always means a reading > X
+    and "below X" a reading <= X: "76°F or higher" parses as ("above", 75.0)
+    and "below 32°F" as ("below", 31.0).
     """
     title_lower = title.lower()
     
@@ -297,12 +301,12 @@ def _extract_temp_threshold(title: str) -> Optional[Tuple[str, float, str]]:
     
     m = re.search(r"(\d+(?:\.\d+)?)\s*°?\s*f\s+or\s+higher", title_lower)
     if m:
-        return ("above", float(m.group(1)), "F")
+        return ("above", float(m.group(1)) - 1, "F")
     
     # "be below X°F" / "be X°F or below"
     m = re.search(r"(?:below|under|lower than)\s+(\d+(?:\.\d+)?)\s*°?\s*f", title_lower)
     if m:
-        return ("below", float(m.group(1)), "F")
+        return ("below", float(m.group(1)) - 1, "F")
     
     m = re.search(r"(\d+(?:\.\d+)?)\s*°?\s*f\s+or\s+below", title_lower)
     if m:
@@ -320,7 +324,7 @@ def _extract_temp_threshold(title: str) -> Optional[Tuple[str, float, str]]:
     
     m = re.search(r"(\d+(?:\.\d+)?)\s*°?\s*c\s+or\s+(?:higher|above)", title_lower)
     if m:
-        return ("above", float(m.group(1)), "C")
+        return ("above", float(m.group(1)) - 1, "C")
     
     m = re.search(r"(\d+(?:\.\d+)?)\s*°?\s*c\s+or\s+(?:below|lower)", title_lower)
     if m:
@@ -511,45 +515,18 @@ def _get_cached_forecast(city: str, days_until: float) -> Optional[dict]:
     return data
 
 
-def _try_ensemble_evaluate(title: str, market_price: float, city: str, target_date: str, temp_info) -> Optional[dict]:
-    """Try ensemble-based evaluation. Returns signal dict or None to fall back."""
-    try:
-        from signals.weather_ensemble import ensemble_fair_value, get_ensemble_forecast, source_health
-    except ImportError:
-        logger.debug("weather_ensemble not available, using legacy")
-        return None
-
-    if not temp_info:
-        return None
-
+def _thresholds_to_f(temp_info) -> Tuple[float, Optional[float]]:
+    """Convert an _extract_temp_threshold tuple to (threshold_f, threshold_high_f)."""
     comparison, threshold, unit = temp_info
+    conv = _c_to_f if unit == "C" else (lambda v: v)
+    if comparison == "between":
+        return conv(threshold[0]), conv(threshold[1])
+    return conv(threshold), None
 
-    # Convert threshold to °F for ensemble
-    if unit == "C":
-        if comparison == "between":
-            thresh_f = _c_to_f(threshold[0])
-            thresh_high_f = _c_to_f(threshold[1])
-        elif comparison == "exact":
-            thresh_f = _c_to_f(threshold)
-            thresh_high_f = None
-        else:
-            thresh_f = _c_to_f(threshold)
-            thresh_high_f = None
-    else:
-        if comparison == "between":
-            thresh_f = threshold[0]
-            thresh_high_f = threshold[1]
-        elif comparison == "exact":
-            thresh_f = threshold
-            thresh_high_f = None
-        else:
-            thresh_f = threshold
-            thresh_high_f = None
-
-    result = ensemble_fair_value(city, target_date, comparison, thresh_f, thresh_high_f)
-    if not result:
-        return None
 
+def _ensemble_signal(result: dict, market_price: float, city: str, target_date: str,
+                     comparison: str, thresh_f: float) -> Optional[dict]:
+    """Turn an ensemble fair-value result into a signal dict, or None if edge < 5%."""
     fair_value = result["fair_value"]
     edge = fair_value - market_price
 
@@ -575,9 +552,6 @@ def _try_ensemble_evaluate(title: str, market_price: float, city: str, target_da
     elif days_until <= 1:
         confidence = min(95, confidence + 10)
 
-    forecast_data = get_ensemble_forecast(city, target_date)
-    ens = forecast_data["ensemble"] if forecast_data else {}
-
     logger.debug(
         "ENSEMBLE %s: %s fair=%.3f mkt=%.3f edge=%.1f%% side=%s n_models=%d agree=%.2f",
         city, comparison, result["fair_value"], market_price,
@@ -602,7 +576,7 @@ def _try_ensemble_evaluate(title: str, market_price: float, city: str, target_da
             "forecast_mean_f": result["forecast_mean_f"],
             "forecast_std_f": result["forecast_std_f"],
             "n_sources": result["n_sources"],
-            "n_models": ens.get("n_models", 0),
+            "n_models": result.get("n_models", 0),
             "agreement": result["agreement"],
             "distribution": result.get("distribution", "normal"),
         },
@@ -613,6 +587,94 @@ def _try_ensemble_evaluate(title: str, market_price: float, city: str, target_da
     }
 
 
+def _try_ensemble_evaluate(title: str, market_price: float, city: str, target_date: str, temp_info) -> Optional[dict]:
+    """Try ensemble-based evaluation. Returns signal dict or None to fall back."""
+    try:
+        from signals.weather_ensemble import ensemble_fair_value, get_ensemble_forecast
+    except ImportError:
+        logger.debug("weather_ensemble not available, using legacy")
+        return None
+
+    if not temp_info:
+        return None
+
+    comparison = temp_info[0]
+    thresh_f, thresh_high_f = _thresholds_to_f(temp_info)
+
+    result = ensemble_fair_value(city, target_date, comparison, thresh_f, thresh_high_f, unit=temp_info[2])
+    if not result:
+        return None
+
+    forecast_data = get_ensemble_forecast(city, target_date)
+    ens = forecast_data["ensemble"] if forecast_data else {}
+    result["n_models"] = ens.get("n_models", 0)
+
+    return _ensemble_signal(result, market_price, city, target_date, comparison, thresh_f)
+
+
+def evaluate_weather_event(markets: List[Tuple[str, float]]) -> List[Optional[dict]]:
+    """Evaluate a batch of weather markets, pricing each city/date bracket ladder at once.
+
+    Markets are grouped by (city, date) and every temperature bracket in a group
+    is priced by a single weather_ensemble.price_brackets call, so mutually
+    exclusive brackets get probabilities that sum to 1. Markets the ensemble
+    can't price fall back to evaluate_weather_market.
+
+    Args:
+        markets: [(title, yes_price), ...]
+
+    Returns:
+        Signal dicts (or None) aligned with the input list.
+    """
+    results: List[Optional[dict]] = [None] * len(markets)
+    groups: Dict[Tuple[str, str], List[Tuple[int, tuple]]] = {}
+    fallback = []
+
+    for i, (title, _) in enumerate(markets):
+        city = _extract_city_from_market(title)
+        target_date = _extract_date_from_market(title)
+        temp_info = _extract_temp_threshold(title)
+        if city and target_date and temp_info:
+            groups.setdefault((city, target_date), []).append((i, temp_info))
+        else:
+            fallback.append(i)
+
+    try:
+        from signals.weather_ensemble import price_brackets
+    except ImportError:
+        logger.debug("weather_ensemble not available, using legacy")
+        price_brackets = None
+
+    for (city, target_date), members in groups.items():
+        brackets = []
+        for i, temp_info in members:
+            thresh_f, thresh_high_f = _thresholds_to_f(temp_info)
+            brackets.append({
+                "comparison": temp_info[0],
+                "threshold_f": thresh_f,
+                "threshold_high_f": thresh_high_f,
+                "unit": temp_info[2],
+                "market_price": markets[i][1],
+            })
+
+        priced = price_brackets(city, target_date, brackets) if price_brackets else None
+        if not priced or len(priced["brackets"]) != len(members):
+            fallback.extend(i for i, _ in members)
+            continue
+
+        for (i, temp_info), bracket in zip(members, priced["brackets"]):
+            result = dict(priced, fair_value=bracket["probability"])
+            results[i] = _ensemble_signal(
+                result, markets[i][1], city, target_date, temp_info[0], bracket["threshold_f"],
+            )
+
+    for i in fallback:
+        title, price = markets[i]
+        results[i] = evaluate_weather_market(title, price)
+
+    return results
+
+
 def evaluate_weather_market(title: str, market_price: float) -> Optional[dict]:
     """Evaluate a weather market against forecast data.
     
@@ -986,29 +1048,36 @@ def scan_polymarket_weather() -> List[dict]:
             condition_id = market.get("conditionId", market.get("id", ""))
             eval_jobs.append((question, yes_price, volume, liquidity, condition_id, slug))
 
-    # Evaluate all markets in parallel (ensemble calls are mostly cache hits after pre-warm)
-    def _eval_market(job):
-        question, yes_price, volume, liquidity, condition_id, mslug = job
+    # Evaluate each city/date event as one bracket ladder (one vectorized
+    # pricing call per event instead of one CDF evaluation per market)
+    def _eval_event(jobs):
         try:
-            result = evaluate_weather_market(question, yes_price)
-            if result:
-                result["platform"] = "polymarket"
-                result["market_id"] = condition_id
-                result["market"] = question[:200]
-                result["volume"] = volume
-                result["liquidity"] = liquidity
-                result["slug"] = mslug
-                result["archetype"] = "weather"
-                return result
+            evaluated = evaluate_weather_event([(job[0], job[1]) for job in jobs])
         except Exception as e:
-            logger.debug("Eval failed for %s: %s", question[:40], e)
-        return None
+            logger.debug("Event eval failed for %s: %s", jobs[0][5], e)
+            return []
+        out = []
+        for job, result in zip(jobs, evaluated):
+            if not result:
+                continue
+            question, yes_price, volume, liquidity, condition_id, mslug = job
+            result["platform"] = "polymarket"
+            result["market_id"] = condition_id
+            result["market"] = question[:200]
+            result["volume"] = volume
+            result["liquidity"] = liquidity
+            result["slug"] = mslug
+            result["archetype"] = "weather"
+            out.append(result)
+        return out
+
+    event_jobs: Dict[str, list] = {}
+    for job in eval_jobs:
+        event_jobs.setdefault(job[5], []).append(job)
 
     with ThreadPoolExecutor(max_workers=8) as pool:
-        results = pool.map(_eval_market, eval_jobs)
-        for r in results:
-            if r:
-                signals.append(r)
+        for event_signals in pool.map(_eval_event, event_jobs.values()):
+            signals.extend(event_signals)
 
     logger.info("Weather scan: %d signals from %d cities × %d dates (parallel)",
                 len(signals), len(WEATHER_CITIES_SLUG), len(dates_to_check))
@@ -1031,7 +1100,7 @@ def reeval_weather_positions() -> dict:
     results = {"checked": 0, "closed": 0, "kept": 0, "errors": 0, "details": []}
     
     try:
-        from signals.weather_ensemble import get_ensemble_forecast, prob_below, prob_above, prob_in_range, _cache, _cache_ts
+        from signals.weather_ensemble import get_ensemble_forecast, prob_comparison, _cache, _cache_ts
     except ImportError:
         logger.warning("weather_ensemble not available for re-evaluation")
         return results
@@ -1075,39 +1144,11 @@ def reeval_weather_positions() -> dict:
             _cache.pop(cache_key, None)
             _cache_ts.pop(cache_key, None)
         
-        comparison, threshold, unit = temp_info
-        
-        # Convert to °F
-        if unit == "C":
-            if comparison == "between":
-                thresh_f = _c_to_f(threshold[0])
-                thresh_high_f = _c_to_f(threshold[1])
-            elif comparison == "exact":
-                thresh_f = _c_to_f(threshold)
-                thresh_high_f = None
-            else:
-                thresh_f = _c_to_f(threshold)
-                thresh_high_f = None
-        else:
-            if comparison == "between":
-                thresh_f = threshold[0]
-                thresh_high_f = threshold[1]
-            else:
-                thresh_f = threshold
-                thresh_high_f = None
+        comparison, _, unit = temp_info
+        thresh_f, thresh_high_f = _thresholds_to_f(temp_info)
         
         # Get fresh probability
-        if comparison == "above":
-            result = prob_above(city, target_date, thresh_f)
-        elif comparison == "below":
-            result = prob_below(city, target_date, thresh_f)
-        elif comparison in ("between", "exact"):
-            if thresh_high_f is None:
-                thresh_high_f = thresh_f + 0.5
-                thresh_f = thresh_f - 0.5
-            result = prob_in_range(city, target_date, thresh_f, thresh_high_f)
-        else:
-            continue
+        result = prob_comparison(city, target_date, comparison, thresh_f, thresh_high_f, unit)
         
         if not result:
             results["errors"] += 1
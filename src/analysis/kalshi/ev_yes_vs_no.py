@@ -15,12 +15,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -42,39 +42,26 @@ class EvYesVsNoAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
-
-        # Calculate YES win rate at each yes_price
-        yes_df = con.execute(
-            f"""
-            SELECT
-                t.yes_price AS price,
-                SUM(CASE WHEN m.result = 'yes' THEN t.count ELSE 0 END) * 1.0 / SUM(t.count) AS win_rate,
-                SUM(t.count) AS total_contracts
-            FROM '{self.trades_dir}/*.parquet' t
-            INNER JOIN '{self.markets_dir}/*.parquet' m ON t.ticker = m.ticker
-            WHERE m.result IN ('yes', 'no')
-              AND t.yes_price BETWEEN 1 AND 99
-            GROUP BY t.yes_price
-            ORDER BY t.yes_price
-            """
-        ).df()
-
-        # Calculate NO win rate at each no_price
-        no_df = con.execute(
-            f"""
-            SELECT
-                t.no_price AS price,
-                SUM(CASE WHEN m.result = 'no' THEN t.count ELSE 0 END) * 1.0 / SUM(t.count) AS win_rate,
-                SUM(t.count) AS total_contracts
-            FROM '{self.trades_dir}/*.parquet' t
-            INNER JOIN '{self.markets_dir}/*.parquet' m ON t.ticker = m.ticker
-            WHERE m.result IN ('yes', 'no')
-              AND t.no_price BETWEEN 1 AND 99
-            GROUP BY t.no_price
-            ORDER BY t.no_price
-            """
-        ).df()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
+
+        # Win rate of the side that bought YES (taker or maker) at each price, and likewise NO
+        yes_df, no_df = (
+            con.execute(
+                """
+                SELECT
+                    price,
+                    SUM(won_contracts) * 1.0 / SUM(contracts) AS win_rate,
+                    SUM(contracts) AS total_contracts
+                FROM kalshi_price_buckets
+                WHERE side = ?
+                  AND price BETWEEN 1 AND 99
+                GROUP BY price
+                ORDER BY price
+                """,
+                [side],
+            ).df()
+            for side in ("yes", "no")
+        )
 
         # Calculate EV = 100 * win_rate - price
         yes_df["ev"] = 100 * yes_df["win_rate"] - yes_df["price"]
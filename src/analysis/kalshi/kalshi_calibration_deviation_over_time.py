@@ -4,12 +4,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -31,48 +31,23 @@ class KalshiCalibrationDeviationOverTimeAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         # Query all trades joined with resolved market outcomes
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE result IN ('yes', 'no')
-            ),
-            trade_positions AS (
+            """
+            WITH trade_positions AS (
                 -- Buyer side (taker)
-                SELECT
-                    t.created_time,
-                    CASE
-                        WHEN t.taker_side = 'yes' THEN t.yes_price
-                        ELSE t.no_price
-                    END AS price,
-                    CASE
-                        WHEN t.taker_side = m.result THEN true
-                        ELSE false
-                    END AS won
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.yes_price > 0 AND t.no_price > 0
+                SELECT created_time, taker_price AS price, taker_won = 1 AS won
+                FROM kalshi_positions
+                WHERE yes_price > 0 AND no_price > 0
 
                 UNION ALL
 
                 -- Seller side (counterparty)
-                SELECT
-                    t.created_time,
-                    CASE
-                        WHEN t.taker_side = 'yes' THEN t.no_price
-                        ELSE t.yes_price
-                    END AS price,
-                    CASE
-                        WHEN t.taker_side != m.result THEN true
-                        ELSE false
-                    END AS won
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.yes_price > 0 AND t.no_price > 0
+                SELECT created_time, maker_price AS price, maker_won = 1 AS won
+                FROM kalshi_positions
+                WHERE yes_price > 0 AND no_price > 0
             )
             SELECT created_time, price, won
             FROM trade_positions
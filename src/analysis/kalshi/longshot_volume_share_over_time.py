@@ -8,12 +8,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -35,25 +35,19 @@ class LongshotVolumeShareOverTimeAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         # Compute quarterly volume by price bucket for takers
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            taker_trades AS (
+            """
+            WITH taker_trades AS (
                 SELECT
-                    DATE_TRUNC('quarter', t.created_time) AS quarter,
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    t.count AS contracts,
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS volume_usd
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                    DATE_TRUNC('quarter', created_time) AS quarter,
+                    taker_price AS price,
+                    count AS contracts,
+                    count * taker_price / 100.0 AS volume_usd
+                FROM kalshi_positions
+                WHERE finalized
             ),
             bucketed AS (
                 SELECT
@@ -8,12 +8,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -35,36 +35,30 @@ class MakerTakerGapOverTimeAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            all_positions AS (
+            """
+            WITH all_positions AS (
                 SELECT
                     'taker' AS role,
-                    DATE_TRUNC('quarter', t.created_time) AS quarter,
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    CASE WHEN t.taker_side = m.result THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                    DATE_TRUNC('quarter', created_time) AS quarter,
+                    taker_price AS price,
+                    taker_won AS won,
+                    count AS contracts
+                FROM kalshi_positions
+                WHERE finalized
 
                 UNION ALL
 
                 SELECT
                     'maker' AS role,
-                    DATE_TRUNC('quarter', t.created_time) AS quarter,
-                    CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END AS price,
-                    CASE WHEN t.taker_side != m.result THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                    DATE_TRUNC('quarter', created_time) AS quarter,
+                    maker_price AS price,
+                    maker_won AS won,
+                    count AS contracts
+                FROM kalshi_positions
+                WHERE finalized
             )
             SELECT
                 role,
@@ -9,13 +9,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
-from src.analysis.util.categories import CATEGORY_SQL, get_group
+from src.analysis.kalshi.util.categories import register_category_map
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -37,40 +37,39 @@ class MakerTakerReturnsByCategoryAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
+        register_category_map(con, source="kalshi_resolved_markets")
 
         # Get taker and maker returns by category
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, event_ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            taker_positions AS (
+            """
+            WITH taker_positions AS (
                 SELECT
-                    {CATEGORY_SQL.replace("event_ticker", "m.event_ticker")} AS category,
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    CASE WHEN t.taker_side = m.result THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts,
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS volume_usd
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                    c.category,
+                    c.group_name,
+                    p.taker_price AS price,
+                    p.taker_won AS won,
+                    p.count AS contracts,
+                    p.count * p.taker_price / 100.0 AS volume_usd
+                FROM kalshi_positions p
+                JOIN category_map c ON c.event_ticker IS NOT DISTINCT FROM p.event_ticker
+                WHERE p.finalized
             ),
             maker_positions AS (
                 SELECT
-                    {CATEGORY_SQL.replace("event_ticker", "m.event_ticker")} AS category,
-                    CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END AS price,
-                    CASE WHEN t.taker_side != m.result THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts,
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END) / 100.0 AS volume_usd
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                    c.category,
+                    p.maker_price AS price,
+                    p.maker_won AS won,
+                    p.count AS contracts,
+                    p.count * p.maker_price / 100.0 AS volume_usd
+                FROM kalshi_positions p
+                JOIN category_map c ON c.event_ticker IS NOT DISTINCT FROM p.event_ticker
+                WHERE p.finalized
             ),
             taker_stats AS (
                 SELECT
                     category,
+                    group_name,
                     AVG(won) AS win_rate,
                     AVG(price / 100.0) AS avg_price,
                     AVG(won - price / 100.0) AS excess_return,
@@ -80,7 +79,7 @@ class MakerTakerReturnsByCategoryAnalysis(Analysis):
                     SUM(volume_usd) AS volume_usd,
                     SUM(contracts * (won - price / 100.0)) AS pnl
                 FROM taker_positions
-                GROUP BY category
+                GROUP BY category, group_name
             ),
             maker_stats AS (
                 SELECT
@@ -113,16 +112,14 @@ class MakerTakerReturnsByCategoryAnalysis(Analysis):
                 m.n_trades AS maker_n,
                 m.contracts AS maker_contracts,
                 m.volume_usd AS maker_volume,
-                m.pnl AS maker_pnl
+                m.pnl AS maker_pnl,
+                t.group_name AS "group"
             FROM taker_stats t
             JOIN maker_stats m ON t.category = m.category
             ORDER BY t.volume_usd DESC
             """
         ).df()
 
-        # Apply group mapping
-        df["group"] = df["category"].apply(get_group)
-
         # Aggregate by group
         group_stats = []
         for group in df["group"].unique():
@@ -9,13 +9,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from scipy import stats
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -37,62 +37,29 @@ class MakerVsTakerReturnsAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
+        # won is 0/1 at a single price per bucket, so VAR_POP(won - price / 100) = p * (1 - p)
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            taker_positions AS (
-                SELECT
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    CASE WHEN t.taker_side = m.result THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts,
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS volume_usd
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-            ),
-            maker_positions AS (
-                SELECT
-                    CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END AS price,
-                    CASE WHEN t.taker_side != m.result THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts,
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END) / 100.0 AS volume_usd
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-            ),
-            taker_stats AS (
+            """
+            WITH role_stats AS (
                 SELECT
+                    role,
                     price,
-                    AVG(won) AS win_rate,
+                    SUM(wins) * 1.0 / SUM(n_trades) AS win_rate,
                     price / 100.0 AS expected_win_rate,
-                    AVG(won) - price / 100.0 AS excess_return,
-                    VAR_POP(won - price / 100.0) AS var_excess,
-                    COUNT(*) AS n_trades,
+                    SUM(wins) * 1.0 / SUM(n_trades) - price / 100.0 AS excess_return,
+                    SUM(wins) * 1.0 / SUM(n_trades) * (1 - SUM(wins) * 1.0 / SUM(n_trades)) AS var_excess,
+                    SUM(n_trades)::BIGINT AS n_trades,
                     SUM(volume_usd) AS volume_usd,
                     SUM(contracts) AS contracts,
-                    SUM(contracts * (won - price / 100.0)) AS pnl
-                FROM taker_positions
-                GROUP BY price
+                    SUM(won_contracts) - SUM(contracts) * price / 100.0 AS pnl
+                FROM kalshi_price_buckets
+                WHERE finalized
+                GROUP BY role, price
             ),
-            maker_stats AS (
-                SELECT
-                    price,
-                    AVG(won) AS win_rate,
-                    price / 100.0 AS expected_win_rate,
-                    AVG(won) - price / 100.0 AS excess_return,
-                    VAR_POP(won - price / 100.0) AS var_excess,
-                    COUNT(*) AS n_trades,
-                    SUM(volume_usd) AS volume_usd,
-                    SUM(contracts) AS contracts,
-                    SUM(contracts * (won - price / 100.0)) AS pnl
-                FROM maker_positions
-                GROUP BY price
-            )
+            taker_stats AS (SELECT * FROM role_stats WHERE role = 'taker'),
+            maker_stats AS (SELECT * FROM role_stats WHERE role = 'maker')
             SELECT
                 t.price,
                 t.win_rate AS taker_win_rate,
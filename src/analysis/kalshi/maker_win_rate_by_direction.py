@@ -9,11 +9,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -35,54 +35,23 @@ class MakerWinRateByDirectionAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
+        # Maker bought YES when the taker bought NO, and vice versa
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            maker_yes_positions AS (
-                -- Maker bought YES (taker sold YES = taker bought NO)
-                SELECT
-                    t.yes_price AS price,
-                    CASE WHEN m.result = 'yes' THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts,
-                    'YES' AS maker_side
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.taker_side = 'no'
-            ),
-            maker_no_positions AS (
-                -- Maker bought NO (taker sold NO = taker bought YES)
-                SELECT
-                    t.no_price AS price,
-                    CASE WHEN m.result = 'no' THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts,
-                    'NO' AS maker_side
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.taker_side = 'yes'
-            ),
-            all_maker_positions AS (
-                SELECT * FROM maker_yes_positions
-                UNION ALL
-                SELECT * FROM maker_no_positions
-            )
+            """
             SELECT
-                maker_side,
+                UPPER(side) AS maker_side,
                 price,
-                SUM(won * contracts) / SUM(contracts) AS win_rate,
+                won_contracts * 1.0 / contracts AS win_rate,
                 price / 100.0 AS implied_prob,
-                SUM(won * contracts) / SUM(contracts) - price / 100.0 AS mispricing,
-                COUNT(*) AS n_trades,
-                SUM(contracts) AS contracts
-            FROM all_maker_positions
-            WHERE price BETWEEN 1 AND 99
-            GROUP BY maker_side, price
+                won_contracts * 1.0 / contracts - price / 100.0 AS mispricing,
+                n_trades,
+                contracts
+            FROM kalshi_price_buckets
+            WHERE finalized
+              AND role = 'maker'
+              AND price BETWEEN 1 AND 99
             ORDER BY maker_side, price
             """
         ).df()
@@ -5,15 +5,15 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-import duckdb
 import matplotlib.colors as mcolors
 import matplotlib.pyplot as plt
 import pandas as pd
 import squarify
 from matplotlib.patches import Patch
 
-from src.analysis.util.categories import GROUP_COLORS, get_group, get_hierarchy
+from src.analysis.kalshi.util.categories import GROUP_COLORS, register_category_map
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -33,33 +33,34 @@ class MarketTypesAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_markets=self.markets_dir)
+        register_category_map(con)
 
-        # Get raw categories with market count
+        # Get raw categories with market count and their hierarchy
         df_raw = con.execute(
-            f"""
-            WITH categorized AS (
+            """
+            WITH by_ticker AS (
                 SELECT
-                    CASE
-                        WHEN event_ticker IS NULL OR event_ticker = '' THEN 'independent'
-                        WHEN regexp_extract(event_ticker, '^([A-Z0-9]+)', 1) = '' THEN 'independent'
-                        ELSE regexp_extract(event_ticker, '^([A-Z0-9]+)', 1)
-                    END AS category,
-                    COALESCE(volume, 0) AS volume
-                FROM '{self.markets_dir}/*.parquet'
+                    event_ticker,
+                    SUM(COALESCE(volume, 0)) AS volume,
+                    COUNT(*) AS market_count
+                FROM kalshi_markets
+                GROUP BY event_ticker
             )
             SELECT
-                category,
-                SUM(volume) AS total_volume,
-                COUNT(*) AS market_count
-            FROM categorized
-            GROUP BY category
+                c.category,
+                SUM(t.volume) AS total_volume,
+                SUM(t.market_count)::BIGINT AS market_count,
+                ANY_VALUE(c.group_name) AS "group",
+                ANY_VALUE(c.mid_category) AS mid_category,
+                ANY_VALUE(c.subcategory) AS subcategory
+            FROM by_ticker t
+            JOIN category_map c ON c.event_ticker IS NOT DISTINCT FROM t.event_ticker
+            GROUP BY c.category
             ORDER BY total_volume DESC
             """
         ).df()
 
-        # Apply grouping
-        df_raw["group"] = df_raw["category"].apply(get_group)
         df_grouped = (
             df_raw.groupby("group")
             .agg(
@@ -79,20 +80,14 @@ class MarketTypesAnalysis(Analysis):
         """Build hierarchical JSON structure for treemap.
 
         Args:
-            df_raw: DataFrame with category and total_volume columns
+            df_raw: DataFrame with category, total_volume and hierarchy
+                    (group, mid_category, subcategory) columns
             min_pct: Minimum percentage of parent volume to include (default 1%)
                      Items below this threshold are excluded entirely
 
         Returns:
             List of dicts with name, value, and optional children
         """
-        # Apply hierarchy mapping
-        hierarchies = df_raw["category"].apply(get_hierarchy)
-        df_raw = df_raw.copy()
-        df_raw["group"] = hierarchies.apply(lambda x: x[0])
-        df_raw["mid_category"] = hierarchies.apply(lambda x: x[1])
-        df_raw["subcategory"] = hierarchies.apply(lambda x: x[2])
-
         # Build tree structure: group -> mid_category -> subcategory
         result = []
 
@@ -4,10 +4,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 
 
 class MetaStatsAnalysis(Analysis):
@@ -28,16 +28,16 @@ class MetaStatsAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         # Trade statistics
         trade_stats = con.execute(
-            f"""
+            """
             SELECT
                 COUNT(*) AS num_trades,
                 SUM(count) AS total_volume,
                 COUNT(DISTINCT ticker) AS num_tickers
-            FROM '{self.trades_dir}/*.parquet'
+            FROM kalshi_trades
             """
         ).fetchone()
 
@@ -47,11 +47,11 @@ class MetaStatsAnalysis(Analysis):
 
         # Market statistics
         market_stats = con.execute(
-            f"""
+            """
             SELECT
                 COUNT(*) AS num_markets,
                 COUNT(DISTINCT event_ticker) AS num_events
-            FROM '{self.markets_dir}/*.parquet'
+            FROM kalshi_markets
             """
         ).fetchone()
 
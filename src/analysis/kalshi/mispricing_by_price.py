@@ -4,11 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -30,63 +30,24 @@ class MispricingByPriceAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
-        # Query for taker, maker, and combined mispricing by price
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            taker_positions AS (
-                SELECT
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    CASE WHEN t.taker_side = m.result THEN 1 ELSE 0 END AS won
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-            ),
-            maker_positions AS (
-                SELECT
-                    CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END AS price,
-                    CASE WHEN t.taker_side != m.result THEN 1 ELSE 0 END AS won
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-            ),
-            taker_stats AS (
-                SELECT
-                    price,
-                    COUNT(*) AS total_trades,
-                    SUM(won) AS wins,
-                    100.0 * SUM(won) / COUNT(*) AS win_rate
-                FROM taker_positions
-                GROUP BY price
-            ),
-            maker_stats AS (
+            """
+            WITH role_stats AS (
                 SELECT
+                    role,
                     price,
-                    COUNT(*) AS total_trades,
-                    SUM(won) AS wins,
-                    100.0 * SUM(won) / COUNT(*) AS win_rate
-                FROM maker_positions
-                GROUP BY price
+                    SUM(n_trades)::BIGINT AS total_trades,
+                    SUM(wins) AS wins,
+                    100.0 * SUM(wins) / SUM(n_trades) AS win_rate
+                FROM kalshi_price_buckets
+                WHERE finalized
+                GROUP BY GROUPING SETS ((role, price), (price))
             ),
-            combined_positions AS (
-                SELECT * FROM taker_positions
-                UNION ALL
-                SELECT * FROM maker_positions
-            ),
-            combined_stats AS (
-                SELECT
-                    price,
-                    COUNT(*) AS total_trades,
-                    SUM(won) AS wins,
-                    100.0 * SUM(won) / COUNT(*) AS win_rate
-                FROM combined_positions
-                GROUP BY price
-            )
+            taker_stats AS (SELECT * FROM role_stats WHERE role = 'taker'),
+            maker_stats AS (SELECT * FROM role_stats WHERE role = 'maker'),
+            combined_stats AS (SELECT * FROM role_stats WHERE role IS NULL)
             SELECT
                 t.price,
                 t.total_trades AS taker_trades,
@@ -8,12 +8,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -35,26 +35,20 @@ class ReturnsByHourAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         # Compute excess returns by hour of day (ET)
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            trade_data AS (
+            """
+            WITH trade_data AS (
                 SELECT
-                    EXTRACT(HOUR FROM t.created_time) AS hour_et,
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    CASE WHEN t.taker_side = m.result THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts,
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS volume_usd
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                    EXTRACT(HOUR FROM created_time) AS hour_et,
+                    taker_price AS price,
+                    taker_won AS won,
+                    count AS contracts,
+                    count * taker_price / 100.0 AS volume_usd
+                FROM kalshi_positions
+                WHERE finalized
             )
             SELECT
                 hour_et,
@@ -19,8 +19,9 @@ import pandas as pd
 from scipy import stats
 from scipy.stats import mannwhitneyu, pearsonr, spearmanr, ttest_ind
 
-from src.analysis.util.categories import CATEGORY_SQL, get_group
+from src.analysis.kalshi.util.categories import register_category_map
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 
 
 class StatisticalTestsAnalysis(Analysis):
@@ -41,7 +42,7 @@ class StatisticalTestsAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         results: dict[str, Any] = {}
 
@@ -103,17 +104,13 @@ class StatisticalTestsAnalysis(Analysis):
     def _test_trade_size_by_role(self, con: duckdb.DuckDBPyConnection) -> pd.DataFrame:
         """Test 1: Trade size by role across price levels."""
         trade_size_by_price = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized' AND result IN ('yes', 'no')
-            )
+            """
             SELECT
-                CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS taker_size,
-                t.count * (CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END) / 100.0 AS maker_size
-            FROM '{self.trades_dir}/*.parquet' t
-            INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                taker_price AS price,
+                count * taker_price / 100.0 AS taker_size,
+                count * maker_price / 100.0 AS maker_size
+            FROM kalshi_positions
+            WHERE finalized
             """
         ).df()
 
@@ -157,33 +154,10 @@ class StatisticalTestsAnalysis(Analysis):
     def _test_yes_no_asymmetry(self, con: duckdb.DuckDBPyConnection) -> pd.DataFrame:
         """Test 2: YES/NO asymmetry by price level."""
         yes_no_by_price = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized' AND result IN ('yes', 'no')
-            ),
-            yes_trades AS (
-                SELECT
-                    t.yes_price AS price,
-                    CASE WHEN m.result = 'yes' THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.taker_side = 'yes'
-            ),
-            no_trades AS (
-                SELECT
-                    t.no_price AS price,
-                    CASE WHEN m.result = 'no' THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.taker_side = 'no'
-            )
-            SELECT 'YES' AS side, price, won, contracts FROM yes_trades
-            UNION ALL
-            SELECT 'NO' AS side, price, won, contracts FROM no_trades
+            """
+            SELECT UPPER(taker_side) AS side, taker_price AS price, taker_won::DOUBLE AS won, count AS contracts
+            FROM kalshi_positions
+            WHERE finalized AND taker_side IN ('yes', 'no')
             """
         ).df()
 
@@ -259,25 +233,21 @@ class StatisticalTestsAnalysis(Analysis):
 
     def _test_category_gaps(self, con: duckdb.DuckDBPyConnection) -> pd.DataFrame:
         """Test 3: Category gap differences."""
+        register_category_map(con, source="kalshi_resolved_markets")
         category_trades = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, event_ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized' AND result IN ('yes', 'no')
-            )
+            """
             SELECT
-                {CATEGORY_SQL.replace("event_ticker", "m.event_ticker")} AS category,
-                CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS taker_price,
-                CASE WHEN t.taker_side = m.result THEN 1.0 ELSE 0.0 END AS taker_won,
-                t.count AS contracts
-            FROM '{self.trades_dir}/*.parquet' t
-            INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                c.category,
+                p.taker_price,
+                p.taker_won::DOUBLE AS taker_won,
+                p.count AS contracts,
+                c.group_name AS "group"
+            FROM kalshi_positions p
+            JOIN category_map c ON c.event_ticker IS NOT DISTINCT FROM p.event_ticker
+            WHERE p.finalized
             """
         ).df()
 
-        category_trades["group"] = category_trades["category"].apply(get_group)
-
         # Compute taker excess return per trade for each category
         category_trades["taker_excess"] = category_trades["taker_won"] - category_trades["taker_price"] / 100
 
@@ -320,18 +290,13 @@ class StatisticalTestsAnalysis(Analysis):
     def _test_trade_size_performance(self, con: duckdb.DuckDBPyConnection) -> dict[str, float]:
         """Test 4: Trade size -> performance relationship."""
         trade_perf = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized' AND result IN ('yes', 'no')
-            )
+            """
             SELECT
-                t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS trade_size,
-                CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                CASE WHEN t.taker_side = m.result THEN 1.0 ELSE 0.0 END AS won
-            FROM '{self.trades_dir}/*.parquet' t
-            INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                count * taker_price / 100.0 AS trade_size,
+                taker_price AS price,
+                taker_won::DOUBLE AS won
+            FROM kalshi_positions
+            WHERE finalized
             """
         ).df()
 
@@ -380,33 +345,14 @@ class StatisticalTestsAnalysis(Analysis):
     def _test_maker_direction(self, con: duckdb.DuckDBPyConnection) -> pd.DataFrame:
         """Test 5: Maker direction performance."""
         maker_direction = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized' AND result IN ('yes', 'no')
-            ),
-            maker_yes AS (
-                SELECT
-                    t.yes_price AS price,
-                    CASE WHEN m.result = 'yes' THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.taker_side = 'no'  -- maker bought YES
-            ),
-            maker_no AS (
-                SELECT
-                    t.no_price AS price,
-                    CASE WHEN m.result = 'no' THEN 1.0 ELSE 0.0 END AS won,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-                WHERE t.taker_side = 'yes'  -- maker bought NO
-            )
-            SELECT 'YES' AS maker_side, price, won, contracts FROM maker_yes
-            UNION ALL
-            SELECT 'NO' AS maker_side, price, won, contracts FROM maker_no
+            """
+            SELECT
+                CASE WHEN taker_side = 'no' THEN 'YES' ELSE 'NO' END AS maker_side,
+                maker_price AS price,
+                maker_won::DOUBLE AS won,
+                count AS contracts
+            FROM kalshi_positions
+            WHERE finalized AND taker_side IN ('yes', 'no')
             """
         ).df()
 
@@ -8,12 +8,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -35,30 +35,20 @@ class TradeSizeByRoleAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         # Get aggregate trade size stats for takers and makers
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            taker_trades AS (
-                SELECT
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS trade_size_usd,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+            """
+            WITH taker_trades AS (
+                SELECT count * taker_price / 100.0 AS trade_size_usd, count AS contracts
+                FROM kalshi_positions
+                WHERE finalized
             ),
             maker_trades AS (
-                SELECT
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END) / 100.0 AS trade_size_usd,
-                    t.count AS contracts
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                SELECT count * maker_price / 100.0 AS trade_size_usd, count AS contracts
+                FROM kalshi_positions
+                WHERE finalized
             )
             SELECT
                 'taker' AS role,
@@ -1,17 +1,21 @@
 """Utility modules for analysis."""
 
-from src.analysis.util.categories import (
+from src.analysis.kalshi.util.categories import (
+    CATEGORY_HIERARCHY_SQL,
     CATEGORY_SQL,
     GROUP_COLORS,
     SUBCATEGORY_PATTERNS,
     get_group,
     get_hierarchy,
+    register_category_map,
 )
 
 __all__ = [
+    "CATEGORY_HIERARCHY_SQL",
     "CATEGORY_SQL",
     "GROUP_COLORS",
     "SUBCATEGORY_PATTERNS",
     "get_group",
     "get_hierarchy",
+    "register_category_map",
 ]
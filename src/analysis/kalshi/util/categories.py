@@ -1,5 +1,11 @@
 """Category grouping utilities for market analysis with hierarchical structure."""
 
+from __future__ import annotations
+
+from functools import lru_cache
+
+import duckdb
+
 # Hierarchical category structure:
 # Group -> Category -> Subcategory
 # e.g., Sports -> NFL -> Games, Spreads, Totals, Props
@@ -568,13 +574,43 @@ SUBCATEGORY_PATTERNS = [
 ]
 
 
+def _build_pattern_trie(patterns: list[tuple[str, str, str, str]]) -> dict:
+    """Trie over the patterns; a node's None key holds the earliest index ending there."""
+    root: dict = {}
+    for index, (pattern, _, _, _) in enumerate(patterns):
+        node = root
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node.setdefault(None, index)
+    return root
+
+
+_PATTERN_TRIE = _build_pattern_trie(SUBCATEGORY_PATTERNS)
+
+
+@lru_cache(maxsize=65536)
 def get_hierarchy(category: str) -> tuple[str, str, str]:
-    """Map a category to its (group, category, subcategory) tuple."""
+    """Map a category to its (group, category, subcategory) tuple.
+
+    The first pattern in SUBCATEGORY_PATTERNS contained in the category wins.
+    Walking the trie from every offset finds all contained patterns in one
+    pass over the string instead of one substring scan per pattern.
+    """
     cat_upper = category.upper()
-    for pattern, group, cat, subcat in SUBCATEGORY_PATTERNS:
-        if pattern in cat_upper:
-            return (group, cat, subcat)
-    return ("Other", "Other", category)
+    best = len(SUBCATEGORY_PATTERNS)
+    for start in range(len(cat_upper)):
+        node = _PATTERN_TRIE
+        for char in cat_upper[start:]:
+            node = node.get(char)
+            if node is None:
+                break
+            index = node.get(None)
+            if index is not None and index < best:
+                best = index
+    if best == len(SUBCATEGORY_PATTERNS):
+        return ("Other", "Other", category)
+    _, group, cat, subcat = SUBCATEGORY_PATTERNS[best]
+    return (group, cat, subcat)
 
 
 def get_group(category: str) -> str:
@@ -609,3 +645,56 @@ CASE
     ELSE regexp_extract(event_ticker, '^([A-Z0-9]+)', 1)
 END
 """
+
+
+# Hierarchy for each distinct category in `{categories}` (a query with a
+# `category` column). Matching is by substring, so this joins the few thousand
+# distinct categories against the patterns rather than every trade row.
+CATEGORY_HIERARCHY_SQL = """
+SELECT
+    c.category,
+    COALESCE(arg_min(p.group_name, p.priority), 'Other') AS group_name,
+    COALESCE(arg_min(p.mid_category, p.priority), 'Other') AS mid_category,
+    COALESCE(arg_min(p.subcategory, p.priority), c.category) AS subcategory
+FROM (SELECT DISTINCT category FROM ({categories})) c
+LEFT JOIN category_patterns p ON contains(upper(c.category), p.pattern)
+GROUP BY c.category
+"""
+
+
+def register_category_map(con: duckdb.DuckDBPyConnection, source: str = "kalshi_markets") -> None:
+    """Create the DuckDB-side category mapping on a connection.
+
+    Creates temp tables `category_patterns` (SUBCATEGORY_PATTERNS with their
+    priority) and `category_map` (event_ticker, category, group_name,
+    mid_category, subcategory) for every event ticker in `source`, so queries
+    categorize with a hash join:
+
+        SELECT m.group_name, SUM(p.count)
+        FROM kalshi_positions p
+        JOIN category_map m ON m.event_ticker IS NOT DISTINCT FROM p.event_ticker
+        GROUP BY m.group_name
+
+    Args:
+        con: Connection (or cursor); the temp tables are local to it.
+        source: Table or view with an event_ticker column.
+    """
+    con.execute("""
+        CREATE OR REPLACE TEMP TABLE category_patterns (
+            priority INTEGER, pattern VARCHAR, group_name VARCHAR, mid_category VARCHAR, subcategory VARCHAR
+        )
+    """)
+    con.executemany(
+        "INSERT INTO category_patterns VALUES (?, ?, ?, ?, ?)",
+        [(i, *row) for i, row in enumerate(SUBCATEGORY_PATTERNS)],
+    )
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE category_map AS
+        WITH tickers AS (
+            SELECT event_ticker, {CATEGORY_SQL} AS category
+            FROM (SELECT DISTINCT event_ticker FROM {source})
+        )
+        SELECT t.event_ticker, t.category, h.group_name, h.mid_category, h.subcategory
+        FROM tickers t
+        JOIN ({CATEGORY_HIERARCHY_SQL.format(categories="SELECT category FROM tickers")}) h USING (category)
+    """)
@@ -4,11 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, ScaleType, UnitType
 
 
@@ -28,14 +28,14 @@ class VolumeOverTimeAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir)
 
         df = con.execute(
-            f"""
+            """
             SELECT
                 DATE_TRUNC('quarter', created_time) AS quarter,
                 SUM(count) AS volume_usd
-            FROM '{self.trades_dir}/*.parquet'
+            FROM kalshi_trades
             GROUP BY quarter
             ORDER BY quarter
             """
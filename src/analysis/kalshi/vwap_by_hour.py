@@ -10,12 +10,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -37,26 +37,20 @@ class VwapByHourAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         # Compute VWAP by hour of day (ET)
         # Trade timestamps are already in America/New_York timezone
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            trade_data AS (
+            """
+            WITH trade_data AS (
                 SELECT
-                    EXTRACT(HOUR FROM t.created_time) AS hour_et,
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    t.count AS contracts,
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS volume_usd
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
+                    EXTRACT(HOUR FROM created_time) AS hour_et,
+                    taker_price AS price,
+                    count AS contracts,
+                    count * taker_price / 100.0 AS volume_usd
+                FROM kalshi_positions
+                WHERE finalized
             )
             SELECT
                 hour_et,
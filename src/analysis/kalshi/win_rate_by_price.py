@@ -4,11 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -30,39 +30,18 @@ class WinRateByPriceAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
+        # Taker and maker (counterparty) positions, pre-aggregated by price
         df = con.execute(
-            f"""
-            WITH resolved_markets AS (
-                SELECT ticker, result
-                FROM '{self.markets_dir}/*.parquet'
-                WHERE status = 'finalized'
-                  AND result IN ('yes', 'no')
-            ),
-            all_positions AS (
-                -- Taker side
-                SELECT
-                    CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS price,
-                    CASE WHEN t.taker_side = m.result THEN 1 ELSE 0 END AS won
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-
-                UNION ALL
-
-                -- Maker side (counterparty)
-                SELECT
-                    CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END AS price,
-                    CASE WHEN t.taker_side != m.result THEN 1 ELSE 0 END AS won
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN resolved_markets m ON t.ticker = m.ticker
-            )
+            """
             SELECT
                 price,
-                COUNT(*) AS total_trades,
-                SUM(won) AS wins,
-                100.0 * SUM(won) / COUNT(*) AS win_rate
-            FROM all_positions
+                SUM(n_trades)::BIGINT AS total_trades,
+                SUM(wins) AS wins,
+                100.0 * SUM(wins) / SUM(n_trades) AS win_rate
+            FROM kalshi_price_buckets
+            WHERE finalized
             GROUP BY price
             ORDER BY price
             """
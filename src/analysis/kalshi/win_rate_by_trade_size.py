@@ -9,12 +9,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, ScaleType, UnitType
 
 
@@ -36,21 +36,19 @@ class WinRateByTradeSizeAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir, kalshi_markets=self.markets_dir)
 
         # Compute excess win rate by trade size bin with variance for CI
         # Uses log-scale bins and controls for price by computing excess win rate
         df = con.execute(
-            f"""
+            """
             WITH trade_data AS (
                 SELECT
-                    t.count * (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS trade_size_usd,
-                    CASE WHEN t.taker_side = m.result THEN 1.0 ELSE 0.0 END AS won,
-                    (CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END) / 100.0 AS expected_win_rate
-                FROM '{self.trades_dir}/*.parquet' t
-                INNER JOIN '{self.markets_dir}/*.parquet' m ON t.ticker = m.ticker
-                WHERE m.status = 'finalized'
-                  AND m.result IN ('yes', 'no')
+                    count * taker_price / 100.0 AS trade_size_usd,
+                    taker_won AS won,
+                    taker_price / 100.0 AS expected_win_rate
+                FROM kalshi_positions
+                WHERE finalized
             ),
             binned AS (
                 SELECT
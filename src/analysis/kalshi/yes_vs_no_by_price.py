@@ -4,11 +4,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
 import matplotlib.pyplot as plt
 import pandas as pd
 
 from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import analytics_connection
 from src.common.interfaces.chart import ChartConfig, ChartType, UnitType
 
 
@@ -28,31 +28,31 @@ class YesVsNoByPriceAnalysis(Analysis):
 
     def run(self) -> AnalysisOutput:
         """Execute the analysis and return outputs."""
-        con = duckdb.connect()
+        con = analytics_connection(kalshi_trades=self.trades_dir)
 
         df = con.execute(
-            f"""
+            """
             WITH taker_yes AS (
                 SELECT yes_price AS price, SUM(count) AS contracts
-                FROM '{self.trades_dir}/*.parquet'
+                FROM kalshi_trades
                 WHERE taker_side = 'yes'
                 GROUP BY yes_price
             ),
             taker_no AS (
                 SELECT no_price AS price, SUM(count) AS contracts
-                FROM '{self.trades_dir}/*.parquet'
+                FROM kalshi_trades
                 WHERE taker_side = 'no'
                 GROUP BY no_price
             ),
             maker_yes AS (
                 SELECT yes_price AS price, SUM(count) AS contracts
-                FROM '{self.trades_dir}/*.parquet'
+                FROM kalshi_trades
                 WHERE taker_side = 'no'
                 GROUP BY yes_price
             ),
             maker_no AS (
                 SELECT no_price AS price, SUM(count) AS contracts
-                FROM '{self.trades_dir}/*.parquet'
+                FROM kalshi_trades
                 WHERE taker_side = 'yes'
                 GROUP BY no_price
             ),
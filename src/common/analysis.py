@@ -108,6 +108,26 @@ class Analysis(ABC):
                      Supported: png, pdf, svg, gif, csv, json.
             dpi: Resolution for raster formats (default: 300).
 
+        Returns:
+            Dict mapping format to saved file path.
+        """
+        return self.export(self.run(), output_dir, formats, dpi)
+
+    def export(
+        self,
+        output: AnalysisOutput,
+        output_dir: Path | str,
+        formats: list[str] | None = None,
+        dpi: int = 300,
+    ) -> dict[str, Path]:
+        """Write an already-computed output to the specified directory.
+
+        Args:
+            output: Result of `run()`.
+            output_dir: Directory to save outputs.
+            formats: List of formats to save. Defaults to ["png", "pdf", "csv"].
+            dpi: Resolution for raster formats (default: 300).
+
         Returns:
             Dict mapping format to saved file path.
         """
@@ -117,7 +137,6 @@ class Analysis(ABC):
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        output = self.run()
         saved: dict[str, Path] = {}
 
         # Save figure formats
@@ -127,8 +146,11 @@ class Analysis(ABC):
                 path = output_dir / f"{self.name}.{fmt}"
                 if fmt == "gif" and isinstance(output.figure, FuncAnimation):
                     output.figure.save(path, writer="pillow", dpi=dpi)
-                elif isinstance(output.figure, Figure):
+                elif fmt != "gif" and isinstance(output.figure, Figure):
+                    # gif is for animations; matplotlib can't save a static figure as one
                     output.figure.savefig(path, dpi=dpi, bbox_inches="tight")
+                else:
+                    continue
                 saved[fmt] = path
 
             # Close figure to free memory
@@ -0,0 +1,423 @@
+"""
+Persistent DuckDB analytics catalog shared by the analyses in src/analysis.
+
+Every analysis used to open a fresh in-memory connection and re-scan the
+Parquet globs under data/, so `main.py analyze all` parsed the same files
+dozens of times. The catalog keeps one database (data/analytics.duckdb) with:
+
+- views over each raw dataset (kalshi_trades, kalshi_markets, polymarket_*)
+- kalshi_resolved_markets: markets with a yes/no result
+- kalshi_positions: one row per trade in a resolved market, with the taker
+  and maker price and outcome already computed
+- kalshi_price_buckets: positions aggregated by (finalized, role, side, price)
+
+The materialized tables are refreshed incrementally from a file manifest:
+new trade chunks are joined and appended, rewritten or removed chunks are
+replaced by file, and a changed markets dataset re-joins only the tickers
+whose status/result changed.
+
+Usage:
+    from src.common.catalog import analytics_connection
+
+    con = analytics_connection(kalshi_trades=trades_dir, kalshi_markets=markets_dir)
+    df = con.execute("SELECT price, SUM(n_trades) FROM kalshi_price_buckets GROUP BY price").df()
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+DEFAULT_DB_PATH = Path(os.environ.get("ANALYTICS_DB", DATA_DIR / "analytics.duckdb"))
+
+# View name -> directory of Parquet files, relative to DATA_DIR
+DATASETS = {
+    "kalshi_trades": "kalshi/trades",
+    "kalshi_markets": "kalshi/markets",
+    "polymarket_trades": "polymarket/trades",
+    "polymarket_legacy_trades": "polymarket/legacy_trades",
+    "polymarket_markets": "polymarket/markets",
+    "polymarket_blocks": "polymarket/blocks",
+}
+
+_RESOLVED_MARKETS_SQL = """
+    SELECT ticker, event_ticker, status, result, close_time
+    FROM {markets}
+    WHERE result IN ('yes', 'no')
+"""
+
+_POSITIONS_SQL = """
+    SELECT
+        t.trade_id,
+        t.ticker,
+        m.event_ticker,
+        t.created_time,
+        t.taker_side,
+        t.yes_price,
+        t.no_price,
+        t.count,
+        m.result,
+        m.status = 'finalized' AS finalized,
+        CASE WHEN t.taker_side = 'yes' THEN t.yes_price ELSE t.no_price END AS taker_price,
+        CASE WHEN t.taker_side = 'yes' THEN t.no_price ELSE t.yes_price END AS maker_price,
+        CASE WHEN t.taker_side = m.result THEN 1 ELSE 0 END AS taker_won,
+        CASE WHEN t.taker_side != m.result THEN 1 ELSE 0 END AS maker_won,
+        {file} AS _file
+    FROM {trades} t
+    INNER JOIN {markets} m ON t.ticker = m.ticker
+"""
+
+_PRICE_BUCKETS_SQL = """
+    SELECT
+        finalized,
+        'taker' AS role,
+        taker_side AS side,
+        taker_price AS price,
+        COUNT(*) AS n_trades,
+        SUM(taker_won) AS wins,
+        SUM(count) AS contracts,
+        SUM(count * taker_won) AS won_contracts,
+        SUM(count * taker_price / 100.0) AS volume_usd
+    FROM kalshi_positions
+    GROUP BY finalized, taker_side, taker_price
+
+    UNION ALL
+
+    SELECT
+        finalized,
+        'maker' AS role,
+        CASE WHEN taker_side = 'yes' THEN 'no' ELSE 'yes' END AS side,
+        maker_price AS price,
+        COUNT(*) AS n_trades,
+        SUM(maker_won) AS wins,
+        SUM(count) AS contracts,
+        SUM(count * maker_won) AS won_contracts,
+        SUM(count * maker_price / 100.0) AS volume_usd
+    FROM kalshi_positions
+    GROUP BY finalized, taker_side, maker_price
+"""
+
+
+def parquet_manifest(directory: Path | str | None, pattern: str = "*.parquet") -> dict[str, tuple[int, int]]:
+    """Map each Parquet file under a directory to its (size, mtime_ns) signature.
+
+    Args:
+        directory: Dataset directory. Missing directories yield an empty manifest.
+        pattern: Glob relative to the directory; "**/*.parquet" recurses.
+
+    Returns:
+        Dict of file path -> (size in bytes, modification time in ns), sorted by path.
+    """
+    if directory is None or not Path(directory).is_dir():
+        return {}
+    files = {}
+    for path in sorted(Path(directory).glob(pattern)):
+        stat = path.stat()
+        files[str(path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def _parquet_list(files: list[str]) -> str:
+    return "read_parquet([" + ", ".join(f"'{f}'" for f in files) + "], filename = true)"
+
+
+class AnalyticsCatalog:
+    """A DuckDB database with views over the raw datasets and shared derived tables.
+
+    Args:
+        db_path: Database file. ":memory:" keeps everything in-process.
+        datasets: Overrides for DATASETS directories (view name -> directory).
+        materialize: When False, the derived tables are plain views over the
+            Parquet files — the same SQL, re-scanned on every query. Useful
+            for comparing timings and for read-only environments.
+        read_only: Open the database read-only and never refresh it. DuckDB
+            allows many read-only processes on one file but only a single
+            writer, so parallel workers use this after the parent refreshed.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str = DEFAULT_DB_PATH,
+        datasets: dict[str, Path | str] | None = None,
+        materialize: bool = True,
+        read_only: bool = False,
+    ):
+        self.db_path = str(db_path)
+        self.dirs = {name: DATA_DIR / rel for name, rel in DATASETS.items()}
+        self.dirs.update({name: Path(d) for name, d in (datasets or {}).items() if d is not None})
+        self.materialize = materialize
+        self.read_only = read_only
+        self._con: duckdb.DuckDBPyConnection | None = None
+        self._lock = threading.Lock()
+        self._refreshed = False
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    def connect(self) -> duckdb.DuckDBPyConnection:
+        """Return a cursor on the catalog, refreshing it on first use in this process."""
+        with self._lock:
+            if self._con is None:
+                if self.db_path != ":memory:":
+                    Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    self._con = duckdb.connect(self.db_path, read_only=self.read_only)
+                except duckdb.IOException as e:
+                    # Another process holds the write lock (or a read-only file is
+                    # missing); fall back to a private copy
+                    logger.warning(f"Analytics catalog {self.db_path} is unavailable ({e}); using an in-memory catalog")
+                    self._reopen_in_memory()
+                    self._con = duckdb.connect()
+                # Raw-dataset views re-read Parquet footers; parse each file's metadata once
+                self._con.execute("SET parquet_metadata_cache = true")
+            if not self._refreshed and not self.read_only:
+                self.refresh()
+            return self._con.cursor()
+
+    def use(
+        self,
+        datasets: dict[str, Path | str | None],
+        materialize: bool | None = None,
+        read_only: bool | None = None,
+    ):
+        """Point datasets at new directories; the next connect() refreshes if anything changed.
+
+        A read-only catalog keeps serving what the writer last built.
+        """
+        with self._lock:
+            if read_only is not None and read_only != self.read_only:
+                if self._con is not None:
+                    self._con.close()
+                    self._con = None
+                self.read_only = read_only
+            if materialize is not None and materialize != self.materialize:
+                self.materialize = materialize
+                self._refreshed = False
+            for name, directory in datasets.items():
+                if directory is not None and Path(directory) != self.dirs.get(name):
+                    self.dirs[name] = Path(directory)
+                    self._refreshed = False
+                    if self.read_only:
+                        # The shared file was built from other directories and can't be refreshed
+                        logger.warning(f"{name} moved to {directory}; using an in-memory catalog")
+                        self._reopen_in_memory()
+
+    def _reopen_in_memory(self):
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+        self.db_path = ":memory:"
+        self.read_only = False
+
+    def close(self):
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+                self._refreshed = False
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> dict:
+        """Bring views and derived tables up to date with the Parquet files.
+
+        Returns:
+            Dict with per-step row counts and the time taken.
+        """
+        con = self._con
+        started = time.perf_counter()
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS _catalog_files (
+                dataset VARCHAR, path VARCHAR, size BIGINT, mtime_ns BIGINT,
+                PRIMARY KEY (dataset, path)
+            )
+        """)
+        files = {name: parquet_manifest(self.dirs.get(name)) for name in self.dirs}
+
+        # Raw views (DuckDB binds a view at creation, so only for non-empty datasets)
+        for name, found in files.items():
+            if found:
+                con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM '{self.dirs[name]}/*.parquet'")
+            else:
+                con.execute(f"DROP VIEW IF EXISTS {name}")
+
+        report = {"db_path": self.db_path, "materialized": self.materialize}
+        if files["kalshi_markets"] and files["kalshi_trades"]:
+            if self.materialize:
+                report.update(self._refresh_kalshi(files))
+            else:
+                self._kalshi_views()
+        self._refreshed = True
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Analytics catalog refreshed: {report}")
+        return report
+
+    def _kalshi_views(self):
+        con = self._con
+        for table in ("kalshi_price_buckets", "kalshi_positions", "kalshi_resolved_markets"):
+            if self._table_type(table) == "BASE TABLE":
+                con.execute(f"DROP TABLE {table}")
+        con.execute(
+            "CREATE OR REPLACE VIEW kalshi_resolved_markets AS "
+            + _RESOLVED_MARKETS_SQL.format(markets="kalshi_markets")
+        )
+        con.execute(
+            "CREATE OR REPLACE VIEW kalshi_positions AS "
+            + _POSITIONS_SQL.format(
+                trades="read_parquet('" + str(self.dirs["kalshi_trades"]) + "/*.parquet', filename = true)",
+                markets="kalshi_resolved_markets",
+                file="t.filename",
+            )
+        )
+        con.execute("CREATE OR REPLACE VIEW kalshi_price_buckets AS " + _PRICE_BUCKETS_SQL)
+
+    def _table_type(self, name: str) -> str | None:
+        row = self._con.execute(
+            "SELECT table_type FROM information_schema.tables WHERE table_name = ?", [name]
+        ).fetchone()
+        return row[0] if row else None
+
+    def _manifest(self, dataset: str) -> dict[str, tuple[int, int]]:
+        rows = self._con.execute(
+            "SELECT path, size, mtime_ns FROM _catalog_files WHERE dataset = ?", [dataset]
+        ).fetchall()
+        return {path: (size, mtime) for path, size, mtime in rows}
+
+    def _save_manifest(self, dataset: str, files: dict[str, tuple[int, int]]):
+        self._con.execute("DELETE FROM _catalog_files WHERE dataset = ?", [dataset])
+        if files:
+            self._con.executemany(
+                "INSERT INTO _catalog_files VALUES (?, ?, ?, ?)",
+                [(dataset, path, size, mtime) for path, (size, mtime) in files.items()],
+            )
+
+    def _refresh_kalshi(self, files: dict[str, dict[str, tuple[int, int]]]) -> dict:
+        con = self._con
+        trade_files, market_files = files["kalshi_trades"], files["kalshi_markets"]
+        old_trades, old_markets = self._manifest("kalshi_trades"), self._manifest("kalshi_markets")
+        tables_exist = all(
+            self._table_type(t) == "BASE TABLE"
+            for t in ("kalshi_resolved_markets", "kalshi_positions", "kalshi_price_buckets")
+        )
+        if not tables_exist:
+            old_trades, old_markets = {}, {}
+
+        stale = [p for p, sig in old_trades.items() if trade_files.get(p) != sig]
+        fresh = [p for p, sig in trade_files.items() if old_trades.get(p) != sig]
+        markets_changed = market_files != old_markets
+        report = {"trade_files_added": len(fresh), "trade_files_removed": len(stale), "markets_changed": markets_changed}
+        if tables_exist and not stale and not fresh and not markets_changed:
+            return report
+
+        con.execute("BEGIN TRANSACTION")
+        try:
+            if not tables_exist:
+                for table in ("kalshi_price_buckets", "kalshi_positions", "kalshi_resolved_markets"):
+                    con.execute(f"DROP VIEW IF EXISTS {table}")
+                con.execute(
+                    "CREATE OR REPLACE TABLE kalshi_resolved_markets AS "
+                    + _RESOLVED_MARKETS_SQL.format(markets="kalshi_markets")
+                )
+                con.execute(
+                    "CREATE OR REPLACE TABLE kalshi_positions AS "
+                    + _POSITIONS_SQL.format(trades=_parquet_list(fresh), markets="kalshi_resolved_markets",
+                                            file="t.filename")
+                )
+                report["positions_inserted"] = con.execute("SELECT COUNT(*) FROM kalshi_positions").fetchone()[0]
+            else:
+                # 1. Trade chunks, joined against the markets as they were
+                if stale:
+                    con.execute(
+                        "DELETE FROM kalshi_positions WHERE _file IN (SELECT UNNEST(?))", [stale]
+                    )
+                if fresh:
+                    con.execute(
+                        "INSERT INTO kalshi_positions "
+                        + _POSITIONS_SQL.format(trades=_parquet_list(fresh), markets="kalshi_resolved_markets",
+                                                file="t.filename")
+                    )
+                # 2. Markets: re-join only tickers whose (status, result, event_ticker) changed
+                if markets_changed:
+                    report.update(self._refresh_resolved_markets(list(trade_files)))
+            con.execute("CREATE OR REPLACE TABLE kalshi_price_buckets AS " + _PRICE_BUCKETS_SQL)
+            self._save_manifest("kalshi_trades", trade_files)
+            self._save_manifest("kalshi_markets", market_files)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        return report
+
+    def _refresh_resolved_markets(self, trade_files: list[str]) -> dict:
+        con = self._con
+        con.execute(
+            "CREATE OR REPLACE TEMP TABLE _new_resolved AS " + _RESOLVED_MARKETS_SQL.format(markets="kalshi_markets")
+        )
+        con.execute("""
+            CREATE OR REPLACE TEMP TABLE _changed_tickers AS
+            SELECT DISTINCT ticker FROM (
+                (SELECT * FROM _new_resolved EXCEPT ALL SELECT * FROM kalshi_resolved_markets)
+                UNION ALL
+                (SELECT * FROM kalshi_resolved_markets EXCEPT ALL SELECT * FROM _new_resolved)
+            )
+        """)
+        changed = con.execute("SELECT COUNT(*) FROM _changed_tickers").fetchone()[0]
+        con.execute("DELETE FROM kalshi_positions WHERE ticker IN (SELECT ticker FROM _changed_tickers)")
+        con.execute("DELETE FROM kalshi_resolved_markets")
+        con.execute("INSERT INTO kalshi_resolved_markets SELECT * FROM _new_resolved")
+        if changed and trade_files:
+            con.execute(
+                "INSERT INTO kalshi_positions "
+                + _POSITIONS_SQL.format(
+                    trades=_parquet_list(trade_files),
+                    markets="(SELECT * FROM kalshi_resolved_markets WHERE ticker IN (SELECT ticker FROM _changed_tickers))",
+                    file="t.filename",
+                )
+            )
+        con.execute("DROP TABLE _new_resolved")
+        con.execute("DROP TABLE _changed_tickers")
+        return {"tickers_rejoined": changed}
+
+
+_catalogs: dict[str, AnalyticsCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(
+    db_path: Path | str | None = None,
+    materialize: bool | None = None,
+    read_only: bool | None = None,
+    **datasets: Path | str | None,
+) -> AnalyticsCatalog:
+    """Process-wide catalog for a database path.
+
+    Dataset directories passed here override DATASETS by view name; a
+    directory that differs from the one the catalog was built with makes the
+    next connect() refresh against it. So does changing `materialize`.
+    """
+    db_path = str(db_path or DEFAULT_DB_PATH)
+    with _catalogs_lock:
+        catalog = _catalogs.get(db_path)
+        if catalog is None:
+            catalog = _catalogs[db_path] = AnalyticsCatalog(
+                db_path, datasets, materialize is not False, read_only is True
+            )
+        else:
+            catalog.use(datasets, materialize, read_only)
+        return catalog
+
+
+def analytics_connection(db_path: Path | str | None = None, **datasets: Path | str | None) -> duckdb.DuckDBPyConnection:
+    """Cursor on the shared catalog (see get_catalog)."""
+    return get_catalog(db_path, **datasets).connect()
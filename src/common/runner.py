@@ -0,0 +1,370 @@
+"""
+Parallel analysis runner with a dependency-aware output cache.
+
+`main.py analyze all` used to run every analysis one after another and
+re-render every figure even when nothing had changed. The runner:
+
+- keys each analysis on a hash of its code (its module plus every src.*
+  module it imports, recursively), the (size, mtime) manifest of every input
+  directory or file it points at, and the requested formats
+- skips analyses whose key matches the cache entry and whose files exist
+- runs the rest in a process pool (DuckDB allows one writer per database, so
+  the parent refreshes the analytics catalog once and workers open it
+  read-only)
+- separates compute from rendering: CSV/JSON are written straight away, and
+  with `lazy_figures=True` figures are pickled and only rendered to
+  PNG/PDF by `render()`, which is the slow half of most analyses
+
+Usage:
+    from src.common.analysis import Analysis
+    from src.common.runner import AnalysisRunner, format_summary
+
+    runner = AnalysisRunner("output", workers=4)
+    results = runner.run(Analysis.load())
+    print(format_summary(results))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from src.common.analysis import Analysis, AnalysisOutput
+from src.common.catalog import get_catalog, parquet_manifest
+
+logger = logging.getLogger(__name__)
+
+FIGURE_FORMATS = ("png", "pdf", "svg", "gif")
+DEFAULT_FORMATS = ["png", "pdf", "csv", "json", "gif"]
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+
+@dataclass
+class RunResult:
+    """Outcome of one analysis in a runner pass."""
+
+    name: str
+    status: str  # "cached", "ran", "rendered" or "failed"
+    seconds: float = 0.0
+    saved: dict[str, Path] = field(default_factory=dict)
+    pending: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+# ----------------------------------------------------------------------
+# Cache keys
+# ----------------------------------------------------------------------
+
+_module_files: dict[str, set[str]] = {}
+
+
+def _dependencies(module: ModuleType, seen: set[str]) -> None:
+    """Collect `module` and every src.* module it references, recursively."""
+    seen.add(module.__name__)
+    for value in vars(module).values():
+        dep = value if isinstance(value, ModuleType) else sys.modules.get(getattr(value, "__module__", None) or "")
+        if (
+            dep is not None
+            and dep.__name__ not in seen
+            and dep.__name__.startswith("src.")
+            and getattr(dep, "__file__", None)
+        ):
+            _dependencies(dep, seen)
+
+
+def code_files(cls: type) -> list[str]:
+    """Source files an analysis class depends on, sorted."""
+    module = cls.__module__
+    if module not in _module_files:
+        seen: set[str] = set()
+        _dependencies(sys.modules[module], seen)
+        _module_files[module] = {sys.modules[name].__file__ for name in seen}
+    return sorted(_module_files[module])
+
+
+def input_manifest(analysis: Analysis) -> dict[str, tuple[int, int]]:
+    """(size, mtime_ns) of every file behind the analysis's Path attributes."""
+    files: dict[str, tuple[int, int]] = {}
+    for value in vars(analysis).values():
+        if not isinstance(value, Path):
+            continue
+        if value.is_dir():
+            files.update(parquet_manifest(value, "**/*.parquet"))
+        elif value.is_file():
+            stat = value.stat()
+            files[str(value)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def cache_key(analysis: Analysis, formats: list[str], dpi: int) -> str:
+    """Hash of the analysis code, its input manifest and the output settings."""
+    digest = hashlib.sha256()
+    for path in code_files(type(analysis)):
+        digest.update(os.path.relpath(path, ROOT_DIR).encode())
+        digest.update(Path(path).read_bytes())
+    digest.update(json.dumps(sorted(input_manifest(analysis).items())).encode())
+    digest.update(json.dumps([type(analysis).__qualname__, analysis.name, sorted(formats), dpi]).encode())
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Worker side (module-level so the process pool can pickle them)
+# ----------------------------------------------------------------------
+
+
+def _init_worker(datasets: dict[str, Path]) -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    # The parent refreshed the catalog; many readers may share the file, writers may not
+    get_catalog(read_only=True, **datasets)
+
+
+def _entry_path(cache_dir: Path, name: str) -> Path:
+    return cache_dir / f"{name}.json"
+
+
+def _figure_path(cache_dir: Path, name: str) -> Path:
+    return cache_dir / f"{name}.figure.pkl"
+
+
+def _write_entry(cache_dir: Path, result: RunResult, key: str) -> None:
+    entry = {
+        "key": key,
+        "seconds": result.seconds,
+        "saved": {fmt: str(path) for fmt, path in result.saved.items()},
+        "pending": result.pending,
+    }
+    _entry_path(cache_dir, result.name).write_text(json.dumps(entry, indent=2))
+
+
+def _compute(
+    analysis: Analysis,
+    key: str,
+    output_dir: Path,
+    cache_dir: Path,
+    formats: list[str],
+    dpi: int,
+    lazy_figures: bool,
+) -> RunResult:
+    started = time.perf_counter()
+    try:
+        output = analysis.run()
+        data_formats = [f for f in formats if f not in FIGURE_FORMATS]
+        figure_formats = [f for f in formats if f in FIGURE_FORMATS]
+        saved = analysis.export(
+            AnalysisOutput(data=output.data, chart=output.chart, metadata=output.metadata),
+            output_dir,
+            data_formats,
+            dpi,
+        )
+        pending: list[str] = []
+        if output.figure is not None and figure_formats:
+            if lazy_figures and _dump_figure(output.figure, _figure_path(cache_dir, analysis.name)):
+                pending = figure_formats
+            else:
+                saved.update(analysis.export(AnalysisOutput(figure=output.figure), output_dir, figure_formats, dpi))
+    except Exception as e:
+        logger.exception(f"Analysis {analysis.name} failed")
+        plt.close("all")
+        return RunResult(analysis.name, "failed", time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+
+    result = RunResult(analysis.name, "ran", time.perf_counter() - started, saved, pending)
+    _write_entry(cache_dir, result, key)
+    return result
+
+
+def _dump_figure(figure, path: Path) -> bool:
+    """Pickle a figure for later rendering; animations and some artists can't be pickled."""
+    if not isinstance(figure, Figure):
+        return False
+    try:
+        path.write_bytes(pickle.dumps(figure))
+    except Exception:
+        path.unlink(missing_ok=True)
+        return False
+    plt.close(figure)
+    return True
+
+
+def _render(
+    analysis: Analysis, key: str, output_dir: Path, cache_dir: Path, pending: list[str], dpi: int
+) -> RunResult:
+    started = time.perf_counter()
+    name = analysis.name
+    entry = json.loads(_entry_path(cache_dir, name).read_text())
+    figure_path = _figure_path(cache_dir, name)
+    try:
+        figure = pickle.loads(figure_path.read_bytes())
+        saved = analysis.export(AnalysisOutput(figure=figure), output_dir, pending, dpi)
+    except Exception as e:
+        logger.exception(f"Rendering {name} failed")
+        return RunResult(name, "failed", time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+
+    figure_path.unlink()
+    result = RunResult(
+        name,
+        "rendered",
+        time.perf_counter() - started,
+        {**{fmt: Path(p) for fmt, p in entry["saved"].items()}, **saved},
+    )
+    _write_entry(cache_dir, RunResult(name, "ran", entry["seconds"], result.saved), key)
+    return result
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+
+class AnalysisRunner:
+    """Run analyses in parallel, skipping those whose code and inputs are unchanged.
+
+    Args:
+        output_dir: Directory for saved outputs. The cache lives in output_dir/.cache.
+        formats: Output formats (see Analysis.save). Defaults to DEFAULT_FORMATS.
+        workers: Process count. 1 (or a single pending analysis) runs in-process.
+            Defaults to os.cpu_count().
+        dpi: Resolution for raster formats.
+        lazy_figures: Write data outputs only and keep figures pickled until
+            `render()` is called.
+        force: Ignore the cache and re-run everything.
+        datasets: Analytics catalog directory overrides (see get_catalog) when
+            the analyses read from somewhere other than data/.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        formats: list[str] | None = None,
+        workers: int | None = None,
+        dpi: int = 300,
+        lazy_figures: bool = False,
+        force: bool = False,
+        datasets: dict[str, Path | str] | None = None,
+    ):
+        self.output_dir = Path(output_dir)
+        self.cache_dir = self.output_dir / ".cache"
+        self.formats = list(formats or DEFAULT_FORMATS)
+        self.workers = workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.lazy_figures = lazy_figures
+        self.force = force
+        self.datasets = {name: Path(d) for name, d in (datasets or {}).items()}
+
+    def _cached(self, name: str, key: str) -> RunResult | None:
+        if self.force:
+            return None
+        path = _entry_path(self.cache_dir, name)
+        if not path.exists():
+            return None
+        entry = json.loads(path.read_text())
+        saved = {fmt: Path(p) for fmt, p in entry["saved"].items()}
+        if entry["key"] != key or not all(p.exists() for p in saved.values()):
+            return None
+        if entry["pending"] and not _figure_path(self.cache_dir, name).exists():
+            return None
+        return RunResult(name, "cached", 0.0, saved, entry["pending"])
+
+    def run(self, analyses: list[type[Analysis] | Analysis]) -> list[RunResult]:
+        """Run every analysis that isn't cached; render pending figures unless lazy.
+
+        Args:
+            analyses: Analysis classes (instantiated with defaults) or instances.
+
+        Returns:
+            One RunResult per analysis, in input order.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        instances = [a() if isinstance(a, type) else a for a in analyses]
+        keys = {a.name: cache_key(a, self.formats, self.dpi) for a in instances}
+
+        results: dict[str, RunResult] = {}
+        todo: list[Analysis] = []
+        for analysis in instances:
+            cached = self._cached(analysis.name, keys[analysis.name])
+            if cached is None:
+                todo.append(analysis)
+            else:
+                results[analysis.name] = cached
+
+        if todo:
+            self._prepare_catalog(todo)
+        tasks = [
+            (_compute, (a, keys[a.name], self.output_dir, self.cache_dir, self.formats, self.dpi, self.lazy_figures))
+            for a in todo
+        ]
+        if not self.lazy_figures:
+            tasks += [
+                (_render, (a, keys[a.name], self.output_dir, self.cache_dir, results[a.name].pending, self.dpi))
+                for a in instances
+                if a.name in results and results[a.name].pending
+            ]
+        for result in self._execute(tasks):
+            results[result.name] = result
+        return [results[a.name] for a in instances]
+
+    def render(self, analyses: list[type[Analysis] | Analysis]) -> list[RunResult]:
+        """Render figures left pending by a lazy run. Analyses that aren't cached are skipped."""
+        instances = [a() if isinstance(a, type) else a for a in analyses]
+        tasks = []
+        for analysis in instances:
+            key = cache_key(analysis, self.formats, self.dpi)
+            cached = self._cached(analysis.name, key)
+            if cached is not None and cached.pending:
+                tasks.append((_render, (analysis, key, self.output_dir, self.cache_dir, cached.pending, self.dpi)))
+        return self._execute(tasks)
+
+    def _prepare_catalog(self, analyses: list[Analysis]) -> None:
+        """Refresh the shared analytics catalog once before workers open it read-only."""
+        if self.workers <= 1 or len(analyses) <= 1:
+            return
+        catalog_file = sys.modules["src.common.catalog"].__file__
+        if any(catalog_file in code_files(type(a)) for a in analyses):
+            catalog = get_catalog(read_only=False, **self.datasets)
+            catalog.connect()
+            catalog.close()
+
+    def _execute(self, tasks: list[tuple]) -> list[RunResult]:
+        if self.workers <= 1 or len(tasks) <= 1:
+            return [fn(*args) for fn, args in tasks]
+        results = []
+        # spawn, not fork: DuckDB and matplotlib state don't survive a fork reliably
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.datasets,),
+        ) as pool:
+            futures = [pool.submit(fn, *args) for fn, args in tasks]
+            for future in as_completed(futures):
+                results.append(future.result())
+        return results
+
+
+def format_summary(results: list[RunResult], wall_seconds: float | None = None) -> str:
+    """Per-analysis status and time (slowest first), then totals and cache hits."""
+    lines = [f"  {'status':<9}{'time':>9}  analysis"]
+    for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+        note = f"  ({r.error})" if r.error else f"  (figures pending: {', '.join(r.pending)})" if r.pending else ""
+        lines.append(f"  {r.status:<9}{r.seconds:>8.2f}s  {r.name}{note}")
+    hits = sum(r.status == "cached" for r in results)
+    failed = sum(r.status == "failed" for r in results)
+    total = f"{len(results)} analyses, {sum(r.seconds for r in results):.2f}s compute"
+    if wall_seconds is not None:
+        total += f", {wall_seconds:.2f}s wall"
+    lines.append(f"\n  {total}, {hits} cache hits, {failed} failed")
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""
+Analytics catalog benchmark for the Kalshi analyses.
+
+Generates a synthetic Kalshi trades/markets parquet tree in a temp dir and
+times every Kalshi analysis `run()` twice: against plain views over the
+parquet files (the old behaviour: every analysis rescans and re-joins the
+raw data) and against the materialized catalog tables. Also reports the
+initial catalog build and the incremental refresh after one new trade chunk.
+
+Usage:
+    python tests/load/bench_analysis_catalog.py [trades] [markets]
+
+Target: materialized total well under the views total once the build is paid.
+"""
+
+import inspect
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import duckdb
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+_TMP = Path(tempfile.mkdtemp(prefix="bench_catalog_"))
+os.environ["ANALYTICS_DB"] = str(_TMP / "analytics.duckdb")
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.common.analysis import Analysis  # noqa: E402
+from src.common.catalog import get_catalog  # noqa: E402
+
+CHUNK = 1_000_000
+
+
+def _write_markets(markets_dir: Path, n: int):
+    duckdb.connect().execute(f"""
+        COPY (
+            SELECT
+                'KX' || (['NFL', 'BTC', 'PRES', 'CPI', 'WEATHER'])[1 + i % 5] || '-' || i AS ticker,
+                'KX' || (['NFL', 'BTC', 'PRES', 'CPI', 'WEATHER'])[1 + i % 5] || '-E' || (i // 10) AS event_ticker,
+                'binary' AS market_type,
+                'Market ' || i AS title,
+                CASE WHEN i % 10 < 8 THEN 'finalized' ELSE 'active' END AS status,
+                CASE WHEN i % 10 >= 8 THEN '' WHEN hash(i) % 2 = 0 THEN 'yes' ELSE 'no' END AS result,
+                (hash(i) % 100000)::BIGINT AS volume,
+                TIMESTAMP '2022-01-01' + INTERVAL (i) HOUR AS open_time,
+                TIMESTAMP '2022-01-02' + INTERVAL (i) HOUR AS close_time,
+                TIMESTAMP '2022-01-01' + INTERVAL (i) HOUR AS created_time
+            FROM range({n}) r(i)
+        ) TO '{markets_dir / f"markets_0_{n}.parquet"}' (FORMAT PARQUET)
+    """)
+
+
+def _write_trades(trades_dir: Path, start: int, n: int, n_markets: int):
+    duckdb.connect().execute(f"""
+        COPY (
+            SELECT
+                'T' || i AS trade_id,
+                'KX' || (['NFL', 'BTC', 'PRES', 'CPI', 'WEATHER'])[1 + (i % {n_markets}) % 5]
+                    || '-' || (i % {n_markets}) AS ticker,
+                1 + hash(i) % 200 AS count,
+                1 + hash(i * 7) % 99 AS yes_price,
+                99 - hash(i * 7) % 99 AS no_price,
+                CASE WHEN hash(i * 3) % 2 = 0 THEN 'yes' ELSE 'no' END AS taker_side,
+                TIMESTAMP '2022-01-01' + INTERVAL (i // 20) MINUTE AS created_time
+            FROM range({start}, {start + n}) r(i)
+        ) TO '{trades_dir / f"trades_{start}.parquet"}' (FORMAT PARQUET)
+    """)
+
+
+def _kalshi_analyses(trades_dir: Path, markets_dir: Path) -> list:
+    instances = []
+    for cls in Analysis.load(ROOT / "src" / "analysis"):
+        if cls.__module__.split(".")[2] != "kalshi":
+            continue
+        params = inspect.signature(cls.__init__).parameters
+        kwargs = {k: v for k, v in (("trades_dir", trades_dir), ("markets_dir", markets_dir)) if k in params}
+        instances.append(cls(**kwargs))
+    return instances
+
+
+def _time_runs(analyses: list) -> dict:
+    timings = {}
+    for analysis in analyses:
+        started = time.perf_counter()
+        analysis.run()
+        timings[analysis.name] = time.perf_counter() - started
+        plt.close("all")
+    return timings
+
+
+def measure(n_trades: int = 5_000_000, n_markets: int = 50_000) -> dict:
+    """Per-analysis run() seconds with raw parquet views vs. the materialized catalog."""
+    trades_dir, markets_dir = _TMP / "kalshi" / "trades", _TMP / "kalshi" / "markets"
+    trades_dir.mkdir(parents=True)
+    markets_dir.mkdir(parents=True)
+    _write_markets(markets_dir, n_markets)
+    for start in range(0, n_trades, CHUNK):
+        _write_trades(trades_dir, start, min(CHUNK, n_trades - start), n_markets)
+
+    dirs = {"kalshi_trades": trades_dir, "kalshi_markets": markets_dir}
+    analyses = _kalshi_analyses(trades_dir, markets_dir)
+
+    get_catalog(materialize=False, **dirs).connect()
+    views = _time_runs(analyses)
+
+    catalog = get_catalog(materialize=True, **dirs)
+    started = time.perf_counter()
+    catalog.connect()
+    build_s = time.perf_counter() - started
+    materialized = _time_runs(analyses)
+
+    _write_trades(trades_dir, n_trades, CHUNK, n_markets)
+    started = time.perf_counter()
+    refresh = catalog.refresh()
+    refresh_s = time.perf_counter() - started
+    catalog.close()
+
+    return {
+        "trades": n_trades,
+        "markets": n_markets,
+        "views_s": views,
+        "materialized_s": materialized,
+        "build_s": build_s,
+        "refresh_s": refresh_s,
+        "refresh": refresh,
+    }
+
+
+if __name__ == "__main__":
+    n_trades = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    n_markets = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    warnings.simplefilter("ignore")  # Synthetic data trips plot-layout warnings
+    try:
+        result = measure(n_trades, n_markets)
+    finally:
+        shutil.rmtree(_TMP, ignore_errors=True)
+    views, materialized = result["views_s"], result["materialized_s"]
+    print(f"trades: {result['trades']:,}  markets: {result['markets']:,}\n")
+    print(f"{'analysis':<44}{'views':>10}{'catalog':>10}")
+    for name in sorted(views, key=views.get, reverse=True):
+        print(f"{name:<44}{views[name]:>9.2f}s{materialized[name]:>9.2f}s")
+    print(f"{'total':<44}{sum(views.values()):>9.2f}s{sum(materialized.values()):>9.2f}s\n")
+    print(f"initial build:        {result['build_s']:.2f}s")
+    print(f"refresh (+{CHUNK:,} trades): {result['refresh_s']:.2f}s  {result['refresh']}")
@@ -0,0 +1,79 @@
+"""
+Basket engine throughput on a replayed price stream.
+
+Builds a synthetic Gamma snapshot (tests/unit/test_basket_engine._events),
+then replays random outcome price ticks. "before" is the old scan shape,
+re-summing every outcome of every event, timed per scan (i.e. the best case
+of one rescan per tick); "after" is BasketEngine.replay with O(1) updates.
+
+Usage:
+    python tests/load/bench_basket_engine.py [events] [ticks]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from signals.basket_arb_scanner import BasketEngine  # noqa: E402
+from test_basket_engine import _events, _full_rescan  # noqa: E402
+
+
+def _ticks(events, n, rng):
+    outcomes = [(e["id"], m["conditionId"]) for e in events for m in e["markets"]]
+    ticks = []
+    for i in range(n):
+        eid, mid = rng.choice(outcomes)
+        yes = rng.randint(1, 60) / 100
+        ticks.append({"ts": i * 0.01, "event_id": eid, "market_id": mid, "yes": yes,
+                      "no": round(1 - yes + rng.choice([-0.02, 0, 0.01]), 2)})
+    return ticks
+
+
+def measure(n_events: int = 2000, n_ticks: int = 200_000) -> dict:
+    rng = random.Random(4)
+    events = _events(n_events, rng)
+    ticks = _ticks(events, n_ticks, rng)
+
+    engine = BasketEngine()
+    started = time.perf_counter()
+    engine.sync_events(events, ts=0)
+    sync_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    emitted = engine.replay(ticks)
+    replay_s = time.perf_counter() - started
+
+    # Old shape: re-sum the whole universe per scan; time a few scans and scale per tick
+    scans = 5
+    started = time.perf_counter()
+    for _ in range(scans):
+        _full_rescan(events)
+    rescan_s = (time.perf_counter() - started) / scans
+
+    return {
+        "events": n_events,
+        "outcomes": sum(len(e["markets"]) for e in events),
+        "ticks": n_ticks,
+        "sync_s": sync_s,
+        "replay_s": replay_s,
+        "ticks_per_s": n_ticks / replay_s,
+        "emitted": len(emitted),
+        "rescan_s": rescan_s,
+        "rescan_ticks_per_s": 1 / rescan_s,
+    }
+
+
+if __name__ == "__main__":
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    r = measure(n_events, n_ticks)
+    print(f"events: {r['events']:,}  outcomes: {r['outcomes']:,}  ticks: {r['ticks']:,}\n")
+    print(f"full rescan:       {r['rescan_s'] * 1000:8.1f} ms/scan  -> {r['rescan_ticks_per_s']:>10,.0f} ticks/s")
+    print(f"engine sync:       {r['sync_s'] * 1000:8.1f} ms (cold snapshot)")
+    print(f"engine replay:     {r['replay_s']:8.2f} s        -> {r['ticks_per_s']:>10,.0f} ticks/s  "
+          f"({r['emitted']:,} crossing events)")
@@ -0,0 +1,103 @@
+"""
+Constraint graph benchmark on a synthetic market universe.
+
+Markets are subset-template titles over every team/person in
+odds/correlation.py, plus price ladders and "Will X win <contest>?" sets.
+"before" is the old detect_constraint_violations loop (every pair within each
+entity group through find_constraint_type); "after" is a cold
+ConstraintGraph sync + solve, then a scan where 2% of prices move.
+
+Usage:
+    python tests/load/bench_constraint_graph.py [markets] [--skip-pairwise]
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from odds import correlation  # noqa: E402
+from odds.constraint_graph import ConstraintGraph  # noqa: E402
+
+PHRASES = ["win AFC", "win NFC", "win Super Bowl", "make playoffs", "win division",
+           "win Championship", "win World Series", "win AL", "win NL", "win primary",
+           "win nomination", "win election", "win Iowa", "win Western Conference"]
+ASSETS = ["Bitcoin", "Ethereum", "Solana", "Gold", "Oil", "SPX", "Nasdaq", "CPI"]
+
+
+def _names():
+    names = []
+    for pattern in correlation.TEAM_PATTERNS + correlation.PERSON_PATTERNS:
+        names.extend(re.sub(r'\\b|\(|\)', '', pattern).split('|'))
+    return sorted(set(names))
+
+
+def universe(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    names = _names()
+    markets = []
+    for i in range(n):
+        kind = rng.random()
+        if kind < 0.7:
+            title = f"Will {rng.choice(names)} {rng.choice(PHRASES)} in {2025 + rng.randint(0, 3)}?"
+        elif kind < 0.9:
+            asset, day = rng.choice(ASSETS), rng.randint(1, 28)
+            title = f"Will {asset} be above ${rng.randint(10, 200) * 1000:,} on March {day}?"
+        else:
+            title = f"Will {rng.choice(names)} win the {rng.choice(['MVP', 'title', 'pennant'])} {rng.randint(1, 60)}?"
+        markets.append({"id": f"m{i}", "title": title, "yes_price": rng.randint(1, 99) / 100})
+    return markets
+
+
+def _pairwise(markets):
+    found = 0
+    for group in correlation.group_markets_by_entity(markets).values():
+        for i, m1 in enumerate(group):
+            for m2 in group[i + 1:]:
+                if correlation.find_constraint_type(m1["title"], m2["title"]) == "subset":
+                    found += 1
+    return found
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def measure(n: int = 20_000, pairwise: bool = True) -> dict:
+    markets = universe(n)
+    out = {"markets": n}
+    if pairwise:
+        out["pairwise_constraints"], out["pairwise_s"] = _timed(lambda: _pairwise(markets))
+
+    graph = ConstraintGraph()
+    out["cold"], out["cold_sync_s"] = _timed(lambda: graph.sync(markets))
+    (pairs, sets), out["cold_solve_s"] = _timed(graph.violations)
+    out["violations"] = (len(pairs), len(sets))
+
+    rng = random.Random(1)
+    for m in rng.sample(markets, n // 50):
+        m["yes_price"] = rng.randint(1, 99) / 100
+    out["warm"], out["warm_sync_s"] = _timed(lambda: graph.sync(markets))
+    _, out["warm_solve_s"] = _timed(graph.violations)
+    return out
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 20_000
+    r = measure(n, pairwise="--skip-pairwise" not in sys.argv)
+    print(f"markets: {r['markets']:,}\n")
+    if "pairwise_s" in r:
+        print(f"pairwise entity scan:  {r['pairwise_s']:7.2f}s  {r['pairwise_constraints']:,} subset pairs")
+    cold = r["cold"]
+    print(f"graph cold sync:       {r['cold_sync_s']:7.2f}s  {cold['edges']:,} edges, "
+          f"{cold['ladders']} ladders, {cold['exclusive_sets']} exclusive sets")
+    print(f"graph cold solve:      {r['cold_solve_s']:7.3f}s  {r['violations'][0]:,} pair, "
+          f"{r['violations'][1]:,} set violations")
+    print(f"graph 2% reprice:      {r['warm_sync_s']:7.3f}s sync + {r['warm_solve_s']:.3f}s solve "
+          f"({r['warm']['repriced']} repriced)")
@@ -0,0 +1,93 @@
+"""
+Cross-platform matching benchmark: per-scan rebuild vs. the persistent MatchStore.
+
+Synthetic Kalshi/Polymarket titles (tests/unit/test_cross_platform_match_store._markets).
+"before" replays the old find_arb_opportunities matching loop, which rebuilt
+the Polymarket inverted index and re-tokenized every title each scan;
+"after" is a cold MatchStore sync, then a scan where every price moves and
+``churn`` of the markets on each side are new or retitled.
+
+Usage:
+    python tests/load/bench_cross_platform_match_store.py [markets_per_side] [churn]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from signals import cross_platform_arb as arb  # noqa: E402
+from test_cross_platform_match_store import _markets  # noqa: E402
+
+
+def _rebuild_each_scan(kalshi_markets, poly_markets, min_sim=arb.MIN_SIMILARITY):
+    """The pre-store matching loop: returns accepted (kalshi_id, poly_id) pairs."""
+    poly_index, poly_tokens = {}, []
+    for i, pm in enumerate(poly_markets):
+        toks = arb._tokenize(pm["title"])
+        poly_tokens.append(toks)
+        arb._extract_subject(pm["title"])
+        for tok in set(toks):
+            poly_index.setdefault(tok, []).append(i)
+    pairs = set()
+    for km in kalshi_markets:
+        k_tokens = arb._tokenize(km["title"])
+        if len(k_tokens) < 2:
+            continue
+        arb._extract_subject(km["title"])
+        counts = {}
+        for tok in set(k_tokens):
+            for pi in poly_index.get(tok, []):
+                counts[pi] = counts.get(pi, 0) + 1
+        for pi, shared in counts.items():
+            if shared < 2 or arb._cosine_similarity(k_tokens, poly_tokens[pi]) < min_sim:
+                continue
+            pm = poly_markets[pi]
+            if arb._subjects_compatible(km["title"], pm["title"], "", ""):
+                pairs.add((km["id"], pm["id"]))
+    return pairs
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def measure(n: int = 2000, churn: float = 0.03) -> dict:
+    rng = random.Random(1)
+    kalshi, poly = _markets("K", n, rng), _markets("P", n, rng)
+
+    before, before_s = _timed(lambda: _rebuild_each_scan(kalshi, poly))
+    store = arb.MatchStore()
+    cold, cold_s = _timed(lambda: store.sync(kalshi, poly))
+
+    for m in kalshi + poly:
+        m["price_yes"] = rng.randint(5, 95) / 100
+    k = int(n * churn)
+    for m in rng.sample(kalshi, k):
+        m["title"] = _markets("X", 1, rng)[0]["title"]
+    poly = poly[k:] + _markets("PN", k, rng)
+
+    before2, before2_s = _timed(lambda: _rebuild_each_scan(kalshi, poly))
+    warm, warm_s = _timed(lambda: store.sync(kalshi, poly))
+    after = {(kid, pid) for kid in (m["id"] for m in kalshi) for pid, _, _ in store.matches(kid)}
+    assert after == before2
+
+    return {"markets": n, "churn": churn, "before_s": before_s, "before_churn_s": before2_s,
+            "cold_s": cold_s, "cold": cold, "warm_s": warm_s, "warm": warm, "pairs": len(after)}
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    churn = float(sys.argv[2]) if len(sys.argv) > 2 else 0.03
+    r = measure(n, churn)
+    print(f"markets per side: {r['markets']:,}  churn: {r['churn']:.0%}  accepted pairs: {r['pairs']:,}\n")
+    print(f"rebuild each scan:     {r['before_s']:7.2f}s  (after churn {r['before_churn_s']:.2f}s)")
+    print(f"store cold sync:       {r['cold_s']:7.2f}s  {r['cold']['pairs_recomputed']:,} pairs scored")
+    print(f"store scan w/ churn:   {r['warm_s']:7.2f}s  {r['warm']['pairs_recomputed']:,} scored, "
+          f"{r['warm']['pairs_reused']:,} reused")
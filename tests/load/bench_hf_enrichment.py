@@ -0,0 +1,151 @@
+"""
+Virtuoso enrichment reads: a memcached round trip per key vs one pipelined gets.
+
+Serves realistic payloads (orderbook snapshots, confluence breakdowns, trade
+lists) from the in-process memcached in tests/unit/test_hf_enrichment and
+reads them every cycle for N symbols. "before" is the previous reader: one
+get per key (what aiomcache.Client.get does), symbol after symbol, every
+value compared and re-decoded with str.decode + json.loads whenever its
+bytes differ. "after" is VirtuosoEnrichmentReader.read_enrichment_many:
+one pipelined gets per cycle, CAS-versioned decode cache.
+
+Between cycles a Virtuoso writer rewrites a share of the keys (half with
+identical content), as its ~15s refresh spread over 1s polls would.
+
+Usage:
+    python tests/load/bench_hf_enrichment.py [symbols] [cycles]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from services.hf_enrichment import GLOBAL_KEYS, SYMBOL_KEYS, VirtuosoEnrichmentReader  # noqa: E402
+from test_hf_enrichment import FakeMemcached  # noqa: E402
+
+REWRITE_SHARE = 0.1  # Keys rewritten between two cycles
+
+
+class PerKeyReader:
+    """The previous reader: sequential get per key, bytes compare, decode on change."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.conn = None
+        self.round_trips = self.decodes = 0
+        self._raw = {}
+
+    async def _get(self, key: str):
+        if self.conn is None:
+            self.conn = await asyncio.open_connection("127.0.0.1", self.port)
+        reader, writer = self.conn
+        writer.write(b"get %s\r\n" % key.encode())
+        self.round_trips += 1
+        line = await reader.readuntil(b"\r\n")
+        if line == b"END\r\n":
+            return None
+        data = await reader.readexactly(int(line.split()[3]) + 2)
+        await reader.readuntil(b"END\r\n")
+        return data[:-2]
+
+    async def read(self, symbol: str) -> dict:
+        out = {}
+        for key in [t.format(symbol=symbol) for t in SYMBOL_KEYS] + GLOBAL_KEYS:
+            raw = await self._get(key)
+            slot = (symbol, key)
+            if slot not in self._raw or self._raw[slot][0] != raw:
+                value = None
+                if raw is not None:
+                    decoded = raw.decode()
+                    value = decoded if key == "analysis:market_regime" else json.loads(decoded)
+                    self.decodes += 1
+                self._raw[slot] = (raw, value)
+            out[key] = self._raw[slot][1]
+        return out
+
+    async def close(self):
+        if self.conn:
+            self.conn[1].close()
+
+
+def _payload(key: str, rng: random.Random):
+    if key == "analysis:market_regime":
+        return rng.choice([b"bullish", b"sideways", b"bearish"])
+    if key.startswith("orderbook:"):
+        return {"bids": [[65000 - i * 0.5, rng.random() * 3] for i in range(200)],
+                "asks": [[65000 + i * 0.5, rng.random() * 3] for i in range(200)], "ts": time.time()}
+    if key.startswith("confluence:breakdown:"):
+        return {"overall_score": rng.uniform(0, 100),
+                "components": {c: {"score": rng.uniform(0, 100), "weight": 0.2, "signals": list(range(20))}
+                               for c in ("orderflow", "technical", "volume", "sentiment", "position")}}
+    if key.startswith(("large_trades:", "liquidations:")):
+        return {"trades": [{"price": 65000 + rng.gauss(0, 50), "size": rng.random() * 5e5, "side": "buy"}
+                           for _ in range(50)]}
+    if key == "market:tickers":
+        return {f"T{i}USDT": {"price": rng.random() * 1000, "change": rng.gauss(0, 2)} for i in range(100)}
+    return {"score": rng.uniform(0, 100), "sentiment": "neutral", "signals": list(range(10))}
+
+
+async def _run(n_symbols: int, cycles: int) -> dict:
+    rng = random.Random(7)
+    symbols = [f"SYM{i}USDT" for i in range(n_symbols)]
+    keys = list(dict.fromkeys([t.format(symbol=s) for s in symbols for t in SYMBOL_KEYS] + GLOBAL_KEYS))
+    async with FakeMemcached() as mc:
+        for key in keys:
+            mc.set(key, _payload(key, rng))
+        writes = [[(k, rng.random() < 0.5) for k in rng.sample(keys, max(1, int(len(keys) * REWRITE_SHARE)))]
+                  for _ in range(cycles)]
+
+        def rewrite(cycle):
+            for key, same in writes[cycle]:
+                mc.set(key, mc.items[key][0] if same else _payload(key, rng))
+
+        before = PerKeyReader(mc.port)
+        spent = 0.0
+        for cycle in range(cycles):
+            t = time.perf_counter()
+            for s in symbols:
+                await before.read(s)
+            spent += time.perf_counter() - t
+            rewrite(cycle)
+        before_ms = spent / cycles * 1000
+        await before.close()
+
+        after = VirtuosoEnrichmentReader(port=mc.port)
+        spent = 0.0
+        for cycle in range(cycles):
+            t = time.perf_counter()
+            await after.read_enrichment_many(symbols)
+            spent += time.perf_counter() - t
+            rewrite(cycle)
+        after_ms = spent / cycles * 1000
+        snapshot = after.snapshot()
+        await after.close()
+    return {
+        "keys": len(keys),
+        "before_ms": before_ms, "before_round_trips": before.round_trips / cycles, "before_decodes": before.decodes / cycles,
+        "after_ms": after_ms, "after_round_trips": snapshot["memcached"]["round_trips"] / cycles,
+        "after_decodes": snapshot["stats"]["decodes"] / cycles, "decoder": snapshot["decoder"],
+    }
+
+
+def measure(n_symbols: int = 10, cycles: int = 50) -> dict:
+    return asyncio.run(_run(n_symbols, cycles))
+
+
+if __name__ == "__main__":
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    r = measure(n_symbols, cycles)
+    print(f"symbols: {n_symbols}  distinct keys: {r['keys']}  cycles: {cycles}  decoder: {r['decoder']}\n")
+    print(f"per-key get:     {r['before_ms']:7.2f} ms/cycle  {r['before_round_trips']:5.0f} round trips  "
+          f"{r['before_decodes']:6.1f} decodes/cycle")
+    print(f"pipelined gets:  {r['after_ms']:7.2f} ms/cycle  {r['after_round_trips']:5.0f} round trips  "
+          f"{r['after_decodes']:6.1f} decodes/cycle")
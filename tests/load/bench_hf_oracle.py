@@ -0,0 +1,114 @@
+"""
+Chainlink polling: per-feed curl eth_calls vs one hedged JSON-RPC batch.
+
+Runs both pollers against local fake JSON-RPC servers (tests/unit/test_hf_oracle
+FakeRpc) with a simulated network delay. "before" is the engine's old loop: a
+curl subprocess per feed, feeds read one after another, switching RPC only
+after 3 consecutive errors. "after" is ChainlinkBatchPoller: one batched POST
+per interval on a keep-alive connection, hedged to the second RPC.
+
+Scenarios: healthy primary, slow primary (1.5s), primary answering quota errors.
+Reports wall time per poll interval, HTTP requests sent and feeds read.
+
+Usage:
+    python tests/load/bench_hf_oracle.py [feeds] [polls] [rtt_ms]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from services.hf_oracle import LATEST_ROUND_DATA, ChainlinkBatchPoller, decode_latest_round  # noqa: E402
+from test_hf_oracle import FakeRpc  # noqa: E402
+
+
+class CurlPoller:
+    """The engine's previous poll_chainlink_oracle loop, minus logging."""
+
+    def __init__(self, feeds, rpc_urls):
+        self.feeds, self.rpc_urls = feeds, rpc_urls
+        self.index = self.consecutive_errors = 0
+
+    async def _poll(self, contract):
+        payload = json.dumps({"jsonrpc": "2.0", "method": "eth_call",
+                              "params": [{"to": contract, "data": LATEST_ROUND_DATA}, "latest"], "id": 1})
+        for _ in range(len(self.rpc_urls)):
+            url = self.rpc_urls[self.index]
+            proc = await asyncio.create_subprocess_exec(
+                "curl", "-s", "-X", "POST", url, "-H", "Content-Type: application/json", "-d", payload,
+                "--max-time", "5", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=8)
+            result = json.loads(stdout.decode())
+            if result.get("error"):
+                self.consecutive_errors += 1
+                if self.consecutive_errors >= 3:
+                    self.index = (self.index + 1) % len(self.rpc_urls)
+                    self.consecutive_errors = 0
+                    continue
+                return None
+            self.consecutive_errors = 0
+            return decode_latest_round(result["result"])
+        return None
+
+    async def poll(self):
+        out = {}
+        for asset, contract in self.feeds.items():
+            r = await self._poll(contract)
+            if r:
+                out[asset] = r
+        return out
+
+
+async def _run(poller, polls):
+    read = 0
+    started = time.perf_counter()
+    for _ in range(polls):
+        read += len(await poller.poll())
+    return (time.perf_counter() - started) / polls, read
+
+
+async def _scenario(feeds, polls, rtt, primary_kwargs):
+    rounds = {c: (i + 1, 6_500_000_000_000, 1_700_000_000) for i, c in enumerate(feeds.values())}
+    async with FakeRpc(rounds, **{"delay": rtt, **primary_kwargs}) as primary, FakeRpc(rounds, delay=rtt) as backup:
+        urls = [primary.url, backup.url]
+        before_s, before_read = await _run(CurlPoller(feeds, urls), polls)
+        before_requests = len(primary.requests) + len(backup.requests)
+        primary.requests.clear(), backup.requests.clear()
+
+        batch = ChainlinkBatchPoller(feeds, urls)
+        after_s, after_read = await _run(batch, polls)
+        await batch.close()
+        after_requests = len(primary.requests) + len(backup.requests)
+    return {
+        "before_ms": before_s * 1000, "before_requests": before_requests, "before_read": before_read,
+        "after_ms": after_s * 1000, "after_requests": after_requests, "after_read": after_read,
+    }
+
+
+def measure(n_feeds: int = 8, polls: int = 6, rtt_ms: float = 40.0) -> dict:
+    feeds = {f"F{i}": "0x" + f"{i + 1:040x}" for i in range(n_feeds)}
+    rtt = rtt_ms / 1000
+    scenarios = {
+        "healthy": {},
+        "slow primary": {"delay": 1.5},
+        "quota errors": {"error": "quota exceeded"},
+    }
+    return {name: asyncio.run(_scenario(feeds, polls, rtt, kw)) for name, kw in scenarios.items()}
+
+
+if __name__ == "__main__":
+    n_feeds = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    polls = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    rtt_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 40.0
+    print(f"feeds: {n_feeds}  polls: {polls}  rtt: {rtt_ms:.0f} ms\n")
+    for name, r in measure(n_feeds, polls, rtt_ms).items():
+        print(f"{name:13s} curl per feed: {r['before_ms']:8.1f} ms/poll  {r['before_requests']:3d} requests  "
+              f"{r['before_read']:3d} feeds read")
+        print(f"{'':13s} hedged batch:  {r['after_ms']:8.1f} ms/poll  {r['after_requests']:3d} requests  "
+              f"{r['after_read']:3d} feeds read")
@@ -0,0 +1,205 @@
+"""
+HF engine status server: close-per-response handler vs keep-alive app with push.
+
+Runs each server in a child process holding a synthetic engine state (12
+assets, prices ticking every 50 ms) and hammers /state from concurrent
+pollers in this process. "before" is the engine's old asyncio.start_server
+handler: one request per connection and a json.dumps of the state per
+request. "after" is services/hf_server.py: uvicorn keep-alive, StateHub
+cached snapshots re-serialized only after a tick touched them.
+
+The push run connects WebSocket subscribers to /ws while the engine
+publishes an "edge" event every 200 ms and the pollers keep polling;
+delivery latency is publish-to-receive, measured per subscriber per event.
+
+Usage:
+    python tests/load/bench_hf_server.py [pollers] [subscribers] [seconds]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+import websockets  # noqa: E402
+
+from services.hf_events import LatencyHistogram  # noqa: E402
+from services.hf_server import StateHub, create_app, make_server  # noqa: E402
+
+ASSETS = ["BTC", "ETH", "SOL", "XRP", "DOGE", "ADA", "AVAX", "LINK", "DOT", "MATIC", "LTC", "BNB"]
+TICK_SECONDS = 0.05
+PUBLISH_SECONDS = 0.2
+
+
+def _state(rng: random.Random) -> dict:
+    return {
+        "prices": {a: {"asset": a, "binance_price": rng.uniform(1, 70000), "oracle_price": rng.uniform(1, 70000),
+                       "divergence_pct": rng.gauss(0, 0.1), "latency_signal": "NONE", "signal_strength": 0.0,
+                       "binance_ts": time.time(), "oracle_ts": time.time() - 20, "oracle_round_id": 123456}
+                   for a in ASSETS},
+        "stats": {"binance_messages": rng.randint(0, 10 ** 6), "oracle_polls": 400, "divergence_events": 12},
+    }
+
+
+async def _ticker(state: dict, on_tick):
+    rng = random.Random(1)
+    while True:
+        await asyncio.sleep(TICK_SECONDS)
+        for row in state["prices"].values():
+            row["binance_price"] *= 1 + rng.gauss(0, 1e-4)
+            row["binance_ts"] = time.time()
+        state["stats"]["binance_messages"] += 1
+        on_tick()
+
+
+async def _old_server(sock: socket.socket, state: dict):
+    async def handler(reader, writer):  # The engine's previous http_handler, /state branch
+        try:
+            request = await asyncio.wait_for(reader.read(4096), timeout=5)
+            path = request.decode().split("\r\n")[0].split(" ")[1]
+            body = json.dumps(state) if path == "/state" else json.dumps({"status": "running"})
+            writer.write((f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                          f"Access-Control-Allow-Origin: *\r\n\r\n{body}").encode())
+            await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handler, sock=sock)
+    await asyncio.gather(server.serve_forever(), _ticker(state, lambda: None))
+
+
+async def _new_server(sock: socket.socket, state: dict):
+    hub = StateHub()
+    hub.register("state", lambda: state)
+
+    async def publisher():
+        while True:
+            await asyncio.sleep(PUBLISH_SECONDS)
+            hub.publish("edge", {"symbol": "BTCUSDT", "action": "WATCH", "sent": time.time()})
+
+    await asyncio.gather(make_server(create_app(hub)).serve(sockets=[sock]),
+                         _ticker(state, lambda: hub.touch("state")), publisher())
+
+
+def _child(kind: str, sock: socket.socket):
+    state = _state(random.Random(0))
+    asyncio.run((_old_server if kind == "before" else _new_server)(sock, state))
+
+
+async def _get(reader, writer, request: bytes) -> bytes:
+    writer.write(request)
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 200"):
+        raise ConnectionError(head.split(b"\r\n")[0].decode())
+    length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                  if line.lower().startswith(b"content-length"))
+    return await reader.readexactly(length)
+
+
+async def _poll(base: str, pollers: int, seconds: float, keep_alive: bool) -> dict:
+    """Raw HTTP/1.1 pollers (httpx's pool, not the server, dominates on a small box)."""
+    hist = LatencyHistogram()
+    errors = 0
+    port = int(base.rsplit(":", 1)[1])
+    request = b"GET /state HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n"
+    deadline = time.perf_counter() + seconds
+
+    async def poller():
+        nonlocal errors
+        conn = None
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = await asyncio.open_connection("127.0.0.1", port)
+                await _get(*conn, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors += 1
+                conn = None
+                continue
+            hist.observe(time.perf_counter() - started)
+            if not keep_alive:
+                conn[1].close()
+                conn = None
+        if conn is not None:
+            conn[1].close()
+
+    await asyncio.gather(*(poller() for _ in range(pollers)))
+    return {"rps": hist.count / seconds, "p50_ms": hist.quantile(0.5) * 1000,
+            "p99_ms": hist.quantile(0.99) * 1000, "errors": errors}
+
+
+async def _subscribe(base: str, subscribers: int, seconds: float, hist: LatencyHistogram, counts: list):
+    url = base.replace("http", "ws") + "/ws?events=edge"
+
+    async def subscriber():
+        async with websockets.connect(url, max_queue=None) as ws:
+            counts[0] += 1
+            deadline = time.time() + seconds
+            while time.time() < deadline:
+                event = json.loads(await ws.recv())
+                if event.get("event") == "edge":
+                    hist.observe(time.time() - event["data"]["sent"])
+                    counts[1] += 1
+
+    await asyncio.gather(*(subscriber() for _ in range(subscribers)))
+
+
+async def _push_run(base: str, pollers: int, subscribers: int, seconds: float) -> dict:
+    hist, counts = LatencyHistogram(), [0, 0]
+    subs = asyncio.ensure_future(_subscribe(base, subscribers, seconds + 1, hist, counts))
+    while counts[0] < subscribers:
+        await asyncio.sleep(0.05)
+    polled = await _poll(base, pollers, seconds, keep_alive=True)
+    await subs
+    return {**polled, "subscribers": counts[0], "delivered": counts[1],
+            "push_p50_ms": hist.quantile(0.5) * 1000, "push_p99_ms": hist.quantile(0.99) * 1000}
+
+
+def _with_server(kind: str, run):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)  # proto set: asyncio enables TCP_NODELAY
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1024)
+    proc = multiprocessing.get_context("fork").Process(target=_child, args=(kind, sock), daemon=True)
+    proc.start()
+    try:
+        time.sleep(0.5)
+        return asyncio.run(run("http://127.0.0.1:%d" % sock.getsockname()[1]))
+    finally:
+        proc.terminate()
+        proc.join()
+        sock.close()
+
+
+def measure(pollers: int = 50, subscribers: int = 500, seconds: float = 3.0) -> dict:
+    return {
+        "before": _with_server("before", lambda base: _poll(base, pollers, seconds, keep_alive=False)),
+        "after": _with_server("after", lambda base: _poll(base, pollers, seconds, keep_alive=True)),
+        "after_push": _with_server("after", lambda base: _push_run(base, pollers, subscribers, seconds)),
+    }
+
+
+if __name__ == "__main__":
+    pollers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    subscribers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    print(f"pollers: {pollers}  subscribers: {subscribers}  seconds: {seconds:.0f}\n")
+    r = measure(pollers, subscribers, seconds)
+    for name, label in (("before", "close per response"), ("after", "keep-alive + cached"),
+                        ("after_push", f"... + {subscribers} ws subs")):
+        m = r[name]
+        print(f"{label:24s} {m['rps']:8.0f} req/s  p50 {m['p50_ms']:6.1f} ms  p99 {m['p99_ms']:6.1f} ms  "
+              f"errors {m['errors']}")
+    p = r["after_push"]
+    print(f"\npush: {p['subscribers']} subscribers, {p['delivered']} events delivered, "
+          f"publish->receive p50 {p['push_p50_ms']:.1f} ms  p99 {p['push_p99_ms']:.1f} ms")
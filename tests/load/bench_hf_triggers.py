@@ -0,0 +1,145 @@
+"""
+Trigger evaluation: fixed 1s loop vs event-driven scheduling, in simulated time.
+
+Replays a synthetic session (Binance trades with quiet and volatile stretches,
+Virtuoso enrichment rewrites every ~15s, an oracle round every ~27s) through
+both strategies. "before" wakes every second and runs all five detectors.
+"after" feeds the same stream to TriggerScheduler (price tick threshold,
+coalescing window, heartbeat) and re-runs only the detectors whose inputs
+changed (DETECTOR_INPUTS). Reports wakeups, detector runs and tick-to-signal
+latency: from the first trade that moved price past the tick threshold to
+the evaluation that saw it.
+
+Usage:
+    python tests/load/bench_hf_triggers.py [seconds] [trades_per_second]
+"""
+
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from services.hf_events import (  # noqa: E402
+    COALESCE_SECONDS, HEARTBEAT_SECONDS, LatencyHistogram, TriggerScheduler, enrichment_inputs,
+)
+from services.hf_triggers import DETECTOR_INPUTS  # noqa: E402
+
+EVAL_SECONDS = 0.0005  # One evaluation + memcached write
+
+
+def session(seconds: int, tps: int, rng: random.Random) -> list:
+    """(t, kind, payload) events ordered by time."""
+    events = []
+    price = 65000.0
+    t = 0.0
+    while t < seconds:
+        t += rng.expovariate(tps)
+        volatile = _volatile(t)
+        price *= 1 + rng.gauss(0, 4e-5 if volatile else 2e-6)
+        events.append((t, "price", price))
+    for k in range(int(seconds // 15)):
+        changed = ["orderbook:BTCUSDT:snapshot", "confluence:breakdown:BTCUSDT", "confluence:score:BTCUSDT"]
+        if k % 4 == 0:
+            changed.append("liquidations:BTCUSDT")
+        events.append((15.0 * k + rng.uniform(0, 1), "enrichment", changed))
+    for k in range(int(seconds // 27)):
+        events.append((27.0 * k + rng.uniform(0, 3), "oracle", None))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def _volatile(t: float) -> bool:
+    return int(t // 60) % 4 == 3  # One minute in four moves
+
+
+def _detectors(inputs) -> int:
+    return sum(1 for deps in DETECTOR_INPUTS.values() if deps & inputs)
+
+
+def run_polling(events: list, seconds: int, tick_pct: float) -> dict:
+    latency = LatencyHistogram()
+    last_price, moved_at = None, None
+    next_poll, i = 1.0, 0
+    while next_poll <= seconds:
+        while i < len(events) and events[i][0] <= next_poll:
+            t, kind, payload = events[i]
+            if kind == "price":
+                if last_price is None or abs(payload - last_price) / last_price * 100 >= tick_pct:
+                    last_price = payload
+                    if moved_at is None:
+                        moved_at = t
+            i += 1
+        if moved_at is not None:
+            latency.observe(next_poll + EVAL_SECONDS - moved_at)
+            moved_at = None
+        next_poll += 1.0
+    wakeups = int(seconds)
+    quiet = sum(1 for s in range(1, wakeups + 1) if not _volatile(s - 0.5))
+    return {"wakeups": wakeups, "quiet_wakeups": quiet, "detector_runs": wakeups * len(DETECTOR_INPUTS),
+            "latency": latency}
+
+
+def run_events(events: list, seconds: int, tick_pct: float) -> dict:
+    scheduler = TriggerScheduler(["BTCUSDT"], price_tick_pct=tick_pct)
+    latency = LatencyHistogram()
+    runs = wakeups = quiet = 0
+    closes_at = None  # End of the current coalescing window
+    last_eval = 0.0
+
+    def evaluate(now):
+        nonlocal runs, wakeups, quiet, last_eval
+        for batch in scheduler.drain():
+            runs += _detectors(batch.inputs)
+            wakeups += 1
+            quiet += not _volatile(now)
+            if batch.source == "price":
+                latency.observe(now + EVAL_SECONDS - batch.received)
+        last_eval = now
+
+    for t, kind, payload in events:
+        if t > seconds:
+            break
+        if closes_at is not None and t >= closes_at:
+            evaluate(closes_at)
+            closes_at = None
+        while closes_at is None and t - last_eval >= HEARTBEAT_SECONDS:
+            last_eval += HEARTBEAT_SECONDS
+            scheduler.notify("BTCUSDT", ("price", "clock"), "heartbeat", received=last_eval)
+            evaluate(last_eval)
+        if kind == "price":
+            woke = scheduler.notify_price("BTCUSDT", payload, received=t)
+        elif kind == "enrichment":
+            woke = scheduler.notify("BTCUSDT", enrichment_inputs(payload, "BTCUSDT"), "enrichment", received=t)
+        else:
+            woke = scheduler.notify("BTCUSDT", ("oracle",), "oracle", received=t)
+        if woke and closes_at is None:
+            closes_at = t + COALESCE_SECONDS
+    return {"wakeups": wakeups, "quiet_wakeups": quiet, "detector_runs": runs, "latency": latency,
+            "ignored": scheduler.stats["price_ticks_ignored"], "ticks": scheduler.stats["price_ticks"]}
+
+
+def measure(seconds: int = 3600, tps: int = 40, tick_pct: float = 0.01) -> dict:
+    events = session(seconds, tps, random.Random(7))
+    return {
+        "seconds": seconds,
+        "trades": sum(1 for e in events if e[1] == "price"),
+        "before": run_polling(events, seconds, tick_pct),
+        "after": run_events(events, seconds, tick_pct),
+    }
+
+
+if __name__ == "__main__":
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 3600
+    tps = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    r = measure(seconds, tps)
+    print(f"simulated: {r['seconds']:,}s  trades: {r['trades']:,}\n")
+    for name, label in (("before", "1s loop"), ("after", "event-driven")):
+        m = r[name]
+        s = m["latency"].summary()
+        print(f"{label:13s} wakeups: {m['wakeups']:6,} ({m['quiet_wakeups']:5,} quiet)  "
+              f"detector runs: {m['detector_runs']:7,}  "
+              f"tick→signal p50 {s['p50_ms']:7.1f} ms  p99 {s['p99_ms']:7.1f} ms  ({s['count']:,} moves)")
+    a = r["after"]
+    print(f"\nprice ticks below threshold (no wakeup): {a['ignored']:,} / {a['ticks']:,}")
@@ -0,0 +1,114 @@
+"""
+Velocity tracker microbenchmark: per-update and per-query cost for many symbols.
+
+"before" keeps a deque of (timestamp, value) readings per symbol, as the
+trackers used to, and answers velocity / acceleration / window slope by
+walking the window (tests/unit/test_hf_velocity reference formulas plus a
+Python least-squares pass). "after" is SymbolVelocityTrackers: preallocated
+RingBank rows with running sums, queried per symbol (O(1) properties) and
+for all symbols at once (snapshot).
+
+Usage:
+    python tests/load/bench_hf_velocity.py [symbols] [updates] [window]
+"""
+
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from services.hf_velocity import SymbolVelocityTrackers  # noqa: E402
+from test_hf_velocity import _acceleration, _rate  # noqa: E402
+
+
+def _window_slope(window):
+    n = len(window)
+    if n < 2:
+        return 0.0
+    t0 = window[0][0]
+    st = sv = stt = stv = 0.0
+    for t, v in window:
+        t -= t0
+        st += t
+        sv += v
+        stt += t * t
+        stv += t * v
+    denom = n * stt - st * st
+    return (n * stv - st * sv) / denom if denom > 0 else 0.0
+
+
+def _ticks(n_symbols, n_updates, rng):
+    symbols = [f"S{i}USDT" for i in range(n_symbols)]
+    t = 1.7e9
+    ticks = []
+    for _ in range(n_updates):
+        t += 0.01
+        ticks.append((rng.choice(symbols), t, rng.gauss(0, 1000)))
+    return symbols, ticks
+
+
+def _best(fn, repeat=5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def measure(n_symbols: int = 1000, n_updates: int = 200_000, window: int = 12) -> dict:
+    rng = random.Random(6)
+    symbols, ticks = _ticks(n_symbols, n_updates, rng)
+
+    windows = {s: deque(maxlen=window) for s in symbols}
+    started = time.perf_counter()
+    for symbol, t, v in ticks:
+        windows[symbol].append((t, v))
+    deque_update_s = (time.perf_counter() - started) / n_updates
+
+    before, deque_query_s = _best(
+        lambda: {s: (_rate(w, 1), _acceleration(w), _window_slope(w)) for s, w in windows.items()})
+
+    bank = SymbolVelocityTrackers(cvd_window=window, capacity=n_symbols)
+    trackers = {s: bank.trackers(s)["cvd"] for s in symbols}
+    started = time.perf_counter()
+    for symbol, t, v in ticks:
+        trackers[symbol].update(v, ts=t)
+    ring_update_s = (time.perf_counter() - started) / n_updates
+
+    per_symbol, ring_query_s = _best(
+        lambda: {s: (tr.velocity, tr.acceleration, tr.slope) for s, tr in trackers.items()})
+    snapshot, snapshot_s = _best(bank.snapshot)
+
+    worst = max(abs(before[s][2] - snapshot[s]["cvd_slope"]) / max(1.0, abs(before[s][2])) for s in symbols)
+    return {
+        "symbols": n_symbols,
+        "updates": n_updates,
+        "window": window,
+        "deque_update_us": deque_update_s * 1e6,
+        "ring_update_us": ring_update_s * 1e6,
+        "deque_query_ms": deque_query_s * 1000,
+        "ring_query_ms": ring_query_s * 1000,
+        "snapshot_ms": snapshot_s * 1000,
+        "same_velocity": all(abs(before[s][0] - per_symbol[s][0]) < 1e-6 for s in symbols),
+        "slope_rel_err": worst,
+    }
+
+
+if __name__ == "__main__":
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_updates = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    window = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    r = measure(n_symbols, n_updates, window)
+    print(f"symbols: {r['symbols']:,}  updates: {r['updates']:,}  window: {r['window']}\n")
+    print(f"per update   deque append:               {r['deque_update_us']:7.2f} us")
+    print(f"             ring append + running sums: {r['ring_update_us']:7.2f} us")
+    print(f"per query    deque walk (vel/accel/slope), all symbols: {r['deque_query_ms']:7.2f} ms")
+    print(f"             ring O(1) properties, all symbols:         {r['ring_query_ms']:7.2f} ms")
+    print(f"             ring snapshot (vectorized, 10 stats):      {r['snapshot_ms']:7.2f} ms")
+    print(f"velocity identical: {r['same_velocity']}  max slope rel err: {r['slope_rel_err']:.1e}")
@@ -0,0 +1,103 @@
+"""
+Kalshi market store benchmark against the serial cold fetch.
+
+Runs against an in-process fake Kalshi API (tests/unit/test_kalshi_market_store.FakeKalshi)
+with a fixed per-request latency, so the numbers reflect round trips, not
+the network. "before" is the old serial cursor walk
+(kalshi_edge._page_kalshi_markets_sync, 200 per page); "after" is the
+store's concurrent windowed full sync, a warm view, and an incremental
+refresh after a handful of updates.
+
+Usage:
+    python tests/load/bench_kalshi_market_store.py [markets] [latency_ms]
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from odds import kalshi_edge  # noqa: E402
+from odds.kalshi_market_store import KalshiMarketStore  # noqa: E402
+from test_kalshi_market_store import FakeKalshi  # noqa: E402
+
+
+class _SlowApi(FakeKalshi):
+    def __init__(self, n, latency):
+        super().__init__(n)
+        self.latency = latency
+
+    def __call__(self, path, params):
+        time.sleep(self.latency)
+        return super().__call__(path, params)
+
+
+class _Response:
+    def __init__(self, data):
+        self.status_code = 200 if data is not None else 500
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def measure(n_markets: int = 20_000, latency_s: float = 0.1) -> dict:
+    """Seconds and request counts for the serial fetch vs. the store."""
+    api = _SlowApi(n_markets, latency_s)
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        return _Response(api(url.split("/trade-api/v2", 1)[1], params))
+
+    with mock.patch.object(kalshi_edge.requests, "get", fake_get):
+        started = time.perf_counter()
+        serial = kalshi_edge._page_kalshi_markets_sync(None, None, "open", max_pages=10**6)
+        serial_s = time.perf_counter() - started
+    serial_requests = len(api.calls)
+
+    store = KalshiMarketStore(get_json=api, refresh_interval=0)
+    api.calls.clear()
+    started = time.perf_counter()
+    store.full_sync()
+    full_s = time.perf_counter() - started
+    full_requests = len(api.calls)
+
+    store.refresh_interval = 3600
+    started = time.perf_counter()
+    view = store.markets(fields=("ticker", "yes_ask", "close_time"))
+    view_s = time.perf_counter() - started
+
+    for i in range(0, n_markets, max(1, n_markets // 20)):
+        api.update(f"M{i}", yes_ask=1)
+    api.calls.clear()
+    started = time.perf_counter()
+    refresh = store.refresh()
+    refresh_s = time.perf_counter() - started
+
+    return {
+        "markets": n_markets,
+        "serial_s": serial_s,
+        "serial_requests": serial_requests,
+        "serial_markets": len(serial),
+        "full_sync_s": full_s,
+        "full_sync_requests": full_requests,
+        "view_s": view_s,
+        "view_markets": len(view),
+        "refresh_s": refresh_s,
+        "refresh_requests": len(api.calls),
+        "refresh": refresh,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 100) / 1000
+    r = measure(n, latency)
+    print(f"markets: {r['markets']:,}  latency: {latency * 1000:.0f} ms/request\n")
+    print(f"serial cold fetch:   {r['serial_s']:7.2f}s  {r['serial_requests']:4d} requests  {r['serial_markets']:,} markets")
+    print(f"store full sync:     {r['full_sync_s']:7.2f}s  {r['full_sync_requests']:4d} requests")
+    print(f"store warm view:     {r['view_s']:7.3f}s     0 requests  {r['view_markets']:,} markets")
+    print(f"store refresh:       {r['refresh_s']:7.2f}s  {r['refresh_requests']:4d} requests  {r['refresh']}")
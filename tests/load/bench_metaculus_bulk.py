@@ -0,0 +1,74 @@
+"""
+Metaculus scan benchmark: per-question detail loop vs. the bulk path.
+
+Runs against an in-process fake API (tests/unit/test_metaculus_bulk.FakeMetaculus)
+with a fixed per-request latency. "before" replays the old loop (0.3s sleep
+plus one detail request per question, serially); "after" is fetch_questions
+cold without inline predictions (concurrent detail fetches under the token
+bucket), warm (activity-keyed cache), and with predictions in the listing.
+
+Usage:
+    python tests/load/bench_metaculus_bulk.py [questions] [latency_ms]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from odds import metaculus  # noqa: E402
+from test_metaculus_bulk import FakeMetaculus  # noqa: E402
+
+
+def _serial(api, min_forecasters=10):
+    listing = api(f"{metaculus.METACULUS_API}/?limit=100")
+    out = {}
+    for q in listing["results"]:
+        if q["nr_forecasters"] < min_forecasters or q["question"]["type"] != "binary":
+            continue
+        time.sleep(0.3)
+        detail = api(f"{metaculus.METACULUS_API}/{q['id']}/")
+        out[q["id"]] = metaculus._latest_center(detail["question"])
+    return out
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def measure(n_questions: int = 100, latency_s: float = 0.15) -> dict:
+    """Seconds and request counts per scan for each path."""
+    api = FakeMetaculus(n_questions, latency=latency_s)
+    metaculus._get_json = api
+    metaculus.clear_prediction_cache()
+
+    serial, serial_s = _timed(lambda: _serial(api))
+    serial_requests = len(api.calls)
+
+    rows = {}
+    for label, inline in (("cold", False), ("warm", False), ("inline", True)):
+        api.inline = inline
+        if label == "inline":
+            metaculus.clear_prediction_cache()
+        questions, seconds = _timed(lambda: metaculus.fetch_questions(limit=n_questions))
+        assert {q["id"]: q["community_prediction"] for q in questions} == serial
+        rows[label] = (seconds, metaculus.get_scan_stats())
+
+    return {"questions": len(serial), "serial_s": serial_s, "serial_requests": serial_requests, **rows}
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 150) / 1000
+    r = measure(n, latency)
+    print(f"binary questions: {r['questions']}  latency: {latency * 1000:.0f} ms/request\n")
+    print(f"serial detail loop:  {r['serial_s']:7.2f}s  {r['serial_requests']:4d} requests")
+    for label in ("cold", "warm", "inline"):
+        seconds, stats = r[label]
+        print(f"bulk scan ({label:6s}): {seconds:7.2f}s  {stats['requests']:4d} requests  "
+              f"{stats['cache_hits']} cached  {stats['inline']} inline")
@@ -0,0 +1,84 @@
+"""
+MetricsMiddleware overhead microbenchmark.
+
+Drives a minimal ASGI app in-process (no sockets, no server) with and
+without MetricsMiddleware and reports the per-request difference, so the
+number is the middleware's own cost: route lookup, counters, histogram.
+
+Usage:
+    python tests/load/bench_metrics_middleware.py [requests]
+
+Target: < 50µs overhead per request.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services.metrics import MetricsMiddleware, MetricsRegistry
+
+
+async def _endpoint():
+    pass
+
+
+class _App:
+    """Stand-in for a routed Starlette app: sets scope endpoint/app like the Router does."""
+
+    def __init__(self):
+        self.routes = [type("Route", (), {"path": "/api/signals/{source}", "endpoint": _endpoint})()]
+
+    async def __call__(self, scope, receive, send):
+        scope["endpoint"] = _endpoint
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _drive(app, n: int) -> float:
+    app_ref = _App()
+    started = time.perf_counter()
+    for _ in range(n):
+        scope = {"type": "http", "method": "GET", "path": "/api/signals/vegas", "app": app_ref}
+        await app(scope, _receive, _send)
+    return time.perf_counter() - started
+
+
+def measure_overhead(n: int = 20_000, rounds: int = 5) -> dict:
+    """Best-of-rounds per-request time for the bare app vs. the wrapped app (µs)."""
+    bare = _App()
+    wrapped = MetricsMiddleware(_App(), metrics=MetricsRegistry())
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_drive(wrapped, 1000))  # Warm route-template cache
+        bare_s = min(loop.run_until_complete(_drive(bare, n)) for _ in range(rounds))
+        wrapped_s = min(loop.run_until_complete(_drive(wrapped, n)) for _ in range(rounds))
+    finally:
+        loop.close()
+    bare_us = bare_s / n * 1e6
+    wrapped_us = wrapped_s / n * 1e6
+    return {
+        "requests": n,
+        "bare_us": round(bare_us, 2),
+        "with_metrics_us": round(wrapped_us, 2),
+        "overhead_us": round(wrapped_us - bare_us, 2),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    result = measure_overhead(n)
+    print(f"requests:        {result['requests']:,}")
+    print(f"bare app:        {result['bare_us']:.2f} µs/request")
+    print(f"with metrics:    {result['with_metrics_us']:.2f} µs/request")
+    print(f"overhead:        {result['overhead_us']:.2f} µs/request (target < 50)")
@@ -0,0 +1,103 @@
+"""
+Order book analytics: dataclass path vs NumPy books.
+
+Generates raw CLOB /book responses (tests/unit/test_orderbook._raw_book).
+"before" parses each into OrderBookLevel dataclasses, runs
+analyze_orderbook_depth, and walks levels in Python to price a ladder of
+order sizes; "after" parses the batch with books_from_clob, runs analyze_books
+and BookBatch.vwap_to_size for the same ladder.
+
+Usage:
+    python tests/load/bench_orderbook.py [books] [levels]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests" / "unit"))
+
+from odds import polymarket_clob  # noqa: E402
+from odds.orderbook import BookBatch, analyze_books, books_from_clob  # noqa: E402
+from test_orderbook import _dataclass_book, _raw_book  # noqa: E402
+
+SIZES = [10, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def _vwap_walk(levels, shares):
+    got = cost = 0.0
+    for lvl in levels:
+        take = min(lvl.size, shares - got)
+        if take <= 0:
+            break
+        got += take
+        cost += take * lvl.price
+    return cost / shares if got >= shares else None
+
+
+def _dataclass_path(raw):
+    out = []
+    for data in raw:
+        book = _dataclass_book(data)
+        analysis = polymarket_clob.analyze_orderbook_depth(book)
+        analysis["vwap"] = [_vwap_walk(book.asks, q) for q in SIZES]
+        out.append(analysis)
+    return out
+
+
+def _numpy_path(raw):
+    books = books_from_clob(raw)
+    analyses = analyze_books(books)
+    curves = BookBatch(books).vwap_to_size(SIZES, side="buy")
+    return analyses, curves
+
+
+def _timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def measure(n_books: int = 500, levels: int = 40) -> dict:
+    rng = random.Random(3)
+    raw = [_raw_book(rng, token_id=f"t{i}", levels=levels) for i in range(n_books)]
+    before, before_s = _timed(lambda: _dataclass_path(raw))
+    (after, curves), after_s = _timed(lambda: _numpy_path(raw))
+    dataclass_books = [_dataclass_book(d) for d in raw]
+    _, dataclass_analyze_s = _timed(lambda: [
+        (polymarket_clob.analyze_orderbook_depth(b), [_vwap_walk(b.asks, q) for q in SIZES])
+        for b in dataclass_books])
+    books = books_from_clob(raw)
+    _, analyze_s = _timed(lambda: analyze_books(books))
+    _, curve_s = _timed(lambda: BookBatch(books).vwap_to_size(SIZES))
+    same = all({k: v for k, v in b.items() if k != "vwap"} == a for b, a in zip(before, after))
+    return {
+        "books": n_books,
+        "levels": levels,
+        "dataclass_s": before_s,
+        "numpy_s": after_s,
+        "dataclass_analyze_s": dataclass_analyze_s,
+        "numpy_analyze_s": analyze_s,
+        "numpy_curve_s": curve_s,
+        "speedup": before_s / after_s,
+        "same_analysis": same,
+    }
+
+
+if __name__ == "__main__":
+    n_books = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    levels = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    r = measure(n_books, levels)
+    print(f"books: {r['books']:,}  levels/side: {r['levels']}  sizes: {len(SIZES)}\n")
+    print(f"dataclass parse + analyze + walk:  {r['dataclass_s'] * 1000:8.1f} ms")
+    print(f"numpy parse + batch analyze/curve: {r['numpy_s'] * 1000:8.1f} ms  ({r['speedup']:.1f}x)")
+    print(f"prebuilt dataclass analyze + walk: {r['dataclass_analyze_s'] * 1000:8.1f} ms")
+    print(f"  analyze_books (prebuilt):        {r['numpy_analyze_s'] * 1000:8.1f} ms")
+    print(f"  vwap_to_size (prebuilt):         {r['numpy_curve_s'] * 1000:8.1f} ms")
+    print(f"identical analysis: {r['same_analysis']}")
@@ -0,0 +1,95 @@
+"""
+Strike pricing: per-market scoring vs the batch ladder pricer.
+
+Seeds a temp price_snapshots DB for a few symbols, then builds strike
+ladders (several expiries per symbol, dozens of strikes each). "before" is
+score_market per market (regex parse + vol/momentum DB reads every call);
+"after" is score_markets: cached contracts, one input load per symbol and
+one vectorized Student-t evaluation per (symbol, expiry).
+
+Usage:
+    python tests/load/bench_strike_pricer.py [strikes_per_ladder] [expiries]
+"""
+
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT / "signals"))
+
+from strike_probability import StrikeProbabilityCalculator  # noqa: E402
+
+ASSETS = {"Bitcoin": ("BTCUSDT", 64000.0), "Ethereum": ("ETHUSDT", 3400.0), "Solana": ("SOLUSDT", 150.0)}
+
+
+def _seed(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE price_snapshots (id INTEGER PRIMARY KEY, timestamp TEXT, symbol TEXT, price REAL)")
+    now = datetime.now(timezone.utc)
+    for symbol, base in ASSETS.values():
+        for i in range(1000):  # 10-minute snapshots over ~7 days
+            ts = (now - timedelta(minutes=10 * (1000 - i))).isoformat()
+            price = base * (1 + 0.02 * math.sin(i / 40) + 0.0001 * i)
+            conn.execute("INSERT INTO price_snapshots (timestamp, symbol, price) VALUES (?, ?, ?)", (ts, symbol, price))
+    conn.commit()
+    conn.close()
+
+
+def markets(strikes: int, expiries: int) -> list:
+    out = []
+    for asset, (_, base) in ASSETS.items():
+        for e in range(expiries):
+            expiry = (datetime.now(timezone.utc) + timedelta(days=3 + 7 * e)).strftime("%B %d, %Y")
+            for k in range(strikes):
+                strike = round(base * (0.7 + 0.6 * k / max(strikes - 1, 1)), 2)
+                out.append({"id": f"{asset}-{e}-{k}", "yes_price": 0.5,
+                            "title": f"Will the price of {asset} be above ${strike:,} on {expiry}?"})
+    return out
+
+
+def measure(strikes: int = 40, expiries: int = 4) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        _seed(path)
+        batch = markets(strikes, expiries)
+
+        calc = StrikeProbabilityCalculator(db_path=path)
+        started = time.perf_counter()
+        before = [calc.score_market(m) for m in batch]
+        before_s = time.perf_counter() - started
+
+        calc = StrikeProbabilityCalculator(db_path=path)
+        started = time.perf_counter()
+        after = calc.score_markets(batch)
+        cold_s = time.perf_counter() - started
+        started = time.perf_counter()
+        calc.score_markets(batch)
+        warm_s = time.perf_counter() - started
+        ladders = calc.check_ladders(after)
+    finally:
+        os.unlink(path)
+    return {
+        "markets": len(batch),
+        "ladders": len(ladders),
+        "scored": (sum(r is not None for r in before), len(after)),
+        "per_market_s": before_s,
+        "batch_cold_s": cold_s,
+        "batch_warm_s": warm_s,
+    }
+
+
+if __name__ == "__main__":
+    strikes = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    expiries = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    r = measure(strikes, expiries)
+    print(f"markets: {r['markets']:,}  ladders: {r['ladders']}  scored: {r['scored'][0]} / {r['scored'][1]}\n")
+    print(f"score_market loop:        {r['per_market_s'] * 1000:9.1f} ms")
+    print(f"score_markets (cold):     {r['batch_cold_s'] * 1000:9.1f} ms  ({r['per_market_s'] / r['batch_cold_s']:.0f}x)")
+    print(f"score_markets (cached):   {r['batch_warm_s'] * 1000:9.1f} ms  ({r['per_market_s'] / r['batch_warm_s']:.0f}x)")
@@ -0,0 +1,55 @@
+"""
+Tweet-count Monte Carlo benchmark: NumPy engine vs. the scalar engine.
+
+Both engines run the same day pools and pace weights built by
+_build_day_pools, so the timing difference is the sampling loop alone.
+
+Usage:
+    python tests/load/bench_tweet_monte_carlo.py [simulations]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
+
+import tweet_count_scanner as tcs
+
+# Roughly a month of Elon-style daily counts; mid-window with a hot pace so weights apply
+DAILY_COUNTS = [38, 52, 61, 47, 70, 55, 66, 44, 58, 63, 49, 72, 41, 57, 68, 50, 60, 45, 53, 75, 39, 62, 48, 56, 67, 51, 59, 43]
+
+
+def measure(simulations: int = tcs.MC_SIMULATIONS, window_days: float = 7.0,
+            days_elapsed: float = 2.4, posts_so_far: int = 240) -> dict:
+    """Seconds per full simulation for each engine."""
+    remaining = window_days - days_elapsed
+    pools, weights = tcs._build_day_pools(DAILY_COUNTS, remaining, posts_so_far, days_elapsed, None, None)
+    args = (DAILY_COUNTS, pools, weights, remaining, posts_so_far, simulations, 7)
+
+    started = time.perf_counter()
+    tcs._simulate_totals_python(*args)
+    python_s = time.perf_counter() - started
+
+    numpy_s = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        tcs._simulate_totals_numpy(*args)
+        numpy_s = min(numpy_s, time.perf_counter() - started)
+
+    return {
+        "simulations": simulations,
+        "pace_weighted": weights is not None,
+        "python_s": round(python_s, 4),
+        "numpy_s": round(numpy_s, 4),
+        "speedup": round(python_s / numpy_s, 1) if numpy_s else None,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else tcs.MC_SIMULATIONS
+    result = measure(n)
+    print(f"simulations:   {result['simulations']:,} (pace weighted: {result['pace_weighted']})")
+    print(f"python engine: {result['python_s'] * 1000:.1f} ms")
+    print(f"numpy engine:  {result['numpy_s'] * 1000:.1f} ms")
+    print(f"speedup:       {result['speedup']}x")
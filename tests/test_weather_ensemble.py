@@ -1,17 +1,22 @@
 """Tests for weather_ensemble module."""
 import json
+
+import numpy as np
 import pytest
 from unittest.mock import patch, MagicMock
 from signals.weather_ensemble import (
     _c_to_f,
     _norm_cdf,
     _t_cdf,
+    _t_cdf_array,
     _fetch_open_meteo_ensemble,
     get_ensemble_forecast,
     prob_below,
     prob_above,
     prob_in_range,
     ensemble_fair_value,
+    bracket_probabilities,
+    price_brackets,
     source_health,
     _cache,
     _cache_ts,
@@ -64,6 +69,19 @@ class TestTCDF:
         # High df should be close to normal
         assert abs(_t_cdf(1, df=100) - _norm_cdf(1)) < 0.02
 
+    def test_exact_df4(self):
+        # t(4) CDF at 2.0 = 0.94194 (tables)
+        assert abs(_t_cdf(2.0, df=4) - 0.941942) < 1e-5
+
+    def test_exact_odd_df(self):
+        # t(1) is Cauchy: CDF(1) = 0.75
+        assert abs(_t_cdf(1.0, df=1) - 0.75) < 1e-9
+
+    def test_array_matches_scalar(self):
+        z = np.array([-3.0, -0.5, 0.0, 1.2, 4.0])
+        expected = [_t_cdf(v, df=5) for v in z]
+        assert np.allclose(_t_cdf_array(z, 5), expected)
+
 
 class TestResolveCity:
     def test_exact(self):
@@ -265,7 +283,130 @@ class TestEnsembleFairValue:
         }
         result = ensemble_fair_value("miami", "2026-02-28", "between", 79.0, 81.0)
         assert result is not None
-        assert 0.2 < result["fair_value"] < 0.5
+        # "79-81°F" covers (78.5, 81.5], same interval as price_brackets
+        assert abs(result["fair_value"] - (_norm_cdf(0.75) - _norm_cdf(-0.75))) < 1e-3
+
+    @patch("signals.weather_ensemble.get_ensemble_forecast")
+    def test_above_is_complement_of_below(self, mock_forecast):
+        mock_forecast.return_value = {
+            "ensemble": {
+                "high_mean_f": 80.0, "high_std_f": 2.0,
+                "n_sources": 3, "source_agreement": 0.9,
+            }
+        }
+        above = ensemble_fair_value("miami", "2026-02-28", "above", 80.0)["fair_value"]
+        below = ensemble_fair_value("miami", "2026-02-28", "below", 80.0)["fair_value"]
+        assert abs(above + below - 1.0) < 1e-3
+        assert abs(above - (1 - _norm_cdf(0.25))) < 1e-3  # Reading > 80 ⇒ (80.5, inf)
+
+
+class TestBracketPricing:
+    def test_exclusive_brackets_sum_to_one(self):
+        lows = np.array([-np.inf, 65.5, 67.5, 69.5])
+        highs = np.array([65.5, 67.5, 69.5, np.inf])
+        probs = bracket_probabilities(68.0, 2.0, lows, highs)
+        assert abs(probs.sum() - 1.0) < 1e-9
+        assert abs(probs[1] - (_norm_cdf(-0.25) - _norm_cdf(-1.25))) < 1e-9  # Normalizing a full ladder is a no-op
+
+    def test_partial_bracket_set_not_normalized(self):
+        # "66-67" and "74-75" alone don't cover every outcome — raw mass, not forced to 1
+        probs = bracket_probabilities(70.0, 2.0, np.array([65.5, 73.5]), np.array([67.5, 75.5]))
+        assert abs(probs[0] - (_norm_cdf(-1.25) - _norm_cdf(-2.25))) < 1e-9
+        assert probs.sum() < 0.5
+
+    def test_overlapping_thresholds_not_normalized(self):
+        # "above 70" and "below 75" overlap — raw probabilities kept
+        probs = bracket_probabilities(72.0, 2.0, np.array([70.0, -np.inf]), np.array([np.inf, 75.0]))
+        assert abs(probs[0] - (1 - _norm_cdf(-1.0))) < 1e-6
+        assert probs.sum() > 1.0
+
+    def test_empirical_members(self):
+        members = np.arange(60.0, 80.0)  # 20 members, uniform 60..79
+        probs = bracket_probabilities(0, 1, np.array([-np.inf]), np.array([69.5]), members=members, normalize=False)
+        assert abs(probs[0] - 0.5) < 1e-9
+
+    @patch("signals.weather_ensemble.get_ensemble_forecast")
+    def test_price_brackets_matches_single_market(self, mock_forecast):
+        mock_forecast.return_value = {
+            "ensemble": {
+                "high_mean_f": 80.0, "high_std_f": 2.0,
+                "n_sources": 3, "source_agreement": 0.9,
+            }
+        }
+        result = price_brackets("miami", "2026-02-28", [
+            {"comparison": "above", "threshold_f": 75.0, "market_price": 0.8},
+            {"comparison": "below", "threshold_f": 85.0},
+        ])
+        single = ensemble_fair_value("miami", "2026-02-28", "above", 75.0)
+        assert result["exclusive"] is False
+        assert abs(result["brackets"][0]["probability"] - single["fair_value"]) < 0.001
+        assert abs(result["brackets"][0]["edge"] - (result["brackets"][0]["probability"] - 0.8)) < 1e-6
+        assert "edge" not in result["brackets"][1]
+
+    @patch("signals.weather_ensemble.get_ensemble_forecast")
+    def test_price_brackets_ladder(self, mock_forecast):
+        mock_forecast.return_value = {
+            "ensemble": {
+                "high_mean_f": 70.0, "high_std_f": 2.5,
+                "n_sources": 2, "source_agreement": 0.8,
+            }
+        }
+        ladder = [{"comparison": "below", "threshold_f": 65.0}]
+        ladder += [{"comparison": "between", "threshold_f": t, "threshold_high_f": t + 1} for t in range(66, 76, 2)]
+        ladder += [{"comparison": "above", "threshold_f": 75.0}]  # "76°F or higher"
+        result = price_brackets("miami", "2026-02-28", ladder)
+        assert result["exclusive"] is True
+        assert result["distribution"] == "t(df=4)"
+        assert abs(sum(b["probability"] for b in result["brackets"]) - 1.0) < 0.001
+        # 70-71°F covers (69.5, 71.5]: the raw t mass, not inflated by normalization
+        middle = _t_cdf((71.5 - 70.0) / 2.5, 4) - _t_cdf((69.5 - 70.0) / 2.5, 4)
+        assert abs(result["brackets"][3]["probability"] - middle) < 1e-4
+        assert abs(result["brackets"][0]["probability"] - _t_cdf((65.5 - 70.0) / 2.5, 4)) < 1e-4
+
+        partial = price_brackets("miami", "2026-02-28", [ladder[1], ladder[5]])
+        assert partial["exclusive"] is False
+        assert partial["brackets"][0]["probability"] == result["brackets"][1]["probability"]
+        assert sum(b["probability"] for b in partial["brackets"]) < 0.5
+
+    @patch("signals.weather_ensemble.get_ensemble_forecast")
+    def test_celsius_ladder_corrected_in_native_unit(self, mock_forecast):
+        mock_forecast.return_value = {
+            "ensemble": {
+                "high_mean_f": 61.0, "high_std_f": 3.0,
+                "n_sources": 3, "source_agreement": 0.8,
+            }
+        }
+        # "14°C or below", "15°C" ... "19°C", "20°C or higher"
+        ladder = [{"comparison": "below", "threshold_f": _c_to_f(14), "unit": "C"}]
+        ladder += [{"comparison": "exact", "threshold_f": _c_to_f(c), "unit": "C"} for c in range(15, 20)]
+        ladder += [{"comparison": "above", "threshold_f": _c_to_f(19), "unit": "C"}]
+        result = price_brackets("london", "2026-02-28", ladder)
+        assert result["exclusive"] is True
+        assert abs(sum(b["probability"] for b in result["brackets"]) - 1.0) < 0.001
+        # 16°C covers (15.5, 16.5)°C = (59.9, 61.7)°F, unnormalized
+        sixteen = _norm_cdf((_c_to_f(16.5) - 61.0) / 3.0) - _norm_cdf((_c_to_f(15.5) - 61.0) / 3.0)
+        assert abs(result["brackets"][2]["probability"] - sixteen) < 1e-4
+
+    @patch("signals.weather_ensemble.get_ensemble_forecast")
+    def test_fallback_path_prices_like_batch(self, mock_forecast):
+        mock_forecast.return_value = {
+            "ensemble": {
+                "high_mean_f": 70.0, "high_std_f": 2.5,
+                "n_sources": 3, "source_agreement": 0.8,
+            }
+        }
+        markets = [
+            {"comparison": "below", "threshold_f": 65.0},
+            {"comparison": "between", "threshold_f": 68.0, "threshold_high_f": 69.0},
+            {"comparison": "above", "threshold_f": 72.0},
+            {"comparison": "exact", "threshold_f": _c_to_f(21), "unit": "C"},
+        ]
+        batch = price_brackets("miami", "2026-02-28", markets)
+        assert batch["exclusive"] is False
+        for m, priced in zip(markets, batch["brackets"]):
+            single = ensemble_fair_value("miami", "2026-02-28", m["comparison"], m["threshold_f"],
+                                         m.get("threshold_high_f"), unit=m.get("unit", "F"))
+            assert abs(single["fair_value"] - priced["probability"]) < 1e-3
 
 
 class TestSourceHealth:
@@ -0,0 +1,80 @@
+"""Tests for the cached analysis runner (src/common/runner.py)."""
+import os
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.common.analysis import Analysis, AnalysisOutput  # noqa: E402
+from src.common.runner import AnalysisRunner, format_summary  # noqa: E402
+
+
+class _Squares(Analysis):
+    runs = 0
+
+    def __init__(self, data_dir, fail=False):
+        super().__init__("squares", "Squares of a parquet-less input")
+        self.data_dir = data_dir
+        self.fail = fail
+
+    def run(self) -> AnalysisOutput:
+        type(self).runs += 1
+        if self.fail:
+            raise RuntimeError("boom")
+        df = pd.DataFrame({"x": [1, 2, 3], "y": [1, 4, 9]})
+        fig, ax = plt.subplots()
+        ax.plot(df["x"], df["y"])
+        return AnalysisOutput(figure=fig, data=df)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "data"
+    path.mkdir()
+    (path / "chunk_0.parquet").write_bytes(b"v1")
+    _Squares.runs = 0
+    return path
+
+
+def test_unchanged_analysis_is_cached(data_dir, tmp_path):
+    runner = AnalysisRunner(tmp_path / "out", formats=["png", "csv"], workers=1)
+    first = runner.run([_Squares(data_dir)])
+    assert [r.status for r in first] == ["ran"]
+    assert set(first[0].saved) == {"png", "csv"}
+
+    second = runner.run([_Squares(data_dir)])
+    assert [r.status for r in second] == ["cached"] and _Squares.runs == 1
+    assert "1 cache hits" in format_summary(second)
+
+    # A new input chunk or a deleted output invalidates the entry
+    (data_dir / "chunk_1.parquet").write_bytes(b"v2")
+    assert runner.run([_Squares(data_dir)])[0].status == "ran"
+    os.remove(first[0].saved["png"])
+    assert runner.run([_Squares(data_dir)])[0].status == "ran"
+    assert _Squares.runs == 3
+
+
+def test_lazy_figures_render_later(data_dir, tmp_path):
+    runner = AnalysisRunner(tmp_path / "out", formats=["png", "pdf", "csv"], workers=1, lazy_figures=True)
+    result = runner.run([_Squares(data_dir)])[0]
+    assert result.pending == ["png", "pdf"] and set(result.saved) == {"csv"}
+    assert not (tmp_path / "out" / "squares.png").exists()
+
+    rendered = runner.render([_Squares(data_dir)])
+    assert [r.status for r in rendered] == ["rendered"]
+    assert (tmp_path / "out" / "squares.png").exists()
+    assert runner.render([_Squares(data_dir)]) == []
+    assert runner.run([_Squares(data_dir)])[0].status == "cached" and _Squares.runs == 1
+
+
+def test_failures_are_reported_and_not_cached(data_dir, tmp_path):
+    runner = AnalysisRunner(tmp_path / "out", formats=["csv"], workers=1)
+    result = runner.run([_Squares(data_dir, fail=True)])[0]
+    assert result.status == "failed" and "boom" in result.error
+    assert runner.run([_Squares(data_dir)])[0].status == "ran"
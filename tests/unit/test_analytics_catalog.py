@@ -0,0 +1,139 @@
+"""Tests for the persistent DuckDB analytics catalog (src/common/catalog.py)."""
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from src.common.catalog import AnalyticsCatalog  # noqa: E402
+
+POSITIONS = "SELECT * EXCLUDE (_file) FROM kalshi_positions ORDER BY trade_id"
+BUCKETS = "SELECT * FROM kalshi_price_buckets ORDER BY ALL"
+
+
+def _write_markets(path, rows):
+    con = duckdb.connect()
+    con.execute("""CREATE TABLE m (ticker VARCHAR, event_ticker VARCHAR, status VARCHAR, result VARCHAR,
+                   close_time TIMESTAMP, volume BIGINT)""")
+    con.executemany("INSERT INTO m VALUES (?, ?, ?, ?, TIMESTAMP '2025-01-01', 100)", rows)
+    con.execute(f"COPY m TO '{path}' (FORMAT PARQUET)")
+    con.close()
+
+
+def _write_trades(path, start, n):
+    con = duckdb.connect()
+    con.execute(f"""
+        COPY (
+            SELECT
+                'T' || i AS trade_id,
+                'MKT-' || (i % 5) AS ticker,
+                1 + (i * 7) % 50 AS count,
+                1 + (i * 13) % 99 AS yes_price,
+                99 - (i * 13) % 99 AS no_price,
+                CASE WHEN i % 3 = 0 THEN 'no' ELSE 'yes' END AS taker_side,
+                TIMESTAMP '2025-01-01' + INTERVAL (i) MINUTE AS created_time
+            FROM range({start}, {start + n}) r(i)
+        ) TO '{path}' (FORMAT PARQUET)
+    """)
+    con.close()
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    trades, markets = tmp_path / "kalshi" / "trades", tmp_path / "kalshi" / "markets"
+    trades.mkdir(parents=True)
+    markets.mkdir(parents=True)
+    _write_markets(markets / "markets_0_10000.parquet", [
+        ("MKT-0", "EVA-1", "finalized", "yes"),
+        ("MKT-1", "EVA-1", "finalized", "no"),
+        ("MKT-2", "EVB-1", "settled", "yes"),
+        ("MKT-3", "EVB-1", "active", ""),
+    ])
+    _write_trades(trades / "trades_0.parquet", 0, 200)
+    return {"kalshi_trades": trades, "kalshi_markets": markets}
+
+
+def _rebuilt(dirs, tmp_path, query):
+    """Same query against a catalog built from scratch."""
+    fresh = AnalyticsCatalog(tmp_path / "fresh.duckdb", dirs)
+    try:
+        return fresh.connect().execute(query).fetchall()
+    finally:
+        fresh.close()
+        (tmp_path / "fresh.duckdb").unlink()
+
+
+def test_positions_match_raw_join(dirs, tmp_path):
+    catalog = AnalyticsCatalog(tmp_path / "a.duckdb", dirs)
+    con = catalog.connect()
+    taker = con.execute("""
+        SELECT SUM(taker_won), COUNT(*) FROM kalshi_positions WHERE finalized
+    """).fetchone()
+    raw = con.execute("""
+        SELECT SUM(CASE WHEN t.taker_side = m.result THEN 1 ELSE 0 END), COUNT(*)
+        FROM kalshi_trades t JOIN kalshi_markets m ON t.ticker = m.ticker
+        WHERE m.status = 'finalized' AND m.result IN ('yes', 'no')
+    """).fetchone()
+    assert taker == raw
+    assert con.execute("SELECT SUM(n_trades) FROM kalshi_price_buckets").fetchone()[0] == 2 * 120
+    catalog.close()
+
+
+def test_incremental_refresh_matches_rebuild(dirs, tmp_path):
+    catalog = AnalyticsCatalog(tmp_path / "a.duckdb", dirs)
+    catalog.connect()
+
+    # New trade chunk + a market that resolves + a result correction
+    _write_trades(dirs["kalshi_trades"] / "trades_1.parquet", 200, 100)
+    _write_markets(dirs["kalshi_markets"] / "markets_0_10000.parquet", [
+        ("MKT-0", "EVA-1", "finalized", "yes"),
+        ("MKT-1", "EVA-1", "finalized", "yes"),
+        ("MKT-2", "EVB-1", "settled", "yes"),
+        ("MKT-3", "EVB-1", "finalized", "no"),
+    ])
+    report = catalog.refresh()
+    assert report["trade_files_added"] == 1
+    assert report["tickers_rejoined"] == 2
+
+    con = catalog.connect()
+    assert con.execute(POSITIONS).fetchall() == _rebuilt(dirs, tmp_path, POSITIONS)
+    assert con.execute(BUCKETS).fetchall() == _rebuilt(dirs, tmp_path, BUCKETS)
+
+    # Removing a chunk drops its positions; an unchanged tree is a no-op
+    (dirs["kalshi_trades"] / "trades_0.parquet").unlink()
+    assert catalog.refresh()["trade_files_removed"] == 1
+    assert con.execute(POSITIONS).fetchall() == _rebuilt(dirs, tmp_path, POSITIONS)
+    assert "tickers_rejoined" not in catalog.refresh()
+    catalog.close()
+
+
+def test_persists_across_processes_and_views_mode(dirs, tmp_path):
+    path = tmp_path / "a.duckdb"
+    catalog = AnalyticsCatalog(path, dirs)
+    expected = catalog.connect().execute(BUCKETS).fetchall()
+    catalog.close()
+
+    reopened = AnalyticsCatalog(path, dirs)
+    reopened.connect()
+    assert reopened.refresh()["trade_files_added"] == 0
+    reopened.close()
+
+    views = AnalyticsCatalog(path, dirs, materialize=False)
+    assert views.connect().execute(BUCKETS).fetchall() == expected
+    views.close()
+
+
+def test_read_only_readers_share_the_built_file(dirs, tmp_path):
+    path = tmp_path / "a.duckdb"
+    writer = AnalyticsCatalog(path, dirs)
+    expected = writer.connect().execute(BUCKETS).fetchall()
+    writer.close()
+
+    readers = [AnalyticsCatalog(path, dirs, read_only=True) for _ in range(2)]
+    assert all(r.connect().execute(BUCKETS).fetchall() == expected for r in readers)
+
+    # Pointing a reader elsewhere can't refresh the shared file; it goes private
+    readers[0].use({"kalshi_trades": tmp_path / "elsewhere"})
+    assert readers[0].db_path == ":memory:"
+    assert readers[0].connect().execute("SELECT COUNT(*) FROM information_schema.tables "
+                                        "WHERE table_name = 'kalshi_positions'").fetchone()[0] == 0
+    for r in readers:
+        r.close()
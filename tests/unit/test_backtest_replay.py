@@ -0,0 +1,112 @@
+"""Parity tests: columnar backtest replay vs. the row-wise reference."""
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+pytest.importorskip("duckdb")
+
+import prediction_market_backtest as bt
+
+TITLES = [
+    "Will BTC be above $100k on March 1?",
+    "Bitcoin Up or Down - February 17, 8:00AM-12:00PM ET",
+    "Bitcoin price range on Feb 17?",
+    "Will ETH dip to $2,000?",
+    "Will the S&P 500 close above 6000?",
+    "Will Iran strike Israel before April?",
+    "Who will be the next prime minister of Japan?",
+    "Lakers vs Celtics: over 220.5 points",
+    "Will Elon post 300-319 tweets this week?",
+    "Will the Fed cut rates by June 2026?",
+    "Highest temperature in NYC today?",
+    "Will it rain in Seattle?",
+    "Which film wins Best Picture at the Oscars?",
+    "Something nobody can classify",
+]
+CATEGORIES = ["KXEURUSDH", "KXSPOTIFYARTISTD", "KXTEMPD", "KXFED", "KXMISC", ""]
+
+
+@pytest.fixture(scope="module")
+def markets():
+    rng = np.random.default_rng(11)
+    n = 3000
+    close = pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(rng.integers(0, 300 * 86400, n), unit="s")
+    price = rng.integers(10, 96, n).astype(float)
+    price[rng.random(n) < 0.15] = np.nan  # No entry trade in window
+    return pd.DataFrame({
+        "market_id": [f"MKT-{i}" for i in range(n)],
+        "title": rng.choice(TITLES, n),
+        "volume": rng.integers(5_000, 60_000, n),
+        "close_time": close,
+        "price_cents": price,
+        "platform": "kalshi",
+        "category": rng.choice(CATEGORIES, n),
+        "resolved_yes": rng.random(n) < 0.4,
+        "duration_days": rng.uniform(0.5, 120, n),
+    })
+
+
+CONFIGS = {
+    "default": bt.BacktestConfig(),
+    "both_sides": bt.BacktestConfig(no_only=False),
+    "no_kill_rules": bt.BacktestConfig(apply_kill_rules=False),
+    "small_cap_full_kelly": bt.BacktestConfig(kelly_fraction=1.0, max_position_pct=0.5, max_position_dollar=50.0),
+    "blocklist": bt.BacktestConfig(blocked_archetypes=("price_above", "election")),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CONFIGS))
+def test_columnar_matches_row_wise(markets, name):
+    config = CONFIGS[name]
+    expected = bt.simulate_trades(markets, config)
+    actual = bt.simulate_trades_columnar(markets, config)
+
+    assert actual.trades == expected.trades
+    assert actual.killed_trades == expected.killed_trades
+    assert actual.equity_curve == pytest.approx(expected.equity_curve, rel=1e-12)
+    assert actual.max_drawdown == pytest.approx(expected.max_drawdown)
+    assert actual.total_trades == expected.total_trades > 0
+
+
+def test_replay_signals_matches_replay_signal(markets):
+    config = CONFIGS["default"]
+    sig = bt.replay_signals(markets, config)
+    for i in range(0, len(markets), 7):
+        row = markets.iloc[i]
+        if pd.isna(row["price_cents"]):
+            assert sig["action"].iloc[i] == "skip"
+            continue
+        ref = bt.replay_signal(row["title"], int(row["price_cents"]), int(row["volume"]),
+                               float(row["duration_days"]), row["category"], row["platform"], config)
+        got = sig.iloc[i]
+        if ref["action"] == "skip":
+            assert (got["action"], got["reason"]) == ("skip", ref["reason"])
+            continue
+        for key, value in ref.items():
+            assert got[key] == value, (i, key)
+
+
+def test_ruined_bankroll_stops_trading(markets):
+    result = bt.simulate_trades_columnar(markets, replace(CONFIGS["default"], initial_bankroll=0.0))
+    assert result.trades == [] and result.killed_trades == []
+    assert result.equity_curve == [0.0]
+
+
+def test_population_analysis_groups_by_archetype(markets):
+    table = bt.kalshi_population_analysis(markets)
+    assert table["n"].sum() == len(markets)
+    expected = sum(1 for t in markets["title"] if bt.classify_archetype(t) == "price_above")
+    assert table.set_index("archetype").loc["price_above", "n"] == expected
+
+
+def test_duration_buckets_match_at_edges():
+    days = [0.5, 1, 1.01, 3, 7, 14, 30, 90, 90.5, 400]
+    df = pd.DataFrame({"title": "Will the Fed cut rates by June 2026?", "price_cents": 60.0, "duration_days": days})
+    features = bt._signal_features(df)
+    assert features["duration_bucket"].tolist() == [bt.classify_duration(d) for d in days]
@@ -0,0 +1,88 @@
+"""Tests for the parallel backtest parameter sweep."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+pytest.importorskip("duckdb")
+
+import backtest_sweep as sweep
+import prediction_market_backtest as bt
+
+TITLES = [
+    "Will BTC be above $100k on March 1?",
+    "Will the Fed cut rates by June 2026?",
+    "Will Iran strike Israel before April?",
+    "Who will be the next prime minister of Japan?",
+    "Will Elon post 300-319 tweets this week?",
+    "Which team wins the Stanley Cup?",
+]
+
+GRID = {
+    "min_entry_price": [45, 60],
+    "kelly_fraction": [0.1, 0.25],
+    "blocked_archetypes": [[], ["price_above"]],
+}
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(5)
+    n = 1500
+    return bt.prepare_markets(pd.DataFrame({
+        "market_id": [f"MKT-{i}" for i in range(n)],
+        "title": rng.choice(TITLES, n),
+        "volume": rng.integers(5_000, 40_000, n),
+        "close_time": pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(rng.integers(0, 2e7, n), unit="s"),
+        "price_cents": rng.integers(30, 96, n).astype(float),
+        "platform": "kalshi",
+        "category": rng.choice(["KXFED", "KXTEMPD", ""], n),
+        "resolved_yes": rng.random(n) < 0.35,
+        "duration_days": rng.uniform(1, 90, n),
+    }))
+
+
+def test_grid_and_sample():
+    points = sweep.expand_grid(GRID)
+    assert len(points) == 8
+    sample = sweep.sample_grid(GRID, 3, seed=1)
+    assert sample == sweep.sample_grid(GRID, 3, seed=1)
+    assert all(p in points for p in sample)
+    with pytest.raises(ValueError):
+        sweep.make_config({"data_dir": "/tmp"})
+
+
+def test_metrics_match_full_backtest(data):
+    params = {"min_entry_price": 45, "kelly_fraction": 0.25}
+    config = sweep.make_config(params)
+    metrics = sweep.path_metrics(bt.replay_path(data, config), config)
+
+    result = bt.simulate_trades_columnar(data, config)
+    bt.compute_portfolio_metrics(result)
+    assert metrics["trades"] == result.total_trades
+    assert metrics["total_pnl"] == pytest.approx(result.total_pnl, abs=0.01 * result.total_trades)
+    assert metrics["sharpe"] == pytest.approx(result.sharpe, abs=0.01)
+    assert metrics["final_bankroll"] == pytest.approx(result.equity_curve[-1], abs=0.01)
+
+
+def test_parallel_sweep_ranks_and_caches(data, tmp_path):
+    param_sets = sweep.expand_grid(GRID)
+    data_hash = sweep.frame_hash(data)
+
+    table = sweep.run_sweep(data, param_sets, data_hash, workers=2, cache_dir=tmp_path)
+    assert len(table) == 8 and not table["cached"].any()
+    assert list(table["rank"]) == list(range(1, 9))
+    assert table["sharpe"].is_monotonic_decreasing
+
+    serial = sweep.run_sweep(data, param_sets, data_hash, workers=1, cache_dir=None)
+    cols = ["min_entry_price", "kelly_fraction", "blocked_archetypes", "sharpe", "total_return", "trades"]
+    pd.testing.assert_frame_equal(table[cols], serial[cols])
+
+    again = sweep.run_sweep(data, param_sets, data_hash, workers=2, cache_dir=tmp_path, sort="max_drawdown")
+    assert again["cached"].all()
+    assert again["max_drawdown"].is_monotonic_increasing
+    assert len(list((tmp_path / data_hash).glob("*.json"))) == 8
@@ -0,0 +1,117 @@
+"""Tests for the incremental basket arbitrage engine (signals/basket_arb_scanner.py)."""
+import json
+import random
+
+import pytest
+
+from signals import basket_arb_scanner as bas
+from signals.basket_arb_scanner import BasketEngine
+
+
+def _events(n_events, rng, neg_risk_share=0.7):
+    events = []
+    for e in range(n_events):
+        k = rng.randint(1, 8)
+        markets = []
+        for i in range(k):
+            yes = rng.randint(1, 60) / 100 / max(1, k // 3)
+            no = max(0.01, round(1 - yes - rng.choice([0, 0, 0.01, 0.03, -0.01]), 2))
+            markets.append({
+                "conditionId": f"e{e}m{i}", "question": f"Outcome {i} of event {e}",
+                "outcomePrices": json.dumps([str(round(yes, 3)), str(no)]),
+                "volume": str(rng.choice([500, 5000, 50000])),
+                "active": rng.random() > 0.05, "closed": False,
+            })
+        events.append({"id": str(e), "title": f"Event {e}", "negRisk": rng.random() < neg_risk_share,
+                       "volume": rng.choice([5000, 20000, 100000]), "volume24hr": 0, "markets": markets})
+    return events
+
+
+def _full_rescan(events):
+    """What scan_basket_arb computed on every run: every outcome of every event re-summed."""
+    found = {}
+    for event in events:
+        if float(event["volume"]) < bas.MIN_EVENT_VOLUME and float(event["volume24hr"]) < bas.MIN_EVENT_VOLUME:
+            continue
+        active = [m for m in event["markets"] if m["active"] and not m["closed"]]
+        if not bas.MIN_OUTCOMES <= len(active) <= bas.MAX_OUTCOMES:
+            continue
+        prices = [bas._get_outcome_prices(m) for m in active]
+        if event["negRisk"] and all(y is not None and y > 0 for y, _ in prices):
+            total = sum(y for y, _ in prices)
+            net = (1 - total) / total * 100 - bas.POLYMARKET_FEE_PCT
+            if bas.MIN_ARB_EDGE_PCT <= net <= bas.MAX_ARB_EDGE_PCT:
+                found[("basket_arb", event["id"])] = round(net, 2)
+        for m, (y, n) in zip(active, prices):
+            if y is None or n is None or y <= 0 or n <= 0 or y + n >= 1:
+                continue
+            net = (1 - y - n) / (y + n) * 100 - bas.POLYMARKET_FEE_PCT
+            if bas.MIN_ARB_EDGE_PCT <= net <= bas.MAX_ARB_EDGE_PCT and float(m["volume"]) >= bas.MIN_MARKET_LIQUIDITY:
+                found[("yes_no_arb", m["conditionId"])] = round(net, 2)
+    return found
+
+
+def _open(engine):
+    return {(s["type"], s.get("event_id") if s["type"] != "yes_no_arb" else s["condition_id"]): s["net_profit_pct"]
+            for s in engine.signals(ts=0)}
+
+
+def test_engine_matches_full_rescan_across_snapshots():
+    rng = random.Random(2)
+    events = _events(300, rng)
+    engine = BasketEngine()
+    engine.sync_events(events, ts=0)
+    expected = _full_rescan(events)
+    assert expected and _open(engine) == pytest.approx(expected, abs=0.011)
+
+    # Next snapshot: some prices move, one event restructures, one drops out
+    for event in events[:100]:
+        for m in event["markets"]:
+            if rng.random() < 0.3:
+                m["outcomePrices"] = json.dumps([str(rng.randint(1, 40) / 100), str(rng.randint(50, 99) / 100)])
+    events[5]["markets"].append({"conditionId": "new", "question": "New outcome", "outcomePrices": '["0.01", "0.99"]',
+                                 "volume": "9000", "active": True, "closed": False})
+    dropped = events.pop(7)
+    updates = engine.stats["updates"]
+    emitted = engine.sync_events(events, ts=30)
+    assert _open(engine) == pytest.approx(_full_rescan(events), abs=0.011)
+    assert engine.stats["updates"] - updates < sum(len(e["markets"]) for e in events) / 2
+    assert all(e["event_id"] != dropped["id"] or e["kind"] == "arb_close" for e in emitted)
+
+
+def test_replay_emits_only_on_threshold_crossings():
+    engine = BasketEngine()
+    engine.sync_events([{
+        "id": "E", "title": "Who wins?", "negRisk": True, "volume": 50000, "volume24hr": 0,
+        "markets": [{"conditionId": c, "question": c, "outcomePrices": '["0.34", "0.66"]',
+                     "volume": "5000", "active": True, "closed": False} for c in "abc"],
+    }], ts=0)
+    ticks = [
+        {"ts": 1, "event_id": "E", "market_id": "a", "yes": 0.30, "no": 0.70},  # 0.98 total: net 0.04% — below band
+        {"ts": 2, "event_id": "E", "market_id": "b", "yes": 0.31, "no": 0.69},  # 0.95: net 3.26% — opens
+        {"ts": 3, "event_id": "E", "market_id": "c", "yes": 0.32, "no": 0.68},  # still open, no event
+        {"ts": 4, "event_id": "E", "market_id": "a", "yes": 0.40, "no": 0.60},  # 1.03 — closes
+        {"ts": 5, "event_id": "E", "market_id": "x", "yes": 0.01},  # unknown outcome, ignored
+    ]
+    emitted = engine.replay(ticks)
+    assert [(e["kind"], e["type"], e["ts"]) for e in emitted] == [
+        ("arb_open", "basket_arb", 2), ("arb_close", "basket_arb", 4)]
+    assert emitted[0]["signal"]["total_cost"] == 0.95 and emitted[0]["net_profit_pct"] == 3.26
+
+
+def test_compression_held_for_window():
+    engine = BasketEngine(compression_window_min=10)
+    engine.sync_events([{
+        "id": "E", "title": "Crowded", "negRisk": False, "volume": 50000, "volume24hr": 0,
+        "markets": [{"conditionId": f"m{i}", "question": f"m{i}", "outcomePrices": '["0.40", "0.55"]',
+                     "volume": "500", "active": True, "closed": False} for i in range(8)],
+    }], ts=0)
+    kinds = []
+    for i in range(8):  # Spreads collapse one market at a time
+        kinds += [e["kind"] for e in engine.update("E", f"m{i}", yes=0.45, no=0.545, ts=10 + i)]
+    assert kinds == ["compression_start"]
+    assert not engine.compression(ts=100)["should_pause"]
+    assert [e["kind"] for e in engine.update("E", "m0", yes=0.45, ts=15 + 600)] == ["compression_pause"]
+    assert engine.compression(ts=700)["should_pause"]
+    kinds = [e["kind"] for i in range(4) for e in engine.update("E", f"m{i}", no=0.50, ts=800)]
+    assert kinds == ["compression_end"] and not engine.compression(ts=900)["should_pause"]
@@ -0,0 +1,58 @@
+"""Parity tests for the category hierarchy: trie lookup and DuckDB mapping vs. a linear scan."""
+import random
+import re
+
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from src.analysis.kalshi.util.categories import (  # noqa: E402
+    SUBCATEGORY_PATTERNS,
+    get_hierarchy,
+    register_category_map,
+)
+
+
+def _linear(category):
+    """The original lookup: first pattern (in list order) contained in the category."""
+    cat_upper = category.upper()
+    for pattern, group, cat, subcat in SUBCATEGORY_PATTERNS:
+        if pattern in cat_upper:
+            return (group, cat, subcat)
+    return ("Other", "Other", category)
+
+
+def _categories(n=3000, seed=11):
+    rng = random.Random(seed)
+    patterns = [p for p, _, _, _ in SUBCATEGORY_PATTERNS]
+    found = {"", "independent", "ZZZ", "kxnflgame", "KX"}
+    found.update("KX" + p for p in patterns)
+    found.update(p + "25" for p in patterns)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    while len(found) < n:
+        parts = [rng.choice(patterns)[: rng.randint(1, 8)] for _ in range(rng.randint(1, 3))]
+        noise = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+        found.add("KX" * rng.randint(0, 1) + noise.join(parts))
+    return sorted(found)
+
+
+def test_trie_matches_linear_scan():
+    for category in _categories():
+        assert get_hierarchy(category) == _linear(category), category
+
+
+def test_duckdb_category_map_matches_python():
+    tickers = [f"{c}-25JAN01" for c in _categories(1000) if c] + [None, "", "-NOPREFIX", "lower-case"]
+    con = duckdb.connect()
+    con.execute("CREATE TABLE markets (event_ticker VARCHAR)")
+    con.executemany("INSERT INTO markets VALUES (?)", [(t,) for t in tickers])
+    register_category_map(con, source="markets")
+
+    rows = con.execute(
+        "SELECT event_ticker, category, group_name, mid_category, subcategory FROM category_map"
+    ).fetchall()
+    assert len(rows) == len(set(tickers))
+    for ticker, category, *hierarchy in rows:
+        prefix = re.match(r"^([A-Z0-9]+)", ticker or "")
+        assert category == (prefix.group(1) if prefix else "independent")
+        assert tuple(hierarchy) == _linear(category), ticker
@@ -0,0 +1,88 @@
+"""Tests for the correlation constraint graph (odds/constraint_graph.py)."""
+import random
+
+from odds import correlation
+from odds.constraint_graph import ConstraintGraph
+
+SUBJECTS = ["Chiefs", "Eagles", "Lakers", "Celtics", "Yankees", "Trump", "Newsom", "Haley"]
+PHRASES = ["win AFC", "win NFC", "win Super Bowl", "make playoffs", "win division",
+           "win Championship", "win World Series", "win AL", "win primary", "win nomination",
+           "win election", "win Iowa", "win Western Conference", "win NBA Championship"]
+
+
+def _universe(n, rng):
+    markets = []
+    for i in range(n):
+        a, b = rng.sample(SUBJECTS, 2)
+        subject = a if rng.random() < 0.85 else f"{a} and {b}"
+        markets.append({"id": f"m{i}", "title": f"Will {subject} {rng.choice(PHRASES)} in {2025 + i % 3}?",
+                        "yes_price": rng.randint(1, 99) / 100})
+    return markets
+
+
+def _pairwise(markets):
+    """Every pair within each entity group, as detect_constraint_violations used to do."""
+    found = set()
+    for group in correlation.group_markets_by_entity(markets).values():
+        for i, m1 in enumerate(group):
+            for m2 in group[i + 1:]:
+                t1, t2 = m1["title"], m2["title"]
+                if correlation.find_constraint_type(t1, t2) != "subset":
+                    continue
+                (parent, pp), (child, cp) = sorted(
+                    [(t1, m1["yes_price"]), (t2, m2["yes_price"])],
+                    key=lambda x: x[0] != (t1 if correlation._is_broader_outcome(t1, t2) else t2))
+                if cp - pp > 0.01:
+                    found.add((parent, child, round((cp - pp) * 100, 2)))
+    return found
+
+
+def _as_set(pairs):
+    return {(v.parent_market, v.child_market, v.violation) for v in pairs}
+
+
+def test_subset_edges_match_pairwise_scan():
+    rng = random.Random(3)
+    markets = _universe(600, rng)
+    expected = _pairwise(markets)
+    assert expected and _as_set(correlation.detect_constraint_violations(markets)) == expected
+
+    # Incremental: reprice, retitle and drop through one shared graph
+    graph = ConstraintGraph()
+    graph.sync(markets)
+    for m in rng.sample(markets, 60):
+        m["yes_price"] = rng.randint(1, 99) / 100
+    markets[0]["title"] = "Will Chiefs win Super Bowl in 2030?"
+    del markets[10:20]
+    stats = graph.sync(markets)
+    assert stats["added"] == 1 and stats["removed"] == 10 and 0 < stats["repriced"] <= 60
+    assert _as_set(graph.violations()[0]) == _pairwise(markets)
+
+
+def test_threshold_ladder_and_exclusive_sets():
+    markets = [
+        {"id": "b100", "title": "Will Bitcoin be above $100,000 on March 31?", "yes_price": 0.40},
+        {"id": "b110", "title": "Will Bitcoin be above $110,000 on March 31?", "yes_price": 0.55},
+        {"id": "b120", "title": "Will Bitcoin be above 120k on March 31?", "yes_price": 0.20},
+        {"id": "b90", "title": "Will Bitcoin be above $90,000 on March 31?", "yes_price": 0.70},
+        {"id": "t", "title": "Will Trump win the 2028 election?", "yes_price": 0.50},
+        {"id": "n", "title": "Will Newsom win the 2028 election?", "yes_price": 0.45},
+        {"id": "h", "title": "Will Haley win the 2028 election?", "yes_price": 0.12},
+        {"id": "x", "title": "Outcome X", "yes_price": 0.7, "negRisk": True, "negRiskMarketID": "e1"},
+        {"id": "y", "title": "Outcome Y", "yes_price": 0.2, "negRisk": True, "negRiskMarketID": "e1"},
+    ]
+    graph = ConstraintGraph()
+    graph.sync(markets)
+    pairs, sets = graph.violations()
+    assert [(p.parent_price, p.child_price, p.violation) for p in pairs] == [(0.40, 0.55, 15.0)]
+    assert len(sets) == 1 and sets[0].group == "win:2028 election" and sets[0].violation == 7.0
+
+    # Price moves re-check only the touched constraints
+    graph.update_prices({"b110": 0.30, "y": 0.35})
+    pairs, sets = graph.violations()
+    assert pairs == []
+    assert {s.group for s in sets} == {"win:2028 election", "negrisk:e1"}
+
+    result = correlation.scan_correlation_arb(markets, min_violation_pct=3.0, graph=ConstraintGraph())
+    assert result["actionable_violations"] == 2 and len(result["set_violations"]) == 1
+    assert result["constraint_graph"]["ladders"] == 1
@@ -0,0 +1,97 @@
+"""Parity tests for the cross-platform match store (signals/cross_platform_arb.py)."""
+import random
+
+import pytest
+
+from signals import cross_platform_arb as arb
+from signals.cross_platform_arb import MatchStore, find_arb_opportunities
+
+NAMES = ["Trump", "Harris", "Newsom", "Vance", "Bitcoin", "Ethereum", "Ukraine", "Taiwan",
+         "Greenland", "Tesla", "Lakers", "Celtics", "Oscars", "Fed", "Musk", "Iran"]
+TEMPLATES = [
+    "Will {a} win the 2028 presidential election?",
+    "Will {a} be the {b} nominee in 2028?",
+    "Will {a} price be above ${n},000 on March 31?",
+    "Will {a} announce a deal with {b} before July?",
+    "Will a ceasefire between {a} and {b} occur in 2026?",
+    "Who will win the {a} vs {b} game?",
+    "{a} {b} summit happen by December {n}?",
+    "Will {a} reach {n} percent in the {b} poll?",
+]
+
+
+def _markets(prefix, n, rng):
+    out = []
+    for i in range(n):
+        a, b = rng.sample(NAMES, 2)
+        title = rng.choice(TEMPLATES).format(a=a, b=b, n=rng.randint(1, 30))
+        out.append({"id": f"{prefix}{i}", "title": title, "price_yes": rng.randint(5, 95) / 100,
+                    "volume": 50_000, "slug": f"{prefix}{i}"})
+    return out
+
+
+def _reference(kalshi_markets, poly_markets, min_spread=arb.MIN_SPREAD_PCT, min_sim=arb.MIN_SIMILARITY):
+    """The per-scan brute force the store replaces: (kalshi, poly) -> (spread, sim, shared)."""
+    found = {}
+    for km in kalshi_markets:
+        k_tokens = arb._tokenize(km["title"])
+        if len(k_tokens) < 2:
+            continue
+        for pm in poly_markets:
+            p_tokens = arb._tokenize(pm["title"])
+            shared = len(set(k_tokens) & set(p_tokens))
+            if shared < 2:
+                continue
+            sim = arb._cosine_similarity(k_tokens, p_tokens)
+            if sim < min_sim or not arb._subjects_compatible(km["title"], pm["title"], "", ""):
+                continue
+            spread = abs(km["price_yes"] - pm["price_yes"]) * 100
+            if spread >= min_spread:
+                found[(km["id"], pm["id"])] = (round(spread, 1), round(sim, 3), shared)
+    return found
+
+
+def _as_dict(opps):
+    return {(o["kalshi_id"], o["poly_id"]): (o["spread_pp"], o["similarity"], o["shared_tokens"]) for o in opps}
+
+
+@pytest.fixture(autouse=True)
+def _no_truncation(monkeypatch):
+    monkeypatch.setattr(arb, "MAX_RESULTS", 10**6)
+
+
+def test_store_matches_brute_force_across_scans():
+    rng = random.Random(5)
+    kalshi, poly = _markets("K", 300, rng), _markets("P", 300, rng)
+    store = MatchStore()
+
+    expected = _reference(kalshi, poly)
+    assert expected and _as_dict(find_arb_opportunities(kalshi, poly, store=store)) == expected
+    assert store.last_scan["pairs_reused"] == 0
+
+    # Reprice everything, retitle/delist a few, list a few new ones
+    for m in kalshi + poly:
+        m["price_yes"] = rng.randint(5, 95) / 100
+    kalshi[3]["title"] = poly[7]["title"]
+    poly[11]["title"] = kalshi[20]["title"]
+    del kalshi[40:45]
+    poly = poly[:-5] + _markets("PN", 5, rng)
+
+    opps = find_arb_opportunities(kalshi, poly, store=store)
+    assert _as_dict(opps) == _reference(kalshi, poly)
+    scan = store.last_scan
+    assert scan["kalshi_rescored"] == 1 and scan["poly_rescored"] == 6 and scan["markets_dropped"] == 10
+    assert scan["pairs_reused"] > scan["pairs_recomputed"] > 0
+
+
+def test_unchanged_universe_scores_nothing():
+    rng = random.Random(9)
+    kalshi, poly = _markets("K", 100, rng), _markets("P", 100, rng)
+    store = MatchStore()
+    store.sync(kalshi, poly)
+    assert store.sync(kalshi, poly)["pairs_recomputed"] == 0
+
+    # A lower similarity threshold rebuilds the store instead of missing pairs
+    looser = _reference(kalshi, poly, min_spread=0, min_sim=0.3)
+    assert _as_dict(find_arb_opportunities(kalshi, poly, min_spread=0, min_sim=0.3, store=store)) == looser
+    assert store.min_sim == 0.3
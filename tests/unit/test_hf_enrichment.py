@@ -0,0 +1,121 @@
+"""Tests for pipelined Virtuoso enrichment reads (services/hf_enrichment.py) against an in-process memcached."""
+import asyncio
+import json
+
+import services.hf_enrichment as hf_enrichment
+from services.hf_enrichment import GLOBAL_KEYS, SYMBOL_KEYS, VirtuosoEnrichmentReader
+
+
+class FakeMemcached:
+    """In-process memcached speaking the text-protocol read subset (get/gets, multi-key)."""
+
+    def __init__(self, port: int = 0):
+        self.items = {}  # key -> (value bytes, cas)
+        self.commands = []
+        self.port = port
+        self._cas = 0
+        self._server = None
+        self._writers = set()
+
+    def set(self, key: str, value):
+        self._cas += 1
+        self.items[key] = (value if isinstance(value, bytes) else json.dumps(value).encode(), self._cas)
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        for writer in self._writers:  # Server.close() leaves accepted connections open
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while True:
+                command, *keys = (await reader.readuntil(b"\r\n")).decode().split()
+                self.commands.append((command, keys))
+                if command not in ("get", "gets"):
+                    writer.write(b"ERROR\r\n")
+                    continue
+                for key in keys:
+                    if key in self.items:
+                        value, cas = self.items[key]
+                        cas_field = b" %d" % cas if command == "gets" else b""
+                        writer.write(b"VALUE %s 0 %d%s\r\n%s\r\n" % (key.encode(), len(value), cas_field, value))
+                writer.write(b"END\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+async def test_one_pipelined_read_per_cycle_with_cas_versioning():
+    symbols = [f"SYM{i}USDT" for i in range(10)]
+    async with FakeMemcached() as mc:
+        for s in symbols:
+            mc.set(f"confluence:score:{s}", {"score": 60.0})
+            mc.set(f"liquidations:{s}", {"zones": []})
+        mc.set("analysis:market_regime", b"bullish")
+        mc.set("analysis:signals", {"signals": []})
+        reader = VirtuosoEnrichmentReader(port=mc.port)
+
+        first = await reader.read_enrichment_many(symbols)
+        assert len(mc.commands) == 1 and len(mc.commands[0][1]) == len(symbols) * len(SYMBOL_KEYS) + len(GLOBAL_KEYS)
+        btc, changed = first["SYM0USDT"]
+        assert btc["analysis:market_regime"] == "bullish" and btc["confluence:score:SYM0USDT"] == {"score": 60.0}
+        assert len(changed) == len(SYMBOL_KEYS) + len(GLOBAL_KEYS)  # First read: everything, incl. missing keys
+        assert btc["_meta"]["keys_found"] == 4 and btc["_meta"]["fields"]["market:overview"]["found"] is False
+        decodes = reader.stats["decodes"]
+        assert decodes == 2 * len(symbols) + 2
+
+        again = await reader.read_enrichment_many(symbols)
+        assert all(changed == [] for _, changed in again.values())
+        assert reader.stats["decodes"] == decodes and reader.stats["cas_hits"] == decodes  # Same CAS: no decode
+
+        mc.set("analysis:signals", {"signals": []})  # Rewrite, same content: fresher but not changed
+        mc.set("confluence:score:SYM3USDT", {"score": 75.0})
+        third = await reader.read_enrichment_many(symbols)
+        assert third["SYM3USDT"][1] == ["confluence:score:SYM3USDT"] and third["SYM0USDT"][1] == []
+        assert third["SYM3USDT"][0]["confluence:score:SYM3USDT"] == {"score": 75.0}
+        assert reader.stats["decodes"] == decodes + 1
+
+        # Single-symbol reads keep per-symbol change tracking for shared global keys
+        mc.set("analysis:market_regime", b"sideways")
+        assert (await reader.read_enrichment_changes("SYM1USDT"))[1] == ["analysis:market_regime"]
+        assert (await reader.read_enrichment_changes("SYM2USDT"))[1] == ["analysis:market_regime"]
+        assert reader.snapshot()["memcached"]["connects"] == 1
+        await reader.close()
+
+
+async def test_staleness_metadata_and_read_errors_keep_last_values(monkeypatch):
+    monkeypatch.setattr(hf_enrichment, "STALE_AFTER_SECONDS", 0.05)
+    async with FakeMemcached() as mc:
+        mc.set("confluence:score:BTCUSDT", {"score": 55.0})
+        mc.set("analysis:market_regime", b"bearish")
+        port = mc.port
+        reader = VirtuosoEnrichmentReader(port=port)
+        assert (await reader.read_enrichment("BTCUSDT"))["_meta"]["stale_keys"] == []
+
+        await asyncio.sleep(0.1)
+        mc.set("analysis:market_regime", b"bearish")  # Writer still alive for this key only
+        meta = (await reader.read_enrichment("BTCUSDT"))["_meta"]
+        assert meta["stale_keys"] == ["confluence:score:BTCUSDT"]
+        assert meta["fields"]["analysis:market_regime"]["age_s"] < 0.05
+
+    enrichment, changed = await reader.read_enrichment_changes("BTCUSDT")  # memcached gone
+    assert changed == [] and enrichment["_meta"]["read_error"]
+    assert enrichment["confluence:score:BTCUSDT"] == {"score": 55.0}
+
+    async with FakeMemcached(port) as mc:  # Back up: reconnects, fresh data counts as changed
+        mc.set("confluence:score:BTCUSDT", {"score": 58.0})
+        enrichment, changed = await reader.read_enrichment_changes("BTCUSDT")
+        assert enrichment["_meta"]["read_error"] is None and "confluence:score:BTCUSDT" in changed
+        assert enrichment["analysis:market_regime"] is None  # Key gone after the restart
+        assert reader.stats["failed_reads"] == 1 and reader.snapshot()["memcached"]["connects"] == 2
+        await reader.close()
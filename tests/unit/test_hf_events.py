@@ -0,0 +1,79 @@
+"""Tests for event-driven trigger scheduling (services/hf_events.py, IncrementalEdgeEvaluator)."""
+import asyncio
+from dataclasses import asdict
+
+from services.hf_events import HEARTBEAT_INPUTS, TriggerScheduler, enrichment_inputs
+from services.hf_triggers import DETECTOR_INPUTS, IncrementalEdgeEvaluator
+
+
+async def test_scheduler_coalesces_events_and_records_latency():
+    scheduler = TriggerScheduler(["BTCUSDT"], price_tick_pct=0.01, coalesce_seconds=0.01, heartbeat_seconds=60)
+    [first] = await scheduler.wait()  # Never evaluated -> immediate heartbeat
+    assert (first.source, first.inputs) == ("heartbeat", HEARTBEAT_INPUTS)
+
+    assert scheduler.notify_price("BTCUSDT", 65000.0)
+    assert not scheduler.notify_price("BTCUSDT", 65003.0)   # 0.005% move: below the tick threshold
+    assert not scheduler.notify_price("ETHUSDT", 3400.0)    # Not a trigger symbol
+    changed = ["orderbook:BTCUSDT:snapshot", "analysis:market_regime", "liquidations:ETHUSDT"]
+    assert enrichment_inputs(changed, "BTCUSDT") == {"orderbook", "gates"}
+    scheduler.notify("BTCUSDT", enrichment_inputs(changed, "BTCUSDT"), "enrichment")
+
+    [batch] = await scheduler.wait()
+    assert batch.symbol == "BTCUSDT" and batch.source == "price" and batch.events == 2
+    assert batch.inputs == {"price", "orderbook", "gates"}
+    assert scheduler.record(batch) >= 0.01  # Includes the coalescing window
+    snap = scheduler.snapshot()
+    assert snap["stats"]["price_ticks_ignored"] == 1 and snap["stats"]["coalesced"] == 1
+    assert snap["tick_to_signal"]["price"]["count"] == snap["tick_to_signal"]["all"]["count"] == 1
+    assert snap["pending"] == {}
+
+
+async def test_quiet_symbol_gets_heartbeat():
+    scheduler = TriggerScheduler(["BTCUSDT"], coalesce_seconds=0, heartbeat_seconds=0.05)
+    scheduler.drain()
+    scheduler.notify("BTCUSDT", ("oracle",), "oracle")
+    assert [b.source for b in await scheduler.wait()] == ["oracle"]
+
+    started = asyncio.get_running_loop().time()
+    [batch] = await asyncio.wait_for(scheduler.wait(), timeout=1)
+    assert batch.source == "heartbeat" and batch.inputs == HEARTBEAT_INPUTS
+    assert asyncio.get_running_loop().time() - started >= 0.04
+
+
+def test_incremental_evaluator_reruns_only_dirty_detectors():
+    from services.hf_triggers import evaluate_edge
+    from services.hf_velocity import SymbolVelocityTrackers
+
+    enrichment = {
+        "analysis:market_regime": "bullish",
+        "confluence:score:BTCUSDT": 72.5,
+        "confluence:breakdown:BTCUSDT": {"orderflow": {"cvd": 1500}, "position": {"long_ratio": 0.62}},
+        "liquidations:BTCUSDT": {"zones": [{"price": 68500, "size": 52_000_000}]},
+        "orderbook:BTCUSDT:snapshot": {"bid_depth": 15_000_000, "ask_depth": 4_000_000},
+        "analysis:signals": {"signals": [{"symbol": "BTCUSDT", "funding_rate": -0.015}]},
+    }
+    fast = {"symbol": "BTCUSDT", "binance_price": 68350, "price_change_3m_pct": 0.0}
+    trackers = SymbolVelocityTrackers().trackers("BTCUSDT")
+    evaluator = IncrementalEdgeEvaluator()
+
+    def same(a, b):
+        a, b = asdict(a), asdict(b)
+        a.pop("timestamp"), b.pop("timestamp")
+        return a == b
+
+    for step in range(12):
+        inputs = {"price"}
+        trackers["liquidation"].update_price(68200 + 30 * step, ts=1000.0 + step)
+        if step % 3 == 0:
+            trackers["imbalance"].update(15e6 + step * 5e5, 4e6, ts=1000.0 + step)
+            inputs.add("orderbook")
+        if step == 6:
+            enrichment["analysis:signals"] = {"signals": [{"symbol": "BTCUSDT", "funding_rate": 0.02}]}
+            inputs.add("signals")
+        evaluator.mark_dirty(inputs)
+        expected_dirty = [n for n, deps in DETECTOR_INPUTS.items() if deps & inputs] if step else list(DETECTOR_INPUTS)
+        assert evaluator.dirty == expected_dirty
+        assert same(evaluator.evaluate(enrichment, fast, trackers), evaluate_edge(enrichment, fast, trackers))
+
+    assert evaluator.stats["detector_skips"] > 0
+    assert evaluator.stats["detector_runs"] + evaluator.stats["detector_skips"] == 12 * len(DETECTOR_INPUTS)
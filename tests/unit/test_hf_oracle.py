@@ -0,0 +1,111 @@
+"""Tests for the batched, hedged Chainlink poller (services/hf_oracle.py) against local fake JSON-RPC servers."""
+import asyncio
+import json
+import time
+
+import pytest
+
+from services.hf_oracle import MAX_CONSECUTIVE_ERRORS, ChainlinkBatchPoller, decode_latest_round
+
+FEEDS = {"BTC": "0xc907E116054Ad103354f2D350FD2514433D57F6f", "ETH": "0xF9680D99D6C9589e2a93a78A04A279e509205945"}
+
+
+def _round_data(round_id: int, answer: int, updated_at: int) -> str:
+    words = [round_id, answer % (1 << 256), updated_at - 2, updated_at, round_id]
+    return "0x" + "".join(f"{w:064x}" for w in words)
+
+
+class FakeRpc:
+    """Minimal keep-alive HTTP/1.1 JSON-RPC server answering latestRoundData calls and batches."""
+
+    def __init__(self, rounds: dict, delay: float = 0.0, error: str = None):
+        self.rounds = rounds  # contract -> (round_id, answer, updated_at)
+        self.delay = delay
+        self.error = error
+        self.requests = []
+        self.url = None
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = "http://127.0.0.1:%d" % self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _answer(self, batch):
+        if self.error:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32005, "message": self.error}}
+        if isinstance(batch, dict):  # Single eth_call
+            return self._answer([batch])[0]
+        return [{"jsonrpc": "2.0", "id": call["id"], "result": _round_data(*self.rounds[call["params"][0]["to"]])}
+                for call in batch]
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                              if line.lower().startswith(b"content-length"))
+                batch = json.loads(await reader.readexactly(length))
+                self.requests.append(batch)
+                await asyncio.sleep(self.delay)
+                body = json.dumps(self._answer(batch)).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def test_decode_latest_round_handles_negative_answers():
+    r = decode_latest_round(_round_data(7, -12_345_000_000, 1_700_000_000))
+    assert r == {"round_id": 7, "price": -123.45, "updated_at": 1_700_000_000}
+
+
+async def test_one_batch_per_poll_and_round_change_detection():
+    rounds = {FEEDS["BTC"]: (100, 6_500_012_345_678, 1_700_000_000), FEEDS["ETH"]: (50, 340_000_000_000, 1_700_000_001)}
+    async with FakeRpc(rounds) as rpc:
+        poller = ChainlinkBatchPoller(FEEDS, [rpc.url])
+        first = await poller.poll()
+        assert first["BTC"]["price"] == pytest.approx(65000.12345678) and first["ETH"]["updated_at"] == 1_700_000_001
+        assert first["BTC"]["changed"] and first["ETH"]["changed"]
+
+        assert not any(r["changed"] for r in (await poller.poll()).values())
+        rounds[FEEDS["BTC"]] = (101, 6_510_000_000_000, 1_700_000_030)
+        third = await poller.poll()
+        assert third["BTC"]["changed"] and not third["ETH"]["changed"] and third["BTC"]["price"] == 65100.0
+        await poller.close()
+
+    assert len(rpc.requests) == 3 and all(len(batch) == 2 for batch in rpc.requests)
+    assert poller.stats == {"polls": 3, "failed_polls": 0, "hedged_polls": 0, "new_rounds": 3, "unchanged": 3}
+    assert poller.snapshot()["rpcs"][rpc.url]["wins"] == 3
+
+
+async def test_hedges_slow_rpc_and_fails_over_on_errors():
+    rounds = {FEEDS["BTC"]: (1, 6_500_000_000_000, 1_700_000_000), FEEDS["ETH"]: (1, 340_000_000_000, 1_700_000_000)}
+    async with FakeRpc(rounds, delay=2.0) as slow, FakeRpc(rounds) as fast, FakeRpc(rounds, error="quota") as broken:
+        poller = ChainlinkBatchPoller(FEEDS, [slow.url, fast.url], hedge_delay=0.05)
+        started = time.perf_counter()
+        assert (await poller.poll())["BTC"]["price"] == 65000.0
+        assert time.perf_counter() - started < 1.0  # Didn't wait for the slow primary
+        s, f = poller.rpc_stats[slow.url], poller.rpc_stats[fast.url]
+        assert (s.cancelled, f.hedges, f.wins, poller.stats["hedged_polls"]) == (1, 1, 1, 1)
+        assert poller.ranked_rpcs() == [fast.url, slow.url]  # The losing leg's time counts against it
+        await poller.close()
+
+        poller = ChainlinkBatchPoller(FEEDS, [broken.url, fast.url], hedge_delay=1.0)
+        for _ in range(MAX_CONSECUTIVE_ERRORS):
+            started = time.perf_counter()
+            assert (await poller.poll())["ETH"]["price"] == 3400.0
+            assert time.perf_counter() - started < 0.5  # Error fails over immediately, not after the hedge delay
+        b = poller.rpc_stats[broken.url]
+        assert b.consecutive_errors == MAX_CONSECUTIVE_ERRORS and "quota" in b.last_error
+        assert poller.ranked_rpcs() == [fast.url, broken.url]
+        await poller.poll()
+        assert len(fast.requests) == 1 + MAX_CONSECUTIVE_ERRORS + 1 and len(broken.requests) == MAX_CONSECUTIVE_ERRORS
+        await poller.close()
@@ -0,0 +1,86 @@
+"""Tests for the HF engine status server (services/hf_server.py)."""
+import asyncio
+import json
+import socket
+
+import httpx
+import websockets
+
+from services.hf_server import StateHub, create_app, make_server
+
+
+def test_views_rebuild_only_when_touched():
+    hub = StateHub()
+    state = {"price": 65000.0, "builds": 0}
+
+    def build():
+        state["builds"] += 1
+        return {"price": state["price"]}
+
+    hub.register("state", build)
+    first = hub.snapshot("state")
+    assert hub.snapshot("state") is first and state["builds"] == 1
+
+    hub.touch("state")  # Touched, content unchanged: rebuilt, same ETag
+    again = hub.snapshot("state")
+    assert state["builds"] == 2 and again.etag == first.etag
+    state["price"] = 65010.0
+    hub.touch("state")
+    assert json.loads(hub.snapshot("state").body) == {"price": 65010.0} and hub.snapshot("state").etag != first.etag
+    assert hub.stats["snapshot_builds"] == 3 and hub.stats["snapshot_hits"] == 2
+
+
+async def test_publish_filters_replays_and_drops_slow_subscribers():
+    hub = StateHub(history=3, queue_size=2)
+    edges = hub.subscribe(kinds=["edge"])
+    slow = hub.subscribe()
+    ids = [hub.publish("divergence", {"n": 1}), hub.publish("edge", {"n": 2})]
+    assert [e.id for e in (edges.queue.get_nowait(),)] == [ids[1]] and edges.queue.empty()
+
+    hub.publish("divergence", {"n": 3})  # Third undelivered event overflows the slow subscriber
+    assert slow.dropped and hub.subscriber_count == 1 and hub.stats["subscribers_dropped"] == 1
+
+    resumed = hub.subscribe(last_event_id=ids[0])  # History keeps the last 3 events
+    replayed = [resumed.queue.get_nowait() for _ in range(2)]
+    assert [e.id for e in replayed] == [2, 3]
+    assert replayed[0].sse == b'id: 2\nevent: edge\ndata: {"n": 2}\n\n'
+    assert json.loads(replayed[1].text) == {"id": 3, "event": "divergence", "data": {"n": 3}}
+
+
+async def test_server_keepalive_304_sse_and_websocket():
+    hub = StateHub()
+    hub.register("state", lambda: {"prices": {"BTC": 65000.0}})
+    server = make_server(create_app(hub))
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)  # proto set: asyncio enables TCP_NODELAY
+    sock.bind(("127.0.0.1", 0))
+    base = "http://127.0.0.1:%d" % sock.getsockname()[1]
+    task = asyncio.ensure_future(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        async with httpx.AsyncClient(base_url=base) as client:
+            first = await client.get("/state")
+            second = await client.get("/state", headers={"If-None-Match": first.headers["etag"]})
+            assert first.json() == {"prices": {"BTC": 65000.0}} and second.status_code == 304
+            assert len(server.server_state.connections) == 1  # Both requests on one keep-alive connection
+            assert "/ws" in (await client.get("/")).json()["endpoints"]
+
+            async with websockets.connect(base.replace("http", "ws") + "/ws?events=edge") as ws:
+                while hub.subscriber_count < 1:
+                    await asyncio.sleep(0.01)
+                hub.publish("divergence", {"asset": "BTC"})
+                hub.publish("edge", {"action": "TRADE"})
+                assert json.loads(await asyncio.wait_for(ws.recv(), 2)) == {
+                    "id": 2, "event": "edge", "data": {"action": "TRADE"}}
+
+            async with client.stream("GET", "/stream", headers={"Last-Event-ID": "0"}) as resp:
+                assert resp.headers["content-type"].startswith("text/event-stream")
+                lines = []
+                async for line in resp.aiter_lines():
+                    lines.append(line)
+                    if line.startswith("data:") and "TRADE" in line:
+                        break
+            assert "event: divergence" in lines and "id: 2" in lines
+    finally:
+        server.should_exit = True
+        await asyncio.wait_for(task, 5)
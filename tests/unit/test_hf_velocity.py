@@ -0,0 +1,84 @@
+"""Tests for the ring-buffer velocity trackers (services/hf_velocity.py)."""
+import random
+from collections import deque
+
+import numpy as np
+import pytest
+
+from services.hf_velocity import (
+    CVDAccelerationTracker,
+    ImbalanceVelocityTracker,
+    LiquidationProximityTracker,
+    SymbolVelocityTrackers,
+)
+
+
+def _rate(window, back):
+    """Finite difference the deque-based trackers computed."""
+    if len(window) < back + 1:
+        return 0.0
+    (t1, v1), (t0, v0) = window[-1], window[-1 - back]
+    return (v1 - v0) / (t1 - t0) if t1 > t0 else 0.0
+
+
+def _acceleration(window):
+    if len(window) < 3:
+        return 0.0
+    (t0, v0), (t1, v1), (t2, v2) = list(window)[-3:]
+    if t2 <= t1 or t1 <= t0:
+        return 0.0
+    return ((v2 - v1) / (t2 - t1) - (v1 - v0) / (t1 - t0)) / ((t2 - t0) / 2)
+
+
+def _stream(rng, n, start=1.7e9):
+    t = start
+    for _ in range(n):
+        t += rng.choice([0.0, 0.5, 1.0, 1.0, 15.0])  # Includes duplicate timestamps
+        yield t, 65000 + rng.gauss(0, 200)
+
+
+def test_trackers_match_window_reference():
+    rng = random.Random(8)
+    imb, cvd, liq = ImbalanceVelocityTracker(12), CVDAccelerationTracker(12), LiquidationProximityTracker(30)
+    imb_ref, cvd_ref, liq_ref = deque(maxlen=12), deque(maxlen=12), deque(maxlen=30)
+    for i, (t, price) in enumerate(_stream(rng, 5000)):
+        bid, ask = rng.uniform(1e6, 2e7), rng.uniform(1e6, 2e7)
+        imb.update(bid, ask, ts=t)
+        imb_ref.append((t, bid / ask))
+        cvd.update(price * 10, ts=t)
+        cvd_ref.append((t, price * 10))
+        liq.update_price(price, ts=t)
+        liq_ref.append((t, price))
+        if i % 7:
+            continue
+        assert imb.velocity == pytest.approx(_rate(imb_ref, 2), rel=1e-9, abs=1e-12)
+        assert cvd.velocity == pytest.approx(_rate(cvd_ref, 1), rel=1e-9, abs=1e-9)
+        assert cvd.acceleration == pytest.approx(_acceleration(cvd_ref), rel=1e-9, abs=1e-9)
+        assert liq.velocity_toward(price + 100) == pytest.approx(_rate(liq_ref, 4), rel=1e-9, abs=1e-9)
+        assert (imb.current_ratio, liq.samples) == (imb_ref[-1][1], len(liq_ref))
+
+        # O(1) running-sum slope vs a least-squares fit of the window, after many wraps
+        ts, vs = np.array(liq_ref).T
+        if len(set(ts)) > 1:
+            assert liq.slope == pytest.approx(np.polyfit(ts - ts[0], vs, 1)[0], rel=1e-6, abs=1e-6)
+
+
+def test_snapshot_matches_per_symbol_trackers():
+    rng = random.Random(2)
+    bank = SymbolVelocityTrackers(capacity=4)  # Forces row growth
+    symbols = [f"S{i}USDT" for i in range(40)]
+    for step, (t, price) in enumerate(_stream(rng, 4000)):
+        symbol = symbols[min(int(rng.expovariate(0.15)), len(symbols) - 1)]  # Uneven sample counts
+        trackers = bank.trackers(symbol)
+        trackers["imbalance"].update(rng.uniform(1, 5), rng.uniform(1, 5), ts=t)
+        trackers["cvd"].update(price + step, ts=t)
+        trackers["liquidation"].update_price(price, ts=t)
+
+    snapshot = bank.snapshot()
+    assert len(snapshot) == len(bank) and any(bank.trackers(s)["cvd"].samples < 3 for s in snapshot)
+    for symbol, row in snapshot.items():
+        imb, cvd, liq = (bank.trackers(symbol)[k] for k in ("imbalance", "cvd", "liquidation"))
+        assert row["imbalance_ratio"] == imb.current_ratio and row["imbalance_velocity"] == pytest.approx(imb.velocity)
+        assert row["cvd_acceleration"] == pytest.approx(cvd.acceleration)
+        assert row["cvd_velocity"] == pytest.approx(cvd.velocity) and row["cvd_slope"] == pytest.approx(cvd.slope)
+        assert row["price_velocity"] == pytest.approx(liq.velocity_toward(liq.current_price + 1))
@@ -0,0 +1,143 @@
+"""Tests for incremental IC / calibration stats (prediction_stats)."""
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
+
+import calibrator
+import ic_tracker
+
+
+def _seed(db, n=200, seed=7, days=60):
+    """Insert n resolved predictions spread over `days`, with tied confidences."""
+    rng = random.Random(seed)
+    now = time.time()
+    conn = sqlite3.connect(db)
+    for i in range(n):
+        conf = rng.choice([55, 60, 65, 70, 75, 80, 85])
+        conn.execute(
+            "INSERT INTO signal_predictions (timestamp, source, market_id, confidence) VALUES (?, ?, ?, ?)",
+            (now - rng.uniform(0, days) * 86400, rng.choice(["a", "b"]), f"m{i}", conf),
+        )
+    conn.commit()
+    rows = conn.execute("SELECT market_id, confidence FROM signal_predictions").fetchall()
+    conn.close()
+    for market_id, conf in rows:
+        ic_tracker.resolve_prediction(market_id, 1.0 if rng.random() < conf / 100 else 0.0, db)
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "ic.db")
+    ic_tracker.init_ic_tables(path)
+    return path
+
+
+def test_incremental_matches_full_recompute(db):
+    _seed(db)
+    result = ic_tracker.verify_prediction_stats(window_days=30, db_path=db)
+    assert result["ok"], result
+    for src in ("a", "b"):
+        stats = result["sources"][src]
+        assert stats["ic_full"] is not None
+        assert stats["ic_incremental"] == pytest.approx(stats["ic_full"], abs=1e-9)
+
+
+def test_spearman_from_counts_matches_expanded():
+    counts = {(60.0, 1.0): 3, (60.0, 0.0): 2, (70.0, 1.0): 4, (80.0, 0.0): 1, (80.0, 1.0): 5}
+    xs, ys = [], []
+    for (x, y), n in counts.items():
+        xs += [x] * n
+        ys += [y] * n
+    assert ic_tracker._spearman_from_counts(counts) == pytest.approx(
+        ic_tracker._spearman_rank_correlation(xs, ys), abs=1e-12)
+    assert ic_tracker._spearman_from_counts({(60.0, 1.0): 10}) == 0.0
+
+
+def test_existing_db_is_backfilled(tmp_path):
+    path = str(tmp_path / "old.db")
+    ic_tracker.init_ic_tables(path)
+    _seed(path, n=40)
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE prediction_stats")
+    conn.commit()
+    conn.close()
+
+    ic_tracker.init_ic_tables(path)
+    assert ic_tracker.verify_prediction_stats(db_path=path)["ok"]
+    assert ic_tracker.rebuild_prediction_stats(path)["resolved_predictions"] == 40
+
+
+def test_recreated_db_gets_tables_again(tmp_path):
+    path = tmp_path / "ic.db"
+    ic_tracker.init_ic_tables(str(path))
+    calibrator.init_calibration_tables(str(path))
+    for f in tmp_path.iterdir():  # DB plus its WAL/SHM files
+        f.unlink()
+
+    ic_tracker.init_ic_tables(str(path))  # Same path, same process: must not be skipped
+    _seed(str(path), n=20)
+    assert ic_tracker.verify_prediction_stats(db_path=str(path))["ok"]
+    assert calibrator.build_calibration_curve("a", db_path=str(path))["sample_size"] > 0
+
+
+def test_calibrator_imports_as_package_module(db):
+    _seed(db, n=40)
+    code = f"import signals.calibrator as c; print(c.build_calibration_curve('a', db_path={db!r})['sample_size'])"
+    root = Path(__file__).parent.parent.parent
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout) > 0
+
+
+def test_calibration_curve_and_cache(db):
+    _seed(db, n=300)
+    curve = calibrator.build_calibration_curve("a", db_path=db)
+    assert curve["status"] == "calibrated"
+    assert sum(b["sample_size"] for b in curve["bins"]) <= curve["sample_size"]
+
+    first = calibrator.calibrate_confidence("a", 70, db_path=db)
+    assert db in calibrator._curve_cache
+
+    # Rebuilding drops the cache; a fresh bin is picked up on the next lookup
+    conn = sqlite3.connect(db)
+    conn.execute("DELETE FROM calibration_curves")
+    conn.commit()
+    conn.close()
+    assert calibrator.calibrate_confidence("a", 70, db_path=db) == first  # Still cached
+    calibrator.build_calibration_curve("b", db_path=db)
+    assert db not in calibrator._curve_cache
+    assert calibrator.calibrate_confidence("a", 70, db_path=db) == 70  # "a" bins deleted above
+
+
+def test_calibrator_keeps_history_archived_by_retention(db):
+    _seed(db, n=300)
+    before = (
+        calibrator.get_signal_decay("a", db_path=db),
+        calibrator.full_calibration_report(db_path=db),
+    )
+    assert before[0]["status"] == "computed"
+    assert before[1]["total_resolved"] == 300
+
+    # What services/retention.py does to resolved rows past the hot window
+    conn = sqlite3.connect(db)
+    purged = conn.execute("DELETE FROM signal_predictions WHERE resolved = 1 AND timestamp < ?",
+                          (time.time() - 45 * 86400,)).rowcount
+    conn.commit()
+    conn.close()
+    assert purged > 0
+
+    after = (
+        calibrator.get_signal_decay("a", db_path=db),
+        calibrator.full_calibration_report(db_path=db),
+    )
+    assert after[0] == before[0]
+    for key in ("total_resolved", "total_unresolved", "per_source"):
+        assert after[1][key] == before[1][key]
+    assert after[1]["source_weights"]["weights"] == before[1]["source_weights"]["weights"]
@@ -0,0 +1,174 @@
+"""Tests for the shared Kalshi market store (odds/kalshi_market_store.py)."""
+import threading
+import time
+from datetime import datetime, timezone
+
+import odds.kalshi_market_store as kalshi_market_store
+from odds.kalshi_market_store import KalshiMarketStore, get_market_store
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class FakeKalshi:
+    """In-memory /markets and /events with Kalshi's filters and offset cursors."""
+
+    def __init__(self, n=2500, updated_since=True):
+        now = time.time()
+        self.updated_since = updated_since
+        self.fail_cursor_pages = 0  # Fail this many follow-up (cursor) /markets pages
+        self.calls = []
+        self.lock = threading.Lock()
+        self.markets = {}
+        for i in range(n):
+            self.markets[f"M{i}"] = {
+                "ticker": f"M{i}",
+                "event_ticker": f"EV{i // 10}",
+                "status": "active",
+                "close_time": _iso(now + (i % 400) * 86400 + 3600),
+                "yes_ask": i % 100,
+                "_updated": now - 3600,
+            }
+        self.events = {
+            f"EV{j}": {"event_ticker": f"EV{j}", "series_ticker": f"SER{j % 7}", "category": f"Cat{j % 3}"}
+            for j in range(n // 10)
+        }
+
+    def update(self, ticker, **fields):
+        self.markets[ticker].update(fields, _updated=time.time())
+
+    def __call__(self, path, params):
+        with self.lock:
+            self.calls.append((path, dict(params)))
+        if path.startswith("/events/"):
+            event = self.events.get(path.rsplit("/", 1)[1])
+            return {"event": event} if event else None
+        if path == "/events":
+            items, key = list(self.events.values()), "events"
+        else:
+            key = "markets"
+            if "min_updated_ts" in params:
+                if not self.updated_since:
+                    return None
+                items = [m for m in self.markets.values() if m["_updated"] >= params["min_updated_ts"]]
+            else:
+                items = [m for m in self.markets.values() if self._match(m, params)]
+        if path == "/markets" and params.get("cursor") and self.fail_cursor_pages:
+            self.fail_cursor_pages -= 1
+            return None
+        start = int(params.get("cursor") or 0)
+        batch = items[start:start + params["limit"]]
+        end = start + len(batch)
+        return {key: [{k: v for k, v in m.items() if k != "_updated"} for m in batch],
+                "cursor": str(end) if end < len(items) else ""}
+
+    def _match(self, m, params):
+        close = datetime.fromisoformat(m["close_time"].replace("Z", "+00:00")).timestamp()
+        if params.get("status") == "open" and m["status"] != "active":
+            return False
+        if "series_ticker" in params and self.events[m["event_ticker"]]["series_ticker"] != params["series_ticker"]:
+            return False
+        if "min_close_ts" in params and close < params["min_close_ts"]:
+            return False
+        if "max_close_ts" in params and close > params["max_close_ts"]:
+            return False
+        return True
+
+
+def test_full_sync_covers_universe_once():
+    api = FakeKalshi()
+    store = KalshiMarketStore(get_json=api, refresh_interval=60)
+    markets = store.markets()
+    assert sorted(m["ticker"] for m in markets) == sorted(api.markets)
+    assert {m["_event_category"] for m in markets} == {"Cat0", "Cat1", "Cat2"}
+    assert store.stats["full_syncs"] == 1
+
+    # Fresh store serves views without hitting the API again
+    calls = len(api.calls)
+    assert len(store.markets(series_ticker="SER3")) == sum(
+        1 for m in api.markets.values() if api.events[m["event_ticker"]]["series_ticker"] == "SER3")
+    assert store.markets(event_ticker="EV4", fields=("ticker", "yes_ask"))[0].keys() == {"ticker", "yes_ask"}
+    assert len(api.calls) == calls
+
+
+def test_incremental_refresh_upserts_and_drops():
+    api = FakeKalshi()
+    store = KalshiMarketStore(get_json=api, refresh_interval=0)
+    store.full_sync()
+    api.update("M1", yes_ask=77)
+    api.update("M2", status="closed")
+    calls = len(api.calls)
+
+    report = store.refresh()
+    assert report["ok"] and report["upserted"] == 1 and report["removed"] == 1
+    assert len(api.calls) == calls + 1  # One min_updated_ts page
+    by_ticker = {m["ticker"]: m for m in store.markets()}
+    assert by_ticker["M1"]["yes_ask"] == 77 and "M2" not in by_ticker
+
+    # Views are copies
+    by_ticker["M1"]["yes_ask"] = -1
+    assert store.markets(event_ticker="EV0", predicate=lambda m: m["ticker"] == "M1")[0]["yes_ask"] == 77
+
+
+def test_refresh_falls_back_to_near_term_windows():
+    api = FakeKalshi(updated_since=False)
+    store = KalshiMarketStore(get_json=api, refresh_interval=0)
+    store.full_sync()
+    api.update("M0", yes_ask=55)  # Closes within the hour
+    assert store.refresh()["ok"]
+    assert {m["ticker"]: m for m in store.markets()}["M0"]["yes_ask"] == 55
+    paged = [p for path, p in api.calls[-5:] if path == "/markets" and "max_close_ts" in p]
+    assert paged and all(p["max_close_ts"] <= time.time() + 8 * 86400 for p in paged)
+
+    # Closed inside the re-paged windows: absent from the results, so dropped
+    api.update("M1", status="closed")
+    report = store.refresh()
+    assert report["removed"] == 1 and "M1" not in {m["ticker"] for m in store.markets()}
+
+
+def test_past_close_open_markets_kept_by_both_paths():
+    api = FakeKalshi(n=50)
+    api.update("M0", close_time=_iso(time.time() - 600))  # Past close, not yet settled
+    for updated_since in (True, False):
+        api.updated_since = updated_since
+        store = KalshiMarketStore(get_json=api, refresh_interval=0)
+        store.full_sync()
+        assert "M0" in {m["ticker"] for m in store.markets()}
+        api.update("M0", yes_ask=99)
+        assert store.refresh()["removed"] == 0
+        assert {m["ticker"]: m for m in store.markets()}["M0"]["yes_ask"] == 99
+
+
+def test_mid_cursor_failure_keeps_the_universe(monkeypatch):
+    api = FakeKalshi()
+    store = KalshiMarketStore(get_json=api, refresh_interval=0)
+    store.full_sync()
+    api.fail_cursor_pages = 1  # Page 2 of the 90-365 day window
+    assert store.full_sync() == {"ok": False}
+    assert len(store) == len(api.markets)
+
+    # Window fallback with small pages, so near-term windows span several cursors
+    monkeypatch.setattr(kalshi_market_store, "MARKETS_PAGE_LIMIT", 10)
+    api.updated_since = False
+    api.fail_cursor_pages = 1
+    assert store.refresh() == {"ok": False}
+    assert len(store) == len(api.markets)
+    report = store.refresh()
+    assert report["ok"] and report["removed"] == 0 and len(store) == len(api.markets)
+
+
+def test_stores_keyed_by_config():
+    headers = lambda: {"Accept": "application/json"}  # noqa: E731
+    assert get_market_store(headers=headers) is get_market_store(headers=headers)
+    assert get_market_store(headers=headers) is not get_market_store()
+
+
+def test_series_fan_out_is_cached():
+    api = FakeKalshi()
+    store = KalshiMarketStore(get_json=api, refresh_interval=60)
+    result = store.series_markets(["SER1", "SER2"])
+    assert set(result) == {"SER1", "SER2"} and all(result.values())
+    calls = len(api.calls)
+    store.series_markets(["SER2", "SER1"])
+    assert len(api.calls) == calls
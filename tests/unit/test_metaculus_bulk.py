@@ -0,0 +1,126 @@
+"""Tests for the bulk Metaculus prediction path (odds/metaculus.py)."""
+import threading
+import time
+
+import pytest
+
+from odds import metaculus
+
+
+class FakeMetaculus:
+    """In-memory /api/posts listing and detail endpoints."""
+
+    def __init__(self, n=12, inline=False, latency=0.0):
+        self.inline = inline
+        self.latency = latency
+        self.failing = set()  # Question ids whose detail request fails
+        self.calls = []
+        self.lock = threading.Lock()
+        self.posts = {
+            i: {
+                "id": i,
+                "title": f"Question {i}",
+                "nr_forecasters": 50 + i,
+                "forecasts_count": 100 + i,
+                "last_activity_time": "2026-01-01T00:00:00Z",
+                "question": {"type": "binary" if i % 6 else "numeric"},
+                "_cp": round(0.05 + i / 100, 2),
+            }
+            for i in range(1, n + 1)
+        }
+
+    def forecast(self, qid, cp):
+        post = self.posts[qid]
+        post.update(_cp=cp, forecasts_count=post["forecasts_count"] + 1,
+                    last_activity_time="2026-01-02T00:00:00Z")
+
+    def _render(self, post, with_cp):
+        question = dict(post["question"])
+        if with_cp:
+            question["aggregations"] = {"recency_weighted": {"latest": {"centers": [post["_cp"]]}}}
+        out = {k: v for k, v in post.items() if not k.startswith("_")}
+        out["question"] = question
+        return out
+
+    def __call__(self, url, timeout=None):
+        with self.lock:
+            self.calls.append(url)
+        time.sleep(self.latency)
+        path = url.split("/api/posts", 1)[1]
+        if path.startswith("/?"):
+            return {"results": [self._render(p, self.inline and "with_cp=true" in path)
+                                for p in self.posts.values()]}
+        qid = int(path.strip("/"))
+        return None if qid in self.failing else self._render(self.posts[qid], True)
+
+    def details(self):
+        return [c for c in self.calls if "/?" not in c]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeMetaculus()
+    monkeypatch.setattr(metaculus, "_get_json", fake)
+    monkeypatch.setattr(metaculus, "_limiter", metaculus.TokenBucket(1000, capacity=1000))
+    metaculus.clear_prediction_cache()
+    yield fake
+    metaculus.clear_prediction_cache()
+
+
+def test_listing_predictions_need_no_detail_requests(api):
+    api.inline = True
+    questions = metaculus.fetch_questions(limit=50, min_forecasters=10)
+    assert len(questions) == 10  # Numeric questions dropped
+    assert all(q["community_prediction"] == api.posts[q["id"]]["_cp"] for q in questions)
+    assert api.details() == []
+    stats = metaculus.get_scan_stats()
+    assert stats["requests"] == 1 and stats["inline"] == 10
+
+
+def test_detail_fetches_are_cached_by_activity(api):
+    first = metaculus.fetch_questions(min_forecasters=10)
+    assert {q["id"]: q["community_prediction"] for q in first} == {
+        qid: p["_cp"] for qid, p in api.posts.items() if qid % 6}
+    assert metaculus.get_scan_stats()["detail_requests"] == 10 and len(api.details()) == 10
+
+    # Unchanged questions are skipped; only the one with new forecasts is refetched
+    api.forecast(5, 0.9)
+    api.calls.clear()
+    second = metaculus.fetch_questions(min_forecasters=10)
+    assert api.details() == [f"{metaculus.METACULUS_API}/5/"]
+    assert {q["id"]: q["community_prediction"] for q in second}[5] == 0.9
+    stats = metaculus.get_scan_stats()
+    assert stats["cache_hits"] == 9 and stats["requests"] == 2
+
+
+def test_cache_entries_expire(api):
+    posts = [api._render(p, False) for p in api.posts.values()]
+    metaculus.fetch_community_predictions(posts)
+    _, stats = metaculus.fetch_community_predictions(posts, ttl=0)
+    assert stats["cache_hits"] == 0 and stats["detail_requests"] == len(posts)
+
+
+def test_failed_detail_fetches_are_not_cached(api):
+    posts = [api._render(p, False) for p in api.posts.values()]
+    api.failing = {1}
+    predictions, stats = metaculus.fetch_community_predictions(posts)
+    assert predictions[1] is None and stats["detail_failures"] == 1
+    assert predictions[6] is None  # Numeric: a real answer, cached
+
+    api.failing.clear()
+    api.calls.clear()
+    predictions, stats = metaculus.fetch_community_predictions(posts)
+    assert api.details() == [f"{metaculus.METACULUS_API}/1/"]
+    assert predictions[1] == api.posts[1]["_cp"] and stats["cache_hits"] == len(posts) - 1
+
+
+def test_token_bucket_paces_concurrent_callers():
+    bucket = metaculus.TokenBucket(50, capacity=5)
+    started = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(15)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 5 from the burst, 10 more at 50/s
+    assert time.monotonic() - started >= 0.18
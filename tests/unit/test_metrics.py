@@ -0,0 +1,84 @@
+"""Tests for request/upstream metrics and Prometheus exposition."""
+import sys
+import urllib.request
+from pathlib import Path
+
+from api.services import metrics
+from api.services.metrics import LATENCY_BUCKETS, MetricsRegistry, UpstreamTimingHandler
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "load"))
+
+from bench_metrics_middleware import measure_overhead
+
+
+def _route(snapshot, route, method="GET"):
+    return next((r for r in snapshot["routes"] if r["route"] == route and r["method"] == method), None)
+
+
+class TestRegistry:
+    def test_histogram_and_statuses(self):
+        reg = MetricsRegistry()
+        for seconds in (0.002, 0.004, 0.2):
+            reg.observe_request("GET", "/api/x", 200, seconds)
+        reg.observe_request("GET", "/api/x", 503, 0.002)
+
+        snap = reg.snapshot()
+        assert snap["request_count"] == 4
+        r = _route(snap, "/api/x")
+        assert r["statuses"] == {"200": 3, "503": 1}
+        assert r["avg_ms"] == 52.0
+        assert r["p50_ms"] <= r["p95_ms"] <= 250
+
+    def test_prometheus_buckets_are_cumulative(self):
+        reg = MetricsRegistry()
+        reg.observe_request("GET", '/a"b', 200, 0.003)
+        reg.observe_request("GET", '/a"b', 200, 40.0)
+        text = reg.prometheus()
+
+        assert 'polyclawd_http_requests_total{method="GET",route="/a\\"b",status="200"} 2' in text
+        assert f'le="{LATENCY_BUCKETS[2]}"}} 1' in text
+        assert f'le="{LATENCY_BUCKETS[-1]}"}} 1' in text
+        assert 'le="+Inf"} 2' in text
+        assert "# TYPE polyclawd_http_request_duration_seconds histogram" in text
+
+    def test_shards_from_threads_are_merged(self):
+        import threading
+        reg = MetricsRegistry()
+        threads = [threading.Thread(target=lambda: [reg.observe_upstream("api.x.com", 200, 0.01) for _ in range(500)])
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert reg.snapshot()["upstreams"][0]["count"] == 2000
+
+
+class TestMiddleware:
+    def test_routes_use_templates(self, test_client):
+        test_client.get("/health")
+        test_client.get("/definitely-not-a-route")
+
+        snap = test_client.get("/metrics").json()
+        assert _route(snap, "/health")["statuses"].get("200", 0) >= 1
+        assert _route(snap, "<unmatched>")["statuses"].get("404", 0) >= 1
+
+        text = test_client.get("/metrics/prometheus").text
+        assert 'polyclawd_http_requests_total{method="GET",route="/health",status="200"}' in text
+
+    def test_overhead_under_50us(self):
+        assert measure_overhead(n=5000, rounds=3)["overhead_us"] < 50
+
+
+class TestUpstream:
+    def test_urllib_handler_records_host(self, monkeypatch):
+        reg = MetricsRegistry()
+        monkeypatch.setattr(metrics, "registry", reg)
+        handler = UpstreamTimingHandler()
+        req = urllib.request.Request("https://gamma-api.polymarket.com/events?limit=1")
+        handler.https_request(req)
+        resp = type("Resp", (), {"status": 429})()
+        assert handler.https_response(req, resp) is resp
+
+        upstream = reg.snapshot()["upstreams"][0]
+        assert upstream["host"] == "gamma-api.polymarket.com"
+        assert upstream["statuses"] == {"429": 1}
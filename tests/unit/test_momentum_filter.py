@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
 from price_momentum_filter import (
     calculate_momentum,
     check_entry,
+    get_price_histories,
     RISING_THRESHOLD,
     FALLING_THRESHOLD,
 )
@@ -98,6 +99,17 @@ def test_current_price_overrides():
     assert r["direction"] == "rising"
 
 
+def test_batch_histories_match_single_lookup():
+    conn = _make_db()
+    _insert_prices(conn, "mkt-1", [0.50, 0.53, 0.56, 0.60])
+    _insert_prices(conn, "mkt-2", [0.60, 0.55, 0.50, 0.45])
+    histories = get_price_histories(["mkt-1", "mkt-2", "missing"], conn=conn)
+    assert [h["price"] for h in histories["mkt-2"]] == [0.60, 0.55, 0.50, 0.45]
+    assert histories["missing"] == []
+    for mid in ("mkt-1", "mkt-2"):
+        assert calculate_momentum(mid, conn=conn) == calculate_momentum(mid, history=histories[mid])
+
+
 if __name__ == "__main__":
     for name, fn in list(globals().items()):
         if name.startswith("test_") and callable(fn):
@@ -0,0 +1,107 @@
+"""Tests for NumPy order books, batch analytics and fill simulation (odds/orderbook.py)."""
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
+
+import paper_portfolio
+from odds import polymarket_clob
+from odds.orderbook import Book, BookBatch, analyze_books, simulate_fill, vwap_curve
+
+
+def _raw_book(rng, token_id="t", levels=None):
+    """A CLOB /book response: levels listed worst-first, as the API returns them."""
+    mid = rng.randint(10, 90) / 100
+    n_bids = rng.randint(0, 25) if levels is None else levels
+    n_asks = rng.randint(0, 25) if levels is None else levels
+    bids = sorted({round(mid - rng.randint(1, 9) / 100 * (1 + i // 9), 2) for i in range(n_bids)} - {0.0})
+    asks = sorted({round(mid + rng.randint(1, 9) / 100 * (1 + i // 9), 2) for i in range(n_asks)}, reverse=True)
+    size = lambda: str(rng.choice([5, 20, 50, 100, 250, 2500]))  # noqa: E731
+    return {"asset_id": token_id, "market": "0xm",
+            "bids": [{"price": str(p), "size": size()} for p in bids if 0 < p < 1],
+            "asks": [{"price": str(p), "size": size()} for p in asks if 0 < p < 1]}
+
+
+def _dataclass_book(data):
+    """The pre-NumPy parse with the best-first sort get_orderbook was missing."""
+    bids = sorted((polymarket_clob.OrderBookLevel(float(b["price"]), float(b["size"])) for b in data["bids"]),
+                  key=lambda lvl: -lvl.price)[:10]
+    asks = sorted((polymarket_clob.OrderBookLevel(float(a["price"]), float(a["size"])) for a in data["asks"]),
+                  key=lambda lvl: lvl.price)[:10]
+    best_bid = bids[0].price if bids else 0
+    best_ask = asks[0].price if asks else 1
+    return polymarket_clob.OrderBook(
+        market_id="0xm", token_id=data["asset_id"], outcome="", bids=bids, asks=asks,
+        spread=round(best_ask - best_bid, 4),
+        mid_price=round((best_bid + best_ask) / 2, 4) if bids and asks else 0.5, timestamp="")
+
+
+def _walk_levels(levels, notional):
+    """Reference fill: spend ``notional`` level by level."""
+    shares = spent = 0.0
+    for price, size in levels:
+        take = min(size, (notional - spent) / price)
+        if take <= 0:
+            break
+        shares += take
+        spent += take * price
+    return shares, spent
+
+
+def test_batch_analysis_matches_dataclass_path():
+    rng = random.Random(5)
+    raw = [_raw_book(rng, token_id=f"t{i}") for i in range(300)]
+    expected = [polymarket_clob.analyze_orderbook_depth(_dataclass_book(d)) for d in raw]
+    assert analyze_books(raw) == expected
+
+    # The dataclass view of a Book is the same best-first top 10
+    book = Book.from_clob(raw[0])
+    view, reference = book.to_orderbook(), _dataclass_book(raw[0])
+    assert (view.bids, view.asks, view.spread, view.mid_price) == \
+        (reference.bids, reference.asks, reference.spread, reference.mid_price)
+    assert polymarket_clob.analyze_orderbook_depth(book) == expected[0]
+
+
+def test_fill_and_vwap_curve_match_level_walk():
+    rng = random.Random(9)
+    for _ in range(200):
+        book = Book.from_clob(_raw_book(rng))
+        notional = rng.choice([1, 10, 100, 1000, 10_000])
+        levels = list(zip(book.ask_px, book.ask_sz))
+        shares, spent = _walk_levels(levels, notional)
+        fill = simulate_fill(book, "buy", notional=notional)
+        assert fill.shares == pytest.approx(shares, abs=1e-6)
+        assert fill.notional == pytest.approx(spent, abs=1e-6)
+        assert fill.complete == (spent >= notional - 1e-9)
+        if shares:
+            assert fill.vwap == pytest.approx(spent / shares, abs=1e-6) and fill.slippage >= 0
+
+    book = Book([0.40, 0.39], [100, 100], [0.42, 0.45, 0.50], [100, 100, 100])
+    curve = vwap_curve(book, [50, 150, 300, 400])
+    assert curve["vwap"][:3] == pytest.approx([0.42, 0.43, 0.4566667])
+    assert curve["vwap"][3] == pytest.approx(0.4566667) and curve["fill_ratio"][3] == 0.75
+    batch = BookBatch([book, book.complement()]).vwap_to_size([50, 150, 400])
+    assert batch[0, :2] == pytest.approx([0.42, 0.43]) and np.isnan(batch[0, 2])
+    assert batch[1, :2] == pytest.approx([0.60, 0.6033333]) and np.isnan(batch[1, 2])
+
+    sell = simulate_fill(book, "sell", shares=150)
+    assert (sell.vwap, sell.slippage, sell.levels_used) == (0.396667, 0.003333, 2)
+    capped = simulate_fill(book, "buy", shares=300, limit_price=0.45)
+    assert (capped.shares, capped.complete) == (200, False)
+
+
+def test_paper_entry_priced_from_book_depth():
+    book = {"asset_id": "yes", "bids": [{"price": "0.30", "size": "1000"}, {"price": "0.38", "size": "200"}],
+            "asks": [{"price": "0.45", "size": "1000"}, {"price": "0.40", "size": "250"}]}
+    sim = paper_portfolio._simulate_entry({"orderbook": book}, "YES", 200)
+    assert sim["entry_price"] == pytest.approx(200 / (250 + 100 / 0.45), abs=1e-4)
+    assert sim["filled"] == pytest.approx(200) and sim["fill"].levels_used == 2
+
+    # NO buys lift the complement: 1 - YES bids; entry stays quoted in YES terms
+    sim = paper_portfolio._simulate_entry({"orderbook": book}, "NO", 124)
+    assert sim["fill"].vwap == pytest.approx(0.62) and sim["entry_price"] == pytest.approx(0.38)
+    assert paper_portfolio._simulate_entry({}, "YES", 100) is None
@@ -0,0 +1,120 @@
+"""Tests for the cached portfolio dashboard snapshot, ETag handling and SSE stream."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
+
+import paper_portfolio
+from api.services import portfolio_snapshot
+
+
+@pytest.fixture
+def portfolio_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(paper_portfolio, "DB_PATH", tmp_path / "shadow_trades.db")
+    monkeypatch.setattr(portfolio_snapshot, "build_risk_guards", lambda: {"kelly": {"status": "bootstrap"}})
+    monkeypatch.setattr(portfolio_snapshot, "_snapshot", None)
+    return tmp_path
+
+
+def _insert_open(market_id="mkt-1", archetype="weather"):
+    conn = paper_portfolio._get_db()
+    cur = conn.execute(
+        "INSERT INTO paper_positions (opened_at, market_id, market_title, side, entry_price, bet_size, potential_payout, status, archetype) "
+        "VALUES ('2026-03-01T00:00:00+00:00', ?, 'Test market', 'NO', 0.4, 100, 66.67, 'open', ?)",
+        (market_id, archetype),
+    )
+    conn.commit()
+    conn.close()
+    return cur.lastrowid
+
+
+class TestPortfolioEvents:
+    def test_version_starts_at_zero(self, portfolio_db):
+        assert paper_portfolio.get_portfolio_version() == 0
+
+    def test_close_records_event_and_bumps_version(self, portfolio_db):
+        pid = _insert_open()
+        result = paper_portfolio.close_position_by_id(pid, "won")
+        assert result["closed"] is True
+        version = paper_portfolio.get_portfolio_version()
+        assert version > 0
+        events = paper_portfolio.get_portfolio_events(since_id=0)
+        assert events[-1]["id"] == version
+        assert events[-1]["event"] == "closed"
+        assert events[-1]["payload"]["outcome"] == "won"
+        assert events[-1]["position_id"] == pid
+
+    def test_events_since_id(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_insert_open("a"), "won")
+        first = paper_portfolio.get_portfolio_version()
+        paper_portfolio.close_position_by_id(_insert_open("b"), "lost")
+        events = paper_portfolio.get_portfolio_events(since_id=first)
+        assert [e["payload"]["market_id"] for e in events] == ["b"]
+
+
+class TestSnapshot:
+    def test_cached_until_version_changes(self, portfolio_db):
+        _insert_open()
+        snap1 = portfolio_snapshot.get_snapshot()
+        assert portfolio_snapshot.get_snapshot() is snap1
+
+        paper_portfolio.close_position_by_id(1, "won")
+        snap2 = portfolio_snapshot.get_snapshot()
+        assert snap2 is not snap1
+        assert snap2.etag != snap1.etag
+        body = json.loads(snap2.body)
+        assert body["status"]["wins"] == 1
+        assert body["archetype_breakdown"]["breakdown"][0]["archetype"] == "weather"
+
+    def test_etag_stable_across_rebuild(self, portfolio_db):
+        _insert_open()
+        snap1 = portfolio_snapshot.get_snapshot()
+        snap2 = portfolio_snapshot.get_snapshot(force=True)
+        assert snap2 is not snap1
+        assert snap2.etag == snap1.etag
+
+    def test_etag_matches(self):
+        assert portfolio_snapshot.etag_matches('"abc"', '"abc"')
+        assert portfolio_snapshot.etag_matches('W/"abc", "def"', '"abc"')
+        assert portfolio_snapshot.etag_matches("*", '"abc"')
+        assert not portfolio_snapshot.etag_matches(None, '"abc"')
+        assert not portfolio_snapshot.etag_matches('"xyz"', '"abc"')
+
+
+class TestDashboardEndpoint:
+    def test_304_on_matching_etag(self, portfolio_db, test_client):
+        resp = test_client.get("/api/portfolio/dashboard")
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        assert "status" in resp.json()
+
+        resp = test_client.get("/api/portfolio/dashboard", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+
+class TestEventStream:
+    async def test_stream_pushes_event_then_snapshot(self, portfolio_db):
+        pid = _insert_open()
+        gen = portfolio_snapshot.stream_events(poll_interval=0.01, heartbeat=60)
+        frames = [await gen.__anext__()]  # retry hint
+        paper_portfolio.close_position_by_id(pid, "lost")
+        while len(frames) < 3:
+            frames.append(await gen.__anext__())
+        await gen.aclose()
+
+        assert frames[0].startswith("retry:")
+        assert "event: closed" in frames[1]
+        assert frames[1].startswith("id: ")
+        assert "event: snapshot" in frames[2]
+
+    async def test_stream_resumes_from_last_event_id(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_insert_open("a"), "won")
+        gen = portfolio_snapshot.stream_events(last_event_id=0, poll_interval=0.01)
+        await gen.__anext__()
+        frame = await gen.__anext__()
+        await gen.aclose()
+        assert "event: closed" in frame
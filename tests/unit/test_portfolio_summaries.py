@@ -0,0 +1,137 @@
+"""Tests for the incrementally maintained paper portfolio and empirical WR summary tables."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
+
+import empirical_confidence
+import paper_portfolio
+import shadow_tracker
+
+import signals.empirical_confidence
+import signals.paper_portfolio
+
+
+@pytest.fixture
+def portfolio_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "shadow_trades.db"
+    monkeypatch.setattr(paper_portfolio, "DB_PATH", db_path)
+    monkeypatch.setattr(empirical_confidence, "DB_PATH", db_path)
+    monkeypatch.setattr(shadow_tracker, "STORAGE_DIR", tmp_path)
+    monkeypatch.setattr(shadow_tracker, "DB_PATH", db_path)
+    shadow_tracker.get_db().close()
+    # Fixed sizing and no external hooks; the INSERT + summary update run for real
+    monkeypatch.setattr(paper_portfolio, "evaluate_signal",
+                        lambda signal: {"eligible": True, "edge": 0.1, "kelly_pct": 0.01, "bet_size": signal["bet_size"]})
+    monkeypatch.setattr(paper_portfolio, "HAS_MOMENTUM", False)
+    monkeypatch.setattr("signals.discord_alerts.alert_position_opened", lambda *a, **k: False)
+    return db_path
+
+
+@pytest.fixture
+def package_portfolio(portfolio_db, monkeypatch):
+    """signals.paper_portfolio, the module copy the scheduler and watchdog import."""
+    pkg = signals.paper_portfolio
+    monkeypatch.setattr(pkg, "DB_PATH", portfolio_db)
+    monkeypatch.setattr(signals.empirical_confidence, "DB_PATH", portfolio_db)
+    monkeypatch.setattr(pkg, "evaluate_signal", paper_portfolio.evaluate_signal)
+    monkeypatch.setattr(pkg, "HAS_MOMENTUM", False)
+    return pkg
+
+
+def _open(market_id, archetype="weather", side="NO", entry_price=0.4, bet_size=100.0, module=paper_portfolio):
+    result = module.open_position({
+        "market_id": market_id, "market_title": "Will BTC be above $100k?", "side": side,
+        "entry_price": entry_price, "bet_size": bet_size, "archetype": archetype, "confidence": 0.7,
+    })
+    assert result["opened"], result
+    conn = module._get_db()
+    row = conn.execute("SELECT id FROM paper_positions WHERE market_id=? AND status='open'", (market_id,)).fetchone()
+    conn.close()
+    return row["id"]
+
+
+class TestPaperSummaries:
+    def test_incremental_matches_full_recompute(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_open("a"), "won")
+        paper_portfolio.close_position_by_id(_open("b", archetype="crypto", side="YES", entry_price=0.7), "lost")
+        paper_portfolio.close_position_by_id(_open("c"), "lost")
+        _open("d")
+
+        result = paper_portfolio.check_summaries()
+        assert result["consistent"], result["mismatches"]
+
+    def test_breakdown_and_series_read_summaries(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_open("a"), "won")
+        paper_portfolio.close_position_by_id(_open("b"), "lost")
+
+        breakdown = paper_portfolio.get_archetype_breakdown()["breakdown"]
+        assert breakdown[0]["archetype"] == "weather"
+        assert (breakdown[0]["wins"], breakdown[0]["losses"]) == (1, 1)
+        assert breakdown[0]["pnl"] == pytest.approx(66.67 - 100, abs=0.01)
+
+        series = paper_portfolio.get_archetype_cumulative_pnl()["weather"]
+        assert [p["pnl"] for p in series] == [66.67, -33.33]
+
+    def test_rebuild_repairs_drift(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_open("a"), "won")
+        conn = paper_portfolio._get_db()
+        conn.execute("UPDATE paper_archetype_stats SET wins = 5")
+        conn.execute("UPDATE paper_running_stats SET recent_outcomes = 'LLL'")
+        conn.commit()
+        conn.close()
+        assert not paper_portfolio.check_summaries(repair=False)["consistent"]
+
+        paper_portfolio.rebuild_summaries()
+        assert paper_portfolio.check_summaries()["consistent"]
+
+    def test_check_rebuilds_on_drift(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_open("a"), "won")
+        conn = paper_portfolio._get_db()
+        conn.execute("UPDATE paper_archetype_stats SET open_count = 3")
+        conn.commit()
+        conn.close()
+
+        result = paper_portfolio.check_summaries()
+        assert not result["consistent"] and result["rebuilt"]
+        assert paper_portfolio.check_summaries() == {"consistent": True, "mismatches": [], "rebuilt": False}
+
+    def test_package_import_keeps_summaries_and_wr_stats(self, package_portfolio):
+        assert package_portfolio.HAS_EMPIRICAL
+        package_portfolio.close_position_by_id(_open("a", module=package_portfolio), "won")
+        _open("b", module=package_portfolio)
+
+        result = package_portfolio.check_summaries(repair=False)
+        assert result["consistent"], result["mismatches"]
+        zones = {r["price_zone"] for r in package_portfolio._get_db().execute("SELECT price_zone FROM paper_archetype_stats")}
+        assert zones == {"cheap"}
+        assert signals.empirical_confidence.check_wr_stats(repair=False)["consistent"]
+        assert sum(r["total"] for r in signals.empirical_confidence._load_wr_stats()) == 1
+
+    def test_equity_curve_starts_at_bankroll(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_open("a"), "won")
+        curve = paper_portfolio.get_equity_curve()
+        assert curve[0]["v"] == paper_portfolio.STARTING_BANKROLL
+        assert len(curve) == 2
+
+
+class TestEmpiricalWRStats:
+    def test_paper_close_updates_wr_table(self, portfolio_db):
+        paper_portfolio.close_position_by_id(_open("a"), "won")
+        paper_portfolio.close_position_by_id(_open("b"), "lost")
+
+        assert empirical_confidence.check_wr_stats()["consistent"]
+        rows = empirical_confidence._load_wr_stats()
+        assert sum(r["total"] for r in rows) == 2
+        assert sum(r["wins"] for r in rows) == 1
+
+    def test_confidence_uses_summary_rows(self, portfolio_db):
+        for i in range(4):
+            paper_portfolio.close_position_by_id(_open(f"m{i}"), "won" if i else "lost")
+
+        result = empirical_confidence.calculate_empirical_confidence("Will BTC be above $100k?", "NO", 0.4)
+        assert result["total_resolved"] == 4
+        assert result["breakdown"]["bucket_n"] == 4
+        assert result["breakdown"]["bucket_wins"] == 3
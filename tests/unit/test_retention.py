@@ -0,0 +1,129 @@
+"""Tests for time-series retention: rollups, Parquet archival and vacuum."""
+import sqlite3
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from services import retention
+
+duckdb = pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+
+NOW = datetime(2026, 3, 20, 12, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "shadow_trades.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("""CREATE TABLE hf_divergence_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, asset TEXT NOT NULL, binance_price REAL, oracle_price REAL,
+        divergence_pct REAL, oracle_age_seconds REAL, snapshot_at TEXT)""")
+    conn.execute("""CREATE TABLE signal_predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL, source TEXT NOT NULL, market_id TEXT,
+        market_title TEXT, side TEXT, confidence REAL NOT NULL, price_at_signal REAL,
+        resolved INTEGER DEFAULT 0, outcome REAL, resolved_at REAL)""")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _insert_divergence(path, when, asset, price, div):
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "INSERT INTO hf_divergence_snapshots (asset, binance_price, divergence_pct, oracle_age_seconds, snapshot_at) "
+        "VALUES (?, ?, ?, 10, ?)",
+        (asset, price, div, when.isoformat()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _policies():
+    return {t: retention.POLICIES[t] for t in ("hf_divergence_snapshots", "signal_predictions")}
+
+
+def test_archives_rolls_up_and_deletes_cold_rows(db, tmp_path):
+    old = datetime(2026, 2, 1, 10, tzinfo=timezone.utc)
+    for i, (price, div) in enumerate([(100, 0.1), (105, 0.3), (95, 0.2), (102, 0.2)]):
+        _insert_divergence(db, old + timedelta(minutes=i * 10), "BTC", price, div)
+    _insert_divergence(db, datetime(2026, 3, 19, tzinfo=timezone.utc), "BTC", 110, 0.5)  # Hot
+
+    archive = tmp_path / "archive"
+    result = retention.run_retention(db, now=NOW, policies=_policies(), archive_dir=archive)
+    table = result["tables"][0]
+    assert table["archived"] == 4
+
+    conn = sqlite3.connect(str(db))
+    conn.row_factory = sqlite3.Row
+    assert conn.execute("SELECT COUNT(*) FROM hf_divergence_snapshots").fetchone()[0] == 1
+    rollup = conn.execute("SELECT * FROM hf_divergence_snapshots_rollup").fetchall()
+    assert len(rollup) == 1
+    r = rollup[0]
+    assert r["n"] == 4
+    assert r["divergence_pct_mean"] == pytest.approx(0.2)
+    assert (r["open"], r["high"], r["low"], r["close"]) == (100, 105, 95, 102)
+    conn.close()
+
+    source = retention.archive_source("hf_divergence_snapshots", archive)
+    rows = duckdb.sql(f"SELECT month, COUNT(*) FROM {source} GROUP BY month").fetchall()
+    assert rows == [("2026-02", 4)]
+
+
+def test_rerun_merges_into_existing_bucket(db, tmp_path):
+    old = datetime(2026, 2, 1, 10, tzinfo=timezone.utc)
+    _insert_divergence(db, old, "BTC", 100, 0.1)
+    retention.run_retention(db, now=NOW, policies=_policies(), archive_dir=tmp_path / "a")
+    _insert_divergence(db, old + timedelta(minutes=30), "BTC", 90, 0.3)
+    retention.run_retention(db, now=NOW, policies=_policies(), archive_dir=tmp_path / "a")
+
+    conn = sqlite3.connect(str(db))
+    n, mean, o, c, low = conn.execute(
+        "SELECT n, divergence_pct_mean, open, close, low FROM hf_divergence_snapshots_rollup"
+    ).fetchone()
+    conn.close()
+    assert (n, o, c, low) == (2, 100, 90, 90)
+    assert mean == pytest.approx(0.2)
+
+
+def test_unresolved_predictions_are_kept(db, tmp_path):
+    conn = sqlite3.connect(str(db))
+    old = NOW - 200 * 86400
+    conn.execute("INSERT INTO signal_predictions (timestamp, source, confidence, resolved) VALUES (?, 'a', 0.6, 0)", (old,))
+    conn.execute("INSERT INTO signal_predictions (timestamp, source, confidence, resolved, outcome) VALUES (?, 'a', 0.7, 1, 1)", (old,))
+    conn.commit()
+    conn.close()
+
+    result = retention.run_retention(db, now=NOW, policies=_policies(), archive_dir=tmp_path / "a")
+    assert result["tables"][1]["archived"] == 1
+    conn = sqlite3.connect(str(db))
+    assert conn.execute("SELECT resolved FROM signal_predictions").fetchall() == [(0,)]
+    conn.close()
+
+
+def test_dry_run_changes_nothing(db, tmp_path):
+    _insert_divergence(db, datetime(2026, 1, 1, tzinfo=timezone.utc), "ETH", 10, 0.1)
+    result = retention.run_retention(db, dry_run=True, now=NOW, policies=_policies(), archive_dir=tmp_path / "a")
+    assert result["tables"][0]["cold_rows"] == 1
+    assert result["tables"][0]["archived"] == 0
+    assert not (tmp_path / "a").exists()
+
+
+def test_report_and_vacuum(db, tmp_path):
+    for i in range(200):
+        _insert_divergence(db, datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i), "ETH", 10, 0.1)
+    result = retention.run_retention(db, now=NOW, policies=_policies(), archive_dir=tmp_path / "a")
+    assert result["vacuum"]["auto_vacuum"] == "incremental"
+    assert result["before"]["tables"]["hf_divergence_snapshots"]["rows"] == 200
+    assert result["after"]["tables"]["hf_divergence_snapshots"]["rows"] == 0
+    assert "last_day_ms" in result["after"]["tables"]["hf_divergence_snapshots"]
+
+
+def test_config_overrides(tmp_path):
+    cfg = tmp_path / "retention.json"
+    cfg.write_text('{"signal_snapshots": {"hot_days": 60, "keys": ["x"]}, "alpha_snapshots": {"enabled": false}}')
+    policies = retention.load_policies(cfg)
+    assert policies["signal_snapshots"].hot_days == 60
+    assert policies["signal_snapshots"].keys == ("market_id",)
+    assert policies["alpha_snapshots"].enabled is False
@@ -14,7 +14,7 @@ import pytest
 # Add signals dir to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'signals'))
 
-from strike_probability import StrikeProbabilityCalculator, _student_t_cdf, _normal_cdf
+from strike_probability import StrikeProbabilityCalculator, _student_t_cdf, _normal_cdf, _student_t_cdf_array
 
 
 @pytest.fixture
@@ -318,5 +318,58 @@ class TestScan:
             assert results[0]["edge"] >= results[1]["edge"]
 
 
+# ─── Batch Pricing Tests ─────────────────────────────────────
+
+def _ladder(days_out=10):
+    expiry = (datetime.now(timezone.utc) + timedelta(days=days_out)).strftime("%B %d, %Y")
+    markets = []
+    for i, strike in enumerate(range(56000, 72001, 2000)):
+        direction = "above" if i % 3 else "below"
+        markets.append({"id": f"btc-{strike}", "yes_price": 0.5 if direction == "above" else 0.4,
+                        "title": f"Will the price of Bitcoin be {direction} ${strike:,} on {expiry}?"})
+    markets.append({"id": "eth-3000", "yes_price": 0.9, "title": f"Will Ethereum be above $3,000 on {expiry}?"})
+    markets.append({"id": "sol-100", "yes_price": 0.5, "title": f"Will Solana be above $100 on {expiry}?"})
+    markets.append({"id": "lakers", "yes_price": 0.5, "title": "Will the Lakers win?"})
+    return markets
+
+
+class TestBatchPricing:
+    def test_batch_matches_per_market_scoring(self, calc):
+        markets = _ladder()
+        expected = {m["id"]: calc.score_market(m) for m in markets}
+        expected = {k: v for k, v in expected.items() if v is not None}
+        batch = {r["market_id"]: r for r in calc.score_markets(markets)}
+        assert set(batch) == set(expected) and len(batch) == 10  # 9 BTC strikes + ETH; no SOL data
+        for market_id, r in batch.items():
+            assert r == pytest.approx(expected[market_id], abs=1e-3)
+        assert calc.stats["ladders"] == 3 and calc.stats["symbols"] == 3
+
+    def test_contracts_parsed_once(self, calc):
+        markets = _ladder()
+        calc.score_markets(markets)
+        parses = calc.stats["contract_parses"]
+        calc.score_markets(markets)
+        assert calc.stats["contract_parses"] == parses and calc.stats["contract_hits"] >= parses
+
+    def test_vectorized_t_cdf_matches_scalar(self):
+        z = [-10, -3, -0.5, 0, 0.7, 2.5, 10]
+        assert list(_student_t_cdf_array(z, 4)) == pytest.approx([_student_t_cdf(x, 4) for x in z])
+
+    def test_ladder_check_flags_non_monotone_prices(self, calc):
+        markets = [m for m in _ladder() if m["id"].startswith("btc")]
+        report = calc.check_ladders(calc.score_markets(markets))
+        # Above rungs price P(above)=0.5, below rungs 1 - 0.4 = 0.6: each below rung after an above one
+        # breaks, paired with the nearest cheaper lower strike
+        assert len(report) == 1 and not report[0]["monotone"] and report[0]["model_monotone"]
+        assert [(v["lower_strike"], v["higher_strike"], v["gap"]) for v in report[0]["violations"]] == [
+            (60000.0, 62000.0, 0.1), (66000.0, 68000.0, 0.1)]
+
+        for m in markets:
+            strike = float(m["id"].split("-")[1])
+            p_above = round(0.9 - (strike - 56000) / 20000, 2)
+            m["yes_price"] = p_above if "above" in m["title"] else round(1 - p_above, 2)
+        assert calc.check_ladders(calc.score_markets(markets))[0]["monotone"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
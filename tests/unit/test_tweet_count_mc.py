@@ -0,0 +1,61 @@
+"""Tests for the tweet-count Monte Carlo engines."""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
+
+import tweet_count_scanner as tcs
+
+COUNTS = [38, 52, 61, 47, 70, 55, 66, 44, 58, 63, 49, 72, 41, 57]
+
+
+def _python_probs(daily_counts, window_days, posts_so_far=0, days_elapsed=0, simulations=40_000,
+                  counts_by_dow=None, window_start=None, seed=3):
+    remaining = max(0, window_days - days_elapsed)
+    pools, weights = tcs._build_day_pools(daily_counts, remaining, posts_so_far, days_elapsed,
+                                          counts_by_dow, window_start)
+    totals = tcs._simulate_totals_python(daily_counts, pools, weights, remaining, posts_so_far, simulations, seed)
+    hits = {}
+    for t in totals:
+        key = tcs._bracket_key(t)
+        hits[key] = hits.get(key, 0) + 1
+    return {k: v / simulations for k, v in hits.items()}
+
+
+def _assert_close(a, b, tol=0.015):
+    for key in set(a) | set(b):
+        assert a.get(key, 0) == pytest.approx(b.get(key, 0), abs=tol), key
+
+
+def test_seeded_runs_are_reproducible():
+    a = tcs.run_monte_carlo(COUNTS, 7, posts_so_far=120, days_elapsed=2.5, seed=42)
+    b = tcs.run_monte_carlo(COUNTS, 7, posts_so_far=120, days_elapsed=2.5, seed=42)
+    assert a == b
+    assert sum(a.values()) == pytest.approx(1.0)
+
+
+def test_brackets_and_overflow_bucket():
+    probs = tcs.run_monte_carlo([100] * 10, 7, simulations=1000, seed=1)
+    assert probs == {"580+": 1.0}
+    probs = tcs.run_monte_carlo([10] * 10, 3.5, simulations=1000, seed=1)
+    assert probs == {"20-39": 1.0}  # 3 × 10 + int(10 × 0.5)
+
+
+@pytest.mark.skipif(not tcs.HAS_NUMPY, reason="numpy not installed")
+def test_numpy_matches_python_engine():
+    _assert_close(tcs.run_monte_carlo(COUNTS, 7, simulations=40_000, seed=3), _python_probs(COUNTS, 7))
+
+
+@pytest.mark.skipif(not tcs.HAS_NUMPY, reason="numpy not installed")
+def test_numpy_matches_python_engine_pace_weighted_dow():
+    # Hot pace (z > 1) turns on weighted sampling; DOW pools differ per day
+    by_dow = {d: [c + d * 5 for c in COUNTS[:6]] for d in range(7)}
+    kwargs = dict(posts_so_far=260, days_elapsed=2.4, counts_by_dow=by_dow, window_start=datetime(2026, 3, 3, 16))
+    pools, weights = tcs._build_day_pools(COUNTS, 4.6, 260, 2.4, by_dow, kwargs["window_start"])
+    assert weights is not None
+
+    _assert_close(tcs.run_monte_carlo(COUNTS, 7, simulations=40_000, seed=3, **kwargs),
+                  _python_probs(COUNTS, 7, **kwargs))
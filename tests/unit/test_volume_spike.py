@@ -1,6 +1,8 @@
 """Tests for volume spike detector."""
 import sqlite3
+import subprocess
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
@@ -8,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "signals"))
 from volume_spike_detector import (
     detect_spike,
     get_volume_baseline,
+    get_volume_baselines,
     SPIKE_RATIO,
     MEGA_SPIKE_RATIO,
     MIN_HISTORY_POINTS,
@@ -96,6 +99,50 @@ def test_insufficient_history():
     assert "reason" in r
 
 
+def _insert_recent(conn, market_id, volumes, hours_ago_start=10):
+    now = datetime.now(timezone.utc)
+    for i, vol in enumerate(volumes):
+        t = now - timedelta(hours=hours_ago_start - i)
+        conn.execute(
+            "INSERT INTO signal_snapshots (snapshot_date, snapshot_time, market_id, market, volume) VALUES (?, ?, ?, ?, ?)",
+            (t.strftime("%Y-%m-%d"), t.isoformat(), market_id, "Test market", vol)
+        )
+    conn.commit()
+
+
+def test_batch_baselines_single_query():
+    conn = _make_db()
+    _insert_recent(conn, "mkt-1", [1000, 2000, 3000])
+    _insert_recent(conn, "mkt-2", [500, 500, 500, 500])
+    _insert_recent(conn, "mkt-3", [9000], hours_ago_start=72)  # Outside 48h window
+    b = get_volume_baselines(["mkt-1", "mkt-2", "mkt-3", "missing"], conn)
+    assert b["mkt-1"]["avg_volume"] == 2000
+    assert b["mkt-2"]["data_points"] == 4
+    assert b["mkt-3"]["data_points"] == 0
+    assert b["missing"]["avg_volume"] == 0
+    assert detect_spike("mkt-2", 2000, baseline=b["mkt-2"])["level"] == "spike"
+
+
+def test_ts_backfill_and_index():
+    conn = _make_db()
+    _insert_snapshots(conn, "mkt-1", [1000])
+    get_volume_baseline("mkt-1", conn)  # Triggers one-shot migration
+    ts = conn.execute("SELECT ts FROM signal_snapshots").fetchone()[0]
+    assert ts == datetime(2026, 2, 24, 10, tzinfo=timezone.utc).timestamp()
+    plan = " ".join(r[3] for r in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT AVG(volume) FROM signal_snapshots WHERE market_id = 'x' AND ts >= 0"
+    ).fetchall())
+    assert "idx_snapshots_market_ts" in plan
+
+
+def test_imports_as_package_module():
+    """signals.<module> must import without signals/ on sys.path (scheduler, API)."""
+    root = Path(__file__).parent.parent.parent
+    code = "import signals.volume_spike_detector, signals.price_momentum_filter"
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
 if __name__ == "__main__":
     for name, fn in list(globals().items()):
         if name.startswith("test_") and callable(fn):
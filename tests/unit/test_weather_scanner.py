@@ -11,6 +11,7 @@ from weather_scanner import (
     _extract_date_from_market,
     _extract_temp_threshold,
     evaluate_weather_market,
+    evaluate_weather_event,
     _c_to_f,
     _f_to_c,
 )
@@ -55,11 +56,11 @@ def test_threshold_above_f():
 
 def test_threshold_or_higher():
     result = _extract_temp_threshold("65°F or higher")
-    assert result == ("above", 65.0, "F")
+    assert result == ("above", 64.0, "F")  # Whole-degree reading >= 65 is > 64
 
 def test_threshold_below_f():
     result = _extract_temp_threshold("below 32°F")
-    assert result == ("below", 32.0, "F")
+    assert result == ("below", 31.0, "F")  # Whole-degree reading < 32 is <= 31
 
 def test_threshold_or_below():
     result = _extract_temp_threshold("40°F or below")
@@ -102,6 +103,29 @@ def test_evaluate_returns_none_for_no_date():
     assert result is None
 
 
+# ── Batch event evaluation ───────────────────────────────────
+
+def test_evaluate_event_prices_ladder_in_one_call():
+    from unittest.mock import patch
+
+    forecast = {"ensemble": {"high_mean_f": 70.0, "high_std_f": 2.0, "n_sources": 3,
+                             "n_models": 30, "source_agreement": 0.9}}
+    markets = [
+        ("Will the highest temperature in Miami be 65°F or below on March 3, 2026?", 0.30),
+        ("Will the highest temperature in Miami be between 68-69°F on March 3, 2026?", 0.05),
+        ("Will the highest temperature in Miami be 76°F or higher on March 3, 2026?", 0.01),
+        ("Temp in Timbuktu on Feb 27", 0.5),
+    ]
+    with patch("signals.weather_ensemble.get_ensemble_forecast", return_value=forecast) as mock_fc:
+        results = evaluate_weather_event(markets)
+    assert mock_fc.call_count == 1
+    assert len(results) == 4
+    assert results[0]["side"] == "NO"  # 65°F or below is ~1% likely vs 30% price
+    assert results[1]["side"] == "YES"
+    assert results[1]["weather_detail"]["n_models"] == 30
+    assert results[3] is None
+
+
 # ── Confidence scoring logic ─────────────────────────────────
 
 def test_confidence_has_reasonable_range():